@@ -11,12 +11,9 @@ import logging
 import time
 import tempfile
 import requests
-import openpyxl
 
 logger = logging.getLogger(__name__)
 
-from openpyxl.styles import Font, PatternFill
-
 
 class KeyCRMAPIError(Exception):
     """Custom exception for KeyCRM API errors."""
@@ -338,7 +335,11 @@ class ReportService:
                     date_range_str = target_date.strftime('%Y-%m-%d')
                     display_date = date_range_str
 
-            # Create Excel workbook
+            # Create Excel workbook. openpyxl drags in numpy and PIL; `bot`
+            # re-exports this module, so importing it eagerly taxed every
+            # process that touches the package.
+            import openpyxl
+            from openpyxl.styles import Font, PatternFill
             wb = openpyxl.Workbook()
             ws = wb.active
             ws.title = "Sales Summary"
@@ -11,7 +11,9 @@ Usage:
     page_limit = config.api.page_limit
 """
 
+import logging
 import os
+import re
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Set
@@ -25,6 +27,8 @@ _VERSION = _VERSION_FILE.read_text().strip() if _VERSION_FILE.exists() else "0.0
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass(frozen=True)
 class APIConfig:
@@ -299,6 +303,61 @@ def is_production_url(url: str | None) -> bool:
     return url.strip().lower().startswith("https://")
 
 
+# ─── Resource Limits ──────────────────────────────────────────────────────────
+# Read on every call rather than frozen into `config`: they size pools and
+# budgets when those are built, and tests set them per case. A value that does
+# not parse falls back to the default instead of stopping the process.
+
+# DuckDB's own memory ceiling, independent of the container's mem_limit. Keep it
+# below what the container allows: Python, pandas frames and the Meili sync all
+# draw from the same budget, and a container OOM-kill is worse than a DuckDB
+# spill to temp_directory.
+DEFAULT_DUCKDB_MEMORY_LIMIT = "4GB"
+
+_SIZE_RE = r"(\d+(?:\.\d+)?)\s*(K|M|G|T)?(i?)B"
+_SIZE_POWERS = {"": 0, "K": 1, "M": 2, "G": 3, "T": 4}
+
+
+def workers_from_env(name: str, default: int) -> int:
+    """A non-negative worker count from the environment variable `name`."""
+    raw = (os.getenv(name) or "").strip()
+    if not raw:
+        return default
+    if raw.isdigit():
+        return int(raw)
+    logger.warning("Ignoring malformed %s=%r; using %d", name, raw, default)
+    return default
+
+
+def memory_limit() -> str:
+    """Resolve the DuckDB memory limit from DUCKDB_MEMORY_LIMIT.
+
+    Only DuckDB's own size syntax is accepted ("4GB", "512MB", …). Anything else
+    falls back to the default rather than reaching the SET statement, so a typo
+    in the environment cannot stop the store from connecting at all.
+    """
+    raw = (os.getenv("DUCKDB_MEMORY_LIMIT") or "").strip()
+    if not raw:
+        return DEFAULT_DUCKDB_MEMORY_LIMIT
+    if re.fullmatch(_SIZE_RE, raw, re.IGNORECASE):
+        return raw
+    logger.warning(
+        "Ignoring malformed DUCKDB_MEMORY_LIMIT=%r; using %s",
+        raw, DEFAULT_DUCKDB_MEMORY_LIMIT,
+    )
+    return DEFAULT_DUCKDB_MEMORY_LIMIT
+
+
+def memory_limit_bytes() -> int:
+    """The resolved memory limit in bytes, for callers that budget against it.
+
+    DuckDB reads "4GB" as decimal and "4GiB" as binary; so does this.
+    """
+    m = re.fullmatch(_SIZE_RE, memory_limit(), re.IGNORECASE)
+    base = 1024 if m.group(3) else 1000
+    return int(float(m.group(1)) * base ** _SIZE_POWERS[(m.group(2) or "").upper()])
+
+
 def validate_config(
     require_bot: bool = False,
     require_api: bool = True,
@@ -14,24 +14,33 @@ Domain-specific query methods are organized into repository mixins:
 - RevenueMixin: Revenue trends, sales analytics, products
 """
 import asyncio
+import itertools
 import json
 import logging
-import os
-import re
+import sys
 import time
 from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Tuple
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Tuple
 from zoneinfo import ZoneInfo
 
 import duckdb
-import pandas as pd
+
+# pandas is a third of a second to import and only the write paths build
+# DataFrames, so the web process no longer pays for it before serving.
+if TYPE_CHECKING:
+    import pandas as pd
 
 from core.models import LOST_STATUS_GROUP_ID, Order, OrderStatus
+from core.upsert_decider import order_payload_hash, should_update_order, should_update_order_sql
+from core.config import memory_limit, workers_from_env
 from core.exceptions import QueryTimeoutError
+from core.observability import metrics
+from core.query_profiler import query_profiler
+from core.gold_delta import GOLD_DELTA_MAX_DATES, diff_gold_cells, read_gold_cells
 from core.duckdb_constants import (
     DB_DIR, DB_PATH, DEFAULT_TZ, DEFAULT_QUERY_TIMEOUT, LONG_QUERY_TIMEOUT,
     B2B_MANAGER_ID, RETAIL_MANAGER_IDS, KNOWN_SALES_TYPES, DISPLAY_TIMEZONE, _date_in_kyiv,
@@ -43,6 +52,7 @@ from core.repositories import (
     InventoryMixin, ExpensesMixin, RevenueMixin, ProductsIntelMixin,
     MarginMixin,
 )
+from core.repositories.traffic import GOLD_TRAFFIC_INSERT_SQL
 
 logger = logging.getLogger(__name__)
 
@@ -68,6 +78,141 @@ class UpsertResult:
         return self.count
 
 
+# Set-based order upsert (upsert_orders). The incoming batch is registered as
+# `_upsert_orders_batch` and the ids it decided to write as `_upsert_write_ids`;
+# the two statements below then apply the whole batch in one transaction.
+# Still no ON CONFLICT — DuckDB 1.5.x has MVCC bugs in that path (P2-1) — so
+# rows that exist are UPDATEd and rows that don't are INSERTed, exactly as the
+# per-row code did.
+#
+# manager_comment carries UTM attribution data. COALESCE keeps the stored
+# value when the API payload has it as null — otherwise a re-sync of an order
+# whose payload omits the field would destroy attribution that backfill
+# restored (loss is unrecoverable: the UTM silver layer parses from this
+# column).
+_BULK_ORDER_UPDATE_SQL = """
+    UPDATE orders SET
+        source_id = b.source_id, status_id = b.status_id,
+        status_group_id = b.status_group_id, grand_total = b.grand_total,
+        ordered_at = b.ordered_at, created_at = b.created_at,
+        updated_at = b.updated_at, buyer_id = b.buyer_id,
+        manager_id = b.manager_id,
+        manager_comment = COALESCE(b.manager_comment, orders.manager_comment),
+        promocode = b.promocode, payload_hash = b.payload_hash, synced_at = now()
+    FROM _upsert_orders_batch b
+    WHERE orders.id = b.id
+      AND b.id IN (SELECT id FROM _upsert_write_ids)
+"""
+
+_BULK_ORDER_INSERT_SQL = """
+    INSERT INTO orders (id, source_id, status_id, status_group_id,
+                        grand_total, ordered_at, created_at, updated_at,
+                        buyer_id, manager_id, manager_comment, promocode,
+                        payload_hash, synced_at)
+    SELECT b.id, b.source_id, b.status_id, b.status_group_id,
+           b.grand_total, b.ordered_at, b.created_at, b.updated_at,
+           b.buyer_id, b.manager_id, b.manager_comment, b.promocode,
+           b.payload_hash, now()
+    FROM _upsert_orders_batch b
+    WHERE b.id IN (SELECT id FROM _upsert_write_ids)
+      AND NOT EXISTS (SELECT 1 FROM orders o WHERE o.id = b.id)
+"""
+
+
+def _upsert_orders_row_by_row(
+    conn: duckdb.DuckDBPyConnection,
+    orders_df: "pd.DataFrame",
+    force_update: bool,
+    skip_unchanged_payload: bool = False,
+) -> Tuple[List[int], List[int], int, List[tuple]]:
+    """Per-row SELECT→UPDATE/INSERT with row-level fault isolation.
+
+    The fallback for a batch the set-based path could not apply. A poisoned
+    row (an occasional write-write conflict on DuckDB 1.5) fails a whole
+    statement; here it fails only itself, and the 24h sync_from buffer
+    retries it on the next cycle.
+
+    Returns (success_ids, written_ids, skipped_unchanged, failed) where
+    `failed` is a list of (order_id, error_str).
+    """
+    import pandas as pd
+
+    def _int_or_none(v):
+        return None if pd.isna(v) else int(v)
+
+    def _str_or_none(v):
+        return None if pd.isna(v) else v
+
+    rows = [
+        (
+            int(row.id), _int_or_none(row.source_id), _int_or_none(row.status_id),
+            _int_or_none(row.status_group_id), float(row.grand_total),
+            row.ordered_at, row.created_at, row.updated_at,
+            _int_or_none(row.buyer_id), _int_or_none(row.manager_id),
+            _str_or_none(row.manager_comment), _str_or_none(row.promocode),
+            _int_or_none(row.payload_hash),
+        )
+        for row in orders_df.itertuples(index=False)
+    ]
+
+    all_ids = [p[0] for p in rows]
+    placeholders = ",".join("?" * len(all_ids))
+    existing: Dict[int, Tuple[Any, Optional[int]]] = {
+        int(r[0]): (r[1], r[2])
+        for r in conn.execute(
+            f"SELECT id, updated_at, payload_hash FROM orders WHERE id IN ({placeholders})",
+            all_ids,
+        ).fetchall()
+    }
+
+    insert_sql = """
+        INSERT INTO orders (id, source_id, status_id, status_group_id,
+                           grand_total, ordered_at, created_at, updated_at,
+                           buyer_id, manager_id, manager_comment, promocode,
+                           payload_hash, synced_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, now())
+    """
+    update_sql = """
+        UPDATE orders SET
+            source_id = ?, status_id = ?, status_group_id = ?, grand_total = ?,
+            ordered_at = ?, created_at = ?, updated_at = ?,
+            buyer_id = ?, manager_id = ?,
+            manager_comment = COALESCE(?, manager_comment),
+            promocode = ?, payload_hash = ?, synced_at = now()
+        WHERE id = ?
+    """
+
+    success_ids: List[int] = []
+    written_ids: List[int] = []
+    skipped = 0
+    failed: List[tuple] = []
+    for params in rows:
+        order_id = params[0]
+        try:
+            if order_id in existing:
+                existing_updated_at, existing_hash = existing[order_id]
+                if not should_update_order(
+                    existing_updated_at, params[7], force=force_update,
+                    existing_hash=existing_hash,
+                    incoming_hash=params[12] if skip_unchanged_payload else None,
+                ):
+                    success_ids.append(order_id)
+                    skipped += 1
+                    continue
+                conn.execute(update_sql, [*params[1:], order_id])
+            else:
+                conn.execute(insert_sql, list(params))
+            written_ids.append(order_id)
+            success_ids.append(order_id)
+        except (duckdb.TransactionException, duckdb.ConstraintException) as e:
+            failed.append((order_id, str(e)))
+            try:
+                conn.execute("ROLLBACK")
+            except Exception:
+                pass
+    return success_ids, written_ids, skipped, failed
+
+
 # Warehouse self-heal bound: how many consecutive failed/errored refreshes we
 # keep auto-retrying (mark dirty → next scheduler tick) before we STOP the loop
 # and escalate loudly. Prevents both the old silent-idle dead-end (wrong data
@@ -75,6 +220,13 @@ class UpsertResult:
 # deterministic data bug.
 MAX_VALIDATION_RETRIES = 3
 
+# Above this fraction of the orders table an incremental Silver/Gold refresh
+# falls back to a full one. It was 0.5, but with the scope bound as IN lists
+# incremental already lost to full at about 10%. Joined against temp tables it
+# holds out to ~70% (scripts/bench_refresh_scope.py, 200k orders: 0.55x of a
+# full rebuild at 27% scope, 0.90x at 65%, 1.10x at 78%).
+SILVER_INCREMENTAL_MAX_SCOPE = 0.7
+
 # Once the retry budget is spent we stop rebuilding on every scheduler tick, but
 # "stop" used to mean forever — the Gold layer stayed wrong until a human acted
 # or the weekly full_sync came round. On 2026-08-02 that was five days. A full
@@ -82,35 +234,35 @@ MAX_VALIDATION_RETRIES = 3
 # was transient, and rare enough not to spin on a deterministic data bug.
 STUCK_REBUILD_COOLDOWN_SECONDS = 6 * 60 * 60
 
-# DuckDB's own memory ceiling, independent of the container's mem_limit. Keep it
-# below what the container allows: Python, pandas frames and the Meili sync all
-# draw from the same budget, and a container OOM-kill is worse than a DuckDB
-# spill to temp_directory.
-DEFAULT_DUCKDB_MEMORY_LIMIT = "4GB"
-
 # Above this many freshly-parsed UTM orders, resolving their dates costs more
 # than the full traffic rebuild it would save, so we just rebuild everything.
 # A parse this large is a backfill or a first run, not a steady-state tick.
 UTM_DATE_LOOKUP_LIMIT = 5000
 
 
-def _memory_limit() -> str:
-    """Resolve the DuckDB memory limit from DUCKDB_MEMORY_LIMIT.
+# Reader cursors for the dashboard read lane. Each is `conn.cursor()` on the
+# one database instance — DuckDB gives every cursor its own MVCC snapshot, so a
+# reader sees the last committed Gold while a refresh is halfway through
+# rewriting it, instead of queueing behind the whole refresh for the lock.
+# 0 turns the lane off and routes every read through the writer lock again.
+DEFAULT_DUCKDB_READ_WORKERS = 4
 
-    Only DuckDB's own size syntax is accepted ("4GB", "512MB", …). Anything else
-    falls back to the default rather than reaching the SET statement, so a typo
-    in the environment cannot stop the store from connecting at all.
-    """
-    raw = (os.getenv("DUCKDB_MEMORY_LIMIT") or "").strip()
-    if not raw:
-        return DEFAULT_DUCKDB_MEMORY_LIMIT
-    if re.fullmatch(r"\d+(\.\d+)?\s*(K|M|G|T)?i?B", raw, re.IGNORECASE):
-        return raw
-    logger.warning(
-        "Ignoring malformed DUCKDB_MEMORY_LIMIT=%r; using %s",
-        raw, DEFAULT_DUCKDB_MEMORY_LIMIT,
-    )
-    return DEFAULT_DUCKDB_MEMORY_LIMIT
+
+def _read_workers() -> int:
+    """Resolve the reader pool size from DUCKDB_READ_WORKERS."""
+    return workers_from_env("DUCKDB_READ_WORKERS", DEFAULT_DUCKDB_READ_WORKERS)
+
+
+# Gold tables rebuilt side by side, each on its own cursor and thread. They
+# share nothing but Silver, which is committed before any of them starts.
+# Every concurrent build holds its own aggregation state, so on a container
+# short of memory 1 puts them back in a row on the writer thread.
+DEFAULT_DUCKDB_GOLD_WORKERS = 3
+
+
+def _gold_workers() -> int:
+    """Resolve the Gold build concurrency from DUCKDB_GOLD_WORKERS (min 1)."""
+    return max(1, workers_from_env("DUCKDB_GOLD_WORKERS", DEFAULT_DUCKDB_GOLD_WORKERS))
 
 
 # The one definition of what a Gold revenue cell contains. Both the rebuild and
@@ -291,7 +443,8 @@ def silver_pass2_sql(buyer_filter: str = "") -> str:
     """Recompute `is_new_customer` from each buyer's MIN(order_date).
 
     Empty `buyer_filter` runs on every Silver row (full mode); otherwise it is
-    scoped to the affected buyers, keeping the write set bounded.
+    scoped to the affected buyers, keeping the write set bounded. It is the
+    body of an `IN (...)` — a subquery over the refresh's scope table.
     """
     inner_filter = "buyer_id IS NOT NULL" if not buyer_filter else f"buyer_id IN ({buyer_filter})"
     outer_filter = "" if not buyer_filter else f"AND silver_orders.buyer_id IN ({buyer_filter})"
@@ -326,6 +479,321 @@ def silver_pass2_sql(buyer_filter: str = "") -> str:
     """
 
 
+
+# ─── The one definition of a buyer ───────────────────────────────────────────
+#
+# Segments, at-risk cohorts, cohort LTV, the customer page's CLV block, the
+# buyer profile in chat and the Meilisearch buyer index each grouped Silver by
+# buyer on every call — the SMS segmentation through five CTEs and a window
+# over every order line. This is that aggregation done once per refresh, for
+# the buyers the refresh touched, so those readers become filtered scans.
+#
+# One row per buyer per Silver sales_type, plus a row with sales_type 'all' —
+# a buyer in two channels counts once there, which no sum of the per-type rows
+# can give. Orders follow Gold's revenue definition (not a return, on an active
+# source), so a buyer who only ever returned or bought on a retired channel has
+# no row at all.
+#
+# Margin is revenue less COGS from `offer_stocks.purchased_price`, with each
+# order's grand_total spread over its lines pro rata so order-level discounts
+# are charged to margin. Lines with no cost drop out of margin but not revenue;
+# `costed_revenue` says how much was costed. A catalog change rebuilds this
+# table whole (mark_catalog_dirty), and so does a cost or SKU change in
+# offer_stocks, through its own flag (buyer_stats_dirty) since nothing else
+# reads them.
+#
+# Recency is not stored — it would be wrong by the next morning. Readers take
+# DATEDIFF from last_order_date.
+#
+# No primary key: it is rewritten a buyer set at a time on every refresh, and
+# an ART index stops DuckDB vacuuming what that leaves behind — the
+# gold_daily_products lesson. A few tens of thousands of rows need no index.
+SILVER_BUYER_STATS_DDL = """CREATE TABLE IF NOT EXISTS silver_buyer_stats (
+            buyer_id INTEGER NOT NULL,
+            sales_type VARCHAR NOT NULL,        -- a Silver sales_type, or 'all'
+            orders INTEGER NOT NULL,
+            revenue DECIMAL(14, 2) NOT NULL,
+            margin DECIMAL(14, 2) NOT NULL,
+            costed_revenue DECIMAL(14, 2) NOT NULL,
+            first_order_date DATE NOT NULL,
+            last_order_date DATE NOT NULL,
+            first_ordered_at TIMESTAMP WITH TIME ZONE,
+            last_ordered_at TIMESTAMP WITH TIME ZONE,
+            cohort_month DATE NOT NULL,
+            last_order_id INTEGER NOT NULL,
+            last_order_total DECIMAL(12, 2) NOT NULL,
+            second_order_date DATE              -- NULL until a second order
+)"""
+
+
+def silver_buyer_stats_sql(buyer_filter: str = "") -> str:
+    """INSERT the `silver_buyer_stats` rows of every buyer, or of `buyer_filter`.
+
+    `buyer_filter` is the body of an `IN (...)` over buyer ids, as in
+    silver_pass2_sql. The caller deletes the same buyers first.
+    """
+    scope = f"AND buyer_id IN ({buyer_filter})" if buyer_filter else ""
+    return f"""
+        INSERT INTO silver_buyer_stats (
+            buyer_id, sales_type, orders, revenue, margin, costed_revenue,
+            first_order_date, last_order_date, first_ordered_at, last_ordered_at,
+            cohort_month, last_order_id, last_order_total, second_order_date
+        )
+        WITH buyer_orders AS (
+            SELECT id, buyer_id, sales_type, order_date, ordered_at, grand_total
+            FROM silver_orders
+            WHERE buyer_id IS NOT NULL
+              AND NOT is_return
+              AND is_active_source
+              {scope}
+        ),
+        lines AS (
+            SELECT
+                l.order_id,
+                CASE WHEN os.purchased_price > 0
+                     THEN os.purchased_price * l.quantity END AS cogs,
+                COALESCE(
+                    l.order_grand_total * l.line_amount
+                        / NULLIF(SUM(l.line_amount) OVER (PARTITION BY l.order_id), 0),
+                    0
+                ) AS revenue
+            FROM silver_order_lines l
+            LEFT JOIN offer_stocks os ON os.sku = l.sku
+            WHERE l.order_id IN (SELECT id FROM buyer_orders)
+        ),
+        order_margin AS (
+            SELECT
+                order_id,
+                SUM(revenue - cogs) FILTER (WHERE cogs IS NOT NULL) AS margin,
+                SUM(revenue) FILTER (WHERE cogs IS NOT NULL) AS costed_revenue
+            FROM lines
+            GROUP BY order_id
+        )
+        SELECT
+            o.buyer_id,
+            CASE WHEN GROUPING(o.sales_type) = 1 THEN 'all' ELSE o.sales_type END,
+            COUNT(*),
+            SUM(o.grand_total),
+            COALESCE(SUM(m.margin), 0),
+            COALESCE(SUM(m.costed_revenue), 0),
+            MIN(o.order_date),
+            MAX(o.order_date),
+            MIN(o.ordered_at),
+            MAX(o.ordered_at),
+            CAST(DATE_TRUNC('month', MIN(o.order_date)) AS DATE),
+            arg_max(o.id, (o.order_date, o.id)),
+            arg_max(o.grand_total, (o.order_date, o.id)),
+            (array_agg(o.order_date ORDER BY o.order_date))[2]
+        FROM buyer_orders o
+        LEFT JOIN order_margin m ON m.order_id = o.id
+        GROUP BY GROUPING SETS ((o.buyer_id, o.sales_type), (o.buyer_id))
+    """
+
+
+def rewrite_buyer_stats(conn, buyer_filter: str = "") -> None:
+    """Replace the `silver_buyer_stats` rows of every buyer, or of `buyer_filter`.
+
+    Runs inside the caller's transaction — the refresh writes it together with
+    Silver, so a reader never sees one without the other.
+    """
+    if buyer_filter:
+        conn.execute(f"DELETE FROM silver_buyer_stats WHERE buyer_id IN ({buyer_filter})")
+    else:
+        conn.execute("DELETE FROM silver_buyer_stats")
+    conn.execute(silver_buyer_stats_sql(buyer_filter))
+
+
+# ─── Cohort activity ─────────────────────────────────────────────────────────
+#
+# The cohort pages — retention, revenue retention, cohort LTV — each
+# re-derived every buyer's cohort and every (buyer, month) pair from
+# silver_orders on every request. What they read is a grid of a few hundred
+# cells: per cohort month, how many of its buyers ordered N months later and
+# what they spent. This is that grid.
+#
+# A buyer's cohort is the month of their first order *of that sales_type*
+# (silver_buyer_stats.cohort_month), so the 'all' grid is not the sum of the
+# per-type ones. `buyers` at months_since = 0 is the cohort's size.
+#
+# A cohort's cells depend only on its own buyers' orders, so a refresh
+# rebuilds the cohorts its buyers were in before and after it — see
+# _RefreshScope.record_cohorts. No primary key, as for silver_buyer_stats.
+GOLD_COHORT_ACTIVITY_DDL = """CREATE TABLE IF NOT EXISTS gold_cohort_activity (
+            sales_type VARCHAR NOT NULL,        -- a Silver sales_type, or 'all'
+            cohort_month DATE NOT NULL,
+            months_since INTEGER NOT NULL,
+            buyers INTEGER NOT NULL,            -- distinct buyers who ordered
+            orders INTEGER NOT NULL,
+            revenue DECIMAL(14, 2) NOT NULL
+)"""
+
+
+def rewrite_cohort_activity(conn, cohorts: "str | None" = None) -> None:
+    """Replace the `gold_cohort_activity` cells of every cohort, or of `cohorts`.
+
+    `cohorts` names a table of (sales_type, cohort_month) pairs. Reads
+    silver_buyer_stats, so it runs after that has been rewritten.
+    """
+    if cohorts:
+        match = f"(sales_type, cohort_month) IN (SELECT sales_type, cohort_month FROM {cohorts})"
+        conn.execute(f"DELETE FROM gold_cohort_activity WHERE {match}")
+        scope = f"AND (st.sales_type, st.cohort_month) IN (SELECT sales_type, cohort_month FROM {cohorts})"
+    else:
+        conn.execute("DELETE FROM gold_cohort_activity")
+        scope = ""
+    conn.execute(f"""
+        INSERT INTO gold_cohort_activity
+            (sales_type, cohort_month, months_since, buyers, orders, revenue)
+        SELECT
+            st.sales_type,
+            st.cohort_month,
+            DATEDIFF('month', st.cohort_month, DATE_TRUNC('month', o.order_date)),
+            COUNT(DISTINCT o.buyer_id),
+            COUNT(*),
+            SUM(o.grand_total)
+        FROM silver_buyer_stats st
+        JOIN silver_orders o
+          ON o.buyer_id = st.buyer_id
+         AND (st.sales_type = 'all' OR o.sales_type = st.sales_type)
+        WHERE NOT o.is_return
+          AND o.is_active_source
+          {scope}
+        GROUP BY ALL
+    """)
+
+
+_GOLD_GENERATIONS = itertools.count(1)
+_USERS_GENERATIONS = itertools.count(1)
+
+
+_REFRESH_SCOPES = itertools.count(1)
+
+
+class _RefreshScope:
+    """One incremental refresh's change scope, as temp tables on the writer.
+
+    - `changed`: the order ids the caller passed in
+    - `buyers`:  buyers of those orders, before (Silver) and after (orders)
+    - `ids`:     changed ids ∪ every order of an affected buyer, on both sides
+    - `dates`:   the order dates the scope occupied before and after the rewrite
+    - `order_dates`: the same for the changed orders alone
+    - `cohorts`: the (sales_type, cohort_month) pairs the affected buyers
+                 belonged to before and after the rewrite
+
+    Temp tables are per-connection and outlive the separate lock blocks a
+    refresh is split into, so each refresh gets its own names: a scheduler
+    tick and an admin trigger overlapping must not read each other's scope.
+    """
+
+    def __init__(self, seq: int):
+        prefix = f"_refresh_scope_{seq}"
+        self.changed = f"{prefix}_changed"
+        self.buyers = f"{prefix}_buyers"
+        self.ids = f"{prefix}_ids"
+        self.dates = f"{prefix}_dates"
+        self.order_dates = f"{prefix}_order_dates"
+        self.cohorts = f"{prefix}_cohorts"
+
+    def build(self, conn, changed_order_ids: list[int]) -> tuple[int, int]:
+        """Materialise the scope. Returns (affected buyers, scope rows)."""
+        import pandas as pd
+        view = f"{self.changed}_frame"
+        conn.register(view, pd.DataFrame({"id": list(changed_order_ids)}, dtype="int64"))
+        try:
+            conn.execute(f"CREATE TEMP TABLE {self.changed} AS SELECT DISTINCT id FROM {view}")
+        finally:
+            conn.unregister(view)
+        # Affected buyers = NEW (orders) ∪ OLD (silver) — covers buyer reassignment
+        conn.execute(f"""
+            CREATE TEMP TABLE {self.buyers} AS
+            SELECT buyer_id FROM orders
+            WHERE id IN (SELECT id FROM {self.changed}) AND buyer_id IS NOT NULL
+            UNION
+            SELECT buyer_id FROM silver_orders
+            WHERE id IN (SELECT id FROM {self.changed}) AND buyer_id IS NOT NULL
+        """)
+        # Scope = changed ids ∪ all orders of affected buyers (cascade), over
+        # BOTH orders and silver_orders so the DELETE catches orphan silver
+        # rows (orders deleted via admin/purge or H3 bronze promotion).
+        # Without the silver-side branch, an orphan tied to an affected buyer
+        # would never get cleaned — full rebuild used to wipe these
+        # implicitly via DELETE *. The changed ids go in whether or not
+        # either table has them: DELETE removes what Silver still holds, and
+        # INSERT only re-adds rows that exist in orders.
+        conn.execute(f"""
+            CREATE TEMP TABLE {self.ids} AS
+            SELECT id FROM {self.changed}
+            UNION
+            SELECT id FROM orders        WHERE buyer_id IN (SELECT buyer_id FROM {self.buyers})
+            UNION
+            SELECT id FROM silver_orders WHERE buyer_id IN (SELECT buyer_id FROM {self.buyers})
+        """)
+        conn.execute(f"CREATE TEMP TABLE {self.dates} (date DATE)")
+        conn.execute(f"CREATE TEMP TABLE {self.order_dates} (date DATE)")
+        conn.execute(f"CREATE TEMP TABLE {self.cohorts} (sales_type VARCHAR, cohort_month DATE)")
+        return (
+            conn.execute(f"SELECT COUNT(*) FROM {self.buyers}").fetchone()[0],
+            conn.execute(f"SELECT COUNT(*) FROM {self.ids}").fetchone()[0],
+        )
+
+    def record_dates(self, conn) -> set[date]:
+        """Add the dates the scope occupies in Silver now; return all so far.
+
+        Records `order_dates` alongside, for the changed orders alone.
+        """
+        for table, ids in ((self.dates, self.ids), (self.order_dates, self.changed)):
+            conn.execute(f"""
+                INSERT INTO {table}
+                SELECT DISTINCT order_date FROM silver_orders
+                WHERE id IN (SELECT id FROM {ids}) AND order_date IS NOT NULL
+                EXCEPT
+                SELECT date FROM {table}
+            """)
+        return {r[0] for r in conn.execute(f"SELECT date FROM {self.dates}").fetchall()}
+
+    def changed_order_dates(self, conn) -> set[date]:
+        """The dates the changed orders occupied before and after, without
+        the buyer cascade — all a table of per-order facts needs rebuilt."""
+        return {r[0] for r in conn.execute(f"SELECT date FROM {self.order_dates}").fetchall()}
+
+    def record_cohorts(self, conn) -> int:
+        """Add the cohorts the affected buyers are in now; return the count so far.
+
+        Read from silver_buyer_stats, so once before it is rewritten and once
+        after: a buyer whose first order moves changes cohort, and both the
+        one left and the one joined need their cells rebuilt.
+        """
+        conn.execute(f"""
+            INSERT INTO {self.cohorts}
+            SELECT DISTINCT sales_type, cohort_month FROM silver_buyer_stats
+            WHERE buyer_id IN (SELECT buyer_id FROM {self.buyers})
+            EXCEPT
+            SELECT sales_type, cohort_month FROM {self.cohorts}
+        """)
+        return conn.execute(f"SELECT COUNT(*) FROM {self.cohorts}").fetchone()[0]
+
+    def drop(self, conn) -> None:
+        for table in (self.changed, self.buyers, self.ids, self.dates, self.order_dates,
+                      self.cohorts):
+            conn.execute(f"DROP TABLE IF EXISTS {table}")
+
+
+def _layer_digest(conn, table: str, where_sql: str = "", params: list | None = None) -> tuple:
+    """(row count, sum of row hashes) over `table`, optionally filtered.
+
+    Cheap enough to take before and after every rewrite — a few ms across a
+    whole Gold table — and what lets a refresh tell "rewrote these cells" from
+    "changed these cells". Order-insensitive, so DuckDB's insertion order
+    (which this store turns off) does not matter.
+    """
+    where = f"WHERE {where_sql}" if where_sql else ""
+    row = conn.execute(
+        f"SELECT COUNT(*), COALESCE(SUM(hash({table})), 0) FROM {table} {where}",
+        params or [],
+    ).fetchone()
+    return (int(row[0]), int(row[1]))
+
+
 GOLD_REVENUE_SELECT_SQL = """
 SELECT
     order_date AS date,
@@ -355,6 +823,404 @@ GROUP BY order_date, sales_type
 """
 
 
+GOLD_PRODUCTS_INSERT_SQL = """
+INSERT INTO gold_daily_products
+SELECT
+    s.order_date AS date,
+    s.sales_type,
+    s.source_id,
+    op.product_id,
+    op.name AS product_name,
+    p.brand,
+    p.category_id,
+    c.name AS category_name,
+    parent_c.name AS parent_category_name,
+    SUM(op.quantity) AS quantity_sold,
+    SUM(op.price_sold * op.quantity) AS product_revenue,
+    COUNT(DISTINCT s.id) AS order_count
+FROM silver_orders s
+JOIN order_products op ON s.id = op.order_id
+LEFT JOIN products p ON op.product_id = p.id
+LEFT JOIN categories c ON p.category_id = c.id
+LEFT JOIN categories parent_c ON c.parent_id = parent_c.id
+WHERE NOT s.is_return
+  AND s.is_active_source
+  AND {date_filter}
+GROUP BY
+    s.order_date, s.sales_type, s.source_id,
+    op.product_id, op.name, p.brand, p.category_id,
+    c.name, parent_c.name
+"""
+
+
+# ─── Basket pairs ────────────────────────────────────────────────────────────
+#
+# Frequently-bought-together, category combinations and brand affinity each
+# self-joined every basket in the window on every request — quadratic in
+# basket size, linear in history. These are the counts those joins produce,
+# per day: how many orders held each pair, how many held each item, and how
+# many orders there were. An order lives on one date and one sales_type, so
+# a range is the sum of its days and 'all' the sum of its types.
+#
+#   kind        a_id / b_id                       a_name / b_name
+#   'order'     NULL / NULL                       NULL / NULL
+#   'product'   COALESCE(product_id, line_id)     name as sold (item rows only)
+#   'category'  NULL                              root category, or 'Unknown'
+#   'brand'     NULL                              brand; lines without one skipped
+#
+# A row with b NULL is an item count; with both set, a pair, a < b. Lines with
+# no product_id are their own item, keyed by line id, exactly as the readers
+# always treated them. Category and brand come from the catalog, so a
+# catalog change rebuilds this table whole (_plan_gold_build). No index, for
+# the reason gold_daily_products has none.
+GOLD_BASKET_PAIRS_DDL = """CREATE TABLE IF NOT EXISTS gold_daily_basket_pairs (
+            date DATE NOT NULL,
+            sales_type VARCHAR NOT NULL,
+            kind VARCHAR NOT NULL,              -- order, product, category, brand
+            a_id BIGINT,
+            a_name VARCHAR,
+            b_id BIGINT,
+            b_name VARCHAR,
+            orders INTEGER NOT NULL
+)"""
+
+GOLD_BASKET_PAIRS_INSERT_SQL = """
+INSERT INTO gold_daily_basket_pairs
+    (date, sales_type, kind, a_id, a_name, b_id, b_name, orders)
+WITH lines AS (
+    SELECT l.order_date AS date, l.sales_type, l.order_id,
+           COALESCE(l.product_id, l.line_id) AS product_key,
+           l.product_name,
+           COALESCE(l.parent_category_name, l.category_name, 'Unknown') AS category,
+           NULLIF(l.brand, '') AS brand
+    FROM silver_order_lines l
+    WHERE NOT l.is_return
+      AND l.is_active_source
+      AND {date_filter}
+),
+basket_products AS (
+    SELECT date, sales_type, order_id, product_key, ANY_VALUE(product_name) AS product_name
+    FROM lines
+    GROUP BY date, sales_type, order_id, product_key
+),
+basket_categories AS (
+    SELECT DISTINCT date, sales_type, order_id, category FROM lines
+),
+basket_brands AS (
+    SELECT DISTINCT date, sales_type, order_id, brand FROM lines WHERE brand IS NOT NULL
+)
+SELECT date, sales_type, 'order', NULL, NULL, NULL, NULL, COUNT(DISTINCT order_id)
+FROM lines
+GROUP BY date, sales_type
+UNION ALL
+SELECT date, sales_type, 'product', product_key, ANY_VALUE(product_name), NULL, NULL, COUNT(*)
+FROM basket_products
+GROUP BY date, sales_type, product_key
+UNION ALL
+SELECT a.date, a.sales_type, 'product', a.product_key, NULL, b.product_key, NULL, COUNT(*)
+FROM basket_products a
+JOIN basket_products b ON a.order_id = b.order_id AND a.product_key < b.product_key
+GROUP BY a.date, a.sales_type, a.product_key, b.product_key
+UNION ALL
+SELECT date, sales_type, 'category', NULL, category, NULL, NULL, COUNT(*)
+FROM basket_categories
+GROUP BY date, sales_type, category
+UNION ALL
+SELECT a.date, a.sales_type, 'category', NULL, a.category, NULL, b.category, COUNT(*)
+FROM basket_categories a
+JOIN basket_categories b ON a.order_id = b.order_id AND a.category < b.category
+GROUP BY a.date, a.sales_type, a.category, b.category
+UNION ALL
+SELECT date, sales_type, 'brand', NULL, brand, NULL, NULL, COUNT(*)
+FROM basket_brands
+GROUP BY date, sales_type, brand
+UNION ALL
+SELECT a.date, a.sales_type, 'brand', NULL, a.brand, NULL, b.brand, COUNT(*)
+FROM basket_brands a
+JOIN basket_brands b ON a.order_id = b.order_id AND a.brand < b.brand
+GROUP BY a.date, a.sales_type, a.brand, b.brand
+"""
+
+
+# Every Gold table the warehouse refresh rebuilds: table → (INSERT template,
+# the Silver date column its `{date_filter}` ranges over). All of them read
+# only Silver (and the catalog), never each other, which is what lets them be
+# built side by side on separate cursors.
+GOLD_BUILDS: Dict[str, Tuple[str, str]] = {
+    "gold_daily_revenue": (
+        "INSERT INTO gold_daily_revenue\n" + GOLD_REVENUE_SELECT_SQL, "order_date",
+    ),
+    "gold_daily_products": (GOLD_PRODUCTS_INSERT_SQL, "s.order_date"),
+    "gold_daily_traffic": (GOLD_TRAFFIC_INSERT_SQL, "s.order_date"),
+    "gold_daily_basket_pairs": (GOLD_BASKET_PAIRS_INSERT_SQL, "l.order_date"),
+}
+
+
+@dataclass(frozen=True)
+class GoldBuild:
+    """What one Gold table's rebuild did."""
+
+    rows: int          # rows in the table afterwards
+    changed: bool      # whether any row in the rebuilt scope differs
+    elapsed_ms: float  # wall time of the rebuild, digests included
+
+
+def _rebuild_gold_table(conn, table: str, dates: "set[date] | None") -> GoldBuild:
+    """DELETE + INSERT one Gold table for `dates`, in one transaction.
+
+    `None` rebuilds every date. An **empty** set rebuilds nothing and only
+    reports the row count — the planner's way of saying "nothing moved here".
+    The dates are bound as a single list parameter rather than an IN list,
+    so a 900-date scope costs one bind, not 900.
+    """
+    t0 = time.perf_counter()
+    if dates is not None and not dates:
+        rows = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        return GoldBuild(rows=rows, changed=False, elapsed_ms=0.0)
+
+    insert_sql, date_col = GOLD_BUILDS[table]
+    if dates is None:
+        scope: tuple = ("", None)
+        delete_sql, delete_params = f"DELETE FROM {table}", []
+        insert = (insert_sql.format(date_filter=f"{date_col} IS NOT NULL"), [])
+    else:
+        date_list = sorted(dates)
+        scope = ("date IN (SELECT UNNEST(?::DATE[]))", [date_list])
+        delete_sql = f"DELETE FROM {table} WHERE date IN (SELECT UNNEST(?::DATE[]))"
+        delete_params = [date_list]
+        insert = (
+            insert_sql.format(date_filter=f"{date_col} IN (SELECT UNNEST(?::DATE[]))"),
+            [date_list],
+        )
+
+    before = _layer_digest(conn, table, *scope)
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        conn.execute(delete_sql, delete_params)
+        conn.execute(*insert)
+        rows = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        conn.execute("COMMIT")
+    except Exception:
+        try:
+            conn.execute("ROLLBACK")
+        except Exception:
+            pass
+        raise
+    changed = _layer_digest(conn, table, *scope) != before
+    return GoldBuild(
+        rows=rows, changed=changed,
+        elapsed_ms=round((time.perf_counter() - t0) * 1000, 2),
+    )
+
+
+def _rebuild_cohort_activity(conn, cohorts: "str | None") -> GoldBuild:
+    """rewrite_cohort_activity in one transaction, reported like a Gold table.
+
+    `None` rebuilds every cohort, a table name the cohorts it lists, and an
+    empty string nothing — the planner's "no cohort moved".
+    """
+    t0 = time.perf_counter()
+    if cohorts == "":
+        rows = conn.execute("SELECT COUNT(*) FROM gold_cohort_activity").fetchone()[0]
+        return GoldBuild(rows=rows, changed=False, elapsed_ms=0.0)
+
+    scope: tuple = ("", None)
+    if cohorts:
+        scope = (
+            f"(sales_type, cohort_month) IN (SELECT sales_type, cohort_month FROM {cohorts})",
+            None,
+        )
+    before = _layer_digest(conn, "gold_cohort_activity", *scope)
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        rewrite_cohort_activity(conn, cohorts)
+        rows = conn.execute("SELECT COUNT(*) FROM gold_cohort_activity").fetchone()[0]
+        conn.execute("COMMIT")
+    except Exception:
+        try:
+            conn.execute("ROLLBACK")
+        except Exception:
+            pass
+        raise
+    changed = _layer_digest(conn, "gold_cohort_activity", *scope) != before
+    return GoldBuild(
+        rows=rows, changed=changed,
+        elapsed_ms=round((time.perf_counter() - t0) * 1000, 2),
+    )
+
+
+# The Silver and Bronze side of validation, one row per (date, sales_type) —
+# exactly the cells Gold must hold. Step 4 used to re-derive all of it on every
+# tick: COUNT(*) over orders and Silver, SUM over Silver, SUM over
+# order_products JOIN silver_orders, and the cell set as a DISTINCT over
+# Silver. All of that is proportional to total history, and on a quiet tick
+# one order had changed. The ledger is rewritten for the dates Gold was
+# rebuilt for, in the same tick, so between full sweeps validation reads
+# history from here and only re-derives the dates that moved.
+#
+# The Gold side is never taken from the ledger. gold_daily_revenue is one row
+# per cell, so summing it and comparing its cell set is as cheap as reading the
+# ledger would be — and a cell deleted from Gold behind the refresh's back is
+# the August incident, which a ledger of what Gold *should* hold still sees.
+VALIDATION_LEDGER_INSERT_SQL = """
+    INSERT INTO warehouse_checksums
+        (date, sales_type, silver_rows, silver_revenue, bronze_product_revenue, computed_at)
+    SELECT c.order_date, c.sales_type, c.silver_rows, c.silver_revenue,
+           COALESCE(p.product_revenue, 0), CURRENT_TIMESTAMP
+    FROM (
+        SELECT s.order_date, s.sales_type, COUNT(*) AS silver_rows,
+               COALESCE(SUM(s.grand_total) FILTER (
+                   WHERE NOT s.is_return AND s.is_active_source
+               ), 0) AS silver_revenue
+        FROM silver_orders s
+        WHERE {date_filter}
+        GROUP BY s.order_date, s.sales_type
+    ) c
+    LEFT JOIN (
+        SELECT s.order_date, s.sales_type,
+               SUM(op.price_sold * op.quantity) AS product_revenue
+        FROM order_products op
+        JOIN silver_orders s ON op.order_id = s.id
+        WHERE NOT s.is_return AND s.is_active_source AND {date_filter}
+        GROUP BY s.order_date, s.sales_type
+    ) p ON p.order_date IS NOT DISTINCT FROM c.order_date
+       AND p.sales_type IS NOT DISTINCT FROM c.sales_type
+"""
+
+# How long scoped validation may stand in for the full sweep. A scoped tick
+# trusts the ledger for every date it did not touch; the sweep is what checks
+# that trust, by re-deriving every date from Silver and Bronze and rewriting
+# the ledger from scratch. A full refresh always sweeps, whatever the clock.
+WAREHOUSE_FULL_VALIDATION_SECONDS = 30 * 60
+
+
+def _refresh_validation_ledger(conn, dates: "set[date] | None") -> None:
+    """Rewrite the ledger rows for `dates` (`None`: all of them) in one transaction."""
+    if dates is None:
+        delete = ("DELETE FROM warehouse_checksums", [])
+        insert = (VALIDATION_LEDGER_INSERT_SQL.format(date_filter="TRUE"), [])
+    else:
+        date_list = sorted(dates)
+        delete = (
+            "DELETE FROM warehouse_checksums WHERE date IN (SELECT UNNEST(?::DATE[]))",
+            [date_list],
+        )
+        insert = (
+            VALIDATION_LEDGER_INSERT_SQL.format(
+                date_filter="s.order_date IN (SELECT UNNEST(?::DATE[]))"
+            ),
+            [date_list, date_list],
+        )
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        conn.execute(*delete)
+        conn.execute(*insert)
+        conn.execute("COMMIT")
+    except Exception:
+        try:
+            conn.execute("ROLLBACK")
+        except Exception:
+            pass
+        raise
+
+
+def _validation_checksums(
+    conn, known_types_sql: str,
+    dates: "set[date] | None" = None, scope_ids: "str | None" = None,
+) -> Dict[str, Any]:
+    """The figures Step 4 validates, for the whole warehouse or for `dates`.
+
+    `dates=None` is the full sweep: every figure re-derived from the layers
+    themselves, exactly as validation always has, and the ledger rebuilt from
+    the same pass. Otherwise only `dates` are re-derived — into the ledger —
+    and history is read back from it; `scope_ids` names the refresh scope's
+    id table, inside which orders and Silver must still agree row for row.
+
+    Either way the same keys come back, totals included, so the audit row
+    and the alert text do not need to know which kind of tick this was.
+    `product_*` cover `dates` only on a scoped tick: gold_daily_products is
+    one row per product per day, too large to sum whole every two minutes.
+    """
+    _refresh_validation_ledger(conn, dates)
+
+    if dates is None:
+        row = conn.execute(f"""
+            SELECT
+                (SELECT COUNT(*) FROM orders) AS bronze_orders,
+                (SELECT COUNT(*) FROM silver_orders) AS silver_rows,
+                (SELECT COALESCE(SUM(grand_total), 0) FROM silver_orders
+                 WHERE NOT is_return AND is_active_source) AS silver_revenue,
+                (SELECT COALESCE(SUM(revenue), 0) FROM gold_daily_revenue) AS gold_revenue,
+                (SELECT COALESCE(SUM(revenue), 0) FROM gold_daily_revenue
+                 WHERE sales_type IN ({known_types_sql})) AS gold_revenue_known,
+                (SELECT COALESCE(SUM(product_revenue), 0) FROM gold_daily_products) AS gold_product_revenue,
+                (SELECT COALESCE(SUM(op.price_sold * op.quantity), 0)
+                 FROM order_products op
+                 JOIN silver_orders s ON op.order_id = s.id
+                 WHERE NOT s.is_return AND s.is_active_source) AS bronze_product_revenue
+        """).fetchone()
+        bronze_orders, silver_rows = row[0], row[1]
+        silver_cells = "SELECT DISTINCT order_date, sales_type FROM silver_orders"
+    else:
+        date_list = sorted(dates)
+        row = conn.execute(f"""
+            SELECT
+                (SELECT COUNT(*) FROM orders
+                 WHERE id IN (SELECT id FROM {scope_ids})) AS scope_orders,
+                (SELECT COALESCE(SUM(silver_rows), 0) FROM warehouse_checksums) AS silver_rows,
+                (SELECT COALESCE(SUM(silver_revenue), 0) FROM warehouse_checksums) AS silver_revenue,
+                (SELECT COALESCE(SUM(revenue), 0) FROM gold_daily_revenue) AS gold_revenue,
+                (SELECT COALESCE(SUM(revenue), 0) FROM gold_daily_revenue
+                 WHERE sales_type IN ({known_types_sql})) AS gold_revenue_known,
+                (SELECT COALESCE(SUM(product_revenue), 0) FROM gold_daily_products
+                 WHERE date IN (SELECT UNNEST(?::DATE[]))) AS gold_product_revenue,
+                (SELECT COALESCE(SUM(bronze_product_revenue), 0) FROM warehouse_checksums
+                 WHERE date IN (SELECT UNNEST(?::DATE[]))) AS bronze_product_revenue,
+                (SELECT COUNT(*) FROM silver_orders
+                 WHERE id IN (SELECT id FROM {scope_ids})) AS scope_silver
+        """, [date_list, date_list]).fetchone()
+        silver_rows = row[1]
+        # Outside the scope Silver was not touched, so orders and Silver differ
+        # there by whatever they differed by at the last sweep — which passed.
+        bronze_orders = silver_rows + row[0] - row[7]
+        silver_cells = "SELECT date, sales_type FROM warehouse_checksums"
+
+    # ── Cell guard ──
+    # Gold holds one row per (date, sales_type) and is built from Silver by
+    # GROUP BY, so the two sets of cells must be equal. The scalar checksums
+    # cannot see it when they are not: on the three backups taken during the
+    # August incident there were 100 → 90 → 84 mismatched cells and *zero*
+    # value mismatches — every one was a cell Gold was missing, while the sums
+    # agreed. Between sweeps the Silver side is the ledger's key set, which is
+    # one row per cell rather than one per order.
+    missing_cells = conn.execute(f"""
+        SELECT COUNT(*) FROM (
+            {silver_cells}
+            EXCEPT
+            SELECT date, sales_type FROM gold_daily_revenue
+        )
+    """).fetchone()[0]
+    extra_cells = conn.execute(f"""
+        SELECT COUNT(*) FROM (
+            SELECT date, sales_type FROM gold_daily_revenue
+            EXCEPT
+            {silver_cells}
+        )
+    """).fetchone()[0]
+
+    return {
+        "bronze_orders": bronze_orders,
+        "silver_rows": silver_rows,
+        "silver_revenue": float(row[2]),
+        "gold_revenue": float(row[3]),
+        "gold_revenue_known": float(row[4]),
+        "gold_product_revenue": float(row[5]),
+        "bronze_product_revenue": float(row[6]),
+        "missing_cells": missing_cells,
+        "extra_cells": extra_cells,
+    }
+
+
 class DuckDBStore(
     UsersMixin, TrafficMixin, CustomersMixin, GoalsMixin,
     InventoryMixin, ExpensesMixin, RevenueMixin, ProductsIntelMixin,
@@ -376,6 +1242,32 @@ class DuckDBStore(
     # __init__ still read cleanly.
     _last_stuck_rebuild: "float | None" = None
 
+    # Monotonic timestamp of the last full validation sweep. None — a fresh
+    # process, or request_full_validation() — makes the next refresh sweep, so
+    # the ledger is rebuilt before a scoped tick is ever allowed to trust it.
+    _last_full_validation: "float | None" = None
+
+    # Reader lane. None means "no pool" — either not connected yet, disabled
+    # with DUCKDB_READ_WORKERS=0, or an instance built without __init__ — and
+    # read_connection() then falls back to the writer lock.
+    _read_cursors: "asyncio.Queue | None" = None
+    _read_executor: Optional[ThreadPoolExecutor] = None
+    _read_pool_size: int = 0
+
+    # Gold build lane: one thread per concurrently rebuilt Gold table. None
+    # (DUCKDB_GOLD_WORKERS=1, or not connected) builds them in turn on the
+    # writer thread.
+    _gold_executor: Optional[ThreadPoolExecutor] = None
+
+    # Bumped whenever a refresh actually changes Silver or Gold. Cached
+    # dashboard answers (core/query_cache.py) are only valid for the
+    # generation they were computed at.
+    _gold_generation: int = 0
+
+    # Bumped by every write to users or role_permissions. The session cache in
+    # web/routes/auth.py holds role/status only for the generation it read.
+    _users_generation: int = 0
+
     def __init__(self, db_path: Optional[Path] = None):
         # Resolved here rather than bound as a default argument. A default is
         # evaluated once, when this function is defined, so `db_path=DB_PATH`
@@ -400,6 +1292,12 @@ class DuckDBStore(
         self._failed_migrations: List[Dict[str, Any]] = []
         self._schema_status: Dict[str, Any] = {"status": "unknown", "reason": "not connected"}
 
+        # Drawn from one process-wide sequence rather than starting at 0, so a
+        # store rebuilt after close_store() can never match an answer cached
+        # against its predecessor.
+        self._gold_generation = next(_GOLD_GENERATIONS)
+        self._users_generation = next(_USERS_GENERATIONS)
+
     async def connect(self) -> None:
         """Initialize database connection, schema, and thread pool."""
         DB_DIR.mkdir(parents=True, exist_ok=True)
@@ -415,7 +1313,7 @@ class DuckDBStore(
                 # at 2.7/2.7 GiB while the container sat at ~950 MiB of its 7g budget, and the
                 # first refresh to complete afterwards left Gold truncated by 763 revenue rows.
                 # The ceiling is now configurable so it can be raised without a code deploy.
-                self._connection.execute(f"SET memory_limit='{_memory_limit()}'")
+                self._connection.execute(f"SET memory_limit='{memory_limit()}'")
                 # Reduce memory usage for bulk operations
                 self._connection.execute("SET preserve_insertion_order=false")
                 # Large WAL threshold; rely on the explicit 6h CHECKPOINT job.
@@ -431,15 +1329,53 @@ class DuckDBStore(
 
                 # Thread pool for offloading blocking operations
                 self._executor = ThreadPoolExecutor(
-                    max_workers=1,  # Single worker - DuckDB requires serialized access
+                    max_workers=1,  # Single worker - the writer lane stays serialized
                     thread_name_prefix="duckdb"
                 )
 
-                logger.info(f"DuckDB connected: {self.db_path}")
+                # Reader lane: one cursor per reader thread, opened after the
+                # schema so every view and table already exists for them.
+                readers = _read_workers()
+                if readers > 0:
+                    self._read_cursors = asyncio.Queue()
+                    for _ in range(readers):
+                        self._read_cursors.put_nowait(self._connection.cursor())
+                    self._read_executor = ThreadPoolExecutor(
+                        max_workers=readers, thread_name_prefix="duckdb-read",
+                    )
+                    self._read_pool_size = readers
+
+                gold_workers = _gold_workers()
+                if gold_workers > 1:
+                    self._gold_executor = ThreadPoolExecutor(
+                        max_workers=gold_workers, thread_name_prefix="duckdb-gold",
+                    )
+
+                logger.info(
+                    f"DuckDB connected: {self.db_path} "
+                    f"(readers={readers}, gold_workers={gold_workers})"
+                )
 
     async def close(self) -> None:
         """Close database connection and thread pool."""
         async with self._lock:
+            # Readers first: their cursors are children of the main connection.
+            async with self._quiesce_readers() as cursors:
+                for cursor in cursors:
+                    try:
+                        cursor.close()
+                    except Exception:
+                        pass
+            self._read_cursors = None
+            self._read_pool_size = 0
+            if self._read_executor:
+                self._read_executor.shutdown(wait=True)
+                self._read_executor = None
+
+            if self._gold_executor:
+                self._gold_executor.shutdown(wait=True)
+                self._gold_executor = None
+
             # Shutdown thread pool (waits for in-flight queries to finish)
             if self._executor:
                 self._executor.shutdown(wait=True)
@@ -461,7 +1397,9 @@ class DuckDBStore(
         """
         async with self._lock:
             if self._connection:
-                self._connection.execute("CHECKPOINT")
+                # No reader may hold a snapshot open across the checkpoint.
+                async with self._quiesce_readers():
+                    self._connection.execute("CHECKPOINT")
                 logger.info("DuckDB checkpoint completed")
 
     @asynccontextmanager
@@ -471,14 +1409,144 @@ class DuckDBStore(
         Acquires lock to ensure single-threaded DuckDB access.
         DuckDB connections are NOT thread-safe - only one thread can use
         a connection at a time.
+
+        This is the writer lane. Anything that writes, or that must read its
+        own writes inside one block, belongs here; plain reads should take
+        `read_connection()` and stop queueing behind refreshes.
+        
+        With the query profiler on (core/query_profiler.py) both lanes hand
+        out the connection behind its timing proxy.
         """
         if self._connection is None:
             await self.connect()
+        waited = time.perf_counter()
         async with self._lock:
-            yield self._connection
+            acquired = time.perf_counter()
+            metrics.observe("duckdb_lock_wait", (acquired - waited) * 1000, lane="writer")
+            try:
+                if query_profiler.enabled:
+                    yield query_profiler.wrap(self._connection, sys._getframe(1))
+                else:
+                    yield self._connection
+            finally:
+                metrics.observe(
+                    "duckdb_execute", (time.perf_counter() - acquired) * 1000,
+                    lane="writer", op="connection",
+                )
+
+    @asynccontextmanager
+    async def read_connection(self):
+        """Borrow a reader cursor — a read that does not wait for the writer.
+
+        Each cursor is an independent DuckDB connection to the same database,
+        so a query on it runs against the last committed state while the
+        writer lane is mid-transaction. Gold is therefore never seen half
+        rebuilt: a reader gets the old cells until the refresh commits.
+
+        Reads only. Nothing here stops a write on a reader cursor, but two
+        lanes writing the same rows is exactly the write-write conflict the
+        single writer exists to prevent.
+
+        Falls back to the writer lock when the pool is off.
+        """
+        if self._connection is None:
+            await self.connect()
+        pool = self._read_cursors
+        if pool is None:
+            async with self.connection() as conn:
+                yield conn
+            return
+        waited = time.perf_counter()
+        cursor = await pool.get()
+        metrics.observe("duckdb_lock_wait", (time.perf_counter() - waited) * 1000, lane="reader")
+        try:
+            if query_profiler.enabled:
+                yield query_profiler.wrap(cursor, sys._getframe(1))
+            else:
+                yield cursor
+        finally:
+            pool.put_nowait(cursor)
+
+    @asynccontextmanager
+    async def _quiesce_readers(self):
+        """Take every reader cursor, so no read is in flight until released.
+
+        CHECKPOINT and the backup's file copy want a database nobody is
+        reading; a read that started before them would otherwise keep its
+        snapshot open underneath. Yields the cursors (empty if there is no
+        pool) and hands them back on exit.
+        """
+        pool = self._read_cursors
+        held: list = []
+        try:
+            for _ in range(self._read_pool_size if pool is not None else 0):
+                held.append(await pool.get())
+            yield held
+        finally:
+            for cursor in held:
+                pool.put_nowait(cursor)
+
+    async def _offload(self, fn, *args):
+        """Run `fn(*args)` on the writer thread.
+
+        For use inside `connection()`: the lock is already held, so this only
+        moves the blocking DuckDB call off the event loop. A multi-second
+        Silver or Gold statement executed inline froze every coroutine in the
+        process — readers included, whichever lane they were on.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    @property
+    def gold_generation(self) -> int:
+        """Version of the warehouse's Silver and Gold contents."""
+        return self._gold_generation
+
+    def bump_gold_generation(self) -> int:
+        """Retire every cached answer computed from the current warehouse.
+
+        `refresh_warehouse_layers` calls this itself when it changed anything;
+        anything else that rewrites Silver or Gold must call it too.
+        """
+        self._gold_generation = next(_GOLD_GENERATIONS)
+        return self._gold_generation
+
+    @property
+    def users_generation(self) -> int:
+        """Version of the users and role_permissions tables."""
+        return self._users_generation
+
+    def bump_users_generation(self) -> int:
+        """Retire every cached session lookup. The user-writing methods call this."""
+        self._users_generation = next(_USERS_GENERATIONS)
+        return self._users_generation
 
     # ─── Query Execution with Timeout ────────────────────────────────────────
 
+    def _read_lane_executor(self) -> Optional[ThreadPoolExecutor]:
+        """Reader threads when the pool is up, the writer thread otherwise."""
+        return self._read_executor if self._read_cursors is not None else self._executor
+
+    async def _run_read(self, conn, run, query: str, timeout: float, message: str):
+        """Run `run` on the reader lane; on timeout, stop it and raise.
+
+        The thread is still running the query when the wait gives up, so the
+        query is interrupted and the thread waited out before the cursor goes
+        back to the pool — the next borrower would otherwise get a cursor that
+        is still busy. On the writer fallback the same wait keeps the lock
+        held until the writer thread is free.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._read_lane_executor(), run)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+        except asyncio.TimeoutError:
+            conn.interrupt()
+            await asyncio.wait([future])
+            if not future.cancelled():
+                future.exception()  # the interrupt's own error; retrieved, not raised
+            raise QueryTimeoutError(query, timeout, message)
+
     async def _fetch_one(
         self,
         query: str,
@@ -488,7 +1556,8 @@ class DuckDBStore(
         """
         Execute query and fetch one result with timeout.
 
-        Offloads blocking DB work to thread pool to avoid blocking event loop.
+        Runs on the reader lane (see `read_connection`), offloaded to a reader
+        thread so the event loop is not blocked.
 
         Args:
             query: SQL query string
@@ -501,20 +1570,17 @@ class DuckDBStore(
         Raises:
             QueryTimeoutError: If query exceeds timeout
         """
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             self._total_queries += 1
-            try:
-                loop = asyncio.get_running_loop()
 
-                def _run():
-                    return conn.execute(query, params or []).fetchone()
+            def _run():
+                started = time.perf_counter()
+                rows = conn.execute(query, params or []).fetchone()
+                return rows, time.perf_counter() - started
 
-                return await asyncio.wait_for(
-                    loop.run_in_executor(self._executor, _run),
-                    timeout=timeout
-                )
-            except asyncio.TimeoutError:
-                raise QueryTimeoutError(query, timeout, "Fetch one failed")
+            rows, elapsed = await self._run_read(conn, _run, query, timeout, "Fetch one failed")
+            metrics.observe("duckdb_execute", elapsed * 1000, lane="reader", op="fetch_one")
+            return rows
 
     async def _fetch_all(
         self,
@@ -525,7 +1591,8 @@ class DuckDBStore(
         """
         Execute query and fetch all results with timeout.
 
-        Offloads blocking DB work to thread pool to avoid blocking event loop.
+        Runs on the reader lane (see `read_connection`), offloaded to a reader
+        thread so the event loop is not blocked.
 
         Args:
             query: SQL query string
@@ -538,20 +1605,17 @@ class DuckDBStore(
         Raises:
             QueryTimeoutError: If query exceeds timeout
         """
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             self._total_queries += 1
-            try:
-                loop = asyncio.get_running_loop()
 
-                def _run():
-                    return conn.execute(query, params or []).fetchall()
+            def _run():
+                started = time.perf_counter()
+                rows = conn.execute(query, params or []).fetchall()
+                return rows, time.perf_counter() - started
 
-                return await asyncio.wait_for(
-                    loop.run_in_executor(self._executor, _run),
-                    timeout=timeout
-                )
-            except asyncio.TimeoutError:
-                raise QueryTimeoutError(query, timeout, "Fetch all failed")
+            rows, elapsed = await self._run_read(conn, _run, query, timeout, "Fetch all failed")
+            metrics.observe("duckdb_execute", elapsed * 1000, lane="reader", op="fetch_all")
+            return rows
 
     async def _init_schema(self) -> None:
         """Create database schema if not exists."""
@@ -572,7 +1636,8 @@ class DuckDBStore(
             promocode VARCHAR,  -- Discount promo code applied to order
             synced_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
             first_seen_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-            update_count INTEGER DEFAULT 0
+            update_count INTEGER DEFAULT 0,
+            payload_hash BIGINT  -- order_payload_hash() at the last write; NULL = unknown
         );
 
         -- Orders indexes for common queries
@@ -1286,6 +2351,9 @@ class DuckDBStore(
         # Silver's shape has one home; the schema script above no longer
         # carries a copy of it.
         self._connection.execute(SILVER_ORDERS_DDL)
+        self._connection.execute(SILVER_BUYER_STATS_DDL)
+        self._connection.execute(GOLD_COHORT_ACTIVITY_DDL)
+        self._connection.execute(GOLD_BASKET_PAIRS_DDL)
         self._connection.execute(schema_sql)
 
         # The order-line level. A view, so it is always exactly as fresh as
@@ -1854,6 +2922,10 @@ class DuckDBStore(
         incrementally when changed_order_ids is provided (only affected dates),
         or fully otherwise.
 
+        silver_buyer_stats is rewritten in Silver's transaction, for the
+        buyers Silver's scope touched; gold_cohort_activity after the other
+        Gold tables, for the cohorts those buyers were and are in.
+
         Args:
             trigger: What triggered the refresh
             changed_order_ids: Order IDs that changed (for incremental Gold rebuild)
@@ -1870,6 +2942,7 @@ class DuckDBStore(
         # which is how the two drifted apart in under a day.
         _silver_select_cols = silver_select_sql()
         _silver_pass2_sql = silver_pass2_sql
+        scope_tables: _RefreshScope | None = None
 
         try:
             # ── Step 1: Silver layer ──
@@ -1880,10 +2953,27 @@ class DuckDBStore(
             # Falls back to full rebuild when:
             #   (a) silver < 95% of orders — post-compact recovery, baseline rebuild
             #   (b) no changed_order_ids — manual trigger, startup, drift retry
-            #   (c) cascade scope > 50% of orders — full is cheaper at that point
-            silver_scope_ids: list[int] = []
-            silver_affected_buyers: list[int] = []
+            #   (c) cascade scope > SILVER_INCREMENTAL_MAX_SCOPE of orders
+            #
+            # The scope (changed ids, affected buyers, their orders, the dates
+            # those occupy) is materialised once into temp tables and joined
+            # against. It used to be bound as `IN (?, ?, …)` lists — repeated
+            # in four UNION branches, the DELETE, the INSERT and both date
+            # lookups — and at 20k ids the binding and planning of those lists
+            # cost more than a full rebuild did.
+            silver_affected_buyers = 0
+            silver_scope_rows = 0
             silver_mode = "full"
+            silver_started = time.perf_counter()
+
+            # A catalog change widens the tables that read the catalog:
+            # gold_daily_products and gold_daily_basket_pairs (see
+            # _plan_gold_build), and silver_buyer_stats. A stock cost change
+            # widens only silver_buyer_stats, whose margin prices lines off
+            # offer_stocks.
+            # Read before Silver, which writes the buyer stats.
+            catalog_dirty = await self._consume_catalog_dirty()
+            buyer_stats_dirty = await self._consume_buyer_stats_dirty()
 
             async with self.connection() as conn:
                 silver_count = conn.execute("SELECT COUNT(*) FROM silver_orders").fetchone()[0]
@@ -1891,46 +2981,20 @@ class DuckDBStore(
                 silver_populated = orders_count > 0 and silver_count >= orders_count * 0.95
 
                 if changed_order_ids and silver_populated:
-                    ph = ",".join("?" * len(changed_order_ids))
-                    ids = list(changed_order_ids)
-                    # Affected buyers = NEW (orders) ∪ OLD (silver) — covers buyer reassignment
-                    silver_affected_buyers = [r[0] for r in conn.execute(f"""
-                        SELECT DISTINCT b FROM (
-                            SELECT buyer_id AS b FROM orders
-                            WHERE id IN ({ph}) AND buyer_id IS NOT NULL
-                            UNION
-                            SELECT buyer_id AS b FROM silver_orders
-                            WHERE id IN ({ph}) AND buyer_id IS NOT NULL
-                        )
-                    """, ids + ids).fetchall()]
-                    # Scope = changed_ids ∪ all orders of affected buyers (cascade).
-                    # UNION over BOTH orders and silver_orders so DELETE catches
-                    # orphan silver rows (orders deleted via admin/purge or H3
-                    # bronze promotion). Without the silver-side branch, an
-                    # orphan tied to an affected buyer would never get cleaned —
-                    # full rebuild used to wipe these implicitly via DELETE *.
-                    if silver_affected_buyers:
-                        bph = ",".join("?" * len(silver_affected_buyers))
-                        silver_scope_ids = [r[0] for r in conn.execute(f"""
-                            SELECT id FROM orders        WHERE id IN ({ph})
-                            UNION
-                            SELECT id FROM orders        WHERE buyer_id IN ({bph})
-                            UNION
-                            SELECT id FROM silver_orders WHERE id IN ({ph})
-                            UNION
-                            SELECT id FROM silver_orders WHERE buyer_id IN ({bph})
-                        """, ids + silver_affected_buyers + ids + silver_affected_buyers).fetchall()]
-                    else:
-                        # No buyer cascade. list(ids) covers both sides:
-                        # DELETE removes silver rows for these ids (cleans orphans),
-                        # INSERT only re-adds rows that exist in orders.
-                        silver_scope_ids = list(ids)
+                    scope_tables = _RefreshScope(next(_REFRESH_SCOPES))
+
+                    def _materialise_scope() -> tuple[int, int]:
+                        return scope_tables.build(conn, changed_order_ids)
+
+                    silver_affected_buyers, silver_scope_rows = await self._offload(
+                        _materialise_scope,
+                    )
                     # Guardrail: large scope → full rebuild is cheaper
-                    if len(silver_scope_ids) > orders_count * 0.5:
-                        silver_scope_ids = []
-                        silver_affected_buyers = []
-                    elif silver_scope_ids:
-                        silver_mode = f"incremental_{len(silver_scope_ids)}"
+                    if silver_scope_rows > orders_count * SILVER_INCREMENTAL_MAX_SCOPE:
+                        silver_affected_buyers = 0
+                        silver_scope_rows = 0
+                    elif silver_scope_rows:
+                        silver_mode = f"incremental_{silver_scope_rows}"
 
                 # Dates these rows occupy BEFORE they are rewritten. Gold is
                 # rebuilt per date, and the dates a row leaves are not the dates
@@ -1939,53 +3003,83 @@ class DuckDBStore(
                 # the money is counted twice. An order deleted upstream is worse
                 # — after the DELETE its date is nowhere to be found, so Gold
                 # keeps it until the next full rebuild.
-                silver_old_dates: set = set()
-                if silver_mode != "full" and silver_scope_ids:
-                    sph = ",".join("?" * len(silver_scope_ids))
-                    silver_old_dates = {
-                        r[0] for r in conn.execute(
-                            f"SELECT DISTINCT order_date FROM silver_orders "
-                            f"WHERE id IN ({sph})",
-                            silver_scope_ids,
-                        ).fetchall()
-                        if r[0] is not None
-                    }
+                # Same for the cohorts their buyers are in, which the buyer
+                # stats below are about to overwrite.
+                if silver_mode != "full":
+                    scope_tables.record_dates(conn)
+                    scope_tables.record_cohorts(conn)
+
+                # Buyer stats follow Silver's scope, except that a catalog or
+                # cost change reprices every buyer, and a table that has never been
+                # filled (first start, after a compaction) has no rows for an
+                # incremental pass to keep.
+                buyer_stats_empty = conn.execute(
+                    "SELECT NOT EXISTS (SELECT 1 FROM silver_buyer_stats)"
+                ).fetchone()[0]
+                buyer_stats_full = (
+                    silver_mode == "full" or catalog_dirty or buyer_stats_dirty or buyer_stats_empty
+                )
+                if buyer_stats_full:
+                    buyer_scope = ""
+                elif silver_affected_buyers:
+                    buyer_scope = f"SELECT buyer_id FROM {scope_tables.buyers}"
+                else:
+                    buyer_scope = None
 
-                conn.execute("BEGIN TRANSACTION")
-                try:
+                def _rewrite_silver() -> bool:
                     if silver_mode != "full":
-                        sph = ",".join("?" * len(silver_scope_ids))
-                        conn.execute(
-                            f"DELETE FROM silver_orders WHERE id IN ({sph})",
-                            silver_scope_ids,
-                        )
-                        conn.execute(f"""
-                            INSERT INTO silver_orders
-                            SELECT {_silver_select_cols}
-                            FROM orders o
-                            WHERE o.id IN ({sph})
-                        """, silver_scope_ids)
-                        if silver_affected_buyers:
-                            bph = ",".join("?" * len(silver_affected_buyers))
-                            conn.execute(
-                                _silver_pass2_sql(buyer_filter=bph),
-                                silver_affected_buyers + silver_affected_buyers,
-                            )
+                        scope = (f"id IN (SELECT id FROM {scope_tables.ids})", None)
                     else:
-                        conn.execute("DELETE FROM silver_orders")
-                        conn.execute(f"""
-                            INSERT INTO silver_orders
-                            SELECT {_silver_select_cols}
-                            FROM orders o
-                        """)
-                        conn.execute(_silver_pass2_sql())
-                    conn.execute("COMMIT")
-                except Exception:
+                        scope = ("", None)
+                    stats_scope = (f"buyer_id IN ({buyer_scope})" if buyer_scope else "", None)
+                    before = _layer_digest(conn, "silver_orders", *scope)
+                    stats_before = (
+                        _layer_digest(conn, "silver_buyer_stats", *stats_scope)
+                        if buyer_scope is not None else None
+                    )
+                    conn.execute("BEGIN TRANSACTION")
                     try:
-                        conn.execute("ROLLBACK")
+                        if silver_mode != "full":
+                            conn.execute(
+                                f"DELETE FROM silver_orders "
+                                f"WHERE id IN (SELECT id FROM {scope_tables.ids})"
+                            )
+                            conn.execute(f"""
+                                INSERT INTO silver_orders
+                                SELECT {_silver_select_cols}
+                                FROM orders o
+                                WHERE o.id IN (SELECT id FROM {scope_tables.ids})
+                            """)
+                            if silver_affected_buyers:
+                                conn.execute(_silver_pass2_sql(
+                                    buyer_filter=f"SELECT buyer_id FROM {scope_tables.buyers}",
+                                ))
+                        else:
+                            conn.execute("DELETE FROM silver_orders")
+                            conn.execute(f"""
+                                INSERT INTO silver_orders
+                                SELECT {_silver_select_cols}
+                                FROM orders o
+                            """)
+                            conn.execute(_silver_pass2_sql())
+                        if buyer_scope is not None:
+                            rewrite_buyer_stats(conn, buyer_scope)
+                        conn.execute("COMMIT")
                     except Exception:
-                        pass
-                    raise
+                        try:
+                            conn.execute("ROLLBACK")
+                        except Exception:
+                            pass
+                        raise
+                    return _layer_digest(conn, "silver_orders", *scope) != before or (
+                        buyer_scope is not None
+                        and _layer_digest(conn, "silver_buyer_stats", *stats_scope) != stats_before
+                    )
+
+                # Off the event loop: the reader lane keeps serving the old
+                # Silver while this runs.
+                silver_changed = await self._offload(_rewrite_silver)
+            silver_ms = round((time.perf_counter() - silver_started) * 1000, 2)
 
             # ── Determine affected dates for incremental Gold rebuild ──
             # Gold follows Silver's decision. A full Silver rebuild with a
@@ -1994,105 +3088,113 @@ class DuckDBStore(
             # recovery path both rewrite every Silver row, and a Gold rebuild
             # scoped to the changed ids would leave every other date as it was.
             affected_dates: set[date] | None = None
-            if silver_mode != "full" and silver_scope_ids:
+            order_dates: set[date] | None = None
+            if silver_mode != "full":
                 async with self.connection() as conn:
-                    # Dates these rows occupy now. silver_scope_ids already
-                    # carries the buyer cascade, so one scope drives Silver and
-                    # Gold and the two cannot disagree about what changed.
-                    sph = ",".join("?" * len(silver_scope_ids))
-                    rows = conn.execute(f"""
-                        SELECT DISTINCT order_date FROM silver_orders
-                        WHERE id IN ({sph})
-                    """, silver_scope_ids).fetchall()
-                    new_dates = {r[0] for r in rows if r[0] is not None}
-
-                # Where they were ∪ where they are.
-                affected_dates = silver_old_dates | new_dates
+                    # Dates these rows occupy now. The scope already carries
+                    # the buyer cascade, so one scope drives Silver and Gold
+                    # and the two cannot disagree about what changed.
+                    # Where they were ∪ where they are.
+                    affected_dates = scope_tables.record_dates(conn)
+                    order_dates = scope_tables.changed_order_dates(conn)
 
                 if not affected_dates:
                     affected_dates = None  # Fall back to full rebuild
+                    order_dates = None
+
+            # ── Step 2: UTM Silver ──
+            # Parsed before Gold rather than after the audit row, so
+            # gold_daily_traffic knows its scope in time to be built alongside
+            # the other two. Still non-critical: a failure here skips the
+            # traffic rebuild, never the refresh.
+            utm_order_ids: set[int] | None = None
+            try:
+                utm_order_ids = await self.refresh_utm_silver_layer()
+            except Exception as utm_error:
+                logger.warning(f"UTM layer refresh failed (non-critical): {utm_error}")
 
-            # gold_daily_products is the only rebuilt table that joins the
-            # catalog, so a product or offer change widens that scope alone.
-            # Everything else keeps whatever scope the orders gave it.
-            catalog_dirty = await self._consume_catalog_dirty()
-            gold_products_dates = None if catalog_dirty else affected_dates
-
-            # ── Step 2: Gold daily revenue (lock acquired + released) ──
-            # Single SQL template for both incremental and full rebuild
-            _GOLD_REVENUE_SQL = "INSERT INTO gold_daily_revenue\n" + GOLD_REVENUE_SELECT_SQL
+            # ── Step 3: Gold — planned once, built table by table in parallel ──
+            gold_plan = await self._plan_gold_build(
+                affected_dates, catalog_dirty, utm_order_ids, order_dates,
+            )
+            # The revenue cells as open dashboards last saw them; the
+            # difference goes out to them once the build lands.
+            revenue_dates = gold_plan["gold_daily_revenue"]
+            cells_before = None
+            if revenue_dates is not None and len(revenue_dates) <= GOLD_DELTA_MAX_DATES:
+                async with self.connection() as conn:
+                    cells_before = read_gold_cells(conn, revenue_dates)
+            gold = await self._run_gold_builds(gold_plan)
 
-            gold_revenue_rows = 0
+            # The cohort grid is keyed by cohort, not date, so it is planned
+            # apart from the three above: every cohort when Silver or the
+            # buyer stats were rebuilt whole, else the ones the scope's
+            # buyers were in before and after.
             async with self.connection() as conn:
-                conn.execute("BEGIN TRANSACTION")
-                try:
-                    if affected_dates:
-                        date_params = list(affected_dates)
-                        date_placeholders = ",".join("?" * len(date_params))
-                        conn.execute(f"DELETE FROM gold_daily_revenue WHERE date IN ({date_placeholders})", date_params)
-                        conn.execute(_GOLD_REVENUE_SQL.format(date_filter=f"order_date IN ({date_placeholders})"), date_params)
-                    else:
-                        conn.execute("DELETE FROM gold_daily_revenue")
-                        conn.execute(_GOLD_REVENUE_SQL.format(date_filter="order_date IS NOT NULL"))
-                    gold_revenue_rows = conn.execute("SELECT COUNT(*) FROM gold_daily_revenue").fetchone()[0]
-                    conn.execute("COMMIT")
-                except Exception:
-                    try:
-                        conn.execute("ROLLBACK")
-                    except Exception:
-                        pass
-                    raise
+                if (
+                    silver_mode == "full"
+                    or buyer_stats_empty
+                    or conn.execute(
+                        "SELECT NOT EXISTS (SELECT 1 FROM gold_cohort_activity)"
+                    ).fetchone()[0]
+                ):
+                    cohort_scope: str | None = None
+                elif scope_tables.record_cohorts(conn):
+                    cohort_scope = scope_tables.cohorts
+                else:
+                    cohort_scope = ""
+                cohorts = await self._offload(_rebuild_cohort_activity, conn, cohort_scope)
+
+            traffic = gold.get("gold_daily_traffic")
+            if isinstance(traffic, BaseException):
+                logger.warning(f"Traffic gold refresh failed (non-critical): {traffic}")
+                traffic = None
+            # Non-critical for the same reason: basket analytics, not revenue.
+            pairs = gold["gold_daily_basket_pairs"]
+            if isinstance(pairs, BaseException):
+                logger.warning(f"Basket pairs gold refresh failed (non-critical): {pairs}")
+                pairs = None
+            for table in ("gold_daily_revenue", "gold_daily_products"):
+                if isinstance(gold[table], BaseException):
+                    raise gold[table]
+            gold_revenue_rows = gold["gold_daily_revenue"].rows
+            gold_products_rows = gold["gold_daily_products"].rows
+            traffic_rows = traffic.rows if traffic else 0
+            utm_count = len(utm_order_ids or ())
+
+            # Only a refresh that moved something retires cached answers. Most
+            # ticks rewrite today's cells with the values they already had.
+            warehouse_changed = (
+                silver_changed
+                or gold["gold_daily_revenue"].changed
+                or gold["gold_daily_products"].changed
+                or bool(traffic and traffic.changed)
+                or bool(pairs and pairs.changed)
+                or cohorts.changed
+            )
+            if warehouse_changed:
+                self.bump_gold_generation()
 
-            # ── Step 3: Gold daily products (lock acquired + released) ──
-            _GOLD_PRODUCTS_SQL = """
-                INSERT INTO gold_daily_products
-                SELECT
-                    s.order_date AS date,
-                    s.sales_type,
-                    s.source_id,
-                    op.product_id,
-                    op.name AS product_name,
-                    p.brand,
-                    p.category_id,
-                    c.name AS category_name,
-                    parent_c.name AS parent_category_name,
-                    SUM(op.quantity) AS quantity_sold,
-                    SUM(op.price_sold * op.quantity) AS product_revenue,
-                    COUNT(DISTINCT s.id) AS order_count
-                FROM silver_orders s
-                JOIN order_products op ON s.id = op.order_id
-                LEFT JOIN products p ON op.product_id = p.id
-                LEFT JOIN categories c ON p.category_id = c.id
-                LEFT JOIN categories parent_c ON c.parent_id = parent_c.id
-                WHERE NOT s.is_return
-                  AND s.is_active_source
-                  AND {date_filter}
-                GROUP BY
-                    s.order_date, s.sales_type, s.source_id,
-                    op.product_id, op.name, p.brand, p.category_id,
-                    c.name, parent_c.name
-            """
-
-            gold_products_rows = 0
-            async with self.connection() as conn:
-                conn.execute("BEGIN TRANSACTION")
-                try:
-                    if gold_products_dates:
-                        date_params = list(gold_products_dates)
-                        date_placeholders = ",".join("?" * len(date_params))
-                        conn.execute(f"DELETE FROM gold_daily_products WHERE date IN ({date_placeholders})", date_params)
-                        conn.execute(_GOLD_PRODUCTS_SQL.format(date_filter=f"s.order_date IN ({date_placeholders})"), date_params)
-                    else:
-                        conn.execute("DELETE FROM gold_daily_products")
-                        conn.execute(_GOLD_PRODUCTS_SQL.format(date_filter="s.order_date IS NOT NULL"))
-                    gold_products_rows = conn.execute("SELECT COUNT(*) FROM gold_daily_products").fetchone()[0]
-                    conn.execute("COMMIT")
-                except Exception:
-                    try:
-                        conn.execute("ROLLBACK")
-                    except Exception:
-                        pass
-                    raise
+            gold_delta: list | None = None
+            if cells_before is not None:
+                gold_delta = []
+                if gold["gold_daily_revenue"].changed:
+                    async with self.connection() as conn:
+                        gold_delta = diff_gold_cells(
+                            cells_before, read_gold_cells(conn, revenue_dates),
+                        )
+
+            # Where the tick went, per table. The audit row keeps these so the
+            # table that dominates a slow refresh can be read off history
+            # instead of guessed at.
+            stage_ms = {
+                "silver_ms": silver_ms,
+                "gold_revenue_ms": gold["gold_daily_revenue"].elapsed_ms,
+                "gold_products_ms": gold["gold_daily_products"].elapsed_ms,
+                "gold_traffic_ms": traffic.elapsed_ms if traffic else None,
+                "gold_cohort_ms": cohorts.elapsed_ms,
+                "gold_pairs_ms": pairs.elapsed_ms if pairs else None,
+            }
 
             # ── Step 4: Validation + audit log ──
             needs_full_retry = False
@@ -2102,61 +3204,48 @@ class DuckDBStore(
             # on every one of the 30 ticks an hour a standing failure produces.
             validation_alert_key: str | None = None
             partition_alert: str | None = None
+            # Between full sweeps only the dates Gold was rebuilt for are
+            # re-derived; see VALIDATION_LEDGER_INSERT_SQL. Anything that
+            # rebuilt a Gold table whole is checked whole.
+            full_validation = (
+                any(gold_plan[t] is None for t in ("gold_daily_revenue", "gold_daily_products"))
+                or scope_tables is None
+                or self._last_full_validation is None
+                or time.monotonic() - self._last_full_validation
+                >= WAREHOUSE_FULL_VALIDATION_SECONDS
+            )
+            validation_mode = "full" if full_validation else "dates"
+            validation_started = time.perf_counter()
             async with self.connection() as conn:
                 # The known-types sum is written with a literal tuple because
                 # DuckDB will not parameterise an IN list; the values come from
                 # a module constant, never from a request.
                 known_types_sql = ", ".join(f"'{t}'" for t in KNOWN_SALES_TYPES)
-                checksums = conn.execute(f"""
-                    SELECT
-                        (SELECT COUNT(*) FROM orders) AS bronze_orders,
-                        (SELECT COUNT(*) FROM silver_orders) AS silver_rows,
-                        (SELECT COALESCE(SUM(grand_total), 0) FROM silver_orders
-                         WHERE NOT is_return AND is_active_source) AS silver_revenue,
-                        (SELECT COALESCE(SUM(revenue), 0) FROM gold_daily_revenue) AS gold_revenue,
-                        (SELECT COALESCE(SUM(revenue), 0) FROM gold_daily_revenue
-                         WHERE sales_type IN ({known_types_sql})) AS gold_revenue_known,
-                        (SELECT COALESCE(SUM(product_revenue), 0) FROM gold_daily_products) AS gold_product_revenue,
-                        (SELECT COALESCE(SUM(op.price_sold * op.quantity), 0)
-                         FROM order_products op
-                         JOIN silver_orders s ON op.order_id = s.id
-                         WHERE NOT s.is_return AND s.is_active_source) AS bronze_product_revenue
-                """).fetchone()
-
-                bronze_orders = checksums[0]
-                silver_rows = checksums[1]
-                silver_revenue = float(checksums[2])
-                gold_revenue = float(checksums[3])
-                gold_revenue_known = float(checksums[4])
-                gold_product_revenue = float(checksums[5])
-                bronze_product_revenue = float(checksums[6])
+                checksums = await self._offload(
+                    _validation_checksums, conn, known_types_sql,
+                    None if full_validation else affected_dates,
+                    None if full_validation else scope_tables.ids,
+                )
+                if full_validation:
+                    self._last_full_validation = time.monotonic()
+                stage_ms["validation_ms"] = round(
+                    (time.perf_counter() - validation_started) * 1000, 2
+                )
+
+                bronze_orders = checksums["bronze_orders"]
+                silver_rows = checksums["silver_rows"]
+                silver_revenue = checksums["silver_revenue"]
+                gold_revenue = checksums["gold_revenue"]
+                gold_revenue_known = checksums["gold_revenue_known"]
+                gold_product_revenue = checksums["gold_product_revenue"]
+                bronze_product_revenue = checksums["bronze_product_revenue"]
 
                 checksum_match = abs(silver_revenue - gold_revenue) < 0.01
                 product_checksum_match = abs(gold_product_revenue - bronze_product_revenue) < 0.01
                 row_count_match = bronze_orders == silver_rows
 
-                # ── Cell guard ──
-                # Gold holds one row per (date, sales_type) and is built from
-                # Silver by GROUP BY, so the two sets of cells must be equal.
-                # The scalar checksums cannot see it when they are not: on the
-                # three backups taken during the August incident there were
-                # 100 → 90 → 84 mismatched cells and *zero* value mismatches —
-                # every one was a cell Gold was missing, while the sums agreed.
-                # Two anti-joins over an indexed pair of columns; ~7 ms.
-                missing_cells = conn.execute("""
-                    SELECT COUNT(*) FROM (
-                        SELECT DISTINCT order_date AS d, sales_type AS t FROM silver_orders
-                        EXCEPT
-                        SELECT date, sales_type FROM gold_daily_revenue
-                    )
-                """).fetchone()[0]
-                extra_cells = conn.execute("""
-                    SELECT COUNT(*) FROM (
-                        SELECT date AS d, sales_type AS t FROM gold_daily_revenue
-                        EXCEPT
-                        SELECT DISTINCT order_date, sales_type FROM silver_orders
-                    )
-                """).fetchone()[0]
+                missing_cells = checksums["missing_cells"]
+                extra_cells = checksums["extra_cells"]
                 cells_match = (missing_cells == 0 and extra_cells == 0)
                 if not cells_match:
                     logger.error(
@@ -2244,7 +3333,7 @@ class DuckDBStore(
                         f"cells: {missing_cells} missing/{extra_cells} orphaned, "
                         f"revenue={silver_revenue:.2f}→{gold_revenue:.2f} (match={checksum_match}), "
                         f"product_revenue={bronze_product_revenue:.2f}→{gold_product_revenue:.2f} "
-                        f"(match={product_checksum_match})"
+                        f"(match={product_checksum_match}), validation={validation_mode}"
                     )
 
                     if consecutive < MAX_VALIDATION_RETRIES:
@@ -2297,16 +3386,24 @@ class DuckDBStore(
                     "gold_revenue_rows, gold_products_rows, silver_revenue_checksum, "
                     "gold_revenue_checksum, checksum_match, validation_passed, error"
                 )
+                _extra_cols = ["silver_mode", "validation_mode", *stage_ms]
+                _extra_values = [
+                    f"{silver_mode}{'+catalog' if catalog_dirty else ''}"
+                    f"{'+costs' if buyer_stats_dirty else ''}",
+                    validation_mode,
+                    *stage_ms.values(),
+                ]
                 try:
                     conn.execute(
-                        f"INSERT INTO warehouse_refreshes ({_audit_cols}, silver_mode) "
-                        f"VALUES (CURRENT_TIMESTAMP, {', '.join('?' * len(_audit_values))}, ?)",
-                        _audit_values + [f"{silver_mode}{'+catalog' if catalog_dirty else ''}"],
+                        f"INSERT INTO warehouse_refreshes ({_audit_cols}, {', '.join(_extra_cols)}) "
+                        f"VALUES (CURRENT_TIMESTAMP, "
+                        f"{', '.join('?' * (len(_audit_values) + len(_extra_values)))})",
+                        _audit_values + _extra_values,
                     )
                 except Exception:
-                    # The column may not exist yet: a deploy can reach this line
+                    # The columns may not exist yet: a deploy can reach this line
                     # before its migration lands, and losing the audit row is a
-                    # worse outcome than losing one field of it. This is the
+                    # worse outcome than losing a few fields of it. This is the
                     # 2026-08-09 failure mode written down as a fallback rather
                     # than left to be rediscovered.
                     conn.execute(
@@ -2326,6 +3423,9 @@ class DuckDBStore(
                     partition_alert, "warehouse:sales_type_partition",
                 )
 
+            if warehouse_changed:
+                await self._announce_warehouse_refresh(trigger, gold_delta)
+
             incremental_info = ""
             if affected_dates:
                 incremental_info = f", gold_dates={len(affected_dates)}"
@@ -2334,51 +3434,11 @@ class DuckDBStore(
                 f"Warehouse layers refreshed ({trigger}): "
                 f"silver={silver_rows} ({silver_mode}), gold_rev={gold_revenue_rows}, "
                 f"gold_prod={gold_products_rows}, "
-                f"duration={duration_ms:.0f}ms, valid={validation_passed}"
-                f"{incremental_info}"
+                f"duration={duration_ms:.0f}ms, valid={validation_passed} ({validation_mode})"
+                f"{incremental_info}; "
+                + ", ".join(f"{k}={v:.0f}" for k, v in stage_ms.items() if v is not None)
             )
 
-            # ── UTM/Traffic layers (after main refresh completes) ──
-            utm_count = 0
-            traffic_rows = 0
-            try:
-                utm_order_ids = await self.refresh_utm_silver_layer()
-                utm_count = len(utm_order_ids)
-
-                # Rebuild the dates that moved, not all 987 of them.
-                #
-                # This passed affected_dates=None unconditionally — a full
-                # DELETE+INSERT of gold_daily_traffic on every one of ~240
-                # refreshes a day. DuckDB cannot reclaim what that leaves
-                # behind while a writer is live: vacuuming deletes needs an
-                # exclusive lock a 2-minute refresh loop never yields, and
-                # `vacuum_rebuild_indexes` is off by default so an indexed
-                # table is skipped anyway. gold_daily_traffic reached 3.86M
-                # stored rows behind 5 781 live ones — 667x amplification,
-                # and the single largest contributor to the ~90 MB a day the
-                # database file grew between weekly compactions.
-                #
-                # The old comment was right that UTM parsing can touch dates
-                # outside affected_dates. The answer is to ask which ones
-                # rather than to avoid the question: refresh_utm_silver_layer
-                # now returns the ids it parsed, so the two sets union.
-                traffic_dates = await self._traffic_rebuild_dates(
-                    affected_dates, utm_order_ids,
-                )
-                if traffic_dates is None or traffic_dates:
-                    traffic_rows = await self.refresh_traffic_gold_layer(
-                        affected_dates=traffic_dates,
-                    )
-                else:
-                    # Nothing moved and nothing parsed — the layer is already
-                    # right. Report its size without rewriting it.
-                    async with self.connection() as conn:
-                        traffic_rows = conn.execute(
-                            "SELECT COUNT(*) FROM gold_daily_traffic"
-                        ).fetchone()[0]
-            except Exception as utm_error:
-                logger.warning(f"UTM layer refresh failed (non-critical): {utm_error}")
-
             return {
                 "status": "success",
                 "trigger": trigger,
@@ -2389,8 +3449,12 @@ class DuckDBStore(
                 "gold_products_rows": gold_products_rows,
                 "checksum_match": checksum_match,
                 "validation_passed": validation_passed,
+                "validation_mode": validation_mode,
                 "utm_orders_parsed": utm_count,
                 "traffic_rows": traffic_rows,
+                "warehouse_changed": warehouse_changed,
+                "gold_generation": self._gold_generation,
+                "stage_ms": stage_ms,
             }
 
         except Exception as e:
@@ -2398,6 +3462,10 @@ class DuckDBStore(
             error_msg = str(e)
             logger.error(f"Warehouse refresh failed ({trigger}): {e}", exc_info=True)
 
+            # Any step may have committed before the one that threw, so assume
+            # the worst about what cached answers still describe.
+            self.bump_gold_generation()
+
             # Log failure to audit table
             try:
                 async with self.connection() as conn:
@@ -2446,6 +3514,136 @@ class DuckDBStore(
                 "error": error_msg,
             }
 
+        finally:
+            if scope_tables is not None:
+                try:
+                    async with self.connection() as conn:
+                        scope_tables.drop(conn)
+                except Exception as e:
+                    logger.warning(f"Could not drop refresh scope tables: {e}")
+
+    async def _announce_warehouse_refresh(
+        self, trigger: str, gold_delta: "list | None",
+    ) -> None:
+        """Emit WAREHOUSE_REFRESHED for the dashboards' live updates.
+
+        `gold_delta` is the revenue cells' differences (core/gold_delta.py),
+        or None when the refresh was too wide to describe that way.
+        """
+        from core.events import events, SyncEvent
+        try:
+            await events.emit(SyncEvent.WAREHOUSE_REFRESHED, {
+                "trigger": trigger,
+                "gold_generation": self._gold_generation,
+                "gold_delta": gold_delta,
+            }, source="duckdb_store")
+        except Exception as e:
+            logger.warning(f"Warehouse refresh announcement failed: {e}")
+
+    async def _plan_gold_build(
+        self,
+        affected_dates: "set[date] | None",
+        catalog_dirty: bool,
+        utm_order_ids: "set[int] | None",
+        order_dates: "set[date] | None" = None,
+    ) -> "Dict[str, set[date] | None]":
+        """The dates each Gold table must be rebuilt for, worked out once.
+
+        Values follow _rebuild_gold_table: `None` is every date, an empty set
+        is none. Each table used to derive its own scope inside its own step;
+        deciding them together, before any is built, is what lets the builds
+        run at once.
+
+        `utm_order_ids` is None when UTM parsing failed; gold_daily_traffic is
+        then left out of the plan rather than rebuilt from a half-parsed
+        silver_order_utm.
+
+        `order_dates` are the changed orders' own dates, without the buyer
+        cascade. gold_daily_basket_pairs holds nothing about buyers, so it
+        needs only those — on a 200k-order history, 50 changed orders cascade
+        to 566 dates and occupy 90. None means `affected_dates`.
+        """
+        async with self.connection() as conn:
+            pairs_empty = conn.execute(
+                "SELECT NOT EXISTS (SELECT 1 FROM gold_daily_basket_pairs)"
+            ).fetchone()[0]
+        plan: "Dict[str, set[date] | None]" = {
+            "gold_daily_revenue": affected_dates,
+            # The two rebuilt tables that join the catalog, so a product or
+            # offer change widens these scopes alone. Everything else keeps
+            # whatever scope the orders gave it.
+            "gold_daily_products": None if catalog_dirty else affected_dates,
+            # Filled whole the first time: its history predates any scope.
+            "gold_daily_basket_pairs": (
+                None if catalog_dirty or pairs_empty or affected_dates is None
+                else order_dates if order_dates is not None
+                else affected_dates
+            ),
+        }
+        if utm_order_ids is not None:
+            # Rebuild the dates that moved, not all 987 of them.
+            #
+            # This used to be a full DELETE+INSERT of gold_daily_traffic on
+            # every one of ~240 refreshes a day. DuckDB cannot reclaim what
+            # that leaves behind while a writer is live: vacuuming deletes
+            # needs an exclusive lock a 2-minute refresh loop never yields,
+            # and `vacuum_rebuild_indexes` is off by default so an indexed
+            # table is skipped anyway. gold_daily_traffic reached 3.86M
+            # stored rows behind 5 781 live ones — 667x amplification, and
+            # the single largest contributor to the ~90 MB a day the database
+            # file grew between weekly compactions.
+            #
+            # UTM parsing can touch dates outside affected_dates, so ask which
+            # ones: refresh_utm_silver_layer returns the ids it parsed, and
+            # the two sets union.
+            plan["gold_daily_traffic"] = await self._traffic_rebuild_dates(
+                affected_dates, utm_order_ids,
+            )
+        return plan
+
+    async def _run_gold_builds(
+        self, plan: "Dict[str, set[date] | None]",
+    ) -> "Dict[str, GoldBuild | BaseException]":
+        """Rebuild every table in `plan`, concurrently when the lane is up.
+
+        The writer lock is held throughout, so no other write lands between
+        the builds; each build is still its own transaction on its own
+        cursor, so one table failing rolls back that table alone. A failure
+        is returned in place of its GoldBuild rather than raised, because
+        the caller decides which tables are worth failing the refresh for.
+        """
+        async with self.connection() as conn:
+            if self._gold_executor is None or len(plan) < 2:
+                results: "Dict[str, GoldBuild | BaseException]" = {}
+                for table, dates in plan.items():
+                    try:
+                        results[table] = await self._offload(
+                            _rebuild_gold_table, conn, table, dates,
+                        )
+                    except Exception as e:
+                        results[table] = e
+                return results
+
+            def _build(table: str, dates: "set[date] | None") -> GoldBuild:
+                # A cursor per build: DuckDB connections are not safe to
+                # share across threads, and each cursor gets its own
+                # transaction.
+                cursor = conn.cursor()
+                try:
+                    return _rebuild_gold_table(cursor, table, dates)
+                finally:
+                    cursor.close()
+
+            loop = asyncio.get_running_loop()
+            outcomes = await asyncio.gather(
+                *(
+                    loop.run_in_executor(self._gold_executor, _build, table, dates)
+                    for table, dates in plan.items()
+                ),
+                return_exceptions=True,
+            )
+            return dict(zip(plan, outcomes))
+
     async def _traffic_rebuild_dates(
         self,
         affected_dates: "set[date] | None",
@@ -2480,11 +3678,13 @@ class DuckDBStore(
 
     async def get_warehouse_status(self) -> Dict[str, Any]:
         """Get warehouse layer status for admin monitoring."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             # Last refresh info
             last = conn.execute("""
                 SELECT refreshed_at, trigger, duration_ms, bronze_orders, silver_rows,
-                       gold_revenue_rows, gold_products_rows, checksum_match, validation_passed
+                       gold_revenue_rows, gold_products_rows, checksum_match, validation_passed,
+                       silver_ms, gold_revenue_ms, gold_products_ms, gold_traffic_ms,
+                       validation_ms, validation_mode, gold_cohort_ms, gold_pairs_ms
                 FROM warehouse_refreshes
                 ORDER BY id DESC
                 LIMIT 1
@@ -2507,6 +3707,15 @@ class DuckDBStore(
                     "gold_products_rows": last[6],
                     "checksum_match": last[7],
                     "validation_passed": last[8],
+                    "stage_ms": {
+                        name: float(value) if value is not None else None
+                        for name, value in zip(
+                            ("silver", "gold_revenue", "gold_products", "gold_traffic",
+                             "validation", "gold_cohort", "gold_pairs"),
+                            (*last[9:14], *last[15:17]),
+                        )
+                    },
+                    "validation_mode": last[14],
                     "recent_refreshes": recent_count[0] if recent_count else 0,
                 }
             else:
@@ -2520,6 +3729,8 @@ class DuckDBStore(
                     "gold_products_rows": 0,
                     "checksum_match": None,
                     "validation_passed": None,
+                    "stage_ms": None,
+                    "validation_mode": None,
                     "recent_refreshes": 0,
                 }
 
@@ -2543,6 +3754,35 @@ class DuckDBStore(
                 VALUES (?, ?, CURRENT_TIMESTAMP)
             """, [f"last_sync_{key}", timestamp.isoformat()])
 
+    async def get_full_sync_progress(self, max_age: timedelta) -> Optional[datetime]:
+        """Where an interrupted full sync got to, if it was recent enough to trust.
+
+        The value is the start of the first chunk not yet committed. Older than
+        `max_age` it is ignored: the chunks behind it were written that long ago
+        and are exactly what a full sync is supposed to re-check.
+        """
+        async with self.connection() as conn:
+            row = conn.execute(
+                "SELECT value, epoch(now()) - epoch(updated_at) FROM sync_metadata "
+                "WHERE key = 'full_sync_progress'"
+            ).fetchone()
+        if not row or not row[0]:
+            return None
+        if row[1] is not None and row[1] > max_age.total_seconds():
+            return None
+        return datetime.fromisoformat(row[0])
+
+    async def set_full_sync_progress(self, resume_from: Optional[datetime]) -> None:
+        """Record the next chunk a full sync would start from; None clears it."""
+        async with self.connection() as conn:
+            if resume_from is None:
+                conn.execute("DELETE FROM sync_metadata WHERE key = 'full_sync_progress'")
+                return
+            conn.execute("""
+                INSERT OR REPLACE INTO sync_metadata (key, value, updated_at)
+                VALUES ('full_sync_progress', ?, CURRENT_TIMESTAMP)
+            """, [resume_from.isoformat()])
+
     async def mark_warehouse_dirty(self, changed_order_ids: list[int] | None = None) -> None:
         """Set dirty flag so the warehouse refresh job picks it up."""
         import json
@@ -2567,22 +3807,56 @@ class DuckDBStore(
                 VALUES ('warehouse_dirty', ?, CURRENT_TIMESTAMP)
             """, [value])
 
+    async def refresh_buyer_stats(self) -> int:
+        """Rebuild silver_buyer_stats, and the cohort grid read from it, whole.
+
+        The warehouse refresh keeps both up to date on its own; this is for a
+        Silver written some other way (the rebuild-silver endpoint, tests).
+        Returns the number of buyer stats rows written.
+        """
+        async with self.connection() as conn:
+            def _rebuild() -> int:
+                conn.execute("BEGIN TRANSACTION")
+                try:
+                    rewrite_buyer_stats(conn)
+                    rewrite_cohort_activity(conn)
+                    conn.execute("COMMIT")
+                except Exception:
+                    try:
+                        conn.execute("ROLLBACK")
+                    except Exception:
+                        pass
+                    raise
+                return conn.execute("SELECT COUNT(*) FROM silver_buyer_stats").fetchone()[0]
+
+            rows = await self._offload(_rebuild)
+        self.bump_gold_generation()
+        return rows
+
     async def mark_catalog_dirty(self) -> None:
         """A product, offer or category changed — not an order.
 
         Kept apart from `mark_warehouse_dirty` because the two mean different
-        things and only one of the four rebuilt tables cares:
-
-            silver_orders        <- orders                     no catalog
-            gold_daily_revenue   <- silver_orders              no catalog
-            gold_daily_traffic   <- silver + silver_order_utm  no catalog
-            gold_daily_products  <- silver + order_products
-                                    + products + categories    YES
-
-        A rename therefore has to widen exactly one scope. Marking the whole
+        things and only three of the rebuilt tables care:
+
+            silver_orders           <- orders                     no catalog
+            silver_buyer_stats      <- silver + order_products
+                                       + products                 YES
+            gold_daily_revenue      <- silver_orders              no catalog
+            gold_daily_traffic      <- silver + silver_order_utm  no catalog
+            gold_cohort_activity    <- silver + buyer stats       no catalog
+            gold_daily_products     <- silver + order_products
+                                       + products + categories    YES
+            gold_daily_basket_pairs <- silver_order_lines         YES
+
+        A rename therefore has to widen exactly those scopes. Marking the whole
         warehouse dirty instead rebuilt all four, and silver_orders — which has
         no product column at all — was the second-largest contributor to the
         file growth that forced a weekly stop-the-world compaction.
+
+        Stock costs are not catalog in this sense: only silver_buyer_stats
+        reads offer_stocks, so `upsert_stocks` sets `buyer_stats_dirty`
+        instead, and an hourly stock sync leaves the product tables alone.
         """
         async with self.connection() as conn:
             conn.execute("""
@@ -2598,15 +3872,20 @@ class DuckDBStore(
         trigger and the admin endpoint alike — without each having to know it
         exists.
         """
+        return await self._consume_flag("warehouse_catalog_dirty")
+
+    async def _consume_buyer_stats_dirty(self) -> bool:
+        """Read and clear the flag `upsert_stocks` sets when a cost moved."""
+        return await self._consume_flag("buyer_stats_dirty")
+
+    async def _consume_flag(self, key: str) -> bool:
         async with self.connection() as conn:
             row = conn.execute(
-                "SELECT value FROM sync_metadata WHERE key = 'warehouse_catalog_dirty'"
+                "SELECT value FROM sync_metadata WHERE key = ?", [key]
             ).fetchone()
             if not row or not row[0]:
                 return False
-            conn.execute(
-                "DELETE FROM sync_metadata WHERE key = 'warehouse_catalog_dirty'"
-            )
+            conn.execute("DELETE FROM sync_metadata WHERE key = ?", [key])
             return True
 
     async def consume_warehouse_dirty(self) -> tuple[bool, list[int] | None]:
@@ -2659,6 +3938,16 @@ class DuckDBStore(
             )
         return len(misses)
 
+    def request_full_validation(self) -> None:
+        """Make the next warehouse refresh validate every date, not just its own.
+
+        For anything that rewrites Silver outside refresh_warehouse_layers —
+        the admin rebuild and purge endpoints. The ledger is only kept in step
+        with the dates a refresh rebuilt, so after one of those a scoped tick
+        would compare Gold against history that is no longer there.
+        """
+        self._last_full_validation = None
+
     def _claim_stuck_rebuild_slot(self) -> bool:
         """Take the one full-rebuild attempt allowed per cooldown, if it is free.
 
@@ -2768,10 +4057,11 @@ class DuckDBStore(
 
         t0 = time.perf_counter()
         try:
-            async with self.connection() as conn:
+            async with self.connection() as conn, self._quiesce_readers():
                 conn.execute("CHECKPOINT")
                 loop = asyncio.get_running_loop()
                 # Copy with the lock held → no concurrent writer → consistent.
+                # Readers are parked too, so none holds a snapshot mid-copy.
                 await loop.run_in_executor(
                     self._executor, shutil.copy2, str(src), str(tmp_path)
                 )
@@ -2877,6 +4167,7 @@ class DuckDBStore(
         orders: List[Dict[str, Any]],
         force_update: bool = False,
         skip_products: bool = False,
+        skip_unchanged_payload: bool = False,
     ) -> "UpsertResult":
         """
         Insert or update orders from API response (idempotent).
@@ -2895,12 +4186,20 @@ class DuckDBStore(
                           Use this for status refresh where only order-level
                           fields (status_id, etc.) change — avoids OOM on
                           executemany for ~2000 orders worth of product rows.
+                          The order's payload_hash is stored as NULL, since
+                          the lines it covers were not written.
+            skip_unchanged_payload: With force_update, write only the orders
+                          whose payload_hash differs from the stored one
+                          (or is unknown), instead of every order. What the
+                          status refresh wants: every status change, none of
+                          the identical rewrites.
 
         Returns:
             An UpsertResult. Read `.changed_ids` to find out what actually
             moved; `.count` includes rows that were already correct, so
             driving a rebuild from it rebuilds the world every cycle.
         """
+        import pandas as pd
         if not orders:
             return UpsertResult(count=0, changed_ids=[], skipped_unchanged=0, failed=0)
 
@@ -2915,7 +4214,7 @@ class DuckDBStore(
             if not order.ordered_at:
                 continue
 
-            order_rows.append({
+            order_row = {
                 "id": order.id,
                 "source_id": order.source_id,
                 "status_id": order.status_id,
@@ -2928,25 +4227,31 @@ class DuckDBStore(
                 "manager_id": order.manager.id if order.manager else None,
                 "manager_comment": order.manager_comment,
                 "promocode": order.promocode,
-            })
+                "payload_hash": None,
+            }
+            order_rows.append(order_row)
 
             # Build product rows (skip for status-only refresh to avoid OOM)
             if not skip_products:
                 # ID generation: order_id * 1000 + position (supports up to 1000 products/order, order IDs up to ~2M)
-                for i, prod in enumerate(order.products):
-                    product_rows.append({
+                lines = [
+                    {
                         "id": order.id * 1000 + i,
                         "order_id": order.id,
                         "product_id": prod.product_id,
                         "name": prod.name,
                         "quantity": prod.quantity,
                         "price_sold": float(prod.price_sold),
-                    })
+                    }
+                    for i, prod in enumerate(order.products)
+                ]
+                order_row["payload_hash"] = order_payload_hash(order_row, lines)
+                product_rows.extend(lines)
 
         if not order_rows:
             return UpsertResult(count=0, changed_ids=[], skipped_unchanged=0, failed=0)
 
-        # Create DataFrame for orders (products use executemany for simplicity)
+        # Create DataFrame for orders
         # Deduplicate by id - API can return same order twice in paginated responses
         orders_df = pd.DataFrame(order_rows).drop_duplicates(subset=["id"], keep="last")
 
@@ -2956,149 +4261,117 @@ class DuckDBStore(
 
         # Ensure nullable integer columns use Int64 so None stays pd.NA, not float NaN
         # (DuckDB 1.5+ rejects float NaN → INT32 in executemany)
-        for col in ["source_id", "status_id", "status_group_id", "buyer_id", "manager_id"]:
+        for col in ["source_id", "status_id", "status_group_id", "buyer_id", "manager_id", "payload_hash"]:
             orders_df[col] = orders_df[col].astype("Int64")
 
         # Ensure nullable string columns are proper type for DuckDB
         orders_df["manager_comment"] = orders_df["manager_comment"].astype(pd.StringDtype())
         orders_df["promocode"] = orders_df["promocode"].astype(pd.StringDtype())
 
-        # Get order IDs for use in queries (avoids DuckDB FK bug with subqueries)
-        order_ids = orders_df["id"].tolist()
-
-        # Helper: pd.NA → None for DuckDB compatibility
-        def _int_or_none(v):
-            return None if pd.isna(v) else int(v)
-
-        insert_rows = []
-        for _, row in orders_df.iterrows():
-            insert_rows.append((
-                int(row["id"]), _int_or_none(row["source_id"]),
-                _int_or_none(row["status_id"]),
-                _int_or_none(row["status_group_id"]),
-                float(row["grand_total"]),
-                row["ordered_at"], row["created_at"], row["updated_at"],
-                _int_or_none(row["buyer_id"]),
-                _int_or_none(row["manager_id"]),
-                row["manager_comment"],
-                row["promocode"],
-            ))
-
-        async with self.connection() as conn:
-            # 1. Upsert orders one-by-one in autocommit mode with row-level fault isolation.
-            # DuckDB 1.5: ON CONFLICT inside explicit transactions is broken
-            # (PK violation poisons transaction). Autocommit per-row works for most rows,
-            # but occasional rows hit write-write conflicts. Skip them and continue —
-            # the 24h sync_from buffer will retry on the next cycle.
-            # P2-1: Explicit SELECT→UPDATE/INSERT instead of ON CONFLICT.
-            # DuckDB 1.5.x has MVCC bugs in ON CONFLICT that cause write-write
-            # conflicts on "poisoned" rows. Explicit check avoids that code path.
-            insert_sql = """
-                INSERT INTO orders (id, source_id, status_id, status_group_id,
-                                   grand_total, ordered_at, created_at, updated_at,
-                                   buyer_id, manager_id, manager_comment, promocode, synced_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, now())
-            """
-            # manager_comment carries UTM attribution data. COALESCE keeps the
-            # stored value when the API payload has it as null — otherwise a
-            # re-sync of an order whose payload omits the field would destroy
-            # attribution that backfill restored (loss is unrecoverable: the
-            # UTM silver layer parses from this column).
-            update_sql = """
-                UPDATE orders SET
-                    source_id = ?, status_id = ?, status_group_id = ?, grand_total = ?,
-                    ordered_at = ?, created_at = ?, updated_at = ?,
-                    buyer_id = ?, manager_id = ?,
-                    manager_comment = COALESCE(?, manager_comment),
-                    promocode = ?, synced_at = now()
-                WHERE id = ?
-            """
-
-            # Batch-fetch (id, updated_at) for every existing target row so the
-            # skip-decider can compare timestamps without per-row SELECTs.
-            # See core.upsert_decider.should_update_order for the contract.
-            from core.upsert_decider import should_update_order
-
-            all_ids = [int(p[0]) for p in insert_rows]
-            placeholders = ",".join("?" * len(all_ids))
-            existing_rows = conn.execute(
-                f"SELECT id, updated_at FROM orders WHERE id IN ({placeholders})",
-                all_ids,
-            ).fetchall()
-            existing: Dict[int, Any] = {int(r[0]): r[1] for r in existing_rows}
-
-            success_ids: List[int] = []
-            updated_ids: List[int] = []
-            skipped_count = 0
+        # Line items as one frame too. An order that appeared twice in the
+        # payload contributed its lines twice; the last copy wins, as it
+        # does for the order row itself.
+        products_df = None
+        if not skip_products and product_rows:
+            products_df = pd.DataFrame(product_rows).drop_duplicates(subset=["id"], keep="last")
+            products_df["product_id"] = products_df["product_id"].astype("Int64")
+            products_df["name"] = products_df["name"].astype(pd.StringDtype())
+
+        def _write(conn) -> "UpsertResult":
+            # 1. Decide the whole batch in one JOIN, on the same contract as
+            # core.upsert_decider.should_update_order: new rows are inserted,
+            # rows whose updated_at (or, for the status refresh, payload_hash)
+            # moved are updated, the rest are skipped.
+            # It used to be a Python loop issuing one statement per order —
+            # ~2 ms each, so a 30-day chunk held the writer lane for seconds.
+            decision = should_update_order_sql(
+                "o.updated_at", "b.updated_at", force=force_update,
+                existing_hash="o.payload_hash",
+                incoming_hash="b.payload_hash" if skip_unchanged_payload else None,
+            )
+            decided = conn.execute(f"""
+                SELECT b.id,
+                       o.id IS NOT NULL,
+                       {decision}
+                FROM _upsert_orders_batch b
+                LEFT JOIN orders o ON o.id = b.id
+            """).fetchall()
+            success_ids = [int(r[0]) for r in decided]
+            insert_ids = [int(r[0]) for r in decided if not r[1]]
+            update_ids = [int(r[0]) for r in decided if r[1] and r[2]]
+            written_ids = insert_ids + update_ids
+            skipped_count = len(decided) - len(written_ids)
             failed: List[tuple] = []  # (order_id, error_str)
-            for params in insert_rows:
-                order_id = int(params[0])
-                incoming_updated_at = params[7]  # tuple index matches insert_sql
-                existing_updated_at = existing.get(order_id) if order_id in existing else None
 
+            # 2. Apply both sets in one transaction: two statements per batch.
+            if written_ids:
+                conn.register("_upsert_write_ids", pd.DataFrame({"id": written_ids}))
+                conn.execute("BEGIN TRANSACTION")
                 try:
-                    if order_id in existing:
-                        if not should_update_order(
-                            existing_updated_at, incoming_updated_at,
-                            force=force_update,
-                        ):
-                            # Identity write — same updated_at, nothing to do.
-                            # Counts toward success because the row IS in the
-                            # desired state (just not freshly written).
-                            success_ids.append(order_id)
-                            skipped_count += 1
-                            continue
-                        conn.execute(update_sql, [
-                            params[1], params[2], params[3], params[4], params[5],
-                            params[6], params[7], params[8], params[9], params[10],
-                            params[11],
-                            order_id,
-                        ])
-                        updated_ids.append(order_id)
-                    else:
-                        conn.execute(insert_sql, list(params))
-                        updated_ids.append(order_id)
-                    success_ids.append(order_id)
+                    if update_ids:
+                        conn.execute(_BULK_ORDER_UPDATE_SQL)
+                    if insert_ids:
+                        conn.execute(_BULK_ORDER_INSERT_SQL)
+                    conn.execute("COMMIT")
                 except (duckdb.TransactionException, duckdb.ConstraintException) as e:
-                    failed.append((order_id, str(e)))
                     try:
                         conn.execute("ROLLBACK")
                     except Exception:
                         pass
+                    # A poisoned row fails the whole statement. Redo the batch
+                    # row by row so it costs that one order, not all of them.
+                    logger.warning(
+                        f"Bulk order upsert failed ({type(e).__name__}: {e}); "
+                        f"retrying {len(orders_df)} orders row by row"
+                    )
+                    success_ids, written_ids, skipped_count, failed = (
+                        _upsert_orders_row_by_row(
+                            conn, orders_df, force_update, skip_unchanged_payload,
+                        )
+                    )
+                    conn.register("_upsert_write_ids", pd.DataFrame({"id": written_ids}))
 
-            # 2. Delete stale products ONLY for rows we actually wrote.
+            # 3. Replace line items ONLY for rows we actually wrote.
             # Skipped rows (skip-if-unchanged) keep their existing products
             # untouched — their order_products are already correct because the
             # order itself didn't change. This was the bulk of the 1440x churn.
             # Failed rows likewise keep their existing products for consistency.
-            if not skip_products and updated_ids:
-                placeholders = ",".join("?" * len(updated_ids))
-                conn.execute(
-                    f"DELETE FROM order_products WHERE order_id IN ({placeholders})",
-                    updated_ids,
-                )
-
-            # 3. Insert products for actually-updated orders only
-            if not skip_products and product_rows and updated_ids:
-                updated_set = set(updated_ids)
-                products_to_insert = [p for p in product_rows if p["order_id"] in updated_set]
-                if products_to_insert:
-                    conn.execute("BEGIN TRANSACTION")
-                    try:
-                        conn.executemany("""
-                            INSERT OR REPLACE INTO order_products (id, order_id, product_id, name, quantity, price_sold)
-                            VALUES (?, ?, ?, ?, ?, ?)
-                        """, [
-                            (p["id"], p["order_id"], p["product_id"], p["name"], p["quantity"], p["price_sold"])
-                            for p in products_to_insert
-                        ])
-                        conn.execute("COMMIT")
-                    except Exception:
+            if not skip_products and written_ids:
+                try:
+                    conn.execute(
+                        "DELETE FROM order_products "
+                        "WHERE order_id IN (SELECT id FROM _upsert_write_ids)"
+                    )
+                    if products_df is not None:
+                        conn.register("_upsert_products_batch", products_df)
+                        conn.execute("BEGIN TRANSACTION")
                         try:
-                            conn.execute("ROLLBACK")
+                            conn.execute("""
+                                INSERT OR REPLACE INTO order_products
+                                    (id, order_id, product_id, name, quantity, price_sold)
+                                SELECT id, order_id, product_id, name, quantity, price_sold
+                                FROM _upsert_products_batch
+                                WHERE order_id IN (SELECT id FROM _upsert_write_ids)
+                            """)
+                            conn.execute("COMMIT")
                         except Exception:
-                            pass
-                        raise
+                            try:
+                                conn.execute("ROLLBACK")
+                            except Exception:
+                                pass
+                            raise
+                except Exception:
+                    # The order rows are committed with a hash that vouches for
+                    # lines we failed to write. Forget it, or the next status
+                    # refresh would see "unchanged" and never repair them.
+                    try:
+                        conn.execute(
+                            "UPDATE orders SET payload_hash = NULL "
+                            "WHERE id IN (SELECT id FROM _upsert_write_ids)"
+                        )
+                    except Exception:
+                        pass
+                    raise
 
             if failed:
                 sample = ", ".join(str(oid) for oid, _ in failed[:5])
@@ -3108,18 +4381,33 @@ class DuckDBStore(
                 )
 
             count = len(success_ids)
-            n_written = len(updated_ids)
             logger.info(
-                f"Upserted {count}/{len(insert_rows)} orders to DuckDB "
-                f"(written={n_written}, skipped_unchanged={skipped_count})"
+                f"Upserted {count}/{len(orders_df)} orders to DuckDB "
+                f"(written={len(written_ids)}, skipped_unchanged={skipped_count})"
             )
             return UpsertResult(
                 count=count,
-                changed_ids=updated_ids,
+                changed_ids=written_ids,
                 skipped_unchanged=skipped_count,
                 failed=len(failed),
             )
 
+        def _write_registered(conn) -> "UpsertResult":
+            conn.register("_upsert_orders_batch", orders_df)
+            try:
+                return _write(conn)
+            finally:
+                for view in ("_upsert_orders_batch", "_upsert_write_ids", "_upsert_products_batch"):
+                    try:
+                        conn.unregister(view)
+                    except Exception:
+                        pass
+
+        async with self.connection() as conn:
+            # On the writer thread, like the warehouse refresh: the event loop
+            # stays free for the readers while a large chunk is applied.
+            return await self._offload(_write_registered, conn)
+
     # ─── H3: bronze order events (append-only audit log) ───────────────────────
 
     async def append_bronze_events(
@@ -3810,7 +5098,7 @@ class DuckDBStore(
         Returns:
             List of manager dicts with id, name, status, is_retail, order_count, etc.
         """
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             result = conn.execute("""
                 SELECT
                     id, name, email, status, is_retail,
@@ -3841,7 +5129,7 @@ class DuckDBStore(
 
     async def get_stats(self) -> Dict[str, Any]:
         """Get database statistics."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             orders_count = conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
             products_count = conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
             categories_count = conn.execute("SELECT COUNT(*) FROM categories").fetchone()[0]
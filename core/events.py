@@ -63,6 +63,9 @@ class SyncEvent(Enum):
     SEASONALITY_CALCULATED = "analytics.seasonality_calculated"
     GOALS_UPDATED = "analytics.goals_updated"
 
+    # Warehouse events
+    WAREHOUSE_REFRESHED = "warehouse.refreshed"
+
     # Cache events
 
     # Scheduler events
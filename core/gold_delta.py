@@ -0,0 +1,104 @@
+"""
+What a warehouse refresh changed in gold_daily_revenue, as cell differences.
+
+After every sync each open dashboard used to get `orders_synced` and refetch
+its summary, revenue trend and sales-by-source, all at once and all for the
+same answer. The refresh already knows which dates it rebuilt, so it reads
+those Gold cells before and after, and the difference goes out once per
+sales-type filter over /ws/dashboard (`gold_delta`). The dashboard adds it to
+what it holds instead of asking again.
+
+Only additive columns travel: a sum over a date range moves by exactly the
+sum of its cells' differences. unique_customers and the like do not add up
+across days, and the widgets that show them still refetch.
+
+Usage:
+    before = read_gold_cells(conn, dates)
+    ...rebuild...
+    cells = diff_gold_cells(before, read_gold_cells(conn, dates))
+    payload = delta_for_sales_type(cells, "retail")
+"""
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# The dashboard's sales-type filter. 'all' is the sum of every sales_type,
+# as the summary and revenue endpoints compute it.
+DASHBOARD_SALES_TYPES = ("retail", "b2b", "all")
+
+DELTA_COLUMNS = (
+    "revenue",
+    "orders_count",
+    "returns_count",
+    "returns_revenue",
+    "instagram_revenue",
+    "instagram_orders",
+    "telegram_revenue",
+    "telegram_orders",
+    "shopify_revenue",
+    "shopify_orders",
+)
+
+# A refresh that rebuilt more dates than this (a backfill, a buyer cascade
+# reaching years back) is announced as a full change. The dashboard refetches
+# then, which is what it did every time before.
+GOLD_DELTA_MAX_DATES = 62
+
+Cells = Dict[Tuple[date, str], Tuple[float, ...]]
+
+
+def read_gold_cells(conn, dates: Iterable[date]) -> Cells:
+    """gold_daily_revenue's additive columns for `dates`, keyed by (date, sales_type)."""
+    dates = sorted(dates)
+    if not dates:
+        return {}
+    rows = conn.execute(f"""
+        SELECT date, sales_type, {", ".join(f"CAST({c} AS DOUBLE)" for c in DELTA_COLUMNS)}
+        FROM gold_daily_revenue
+        WHERE date IN (SELECT UNNEST(?::DATE[]))
+    """, [dates]).fetchall()
+    return {(row[0], row[1]): tuple(row[2:]) for row in rows}
+
+
+def diff_gold_cells(before: Cells, after: Cells) -> List[Dict[str, Any]]:
+    """Per-cell differences, after minus before; unchanged cells are left out.
+
+    A cell that disappeared counts as zeros after, a new one as zeros before.
+    """
+    zeros = (0.0,) * len(DELTA_COLUMNS)
+    changed = []
+    for key in sorted(before.keys() | after.keys()):
+        old, new = before.get(key, zeros), after.get(key, zeros)
+        diff = [round(n - o, 2) for o, n in zip(old, new)]
+        if any(diff):
+            changed.append({
+                "date": key[0].isoformat(),
+                "sales_type": key[1],
+                **dict(zip(DELTA_COLUMNS, diff)),
+            })
+    return changed
+
+
+def delta_for_sales_type(
+    cells: Optional[List[Dict[str, Any]]], sales_type: str, generation: int = 0,
+) -> Dict[str, Any]:
+    """The `gold_delta` payload for dashboards filtered to `sales_type`.
+
+    `cells` None means the refresh cannot be described cell by cell; the
+    payload then says `full` and the dashboard refetches.
+    """
+    if cells is None:
+        return {"sales_type": sales_type, "generation": generation, "full": True, "cells": []}
+
+    by_date: Dict[str, Dict[str, float]] = {}
+    for cell in cells:
+        if sales_type != "all" and cell["sales_type"] != sales_type:
+            continue
+        day = by_date.setdefault(cell["date"], dict.fromkeys(DELTA_COLUMNS, 0.0))
+        for column in DELTA_COLUMNS:
+            day[column] = round(day[column] + cell[column], 2)
+    return {
+        "sales_type": sales_type,
+        "generation": generation,
+        "full": False,
+        "cells": [{"date": d, **values} for d, values in sorted(by_date.items())],
+    }
@@ -11,11 +11,28 @@ Features:
 - Request correlation IDs for tracing
 """
 import asyncio
+import itertools
+import json
 import os
+import socket
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from functools import wraps
+from pathlib import Path
 from typing import Dict, List, Any, Optional, AsyncGenerator
 
 import httpx
 
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, so no bucket shared between processes
+    fcntl = None
+
+from core.config import config, workers_from_env
 from core.exceptions import KeyCRMAPIError, KeyCRMConnectionError
 from core.models import Order, Product, Buyer
 from core.observability import get_logger, get_correlation_id, Timer
@@ -35,6 +52,21 @@ KEYCRM_API_KEY = os.getenv("KEYCRM_API_KEY", "")
 REQUEST_TIMEOUT = 30.0
 MAX_CONCURRENT_REQUESTS = 5
 
+# Pages paginate(prefetch=...) keeps in flight by default for the order scans
+# in core/sync_service.py. A 30-day chunk with products, offers, manager, buyer
+# and expenses included is ~1 s of server time per page and almost nothing of
+# ours, so one page at a time spent the whole scan waiting. Kept at or under
+# MAX_CONCURRENT_REQUESTS: KeyCRM rate-limits per key, not per connection.
+DEFAULT_PAGINATE_PREFETCH = 4
+
+
+def paginate_prefetch() -> int:
+    """Resolve the order-scan prefetch window from KEYCRM_PAGINATE_PREFETCH (min 1).
+
+    1 restores strictly sequential pages.
+    """
+    return max(1, workers_from_env("KEYCRM_PAGINATE_PREFETCH", DEFAULT_PAGINATE_PREFETCH))
+
 # Resilience configuration
 RETRY_CONFIG = RetryConfig(
     max_attempts=3,
@@ -79,6 +111,383 @@ CIRCUIT_BREAKER_CONFIG = CircuitBreakerConfig(
 _circuit_breaker = CircuitBreaker(config=CIRCUIT_BREAKER_CONFIG)
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# RATE GOVERNOR
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# Requests a minute the governor allows at most, every consumer together — they
+# all spend the one API key, the bot container's as much as the web's. The ceiling is the pace this client has always been
+# configured for, one request per APIConfig.rate_limit_delay (0.3 s, so 200 a
+# minute): what the sequential order scan alone could spend, now shared. It used
+# to be 60, which held a four-page prefetch window to about a request a second
+# and undid the prefetch. Until the governor, the only shared limit was
+# MAX_CONCURRENT_REQUESTS per call site, so a reconciliation run, a buyer
+# backfill and the incremental sync each stayed "under the limit" while
+# together they were well over it, and found out from the 429s. If KeyCRM's
+# limit is lower, its 429s cut the rate (AIMD, below) until it fits.
+DEFAULT_KEYCRM_RATE_PER_MINUTE = 60.0 / config.api.rate_limit_delay
+
+# Requests that may go out back to back after a quiet spell.
+KEYCRM_RATE_BURST = 10
+
+# AIMD. A 429 or a 5xx halves the rate and a response slower than this cuts it
+# by a quarter; every other response wins back one request a minute, up to the
+# ceiling — an upstream that is failing has no headroom to give back. Cuts are
+# at most one per KEYCRM_RATE_CUT_COOLDOWN seconds: the four pages of a
+# prefetch window come back throttled together, and that is one signal, not
+# four.
+KEYCRM_SLOW_RESPONSE_SECONDS = 10.0
+KEYCRM_RATE_CUT_COOLDOWN = 2.0
+KEYCRM_RATE_FLOOR_PER_MINUTE = 6.0
+
+# Where the bucket lives when more than one process spends the key. The bot
+# and the web app are separate containers that both mount ./data, and a bucket
+# per process let each spend the whole ceiling: twice the key's limit between
+# them, and a bot command never ahead of the web's reconciliation.
+# KEYCRM_RATE_STATE=off keeps the bucket in the process.
+DEFAULT_KEYCRM_RATE_STATE_PATH = Path(__file__).parent.parent / "data" / "keycrm_rate.json"
+
+# A waiter in another process counts for this long after it last looked, so
+# one that crashed mid-wait stops holding back the lower classes. Shared
+# waiters never sleep longer than a third of it, to stay counted.
+KEYCRM_SHARED_WAITER_TTL = 15.0
+
+
+class Priority(IntEnum):
+    """Who is waiting on a KeyCRM request. Lower goes first."""
+    INTERACTIVE = 0  # a person is looking at a spinner — bot commands
+    SYNC = 1         # the incremental sync keeping the dashboard current
+    BACKGROUND = 2   # reconciliation, backfills, the full sync
+
+
+_priority: ContextVar[Priority] = ContextVar("keycrm_priority", default=Priority.SYNC)
+
+
+class keycrm_priority:
+    """Context manager setting the priority of KeyCRM requests made inside it.
+
+    A context variable rather than a parameter, so it reaches every request a
+    job makes — through paginate, fetch_all and the tasks an asyncio.gather
+    fans out — without threading an argument through all of them.
+    """
+
+    def __init__(self, priority: Priority):
+        self.priority = Priority(priority)
+        self.token = None
+
+    def __enter__(self):
+        self.token = _priority.set(self.priority)
+        return self.priority
+
+    def __exit__(self, *args):
+        _priority.reset(self.token)
+
+
+def with_keycrm_priority(priority: Priority):
+    """Decorator running an async function under keycrm_priority(priority)."""
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            with keycrm_priority(priority):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _rate_per_minute() -> float:
+    """Resolve the governor ceiling from KEYCRM_RATE_PER_MINUTE.
+
+    A value that does not parse falls back to the default rather than
+    stopping the client from being built.
+    """
+    raw = (os.getenv("KEYCRM_RATE_PER_MINUTE") or "").strip()
+    if not raw:
+        return DEFAULT_KEYCRM_RATE_PER_MINUTE
+    try:
+        value = float(raw)
+        if value > 0:
+            return value
+    except ValueError:
+        pass
+    logger.warning(
+        "Ignoring malformed KEYCRM_RATE_PER_MINUTE=%r; using %g",
+        raw, DEFAULT_KEYCRM_RATE_PER_MINUTE,
+    )
+    return DEFAULT_KEYCRM_RATE_PER_MINUTE
+
+
+def _rate_state_path() -> Optional[Path]:
+    """Resolve the shared bucket file from KEYCRM_RATE_STATE ("off": none)."""
+    raw = (os.getenv("KEYCRM_RATE_STATE") or "").strip()
+    if not raw:
+        return DEFAULT_KEYCRM_RATE_STATE_PATH
+    if raw.lower() in {"off", "0", "false", "none"}:
+        return None
+    return Path(raw)
+
+
+class _SharedBucket:
+    """The governor's state in a file, under flock, for every process on the host.
+
+    Holds the bucket (tokens, rate, pause, last cut) and, per process, how
+    many waiters each Priority has, so a class in one process yields to a
+    higher one waiting in another. Times are time.monotonic(), which is the
+    host's boot clock in every container on it; a file from before a reboot
+    reads as long idle, or, stamped later than "now", is ignored.
+
+    Anything going wrong with the file leaves the governor running on its own
+    state — a missing bucket must not stop requests — and is logged once.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.process = f"{socket.gethostname()}:{os.getpid()}"
+        self._warned = False
+
+    @contextmanager
+    def locked(self):
+        """Yield the stored state (a dict, possibly empty) to read and update."""
+        try:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+        except OSError as e:
+            self._warn(e)
+            yield None
+            return
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                state = json.loads(os.read(fd, 1 << 20) or b"{}")
+            except ValueError:
+                state = {}
+            yield state
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.ftruncate(fd, 0)
+            os.write(fd, json.dumps(state).encode())
+        finally:
+            os.close(fd)
+
+    def _warn(self, error: OSError) -> None:
+        if not self._warned:
+            self._warned = True
+            logger.warning(
+                "KeyCRM rate state %s unavailable (%s); this process keeps its own bucket",
+                self.path, error,
+            )
+
+
+class RateGovernor:
+    """One token bucket for every KeyCRM request made with the key.
+
+    The refill rate adapts (AIMD, see above) and waiters are served by
+    Priority: a request is granted only when no higher class is waiting, in
+    arrival order within its class. BACKGROUND additionally leaves a small
+    reserve in the bucket, so a bot command arriving in the middle of a
+    reconciliation finds a token there instead of queueing behind it.
+
+    With `state_path` the bucket is a file every process shares (see
+    _SharedBucket), which is what lets the bot's INTERACTIVE calls get ahead
+    of the web app's BACKGROUND ones. Arrival order holds within a process;
+    between processes a class only yields to higher ones.
+
+    State is guarded by a threading lock and waiting is done by sleeping, not
+    on an asyncio primitive: SyncKeyCRMClient runs every bot call on its own
+    event loop, and a Condition bound to one loop cannot be awaited from
+    another. A waiter sleeps until the bucket could have served everyone
+    ahead of it, then looks again.
+    """
+
+    _RESERVE = {Priority.INTERACTIVE: 0, Priority.SYNC: 0, Priority.BACKGROUND: 2}
+    # Shortest sleep: the bucket already holds enough for the waiters ahead,
+    # who have yet to wake and take it.
+    _MIN_WAIT_SECONDS = 0.001
+
+    def __init__(self, per_minute: float = DEFAULT_KEYCRM_RATE_PER_MINUTE,
+                 burst: int = KEYCRM_RATE_BURST,
+                 state_path: Optional[Path] = None):
+        self.max_rate = per_minute / 60.0
+        self.min_rate = min(KEYCRM_RATE_FLOOR_PER_MINUTE / 60.0, self.max_rate)
+        self.rate = self.max_rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._last_cut = 0.0
+        self._lock = threading.Lock()
+        self._queues: Dict[Priority, deque] = {p: deque() for p in Priority}
+        self._tickets = itertools.count()
+        self.granted = {p: 0 for p in Priority}
+        self.throttle_events = 0
+        self.slow_events = 0
+        self.server_error_events = 0
+        self._shared = _SharedBucket(state_path) if state_path and fcntl else None
+        self._remote_waiting = {p: 0 for p in Priority}
+
+    @contextmanager
+    def _locked(self):
+        """The lock, and with a shared bucket its state loaded and written back.
+
+        Yields the time, read once the lock is held: read before, another
+        process could have stored a later one meanwhile.
+        """
+        with self._lock:
+            if self._shared is None:
+                yield time.monotonic()
+                return
+            with self._shared.locked() as state:
+                now = time.monotonic()
+                if state is not None:
+                    self._load(state, now)
+                yield now
+                if state is not None:
+                    self._store(state, now)
+
+    def _load(self, state: dict, now: float) -> None:
+        self._remote_waiting = {p: 0 for p in Priority}
+        if not state or state["updated"] > now:
+            return  # first process here, or the file predates a reboot
+        self.rate = min(self.max_rate, max(self.min_rate, state["rate"]))
+        self.tokens = min(float(self.burst), state["tokens"])
+        self._updated = state["updated"]
+        self._paused_until = state["paused_until"]
+        self._last_cut = state["last_cut"]
+        for process, waiting in state.get("waiting", {}).items():
+            if process != self._shared.process and now < waiting["expires"] <= now + KEYCRM_SHARED_WAITER_TTL:
+                for p in Priority:
+                    self._remote_waiting[p] += waiting["counts"][p]
+
+    def _store(self, state: dict, now: float) -> None:
+        waiting = {
+            process: entry for process, entry in state.get("waiting", {}).items()
+            if process != self._shared.process and now < entry["expires"] <= now + KEYCRM_SHARED_WAITER_TTL
+        }
+        counts = [len(self._queues[p]) for p in Priority]
+        if any(counts):
+            waiting[self._shared.process] = {"counts": counts, "expires": now + KEYCRM_SHARED_WAITER_TTL}
+        state.clear()
+        state.update(
+            rate=self.rate, tokens=self.tokens, updated=self._updated,
+            paused_until=self._paused_until, last_cut=self._last_cut, waiting=waiting,
+        )
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _wait_for(self, priority: Priority, ticket: int, now: float) -> float:
+        """0 and a token taken if `ticket` may go now, else seconds to sleep."""
+        self._refill(now)
+        if now < self._paused_until:
+            return self._paused_until - now
+        # Tokens owed first: every waiter of a higher class, here or in
+        # another process, then those ahead of this one in its own.
+        ahead = self._queues[priority].index(ticket) + sum(
+            len(self._queues[p]) + self._remote_waiting[p] for p in Priority if p < priority
+        )
+        # Never more than the bucket holds, or a small burst starves the class.
+        need = min(1 + self._RESERVE[priority], self.burst)
+        if not ahead and self.tokens >= need:
+            self.tokens -= 1
+            return 0.0
+        wait = max((ahead + need - self.tokens) / self.rate, self._MIN_WAIT_SECONDS)
+        if self._shared is not None:
+            # Wake in time to stay counted, and to see waiters other
+            # processes have added since.
+            wait = min(wait, KEYCRM_SHARED_WAITER_TTL / 3)
+        return wait
+
+    async def acquire(self, priority: Optional[Priority] = None) -> float:
+        """Wait for a token. Returns the seconds spent waiting."""
+        priority = Priority(_priority.get() if priority is None else priority)
+        ticket = next(self._tickets)
+        started = time.monotonic()
+        with self._lock:
+            self._queues[priority].append(ticket)
+        try:
+            while True:
+                with self._locked() as now:
+                    wait = self._wait_for(priority, ticket, now)
+                    if wait == 0.0:
+                        self._queues[priority].popleft()
+                        self.granted[priority] += 1
+                        return time.monotonic() - started
+                await asyncio.sleep(wait)
+        except BaseException:
+            with self._locked():
+                try:
+                    self._queues[priority].remove(ticket)
+                except ValueError:
+                    pass
+            raise
+
+    def _cut(self, factor: float, now: float) -> None:
+        if now - self._last_cut >= KEYCRM_RATE_CUT_COOLDOWN:
+            self.rate = max(self.min_rate, self.rate * factor)
+            self._last_cut = now
+
+    def record_throttled(self, retry_after: float) -> None:
+        """A 429: halve the rate, empty the bucket, hold everyone for Retry-After."""
+        with self._locked() as now:
+            self.throttle_events += 1
+            self._refill(now)
+            self.tokens = 0.0
+            self._paused_until = max(self._paused_until, now + retry_after)
+            self._cut(0.5, now)
+
+    def record_server_error(self) -> None:
+        """A 5xx: halve the rate. Retry-After is the retry's to honour, not a pause."""
+        with self._locked() as now:
+            self.server_error_events += 1
+            self._cut(0.5, now)
+
+    def record_response(self, seconds: float) -> None:
+        """A completed request: a slow one is congestion, anything else is headroom."""
+        with self._locked() as now:
+            if seconds >= KEYCRM_SLOW_RESPONSE_SECONDS:
+                self.slow_events += 1
+                self._cut(0.75, now)
+            else:
+                self.rate = min(self.max_rate, self.rate + 1 / 60.0)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot for /api/health."""
+        with self._locked() as now:
+            self._refill(now)
+            return {
+                "rate_per_minute": round(self.rate * 60, 1),
+                "ceiling_per_minute": round(self.max_rate * 60, 1),
+                "tokens": round(self.tokens, 2),
+                "burst": self.burst,
+                "paused_seconds": round(max(0.0, self._paused_until - now), 2),
+                "queued": {p.name.lower(): len(q) for p, q in self._queues.items()},
+                "queued_elsewhere": {p.name.lower(): n for p, n in self._remote_waiting.items()},
+                "shared": self._shared is not None,
+                "granted": {p.name.lower(): n for p, n in self.granted.items()},
+                "throttle_events": self.throttle_events,
+                "slow_events": self.slow_events,
+                "server_error_events": self.server_error_events,
+            }
+
+
+# Host-wide through the state file, process-wide otherwise. Looked up at call
+# time, so a benchmark or a test can swap it.
+rate_governor = RateGovernor(per_minute=_rate_per_minute(), state_path=_rate_state_path())
+
+
+def _last_page(response: Dict[str, Any], page: int) -> int:
+    """The last page a paginated response says exists, or a very large number.
+
+    KeyCRM pages the Laravel way: `last_page`, and `next_page_url` set to null
+    on the final page. Either one lets a prefetching scan stop launching
+    requests it already knows will come back empty.
+    """
+    last = response.get("last_page")
+    if isinstance(last, int) and last >= page:
+        return last
+    if "next_page_url" in response and not response["next_page_url"]:
+        return page
+    return 1 << 30
+
+
 class KeyCRMClient:
     """
     Unified async HTTP client for KeyCRM API.
@@ -227,6 +636,9 @@ class KeyCRMClient:
         if correlation_id:
             request_headers["X-Request-ID"] = correlation_id
 
+        # Every attempt is a request KeyCRM counts, retries included.
+        await rate_governor.acquire()
+
         try:
             with Timer(f"keycrm_{endpoint}", logger) as timer:
                 response = await self._client.request(
@@ -236,6 +648,10 @@ class KeyCRMClient:
                     json=json,
                     headers=request_headers if request_headers else None,
                 )
+            if response.status_code >= 500:
+                rate_governor.record_server_error()
+            elif response.status_code != 429:
+                rate_governor.record_response(timer.elapsed_ms / 1000)
 
             # Handle HTTP errors
             if response.status_code >= 400:
@@ -250,9 +666,12 @@ class KeyCRMClient:
                 # what killed most reconciliation runs. Raise the retryable type
                 # instead and let the caller's backoff handle it.
                 if response.status_code == 429 or response.status_code >= 500:
+                    retry_after = _retry_after_seconds(response)
+                    if response.status_code == 429:
+                        rate_governor.record_throttled(retry_after)
                     raise KeyCRMConnectionError(
                         f"API returned {response.status_code}",
-                        retry_after=_retry_after_seconds(response),
+                        retry_after=retry_after,
                     )
                 raise KeyCRMAPIError(
                     f"API returned {response.status_code}",
@@ -265,6 +684,7 @@ class KeyCRMClient:
             return {"status": "success"}
 
         except httpx.TimeoutException as e:
+            rate_governor.record_response(self.timeout)
             logger.error(
                 f"Request timeout: {method} {endpoint}",
                 extra={"endpoint": endpoint, "timeout": self.timeout}
@@ -402,17 +822,30 @@ class KeyCRMClient:
         params: Optional[Dict[str, Any]] = None,
         page_size: int = 50,
         max_pages: int = 100,
+        prefetch: int = 1,
     ) -> AsyncGenerator[List[Dict[str, Any]], None]:
         """
         Paginate through API results.
 
-        Yields batches of items from paginated endpoint.
+        Yields batches of items from paginated endpoint, in page order.
+
+        With `prefetch` > 1 up to that many page requests are in flight at
+        once: while the caller handles page N, pages N+1 … N+prefetch-1 are
+        already on the wire. Each still goes through _request, so the circuit
+        breaker and retry apply per page, and a failed page raises when its
+        turn comes — after every page before it has been yielded, exactly
+        where the sequential scan would have raised. Every page waits its turn
+        at the rate governor, so a Retry-After holds the whole window. The
+        scan ends at the first empty or
+        short page, or at the last page the response metadata names; requests
+        already launched past the end are cancelled.
 
         Args:
             endpoint: API endpoint
             params: Base query params
             page_size: Items per page
             max_pages: Maximum pages to fetch
+            prefetch: Page requests to keep in flight (1 = one at a time)
 
         Yields:
             List of items per page
@@ -420,19 +853,51 @@ class KeyCRMClient:
         params = dict(params or {})
         params["limit"] = page_size
 
-        for page in range(1, max_pages + 1):
-            params["page"] = page
+        if prefetch <= 1:
+            for page in range(1, max_pages + 1):
+                params["page"] = page
 
-            response = await self._request("GET", endpoint, params=params)
-            batch = response.get("data", [])
+                response = await self._request("GET", endpoint, params=params)
+                batch = response.get("data", [])
 
-            if not batch:
-                break
+                if not batch:
+                    break
 
-            yield batch
+                yield batch
 
-            if len(batch) < page_size:
-                break
+                if len(batch) < page_size:
+                    break
+            return
+
+        in_flight: Dict[int, asyncio.Task] = {}
+        last_page = max_pages
+        next_page = 1
+        try:
+            for page in range(1, max_pages + 1):
+                if page > last_page:
+                    break
+                while next_page <= min(last_page, page + prefetch - 1):
+                    in_flight[next_page] = asyncio.create_task(
+                        self._request("GET", endpoint, params={**params, "page": next_page})
+                    )
+                    next_page += 1
+
+                response = await in_flight.pop(page)
+                batch = response.get("data", [])
+                last_page = min(last_page, _last_page(response, page))
+
+                if not batch:
+                    break
+
+                yield batch
+
+                if len(batch) < page_size:
+                    break
+        finally:
+            for task in in_flight.values():
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight.values(), return_exceptions=True)
 
     async def fetch_all(
         self,
@@ -654,7 +1119,16 @@ class SyncKeyCRMClient:
         self._async_client = KeyCRMClient(api_key, base_url, timeout)
 
     def _run(self, coro):
-        """Run coroutine in event loop."""
+        """Run coroutine in event loop, at INTERACTIVE priority.
+
+        This wrapper is the bot's client, and a bot call is someone waiting
+        on a reply in Telegram.
+        """
+        async def _interactive(inner):
+            with keycrm_priority(Priority.INTERACTIVE):
+                return await inner
+
+        coro = _interactive(coro)
         try:
             loop = asyncio.get_running_loop()
         except RuntimeError:
@@ -4,15 +4,17 @@ LLM client for chat assistant using Anthropic Claude.
 Provides streaming responses and function calling capabilities.
 Supports Ukrainian, Russian, and English responses.
 """
-from typing import Optional, List, Dict, Any, AsyncGenerator
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, AsyncGenerator
 from dataclasses import dataclass
 
-import anthropic
-from anthropic import AsyncAnthropic
-
 from core.config import config
 from core.observability import get_logger
 
+# The SDK costs ~1.5 s to import and the web process imports this module at
+# startup only to mount the chat routes, so it is loaded on first use.
+if TYPE_CHECKING:
+    from anthropic import AsyncAnthropic
+
 logger = get_logger(__name__)
 
 
@@ -58,12 +60,13 @@ When using tools, prefer to answer with specific data rather than generic respon
     def __init__(self, api_key: str, model: str = "claude-sonnet-4-20250514"):
         self.api_key = api_key
         self.model = model
-        self._client: Optional[AsyncAnthropic] = None
+        self._client: Optional["AsyncAnthropic"] = None
 
     @property
-    def client(self) -> AsyncAnthropic:
+    def client(self) -> "AsyncAnthropic":
         """Lazy-initialize Anthropic client."""
         if self._client is None:
+            from anthropic import AsyncAnthropic
             self._client = AsyncAnthropic(api_key=self.api_key)
         return self._client
 
@@ -95,6 +98,8 @@ When using tools, prefer to answer with specific data rather than generic respon
                 "error": True
             }
 
+        import anthropic
+
         try:
             kwargs = {
                 "model": self.model,
@@ -169,6 +174,8 @@ When using tools, prefer to answer with specific data rather than generic respon
             }
             return
 
+        import anthropic
+
         try:
             kwargs = {
                 "model": self.model,
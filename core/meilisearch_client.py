@@ -5,39 +5,33 @@ Provides fast, typo-tolerant search for buyers, orders, and products.
 Syncs data from DuckDB to Meilisearch for optimal search performance.
 """
 import asyncio
-import math
-from typing import Optional, List, Dict, Any
-from datetime import datetime, date
-
-import meilisearch
-from meilisearch.errors import MeilisearchApiError
+from collections import deque
+from typing import TYPE_CHECKING, AsyncIterator, Optional, List, Dict, Any, Tuple
 
 from core.config import config
 from core.observability import get_logger
 
 logger = get_logger(__name__)
 
+# Loaded on first use, like the client itself: the web process imports this
+# module at startup to mount search routes it may not serve for a while.
+if TYPE_CHECKING:
+    import meilisearch
+
+# Document batches enqueued and not yet settled. Meilisearch applies one index's
+# tasks in order but auto-batches those already queued, so a few in flight keep
+# it busy while the next page is read; more only buffer pages in memory.
+DEFAULT_MEILI_IN_FLIGHT = 4
 
-def _sanitize_for_json(obj: Any) -> Any:
-    """Sanitize a value for JSON serialization (handle NaN, Infinity, dates)."""
-    if obj is None:
-        return None
-    if isinstance(obj, float):
-        if math.isnan(obj) or math.isinf(obj):
-            return None
-        return obj
-    if isinstance(obj, (datetime, date)):
-        return obj.isoformat()
-    if isinstance(obj, dict):
-        return {k: _sanitize_for_json(v) for k, v in obj.items()}
-    if isinstance(obj, list):
-        return [_sanitize_for_json(v) for v in obj]
-    return obj
+# How long one batch may take to be applied, and how often to ask. A full
+# reindex page is 10,000 documents; the client's 5 s default is too short once
+# a few of them queue behind each other.
+MEILI_TASK_TIMEOUT_MS = 120_000
+MEILI_TASK_POLL_MS = 100
 
 
-def _sanitize_documents(docs: List[dict]) -> List[dict]:
-    """Sanitize a list of documents for Meilisearch indexing."""
-    return [_sanitize_for_json(doc) for doc in docs]
+class MeiliIndexError(Exception):
+    """A document batch did not make it into a Meilisearch index."""
 
 
 class MeiliClient:
@@ -46,13 +40,14 @@ class MeiliClient:
     def __init__(self, url: str, master_key: str):
         self.url = url
         self.master_key = master_key
-        self._client: Optional[meilisearch.Client] = None
+        self._client: Optional["meilisearch.Client"] = None
         self._initialized = False
 
     @property
-    def client(self) -> meilisearch.Client:
+    def client(self) -> "meilisearch.Client":
         """Lazy-initialize Meilisearch client."""
         if self._client is None:
+            import meilisearch
             self._client = meilisearch.Client(self.url, self.master_key)
         return self._client
 
@@ -69,6 +64,7 @@ class MeiliClient:
 
     async def initialize_indexes(self) -> bool:
         """Initialize required indexes with proper settings."""
+        from meilisearch.errors import MeilisearchApiError
         try:
             loop = asyncio.get_event_loop()
 
@@ -275,117 +271,74 @@ class MeiliClient:
             logger.warning(f"Product search failed: {e}")
             return []
 
-    async def index_buyers(self, buyers: List[dict]) -> int:
+    async def index_ndjson(
+        self,
+        index_name: str,
+        pages: AsyncIterator[Tuple[int, bytes]],
+        max_in_flight: int = DEFAULT_MEILI_IN_FLIGHT,
+    ) -> int:
         """
-        Index buyers for search.
+        Stream NDJSON pages into an index.
 
-        Args:
-            buyers: List of buyer dicts with id, full_name, phone, etc.
-
-        Returns:
-            Number of documents indexed
-        """
-        if not buyers:
-            return 0
-
-        try:
-            loop = asyncio.get_event_loop()
-            index = self.client.index("buyers")
-
-            # Sanitize data for JSON serialization
-            buyers = _sanitize_documents(buyers)
-
-            # Add documents in batches
-            batch_size = 1000
-            total = 0
-            for i in range(0, len(buyers), batch_size):
-                batch = buyers[i:i + batch_size]
-                await loop.run_in_executor(
-                    None,
-                    lambda b=batch: index.add_documents(b)
-                )
-                total += len(batch)
-
-            logger.info(f"Indexed {total} buyers to Meilisearch")
-            return total
-
-        except Exception as e:
-            logger.error(f"Failed to index buyers: {e}")
-            return 0
-
-    async def index_orders(self, orders: List[dict]) -> int:
-        """
-        Index orders for search.
+        Each page is one add-documents task. Up to `max_in_flight` of them are
+        uploaded and awaited side by side while the next page is read, and a
+        page counts only once Meilisearch reports its task succeeded.
 
         Args:
-            orders: List of order dicts
+            index_name: Target index
+            pages: (document count, NDJSON body) pairs
+            max_in_flight: Tasks enqueued and not yet settled, at most
 
         Returns:
             Number of documents indexed
-        """
-        if not orders:
-            return 0
-
-        try:
-            loop = asyncio.get_event_loop()
-            index = self.client.index("orders")
-
-            # Sanitize data for JSON serialization
-            orders = _sanitize_documents(orders)
-
-            batch_size = 1000
-            total = 0
-            for i in range(0, len(orders), batch_size):
-                batch = orders[i:i + batch_size]
-                await loop.run_in_executor(
-                    None,
-                    lambda b=batch: index.add_documents(b)
-                )
-                total += len(batch)
-
-            logger.info(f"Indexed {total} orders to Meilisearch")
-            return total
 
-        except Exception as e:
-            logger.error(f"Failed to index orders: {e}")
-            return 0
-
-    async def index_products(self, products: List[dict]) -> int:
+        Raises:
+            MeiliIndexError: an upload failed or a task did not succeed. Pages
+                already enqueued are settled first; no further page is read.
         """
-        Index products for search.
+        loop = asyncio.get_running_loop()
+        index = self.client.index(index_name)
+
+        def push(count: int, body: bytes) -> int:
+            info = index.add_documents_ndjson(body, primary_key="id")
+            task = self.client.wait_for_task(
+                info.task_uid,
+                timeout_in_ms=MEILI_TASK_TIMEOUT_MS,
+                interval_in_ms=MEILI_TASK_POLL_MS,
+            )
+            if task.status != "succeeded":
+                raise MeiliIndexError(f"task {task.uid} {task.status}: {task.error}")
+            return count
 
-        Args:
-            products: List of product dicts
+        in_flight: deque = deque()
+        indexed = 0
+        errors: List[str] = []
 
-        Returns:
-            Number of documents indexed
-        """
-        if not products:
-            return 0
+        async def settle() -> None:
+            nonlocal indexed
+            try:
+                indexed += await in_flight.popleft()
+            except Exception as e:
+                errors.append(str(e))
 
         try:
-            loop = asyncio.get_event_loop()
-            index = self.client.index("products")
-
-            # Sanitize data for JSON serialization
-            products = _sanitize_documents(products)
-
-            batch_size = 1000
-            total = 0
-            for i in range(0, len(products), batch_size):
-                batch = products[i:i + batch_size]
-                await loop.run_in_executor(
-                    None,
-                    lambda b=batch: index.add_documents(b)
-                )
-                total += len(batch)
-
-            logger.info(f"Indexed {total} products to Meilisearch")
-            return total
-
-        except Exception as e:
-            logger.error(f"Failed to index products: {e}")
-            return 0
+            async for count, body in pages:
+                while len(in_flight) >= max(1, max_in_flight):
+                    await settle()
+                if errors:
+                    break
+                in_flight.append(loop.run_in_executor(None, push, count, body))
+        finally:
+            while in_flight:
+                await settle()
+
+        if errors:
+            raise MeiliIndexError(
+                f"{len(errors)} {index_name} batch(es) failed after {indexed} "
+                f"documents: {errors[0]}"
+            )
+        logger.info(f"Indexed {indexed} {index_name} to Meilisearch")
+        return indexed
 
     async def get_stats(self) -> Dict[str, Any]:
         """Get index statistics."""
@@ -732,6 +732,101 @@ def _m0028_drop_bot_owned_duplicates(self) -> None:
     self._connection.execute("DROP SEQUENCE IF EXISTS seq_report_history_id")
 
 
+def _m0029_warehouse_refreshes_stage_timings(self) -> None:
+    # Migration: per-stage wall time on every refresh audit row.
+    #
+    # duration_ms said a tick took 40 s; nothing said whether Silver, one of
+    # the three Gold tables, or the validation after them was the 40. The
+    # Gold tables now build concurrently, which makes the total even less
+    # informative about its parts. NULL on old rows, and on gold_traffic_ms
+    # when the traffic rebuild was skipped.
+    #
+    # No DEFAULT, same reason as 0005: materialising one rewrites every row.
+    for column in ("silver_ms", "gold_revenue_ms", "gold_products_ms", "gold_traffic_ms"):
+        self._connection.execute(
+            f"ALTER TABLE warehouse_refreshes ADD COLUMN IF NOT EXISTS {column} DECIMAL(10, 2)"
+        )
+
+
+def _m0030_warehouse_checksums(self) -> None:
+    # Migration: the per-(date, sales_type) validation ledger.
+    #
+    # Step 4 of the refresh re-derived every Silver and Bronze total on every
+    # tick; it now re-derives the dates the tick rebuilt and reads the rest
+    # from here (VALIDATION_LEDGER_INSERT_SQL). Created empty: a new process
+    # always sweeps first, and the sweep fills it.
+    #
+    # No primary key. It is rewritten a few dates at a time on every refresh,
+    # and an ART index stops DuckDB vacuuming the rows that leaves behind —
+    # the gold_daily_products lesson. A few thousand rows need no index.
+    self._connection.execute("""
+        CREATE TABLE IF NOT EXISTS warehouse_checksums (
+            date DATE,
+            sales_type VARCHAR,
+            silver_rows INTEGER NOT NULL,
+            silver_revenue DECIMAL(18, 2) NOT NULL,
+            bronze_product_revenue DECIMAL(18, 2) NOT NULL,
+            computed_at TIMESTAMP WITH TIME ZONE
+        )
+    """)
+    # Which kind of validation the audit row records, and what it cost —
+    # 'full' or 'dates'. NULL on older rows. No DEFAULT, as in 0005.
+    self._connection.execute(
+        "ALTER TABLE warehouse_refreshes ADD COLUMN IF NOT EXISTS validation_mode VARCHAR"
+    )
+    self._connection.execute(
+        "ALTER TABLE warehouse_refreshes ADD COLUMN IF NOT EXISTS validation_ms DECIMAL(10, 2)"
+    )
+
+
+def _m0031_orders_payload_hash(self) -> None:
+    # Migration: a fingerprint of what each order last looked like on write.
+    #
+    # The status refresh re-fetches the whole lookback window and has to
+    # force the write, because KeyCRM does not bump updated_at on a status
+    # change. Forcing every row rewrote thousands of identical orders and
+    # handed all of them to the warehouse as changed. Comparing this hash
+    # instead writes only the orders that actually moved (see
+    # core.upsert_decider).
+    #
+    # NULL on existing rows, which reads as "unknown" and is always written,
+    # so the first refresh after this fills it in. No DEFAULT, as in 0005.
+    self._connection.execute(
+        "ALTER TABLE orders ADD COLUMN IF NOT EXISTS payload_hash BIGINT"
+    )
+
+
+def _m0032_cohort_activity(self) -> None:
+    # Migration: what the cohort pages now read instead of silver_orders.
+    #
+    # gold_cohort_activity itself is created with the schema and filled by
+    # the first refresh. This adds the two columns that come with it: the
+    # cohort build's wall time on the audit row, and the buyer's second order
+    # date, which purchase timing reads.
+    #
+    # Existing silver_buyer_stats rows have no second_order_date. Emptying
+    # the table makes the next refresh rebuild it whole (an empty table is
+    # always filled whole), and the cohort grid with it. No DEFAULT, as in 0005.
+    self._connection.execute(
+        "ALTER TABLE warehouse_refreshes ADD COLUMN IF NOT EXISTS gold_cohort_ms DECIMAL(10, 2)"
+    )
+    self._connection.execute(
+        "ALTER TABLE silver_buyer_stats ADD COLUMN IF NOT EXISTS second_order_date DATE"
+    )
+    self._connection.execute("DELETE FROM silver_buyer_stats")
+
+
+def _m0033_basket_pairs(self) -> None:
+    # Migration: the basket pages' pair counts, gold_daily_basket_pairs.
+    #
+    # The table is created with the schema, and the first refresh fills it
+    # whole because it is empty (see _plan_gold_build). This adds the build's
+    # wall time to the audit row. No DEFAULT, as in 0005.
+    self._connection.execute(
+        "ALTER TABLE warehouse_refreshes ADD COLUMN IF NOT EXISTS gold_pairs_ms DECIMAL(10, 2)"
+    )
+
+
 
 MIGRATIONS: List[Migration] = [
     Migration("0001_orders_updated_at", ONCE, _m0001_orders_updated_at),
@@ -761,4 +856,9 @@ MIGRATIONS: List[Migration] = [
     Migration("0026_data_dir_samples", ONCE, _m0026_data_dir_samples),
     Migration("0027_reset_sequences_after_compaction", ALWAYS, _m0027_reset_sequences_after_compaction),
     Migration("0028_drop_bot_owned_duplicates", ONCE, _m0028_drop_bot_owned_duplicates),
+    Migration("0029_warehouse_refreshes_stage_timings", ONCE, _m0029_warehouse_refreshes_stage_timings),
+    Migration("0030_warehouse_checksums", ONCE, _m0030_warehouse_checksums),
+    Migration("0031_orders_payload_hash", ONCE, _m0031_orders_payload_hash),
+    Migration("0032_cohort_activity", ONCE, _m0032_cohort_activity),
+    Migration("0033_basket_pairs", ONCE, _m0033_basket_pairs),
 ]
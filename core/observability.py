@@ -16,11 +16,14 @@ Usage:
 """
 import logging
 import json
+import math
+import re
 import time
 import uuid
 import functools
+import itertools
 from contextvars import ContextVar
-from typing import Optional, Any, Dict, Callable
+from typing import Optional, Any, Dict, Callable, List, Tuple
 from datetime import datetime, timezone
 
 # Context variable for request correlation ID
@@ -288,9 +291,103 @@ def asyncio_iscoroutinefunction(func: Callable) -> bool:
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
-# METRICS COLLECTOR (simple in-memory stats)
+# METRICS COLLECTOR (in-memory histograms, JSON and Prometheus text)
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# Histogram layout, HDR-style: every power-of-two octave of milliseconds is
+# split into SUB_BUCKETS equal slices, so a quantile read back from the
+# buckets is within 1/(2*SUB_BUCKETS) of the true value at any scale.
+# Values below 2**MIN_OCTAVE ms share the first bucket; values past
+# 2**MAX_OCTAVE ms (about 17 minutes) share the overflow bucket.
+SUB_BUCKETS = 4
+MIN_OCTAVE = -6
+MAX_OCTAVE = 20
+_BUCKET_COUNT = (MAX_OCTAVE - MIN_OCTAVE + 1) * SUB_BUCKETS + 1
+
+# Octave edges, in ms, exported as Prometheus `le` buckets (0.125 ms .. 65.5 s).
+PROMETHEUS_OCTAVES = range(-3, 17)
+
+
+_frexp = math.frexp
+_LAST_BUCKET = _BUCKET_COUNT - 1
+# Offsets folded so that a bucket index is `exponent * SUB_BUCKETS + slice`
+_INDEX_OFFSET = (1 + MIN_OCTAVE) * SUB_BUCKETS
+_SLICES = 2 * SUB_BUCKETS
+
+
+def _bucket_bounds(index: int) -> tuple:
+    """(lower, upper) in ms of bucket `index`."""
+    if index >= _BUCKET_COUNT - 1:
+        return 2.0 ** (MAX_OCTAVE + 1), math.inf
+    octave, sub = divmod(index, SUB_BUCKETS)
+    base = 2.0 ** (octave + MIN_OCTAVE)
+    lower = base * (1 + sub / SUB_BUCKETS) if index else 0.0
+    return lower, base * (1 + (sub + 1) / SUB_BUCKETS)
+
+
+class Histogram:
+    """
+    Latency histogram with O(1) recording and bounded memory.
+
+    Keeps exact count, sum, min and max; quantiles are interpolated inside
+    the bucket they fall in.
+    """
+
+    __slots__ = ("counts", "count", "sum", "min", "max")
+
+    def __init__(self):
+        self.counts = [0] * _BUCKET_COUNT
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, value_ms: float) -> None:
+        # frexp: value = mantissa * 2**exponent, 0.5 <= mantissa < 1
+        mantissa, exponent = _frexp(value_ms)
+        index = exponent * SUB_BUCKETS - _INDEX_OFFSET + int((mantissa - 0.5) * _SLICES)
+        if index < 0 or value_ms <= 0:
+            index = 0
+        elif index > _LAST_BUCKET:
+            index = _LAST_BUCKET
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value_ms
+        if value_ms < self.min:
+            self.min = value_ms
+        if value_ms > self.max:
+            self.max = value_ms
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated `q` quantile in ms, None when nothing was recorded."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower, upper = _bucket_bounds(index)
+                lower, upper = max(lower, self.min), min(upper, self.max)
+                return lower + (upper - lower) * max(rank - seen, 0) / n
+            seen += n
+        return self.max
+
+    def cumulative(self, octaves) -> List[int]:
+        """Counts below 2**octave ms, for each of `octaves`."""
+        running = list(itertools.accumulate(self.counts))
+        return [running[(octave - MIN_OCTAVE) * SUB_BUCKETS - 1] for octave in octaves]
+
+
+_METRIC_NAME = re.compile(r"^[a-zA-Z_:][a-zA-Z0-9_:]*$")
+
+
+def _label_text(labels) -> str:
+    """`k="v",...` with values escaped as the exposition format requires."""
+    def escape(value) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return ",".join(f'{k}="{escape(v)}"' for k, v in labels)
+
+
 class MetricsCollector:
     """
     Simple in-memory metrics collector.
@@ -298,14 +395,16 @@ class MetricsCollector:
     Tracks:
     - Request counts by endpoint
     - Error counts
-    - Query timing histograms
+    - Latency histograms, optionally labelled (route, status, lane, ...)
+
+    Recording is a dict lookup and a few integer adds, cheap enough for every
+    request and every DuckDB call. Call it from the event loop thread.
     """
 
     def __init__(self):
         self._request_counts: Dict[str, int] = {}
         self._error_counts: Dict[str, int] = {}
-        self._timing_samples: Dict[str, list] = {}
-        self._max_samples = 100  # Keep last N samples per metric
+        self._histograms: Dict[Tuple[str, tuple], Histogram] = {}
 
     def record_request(self, endpoint: str) -> None:
         """Record a request to an endpoint."""
@@ -317,15 +416,20 @@ class MetricsCollector:
 
     def record_timing(self, operation: str, duration_ms: float) -> None:
         """Record timing for an operation."""
-        if operation not in self._timing_samples:
-            self._timing_samples[operation] = []
+        self.observe(operation, duration_ms)
 
-        samples = self._timing_samples[operation]
-        samples.append(duration_ms)
+    def observe(self, name: str, duration_ms: float, **labels: str) -> None:
+        """Record `duration_ms` in the histogram for `name` and `labels`.
 
-        # Keep only last N samples
-        if len(samples) > self._max_samples:
-            self._timing_samples[operation] = samples[-self._max_samples:]
+        Keep label values to a small set (route templates, status codes,
+        lane names) — every combination is its own histogram.
+        """
+        key = (name, tuple(sorted(labels.items())) if labels else ())
+        try:
+            histogram = self._histograms[key]
+        except KeyError:
+            histogram = self._histograms[key] = Histogram()
+        histogram.record(duration_ms)
 
     def get_stats(self) -> Dict[str, Any]:
         """Get current metrics snapshot."""
@@ -335,25 +439,70 @@ class MetricsCollector:
             "timing": {}
         }
 
-        for operation, samples in self._timing_samples.items():
-            if samples:
-                sorted_samples = sorted(samples)
-                stats["timing"][operation] = {
-                    "count": len(samples),
-                    "avg_ms": round(sum(samples) / len(samples), 2),
-                    "min_ms": round(min(samples), 2),
-                    "max_ms": round(max(samples), 2),
-                    "p50_ms": round(sorted_samples[len(sorted_samples) // 2], 2),
-                    "p95_ms": round(sorted_samples[int(len(sorted_samples) * 0.95)], 2) if len(sorted_samples) >= 20 else None,
-                }
+        for (name, labels), h in self._histograms.items():
+            if not h.count:
+                continue
+            key = f"{name}{{{','.join(f'{k}={v}' for k, v in labels)}}}" if labels else name
+            stats["timing"][key] = {
+                "count": h.count,
+                "avg_ms": round(h.sum / h.count, 2),
+                "min_ms": round(float(h.min), 2),
+                "max_ms": round(float(h.max), 2),
+                "p50_ms": round(h.quantile(0.5), 2),
+                "p95_ms": round(h.quantile(0.95), 2),
+                "p99_ms": round(h.quantile(0.99), 2),
+            }
 
         return stats
 
+    def prometheus_text(self) -> str:
+        """Everything recorded, in the Prometheus text exposition format.
+
+        Histograms are exported in seconds as `<name>_seconds`. A name that is
+        not a valid metric name (record_timing's free-form operations) goes
+        out as `operation_duration_seconds{operation="..."}`.
+        """
+        lines: List[str] = []
+
+        def counter(metric: str, label: str, values: Dict[str, int], help_text: str):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for value, n in sorted(values.items()):
+                lines.append(f"{metric}{{{_label_text([(label, value)])}}} {n}")
+
+        counter("http_requests_total", "endpoint", self._request_counts, "Requests by endpoint.")
+        counter("errors_total", "type", self._error_counts, "Errors by type.")
+
+        families: Dict[str, list] = {}
+        for (name, labels), h in sorted(self._histograms.items()):
+            if _METRIC_NAME.match(name):
+                families.setdefault(f"{name}_seconds", []).append((labels, h))
+            else:
+                families.setdefault("operation_duration_seconds", []).append(
+                    ((("operation", name),) + labels, h)
+                )
+
+        les = [repr(2.0 ** octave / 1000) for octave in PROMETHEUS_OCTAVES]
+        for metric, series in families.items():
+            lines.append(f"# HELP {metric} Latency histogram.")
+            lines.append(f"# TYPE {metric} histogram")
+            for labels, h in series:
+                text = _label_text(labels)
+                prefix = f"{metric}_bucket{{{text},le=" if labels else f"{metric}_bucket{{le="
+                for le, n in zip(les, h.cumulative(PROMETHEUS_OCTAVES)):
+                    lines.append(f'{prefix}"{le}"}} {n}')
+                lines.append(f'{prefix}"+Inf"}} {h.count}')
+                suffix = f"{{{text}}}" if labels else ""
+                lines.append(f"{metric}_sum{suffix} {h.sum / 1000!r}")
+                lines.append(f"{metric}_count{suffix} {h.count}")
+
+        return "\n".join(lines) + "\n"
+
     def reset(self) -> None:
         """Reset all metrics."""
         self._request_counts.clear()
         self._error_counts.clear()
-        self._timing_samples.clear()
+        self._histograms.clear()
 
 
 # Global metrics instance
@@ -227,7 +227,8 @@ async def set_permission_async(
         store = await get_store()
         result = await store.set_permission(role, feature, can_view, can_edit, can_delete, updated_by)
 
-        # Invalidate cache
+        # Invalidate cache. store.set_permission has already bumped
+        # users_generation, which retires cached sessions in web.routes.auth.
         _permissions_cache = None
 
         return result
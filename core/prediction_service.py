@@ -3,20 +3,41 @@ LightGBM-based revenue prediction service.
 
 Trains on historical daily revenue data and predicts remaining days of the current month.
 Runs nightly via scheduler, stores predictions in DuckDB.
+
+Each sales type (retail, b2b, all) has its own model in a `ModelRegistry`:
+versioned joblib artifacts under data/models/<sales_type>/, loaded lazily on
+first use and swapped atomically when a training run passes the gates. The
+previous versions stay on disk so a model whose predictions fail the sanity
+gate can be rolled back without retraining.
+
+Forecasts served to the dashboard are memoised in `forecast_cache`, keyed to
+the model that made them and the Gold generation they read: the model only
+changes on train() and its inputs only when a refresh moves Gold.
 """
 import asyncio
+import functools
+import itertools
 import json
 import logging
+import os
+import tempfile
+import threading
+import time
 from calendar import monthrange
+from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
 from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, Iterator, List, Sequence, Tuple
 from zoneinfo import ZoneInfo
 
 import numpy as np
 import pandas as pd
 
+from core.query_cache import QueryCache
+
 logger = logging.getLogger(__name__)
 
 _KYIV_TZ = ZoneInfo("Europe/Kyiv")
@@ -28,17 +49,44 @@ def _today_kyiv() -> date:
 
 # Model storage
 MODEL_DIR = Path(__file__).parent.parent / "data"
-MODEL_PATH = MODEL_DIR / "revenue_model.joblib"
 TUNED_PARAMS_PATH = MODEL_DIR / "lgbm_best_params.json"
+
+# The single-model layout from before the registry. Read once, by
+# _import_legacy_model, to seed retail v1; never written.
+MODEL_PATH = MODEL_DIR / "revenue_model.joblib"
 DOW_CORRECTIONS_PATH = MODEL_DIR / "dow_corrections.json"
 CLIP_RATIO_PATH = MODEL_DIR / "clip_ratio.json"
 
-# Thread pool for CPU-bound training
-_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ml-train")
+# The segments trained nightly. Any other sales type the API accepts gets its
+# own model too, but only when someone trains it.
+SALES_TYPES = ("retail", "b2b", "all")
+
+# Versions kept per sales type: the current one plus four to roll back to.
+MODEL_KEEP_VERSIONS = 5
+
+# Thread pool for CPU-bound training, one thread per sales type so train_all()
+# fits the three segments side by side. LightGBM runs with n_jobs=1 and
+# releases the GIL while it fits.
+_executor = ThreadPoolExecutor(max_workers=len(SALES_TYPES), thread_name_prefix="ml-train")
 
 # How far ahead to predict (days)
 FORECAST_HORIZON_DAYS = 60
 
+# Forecasts by (kind, sales_type, dates, model version), one per horizon the
+# dashboard asks for: the month, the week, and whatever custom ranges are open.
+# The key carries today's date, so the TTL is only a backstop.
+FORECAST_CACHE_MAX_ENTRIES = 64
+FORECAST_CACHE_TTL_SECONDS = 3600.0
+forecast_cache = QueryCache(
+    max_entries=FORECAST_CACHE_MAX_ENTRIES, ttl_seconds=FORECAST_CACHE_TTL_SECONDS,
+)
+
+# A registry version says which model answers, not whether its predictions
+# have been stored yet, so each sales type also gets a cache epoch from this
+# counter whenever what it serves has settled: after training stores
+# predictions, and after a rollback.
+_MODEL_VERSIONS = itertools.count(1)
+
 # A11-6 model-validation gate: reject a freshly trained model whose holdout
 # WAPE is implausibly bad rather than let it overwrite a working model and feed
 # the forecast. Known-good WAPE is ~27.66%; the worst naive baseline is ~low
@@ -527,6 +575,66 @@ def _train_model(df: pd.DataFrame) -> Tuple[Any, Dict[str, Any], Dict[int, float
     return model, metrics, dow_corrections, clip_ratio
 
 
+# Features that read the revenue column, and so change as each forecast day is
+# written back. Everything else in FEATURE_COLUMNS is calendar, trend or the
+# extra Gold columns, which future rows don't have, and is fixed per row.
+_REVENUE_FEATURES = (
+    'lag_1d', 'lag_7d', 'lag_14d', 'lag_28d', 'lag_365d',
+    'rolling_mean_7d', 'rolling_mean_14d', 'rolling_mean_28d', 'rolling_std_7d',
+    'yoy_ratio', 'momentum_7d_28d', 'revenue_growth_7d',
+    'rolling_mean_4w_same_dow', 'rolling_std_4w_same_dow',
+)
+
+
+def _window_mean(values: np.ndarray, min_periods: int) -> float:
+    """pandas rolling().mean(): NaNs skipped, NaN below min_periods."""
+    values = values[~np.isnan(values)]
+    return float(values.mean()) if len(values) >= min_periods else np.nan
+
+
+def _window_std(values: np.ndarray, min_periods: int) -> float:
+    """pandas rolling().std(): sample std, NaNs skipped, NaN below min_periods."""
+    values = values[~np.isnan(values)]
+    return float(values.std(ddof=1)) if len(values) >= min_periods else np.nan
+
+
+def _revenue_features(revenue: np.ndarray, p: int) -> Dict[str, float]:
+    """The revenue-dependent features for day `p` of a continuous daily grid.
+
+    Same definitions as _build_features, read off the at most 366 days before
+    `p` instead of recomputed over the whole history. Gaps are NaN in `revenue`.
+    """
+    def lag(k: int) -> float:
+        return float(revenue[p - k]) if p >= k else np.nan
+
+    def days(lo: int, hi: int) -> np.ndarray:
+        """revenue for the days p-hi .. p-lo-1."""
+        return revenue[max(p - hi, 0):max(p - lo, 0)]
+
+    def ratio(a: float, b: float) -> float:
+        return a / b if b != 0 else np.nan
+
+    mean_7d = _window_mean(days(0, 7), 3)
+    mean_28d = _window_mean(days(0, 28), 14)
+    same_dow = revenue[[p - k for k in (28, 21, 14, 7) if p >= k]]
+    return {
+        'lag_1d': lag(1),
+        'lag_7d': lag(7),
+        'lag_14d': lag(14),
+        'lag_28d': lag(28),
+        'lag_365d': lag(365),
+        'rolling_mean_7d': mean_7d,
+        'rolling_mean_14d': _window_mean(days(0, 14), 7),
+        'rolling_mean_28d': mean_28d,
+        'rolling_std_7d': _window_std(days(0, 7), 3),
+        'yoy_ratio': ratio(lag(1), lag(366)),
+        'momentum_7d_28d': ratio(mean_7d, mean_28d),
+        'revenue_growth_7d': ratio(mean_7d, _window_mean(days(7, 14), 3)) - 1,
+        'rolling_mean_4w_same_dow': _window_mean(same_dow, 2),
+        'rolling_std_4w_same_dow': _window_std(same_dow, 2),
+    }
+
+
 def _predict_future(
     model: Any,
     historical_df: pd.DataFrame,
@@ -538,6 +646,11 @@ def _predict_future(
 
     Uses actual historical data for lag features, then iteratively fills in
     predictions as we go forward, adjusted by DOW corrections.
+
+    _build_features runs once, over history and the placeholder rows together,
+    for the features that don't read revenue. Each step then derives only the
+    revenue features from a daily array the predictions are written into, so a
+    step costs the same on 780 days of history as on 30.
     """
     if not future_dates:
         return []
@@ -568,19 +681,33 @@ def _predict_future(
     # Find the index where future starts
     future_start_idx = combined[combined['revenue'].isna()].index[0]
 
+    # Fixed features for every row; the revenue ones are overwritten per step
+    featured = _build_features(combined)
+    fixed = featured[FEATURE_COLUMNS].to_numpy(dtype=float)
+    revenue_cols = [FEATURE_COLUMNS.index(c) for c in _REVENUE_FEATURES]
+    yoy_col = FEATURE_COLUMNS.index('yoy_ratio')
+
+    # Revenue on a continuous daily grid, so day p-k is always k days back
+    offsets = (combined['date'] - combined['date'].iloc[0]).dt.days.to_numpy()
+    revenue = np.full(offsets[-1] + 1, np.nan)
+    revenue[offsets[:future_start_idx]] = combined['revenue'].to_numpy(dtype=float)[:future_start_idx]
+
     # Iteratively predict each future day
     predictions = []
     for idx in range(future_start_idx, len(combined)):
         row_date = combined.loc[idx, 'date']
+        p = offsets[idx]
 
-        # Rebuild features for the current state
-        featured = _build_features(combined.iloc[:idx + 1])
-        featured['yoy_ratio'] = featured['yoy_ratio'].fillna(1.0)
+        row_features = fixed[idx].copy()
+        computed = _revenue_features(revenue, p)
+        row_features[revenue_cols] = [computed[c] for c in _REVENUE_FEATURES]
+        if np.isnan(row_features[yoy_col]):
+            row_features[yoy_col] = 1.0
 
         # Fill remaining NaN features with 0
-        row_features = featured.iloc[-1][FEATURE_COLUMNS].fillna(0).values.reshape(1, -1)
+        row_features[np.isnan(row_features)] = 0.0
 
-        pred = float(model.predict(row_features)[0])
+        pred = float(model.predict(row_features.reshape(1, -1))[0])
         pred = max(pred, 0)  # Revenue can't be negative
         pred *= clip_ratio  # Scale back from winsorized training
 
@@ -590,7 +717,7 @@ def _predict_future(
             pred *= dow_corrections.get(dow, 1.0)
 
         # Store prediction back so next iteration can use it as a lag
-        combined.loc[idx, 'revenue'] = pred
+        revenue[p] = pred
 
         predictions.append({
             'date': row_date.strftime('%Y-%m-%d'),
@@ -690,15 +817,326 @@ def _compute_baselines(
     return baselines
 
 
-def _run_evaluation(df: pd.DataFrame) -> Dict[str, Any]:
+# ─── Process pool for tuning and evaluation ──────────────────────────────────
+#
+# A tune is 72 parameter sets × up to 6 walk-forward folds, each a LightGBM fit.
+# On the ml-train thread they ran one after another and held that thread, and
+# with it every forecast request, for the whole search. They run as
+# (params × fold) jobs on a process pool now. The fold matrices are written
+# once as .npy files and each worker memory-maps them, so a job ships a path,
+# a fold number and a params dict instead of pickling the arrays every time.
+
+# Each worker imports pandas and LightGBM and holds a fold's matrices plus one
+# booster: a few hundred MB at the peak, measured against what DuckDB leaves.
+ML_WORKER_BYTES = 384 * 1024 * 1024
+
+# Successive halving: each rung scores the survivors on twice as many folds,
+# most recent first, and keeps the best third.
+TUNE_HALVING_ETA = 3
+TUNE_HALVING_FIRST_FOLDS = 2
+
+# Coordinates tune and evaluate so that neither holds the ml-train thread
+# while the pool works.
+_tune_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ml-tune")
+
+# The tune/evaluate process pool, kept from one run to the next: spawning the
+# workers and importing LightGBM in each costs seconds a run should not pay.
+_ml_pool_lock = threading.Lock()
+_ml_executor = None
+_ml_executor_workers = 0
+
+# Worker-side cache of what a run memory-maps, keyed (run_dir, name). A run
+# deletes its directory when it ends, so the next run's first job drops the
+# previous run's entries.
+_worker_mmaps: Dict[Tuple[str, Any], Any] = {}
+
+
+def _cpu_limit(cgroup_root: str = "/sys/fs/cgroup") -> int:
+    """CPUs this process may use: the cgroup quota if set, else its affinity."""
+    import math
+    import os
+
+    try:
+        available = len(os.sched_getaffinity(0))
+    except AttributeError:  # not Linux
+        available = os.cpu_count() or 1
+    try:
+        quota, period = (Path(cgroup_root) / "cpu.max").read_text().split()
+        if quota != "max":
+            return max(1, min(available, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return available
+
+
+def _ml_workers() -> int:
+    """Resolve the tune/evaluate pool size.
+
+    ML_TUNE_WORKERS wins when set. Otherwise the CPU limit, capped by how many
+    workers fit in half of what the container allows beyond DuckDB's own
+    ceiling. Never below 1: even one worker keeps the search off the ml-train
+    thread.
+    """
+    from core.config import memory_limit_bytes, workers_from_env
+    from core.memory_monitor import read_cgroup_memory
+
+    configured = workers_from_env("ML_TUNE_WORKERS", 0)
+    if configured:
+        return configured
+
+    workers = _cpu_limit()
+    cgroup = read_cgroup_memory()
+    if cgroup and cgroup.get("limit"):
+        spare = max(0, cgroup["limit"] - memory_limit_bytes()) // 2
+        workers = min(workers, spare // ML_WORKER_BYTES)
+    return max(1, workers)
+
+
+@contextmanager
+def _ml_pool(workers: int) -> Iterator[Any]:
+    """The shared spawn-context process pool, sized to `workers`.
+
+    Spawn, because the parent holds DuckDB and event-loop threads, and forking
+    those is not safe. The pool is created on first use and kept for the next
+    run; a different size replaces it, and a broken one (a worker killed, say
+    by the OOM killer) is dropped so the next run starts a fresh one.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+
+    global _ml_executor, _ml_executor_workers
+    with _ml_pool_lock:
+        if _ml_executor is not None and _ml_executor_workers != workers:
+            _ml_executor.shutdown(wait=True)
+            _ml_executor = None
+        if _ml_executor is None:
+            _ml_executor = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+            )
+            _ml_executor_workers = workers
+        pool = _ml_executor
+    try:
+        yield pool
+    except BrokenProcessPool:
+        with _ml_pool_lock:
+            if _ml_executor is pool:
+                _ml_executor = None
+        pool.shutdown(wait=False)
+        raise
+
+
+def _shutdown_ml_pool() -> None:
+    """Stop the shared pool's workers, if there are any."""
+    global _ml_executor
+    with _ml_pool_lock:
+        pool, _ml_executor = _ml_executor, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _worker_mapped(run_dir: str, name: Any, load) -> Any:
+    """Worker: `load()` once per run and keep it for the run's later jobs."""
+    if any(cached_dir != run_dir for cached_dir, _ in _worker_mmaps):
+        _worker_mmaps.clear()
+    key = (run_dir, name)
+    if key not in _worker_mmaps:
+        _worker_mmaps[key] = load()
+    return _worker_mmaps[key]
+
+
+def _fit_and_predict(
+    params: Dict[str, Any],
+    X_tr: np.ndarray, y_tr: np.ndarray,
+    X_es: np.ndarray, y_es: np.ndarray,
+    X_test: np.ndarray,
+) -> Tuple[Any, np.ndarray]:
+    """One walk-forward fit with early stopping; returns (model, raw test preds)."""
+    import lightgbm as lgb
+
+    train_set = lgb.Dataset(X_tr, label=y_tr, feature_name=FEATURE_COLUMNS)
+    es_set = lgb.Dataset(X_es, label=y_es, reference=train_set)
+    model = lgb.train(
+        params,
+        train_set,
+        num_boost_round=500,
+        valid_sets=[es_set],
+        callbacks=[lgb.early_stopping(50, verbose=False)],
+    )
+    return model, model.predict(X_test)
+
+
+def _write_folds(fold_dir: Path, fold_data: List[tuple]) -> None:
+    """Save each fold's matrices where workers can memory-map them."""
+    for i, (X_tr, y_tr, X_es, y_es, X_test, _y_test, _clip) in enumerate(fold_data):
+        for name, arr in (("X_tr", X_tr), ("y_tr", y_tr), ("X_es", X_es),
+                          ("y_es", y_es), ("X_test", X_test)):
+            np.save(fold_dir / f"{i}_{name}.npy", np.ascontiguousarray(arr, dtype=np.float64))
+
+
+def _tune_job(fold_dir: str, fold: int, params: Dict[str, Any], clip_ratio: float) -> Tuple[np.ndarray, int, float]:
+    """Worker: fit one parameter set on one fold. Returns (preds, pid, seconds)."""
+    import os
+    import time
+
+    started = time.perf_counter()
+    arrays = _worker_mapped(fold_dir, fold, lambda: tuple(
+        np.load(Path(fold_dir) / f"{fold}_{name}.npy", mmap_mode="r")
+        for name in ("X_tr", "y_tr", "X_es", "y_es", "X_test")
+    ))
+    _, preds = _fit_and_predict(params, *arrays)
+    preds = np.maximum(preds, 0) * clip_ratio  # Scale back from winsorized training
+    return preds, os.getpid(), time.perf_counter() - started
+
+
+def _pool_report(wall: float, workers: int, timings: List[Tuple[int, float]]) -> Dict[str, Any]:
+    """Wall clock and how busy each worker process was during it."""
+    busy: Dict[int, List[float]] = {}
+    for pid, seconds in timings:
+        busy.setdefault(pid, []).append(seconds)
+    return {
+        "wall_seconds": round(wall, 2),
+        "workers": workers,
+        "jobs": len(timings),
+        "worker_utilization": [
+            {
+                "pid": pid,
+                "jobs": len(runs),
+                "busy_seconds": round(sum(runs), 2),
+                "utilization": round(sum(runs) / wall, 3) if wall > 0 else None,
+            }
+            for pid, runs in sorted(busy.items())
+        ],
+    }
+
+
+def _write_frame(frame_dir: Path, df: pd.DataFrame) -> None:
+    """Save each column of `df` where workers can memory-map it."""
+    (frame_dir / "columns.json").write_text(json.dumps([str(c) for c in df.columns]))
+    for i, col in enumerate(df.columns):
+        values = df[col].to_numpy()
+        if values.dtype == object:
+            values = values.astype(np.float64)
+        np.save(frame_dir / f"col{i}.npy", values, allow_pickle=False)
+
+
+def _read_frame(frame_dir: str) -> pd.DataFrame:
+    """Worker: the frame _write_frame saved, over its memory-mapped columns."""
+    columns = json.loads((Path(frame_dir) / "columns.json").read_text())
+    return pd.DataFrame({
+        name: np.load(Path(frame_dir) / f"col{i}.npy", mmap_mode="r")
+        for i, name in enumerate(columns)
+    })
+
+
+def _evaluate_fold(
+    frame_dir: str,
+    train_end: int,
+    test_end: int,
+    lgb_params: Dict[str, Any],
+) -> Optional[Dict[str, Any]]:
+    """Worker: train on rows [0, train_end), score the fold month in rows
+    [train_end, test_end), run the baselines.
+
+    The frame is the date-sorted one _run_evaluation saved to `frame_dir`;
+    each worker maps it once per run.
+
+    Returns None when the fold has too little data to evaluate.
+    """
+    import os
+    import time
+
+    started = time.perf_counter()
+
+    df = _worker_mapped(frame_dir, "frame", lambda: _read_frame(frame_dir))
+    if train_end >= test_end:
+        return None
+    fold_start = df['date'].iloc[train_end].to_period('M').start_time
+    fold_end = fold_start + pd.offsets.MonthEnd(0)
+
+    # Split: train = everything before fold_start, test = fold month
+    train_df = df.iloc[:train_end].copy()
+    test_df = df.iloc[train_end:test_end].copy()
+
+    if len(train_df) < 60 or len(test_df) < 20:
+        return None
+
+    # Columns that can legitimately be NaN early — skip in dropna
+    _nan_safe = {
+        'yoy_ratio', 'lag_365d',
+        'momentum_7d_28d', 'revenue_growth_7d',
+        'rolling_mean_7d_new_cust_ratio', 'rolling_mean_7d_returning_ratio',
+        'rolling_mean_7d_return_rate',
+        'rolling_mean_4w_same_dow', 'rolling_std_4w_same_dow',
+    }
+
+    # Winsorize training revenue at P95
+    p95 = train_df['revenue'].quantile(0.95)
+    original_mean = train_df['revenue'].mean()
+    train_df['revenue'] = train_df['revenue'].clip(upper=p95)
+    fold_clip_ratio = original_mean / train_df['revenue'].mean()
+
+    # Build features for train set
+    featured_train = _build_features(train_df)
+    featured_train = featured_train.dropna(subset=[c for c in FEATURE_COLUMNS if c not in _nan_safe])
+    featured_train = featured_train.copy()
+    featured_train['yoy_ratio'] = featured_train['yoy_ratio'].fillna(1.0)
+    featured_train['lag_365d'] = featured_train['lag_365d'].fillna(0)
+    for col in FEATURE_COLUMNS:
+        if col not in ('yoy_ratio', 'lag_365d'):
+            featured_train[col] = featured_train[col].fillna(0)
+
+    if len(featured_train) < 60:
+        return None
+
+    X_full_train = featured_train[FEATURE_COLUMNS].values
+    y_full_train = featured_train['revenue'].values
+
+    # Internal early-stopping split: last 30 days of training data
+    es_split = max(len(X_full_train) - 30, int(len(X_full_train) * 0.8))
+    X_tr, X_es = X_full_train[:es_split], X_full_train[es_split:]
+    y_tr, y_es = y_full_train[:es_split], y_full_train[es_split:]
+
+    # Predict test set: build features on train + test combined
+    combined = pd.concat([train_df, test_df], ignore_index=True).sort_values('date').reset_index(drop=True)
+    featured_combined = _build_features(combined)
+    featured_combined = featured_combined.copy()
+    featured_combined['yoy_ratio'] = featured_combined['yoy_ratio'].fillna(1.0)
+
+    test_featured = featured_combined[featured_combined['date'] >= fold_start].copy()
+    # Fill remaining NaN in features with 0
+    X_test = test_featured[FEATURE_COLUMNS].fillna(0).values
+    y_test = test_featured['revenue'].values
+
+    model, lgbm_preds = _fit_and_predict(lgb_params, X_tr, y_tr, X_es, y_es, X_test)
+    lgbm_preds = np.maximum(lgbm_preds, 0)
+    lgbm_preds *= fold_clip_ratio  # Scale back from winsorized training
+
+    # Baselines for this fold
+    baseline_results = _compute_baselines(test_featured[['date', 'revenue']], df.iloc[:test_end])
+
+    return {
+        "period": f"{fold_start.strftime('%Y-%m-%d')} to {fold_end.strftime('%Y-%m-%d')}",
+        "test_days": len(y_test),
+        "lgbm": _compute_metrics(y_test, lgbm_preds),
+        "baselines": {name: data['metrics'] for name, data in baseline_results.items()},
+        "importance": model.feature_importance(importance_type='gain'),
+        "dates": test_featured['date'].values,
+        "actuals": y_test,
+        "preds": lgbm_preds,
+        "pid": os.getpid(),
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def _run_evaluation(df: pd.DataFrame, workers: Optional[int] = None) -> Dict[str, Any]:
     """Run walk-forward cross-validation with baselines and feature importance.
 
     df must have 'date' and 'revenue' columns, sorted by date.
     Excludes today's (potentially incomplete) row.
-    Uses last 6 complete calendar months as test folds.
+    Uses last 6 complete calendar months as test folds, evaluated in parallel
+    on up to `workers` processes (default: _ml_workers()).
     """
-    import lightgbm as lgb
-
     df = df.copy()
     df['date'] = pd.to_datetime(df['date'])
     df = df.sort_values('date').reset_index(drop=True)
@@ -742,100 +1180,40 @@ def _run_evaluation(df: pd.DataFrame) -> Dict[str, Any]:
     feature_importances = np.zeros(len(FEATURE_COLUMNS))
     n_folds_with_importance = 0
 
-    for fold_idx, (fold_start, fold_end) in enumerate(folds):
-        # Split: train = everything before fold_start, test = fold month
-        train_mask = df['date'] < fold_start
-        test_mask = (df['date'] >= fold_start) & (df['date'] <= fold_end)
-
-        train_df = df[train_mask].copy()
-        test_df = df[test_mask].copy()
-
-        if len(train_df) < 60 or len(test_df) < 20:
-            continue
-
-        # Columns that can legitimately be NaN early — skip in dropna
-        _nan_safe = {
-            'yoy_ratio', 'lag_365d',
-            'momentum_7d_28d', 'revenue_growth_7d',
-            'rolling_mean_7d_new_cust_ratio', 'rolling_mean_7d_returning_ratio',
-            'rolling_mean_7d_return_rate',
-            'rolling_mean_4w_same_dow', 'rolling_std_4w_same_dow',
-        }
-
-        # Winsorize training revenue at P95
-        p95 = train_df['revenue'].quantile(0.95)
-        original_mean = train_df['revenue'].mean()
-        train_df['revenue'] = train_df['revenue'].clip(upper=p95)
-        fold_clip_ratio = original_mean / train_df['revenue'].mean()
-
-        # Build features for train set
-        featured_train = _build_features(train_df)
-        featured_train = featured_train.dropna(subset=[c for c in FEATURE_COLUMNS if c not in _nan_safe])
-        featured_train = featured_train.copy()
-        featured_train['yoy_ratio'] = featured_train['yoy_ratio'].fillna(1.0)
-        featured_train['lag_365d'] = featured_train['lag_365d'].fillna(0)
-        for col in FEATURE_COLUMNS:
-            if col not in ('yoy_ratio', 'lag_365d'):
-                featured_train[col] = featured_train[col].fillna(0)
-
-        if len(featured_train) < 60:
+    # One job per fold; each builds its own features and trains its own model.
+    # The frame is written once and memory-mapped by the workers, so a job
+    # carries only its row bounds: train before the fold month, test through it.
+    bounds = [
+        (int(df['date'].searchsorted(fold_start, side='left')),
+         int(df['date'].searchsorted(fold_end, side='right')))
+        for fold_start, fold_end in folds
+    ]
+    pool_workers = workers or _ml_workers()
+    workers = min(pool_workers, len(folds))
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="lgbm-eval-") as frame_dir, _ml_pool(pool_workers) as pool:
+        _write_frame(Path(frame_dir), df)
+        outcomes = list(pool.map(
+            _evaluate_fold,
+            *zip(*[(frame_dir, train_end, test_end, lgb_params) for train_end, test_end in bounds]),
+        ))
+    wall = time.perf_counter() - started
+
+    for fold_idx, outcome in enumerate(outcomes):
+        if outcome is None:
             continue
 
-        X_full_train = featured_train[FEATURE_COLUMNS].values
-        y_full_train = featured_train['revenue'].values
-
-        # Internal early-stopping split: last 30 days of training data
-        es_split = max(len(X_full_train) - 30, int(len(X_full_train) * 0.8))
-        X_tr, X_es = X_full_train[:es_split], X_full_train[es_split:]
-        y_tr, y_es = y_full_train[:es_split], y_full_train[es_split:]
-
-        train_set = lgb.Dataset(X_tr, label=y_tr, feature_name=FEATURE_COLUMNS)
-        es_set = lgb.Dataset(X_es, label=y_es, reference=train_set)
-
-        model = lgb.train(
-            lgb_params,
-            train_set,
-            num_boost_round=500,
-            valid_sets=[es_set],
-            callbacks=[lgb.early_stopping(50, verbose=False)],
-        )
-
         # Accumulate feature importance (gain-based)
-        importance = model.feature_importance(importance_type='gain')
-        feature_importances += importance
+        feature_importances += outcome["importance"]
         n_folds_with_importance += 1
 
-        # Predict test set: build features on train + test combined
-        combined = pd.concat([train_df, test_df], ignore_index=True).sort_values('date').reset_index(drop=True)
-        featured_combined = _build_features(combined)
-        featured_combined = featured_combined.copy()
-        featured_combined['yoy_ratio'] = featured_combined['yoy_ratio'].fillna(1.0)
-
-        test_featured = featured_combined[featured_combined['date'] >= fold_start].copy()
-        # Fill remaining NaN in features with 0
-        X_test = test_featured[FEATURE_COLUMNS].fillna(0).values
-        y_test = test_featured['revenue'].values
-        test_dates = test_featured['date'].values
-
-        lgbm_preds = model.predict(X_test)
-        lgbm_preds = np.maximum(lgbm_preds, 0)
-        lgbm_preds *= fold_clip_ratio  # Scale back from winsorized training
-
-        # LightGBM metrics for this fold
-        lgbm_metrics = _compute_metrics(y_test, lgbm_preds)
-
-        # Baselines for this fold
-        baseline_results = _compute_baselines(test_featured[['date', 'revenue']], df[df['date'] <= fold_end])
-        baseline_fold_metrics = {
-            name: data['metrics'] for name, data in baseline_results.items()
-        }
-
+        y_test, lgbm_preds, test_dates = outcome["actuals"], outcome["preds"], outcome["dates"]
         fold_results.append({
             "fold": fold_idx + 1,
-            "period": f"{fold_start.strftime('%Y-%m-%d')} to {fold_end.strftime('%Y-%m-%d')}",
-            "test_days": len(y_test),
-            "lgbm": lgbm_metrics,
-            "baselines": baseline_fold_metrics,
+            "period": outcome["period"],
+            "test_days": outcome["test_days"],
+            "lgbm": outcome["lgbm"],
+            "baselines": outcome["baselines"],
         })
 
         # Collect for aggregate metrics
@@ -964,16 +1342,28 @@ def _run_evaluation(df: pd.DataFrame) -> Dict[str, Any]:
             "total_days": len(df),
             "date_range": f"{date_min} to {date_max}",
         },
+        "parallelism": _pool_report(
+            wall, workers, [(o["pid"], o["seconds"]) for o in outcomes if o is not None],
+        ),
     }
 
 
-def _tune_hyperparameters(df: pd.DataFrame) -> Dict[str, Any]:
+def _tune_hyperparameters(
+    df: pd.DataFrame,
+    workers: Optional[int] = None,
+    halving: bool = False,
+) -> Dict[str, Any]:
     """Grid search over walk-forward CV folds to find best LightGBM hyperparameters.
 
-    Reuses the same fold logic as _run_evaluation. Returns dict with best params,
-    WAPE comparison, and search metadata.
+    Reuses the same fold logic as _run_evaluation. Every (params, fold) fit is
+    a job on a process pool of `workers` (default: _ml_workers()). With
+    `halving`, parameter sets are scored on the most recent folds first and
+    only the best third go on to more (successive halving); the default-params
+    reference is always scored on every fold.
+
+    Returns dict with best params, WAPE comparison, search metadata, and the
+    pool's wall clock and per-worker utilization.
     """
-    import lightgbm as lgb
     from itertools import product as iterproduct
 
     df = df.copy()
@@ -1076,84 +1466,77 @@ def _tune_hyperparameters(df: pd.DataFrame) -> Dict[str, Any]:
     keys = list(grid.keys())
     combos = list(iterproduct(*[grid[k] for k in keys]))
 
-    best_wape = float('inf')
-    best_combo = None
-
-    for combo_vals in combos:
-        hp = dict(zip(keys, combo_vals))
-        params = {
+    def lgb_params(hp: Dict[str, Any]) -> Dict[str, Any]:
+        return {
             'objective': 'regression',
             'metric': 'mae',
-            'num_leaves': hp['num_leaves'],
-            'learning_rate': hp['learning_rate'],
-            'min_child_samples': hp['min_child_samples'],
-            'reg_alpha': hp['reg_alpha'],
-            'subsample': hp['subsample'],
+            **{k: hp[k] for k in keys},
             'n_jobs': 1,
             'verbose': -1,
             'seed': 42,
         }
 
-        all_actuals = []
-        all_preds = []
-
-        for X_tr, y_tr, X_es, y_es, X_test, y_test, fold_clip_ratio in fold_data:
-            train_set = lgb.Dataset(X_tr, label=y_tr, feature_name=FEATURE_COLUMNS)
-            es_set = lgb.Dataset(X_es, label=y_es, reference=train_set)
-
-            model = lgb.train(
-                params,
-                train_set,
-                num_boost_round=500,
-                valid_sets=[es_set],
-                callbacks=[lgb.early_stopping(50, verbose=False)],
-            )
-
-            preds = np.maximum(model.predict(X_test), 0)
-            preds *= fold_clip_ratio  # Scale back from winsorized training
-            all_actuals.extend(y_test.tolist())
-            all_preds.extend(preds.tolist())
+    # Candidate 0 is the defaults, scored on every fold for the comparison.
+    candidates = [{k: DEFAULT_LGB_PARAMS[k] for k in keys}] + [dict(zip(keys, c)) for c in combos]
+    preds: Dict[Tuple[int, int], np.ndarray] = {}
+    timings: List[Tuple[int, float]] = []
 
-        actuals_arr = np.array(all_actuals)
-        preds_arr = np.array(all_preds)
+    def wape(candidate: int, folds: List[int]) -> float:
+        actuals_arr = np.concatenate([fold_data[f][5] for f in folds])
+        preds_arr = np.concatenate([preds[(candidate, f)] for f in folds])
         total_actual = float(np.sum(actuals_arr))
-        wape = float(np.sum(np.abs(actuals_arr - preds_arr)) / total_actual * 100) if total_actual > 0 else float('inf')
+        return float(np.sum(np.abs(actuals_arr - preds_arr)) / total_actual * 100) if total_actual > 0 else float('inf')
+
+    all_folds = list(range(len(fold_data)))
+    if halving:
+        # Most recent folds first: they are the closest to what the model will face.
+        budgets = []
+        n = TUNE_HALVING_FIRST_FOLDS
+        while n < len(all_folds):
+            budgets.append(n)
+            n *= 2
+        budgets.append(len(all_folds))
+    else:
+        budgets = [len(all_folds)]
 
-        if wape < best_wape:
-            best_wape = wape
-            best_combo = hp
+    workers = workers or _ml_workers()
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="lgbm-tune-") as fold_dir, _ml_pool(workers) as pool:
+        _write_folds(Path(fold_dir), fold_data)
 
-    # Compute default WAPE for comparison
-    default_params = {
-        'objective': 'regression',
-        'metric': 'mae',
-        **{k: DEFAULT_LGB_PARAMS[k] for k in keys},
-        'n_jobs': 1,
-        'verbose': -1,
-        'seed': 42,
-    }
-
-    all_actuals = []
-    all_preds = []
-    for X_tr, y_tr, X_es, y_es, X_test, y_test, fold_clip_ratio in fold_data:
-        train_set = lgb.Dataset(X_tr, label=y_tr, feature_name=FEATURE_COLUMNS)
-        es_set = lgb.Dataset(X_es, label=y_es, reference=train_set)
-        model = lgb.train(
-            default_params,
-            train_set,
-            num_boost_round=500,
-            valid_sets=[es_set],
-            callbacks=[lgb.early_stopping(50, verbose=False)],
-        )
-        preds = np.maximum(model.predict(X_test), 0)
-        preds *= fold_clip_ratio  # Scale back from winsorized training
-        all_actuals.extend(y_test.tolist())
-        all_preds.extend(preds.tolist())
+        def run(jobs: List[Tuple[int, int]]) -> None:
+            futures = {
+                (c, f): pool.submit(_tune_job, fold_dir, f, lgb_params(candidates[c]), fold_data[f][6])
+                for c, f in jobs if (c, f) not in preds
+            }
+            for job, future in futures.items():
+                preds[job], pid, seconds = future.result()
+                timings.append((pid, seconds))
+
+        survivors = list(range(1, len(candidates)))
+        for rung, budget in enumerate(budgets):
+            folds_now = all_folds[-budget:]
+            jobs = [(c, f) for c in survivors for f in folds_now]
+            if rung == 0:
+                jobs += [(0, f) for f in all_folds]
+            run(jobs)
+            if budget < len(all_folds):
+                ranked = sorted(survivors, key=lambda c: wape(c, folds_now))
+                survivors = sorted(ranked[:max(1, -(-len(ranked) // TUNE_HALVING_ETA))])
+    wall = time.perf_counter() - started
+
+    # First-best in grid order, as the sequential search picked it
+    best_wape = float('inf')
+    best_combo = None
+    for c in survivors:
+        score = wape(c, all_folds)
+        if score < best_wape:
+            best_wape = score
+            best_combo = candidates[c]
 
-    actuals_arr = np.array(all_actuals)
-    preds_arr = np.array(all_preds)
-    total_actual = float(np.sum(actuals_arr))
-    default_wape = float(np.sum(np.abs(actuals_arr - preds_arr)) / total_actual * 100) if total_actual > 0 else 0.0
+    default_wape = wape(0, all_folds)
+    if not np.isfinite(default_wape):
+        default_wape = 0.0
 
     # Save best params
     MODEL_DIR.mkdir(parents=True, exist_ok=True)
@@ -1168,29 +1551,250 @@ def _tune_hyperparameters(df: pd.DataFrame) -> Dict[str, Any]:
         "default_wape": round(default_wape, 2),
         "improvement": round(default_wape - best_wape, 2),
         "combos_tested": len(combos),
+        "combos_fully_evaluated": len(survivors),
+        "halving": halving,
         "folds": len(fold_data),
+        **_pool_report(wall, workers, timings),
     }
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# MODEL REGISTRY
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class ModelArtifact:
+    """A trained model and everything _predict_future needs alongside it."""
+    model: Any
+    metrics: Dict[str, float] = field(default_factory=dict)
+    dow_corrections: Dict[int, float] = field(default_factory=dict)
+    clip_ratio: float = 1.0
+    trained: Optional[str] = None
+    version: int = 0
+
+
+class ModelRegistry:
+    """Versioned model artifacts, one line per sales type.
+
+    Layout under `root` (data/models by default)::
+
+        retail/v0001.joblib
+        retail/v0002.joblib
+        retail/v0002.rejected    rolled back from; never served again
+        retail/current.json      {"version": 1}
+
+    Artifacts and the pointer are each written to a temporary file and
+    renamed into place, so a crash mid-publish leaves the previous version
+    current. Nothing is deserialised until a sales type is first asked for,
+    and then with mmap_mode='r' so numpy arrays inside stay on disk.
+
+    Methods block on file I/O; PredictionService calls them from `_executor`.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        # Resolved here rather than as a default argument, so tests that
+        # redirect MODEL_DIR are honoured.
+        self._root = Path(root) if root is not None else MODEL_DIR / "models"
+        self._loaded: Dict[str, ModelArtifact] = {}
+        # Sales types whose current version did not load (none, unreadable,
+        # or built for other features), so has() and get() stop going back to
+        # disk for them. Publish and rollback clear the entry.
+        self._unservable: set = set()
+        self._lock = threading.Lock()
+
+    def _dir(self, sales_type: str) -> Path:
+        return self._root / sales_type
+
+    def _path(self, sales_type: str, version: int) -> Path:
+        return self._dir(sales_type) / f"v{version:04d}.joblib"
+
+    def _rejected_path(self, sales_type: str, version: int) -> Path:
+        return self._dir(sales_type) / f"v{version:04d}.rejected"
+
+    def versions(self, sales_type: str) -> List[int]:
+        """Versions on disk for `sales_type`, oldest first."""
+        d = self._dir(sales_type)
+        if not d.is_dir():
+            return []
+        found = []
+        for p in d.glob("v*.joblib"):
+            try:
+                found.append(int(p.stem[1:]))
+            except ValueError:
+                continue
+        return sorted(found)
+
+    def current_version(self, sales_type: str) -> int:
+        """The version serving `sales_type`, or 0 if it has none."""
+        if sales_type in self._loaded:
+            return self._loaded[sales_type].version
+        try:
+            with open(self._dir(sales_type) / "current.json") as f:
+                return int(json.load(f).get("version", 0))
+        except (OSError, ValueError):
+            return 0
+
+    def has(self, sales_type: str) -> bool:
+        """Whether `sales_type` has a model that loads and fits FEATURE_COLUMNS.
+
+        The first call loads it, as get() would; a miss is remembered, so a
+        model left over from other features reads as no model at all.
+        """
+        return self.get(sales_type) is not None
+
+    def peek(self, sales_type: str) -> Optional[ModelArtifact]:
+        """The artifact if it is already in memory; never touches disk."""
+        return self._loaded.get(sales_type)
+
+    def unservable(self, sales_type: str) -> bool:
+        """Whether `sales_type` is known to have no model; never touches disk."""
+        return sales_type in self._unservable
+
+    def get(self, sales_type: str) -> Optional[ModelArtifact]:
+        """The current artifact for `sales_type`, loading it on first use."""
+        with self._lock:
+            artifact = self._loaded.get(sales_type)
+            if artifact is None and sales_type not in self._unservable:
+                version = self.current_version(sales_type)
+                artifact = self._load(sales_type, version) if version else None
+                if artifact is None:
+                    self._unservable.add(sales_type)
+                else:
+                    self._loaded[sales_type] = artifact
+            return artifact
+
+    def _load(self, sales_type: str, version: int) -> Optional[ModelArtifact]:
+        """Read one version, or None if it is missing or was built for other features.
+
+        A model trained on a different FEATURE_COLUMNS (e.g. an old 24-feature
+        one) is not served; the nightly retrain replaces it.
+        """
+        import joblib
+        path = self._path(sales_type, version)
+        try:
+            artifact = joblib.load(path, mmap_mode="r")
+        except Exception as e:
+            logger.warning(f"Failed to load model {path}: {e}")
+            return None
+        model = artifact.model
+        if hasattr(model, "num_feature") and model.num_feature() != len(FEATURE_COLUMNS):
+            logger.warning(
+                f"Model feature count mismatch ({path}): model has {model.num_feature()}, "
+                f"expected {len(FEATURE_COLUMNS)}. Will retrain on next cycle."
+            )
+            return None
+        logger.info(f"Model loaded from {path}")
+        return replace(artifact, version=version)
+
+    def _write_pointer(self, sales_type: str, version: int) -> None:
+        d = self._dir(sales_type)
+        fd, tmp = tempfile.mkstemp(dir=d, prefix=".current-", suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"version": version}, f)
+        os.replace(tmp, d / "current.json")
+
+    def publish(self, sales_type: str, artifact: ModelArtifact) -> int:
+        """Store `artifact` as the next version and make it current."""
+        import joblib
+        with self._lock:
+            d = self._dir(sales_type)
+            d.mkdir(parents=True, exist_ok=True)
+            version = max(self.versions(sales_type), default=0) + 1
+            artifact = replace(artifact, version=version)
+
+            fd, tmp = tempfile.mkstemp(dir=d, prefix=".v", suffix=".joblib")
+            os.close(fd)
+            try:
+                joblib.dump(artifact, tmp)
+                os.replace(tmp, self._path(sales_type, version))
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+            self._write_pointer(sales_type, version)
+            self._loaded[sales_type] = artifact
+            self._unservable.discard(sales_type)
+            self._prune(sales_type)
+
+        logger.info(f"Model published: {sales_type} v{version}")
+        return version
+
+    def rollback(self, sales_type: str) -> Optional[int]:
+        """Make the newest loadable version before the current one current.
+
+        Returns that version, or None if there is none — in which case the
+        current model is withdrawn and `sales_type` has no model until the
+        next successful train. The rejected version stays on disk with a
+        `.rejected` marker beside it, and no later rollback returns to it or
+        to any other marked version.
+        """
+        with self._lock:
+            current = self.current_version(sales_type)
+            if current:
+                self._rejected_path(sales_type, current).touch()
+            earlier = [
+                v for v in self.versions(sales_type)
+                if v < current and not self._rejected_path(sales_type, v).exists()
+            ]
+            for version in reversed(earlier):
+                artifact = self._load(sales_type, version)
+                if artifact is not None:
+                    self._write_pointer(sales_type, version)
+                    self._loaded[sales_type] = artifact
+                    self._unservable.discard(sales_type)
+                    logger.warning(f"Model rolled back: {sales_type} v{current} -> v{version}")
+                    return version
+            self._loaded.pop(sales_type, None)
+            self._unservable.add(sales_type)
+            (self._dir(sales_type) / "current.json").unlink(missing_ok=True)
+            logger.warning(f"Model withdrawn: {sales_type} v{current}, nothing to roll back to")
+            return None
+
+    def _prune(self, sales_type: str) -> None:
+        current = self.current_version(sales_type)
+        old = [v for v in self.versions(sales_type) if v != current]
+        for version in old[:max(len(old) - (MODEL_KEEP_VERSIONS - 1), 0)]:
+            self._path(sales_type, version).unlink(missing_ok=True)
+            self._rejected_path(sales_type, version).unlink(missing_ok=True)
+
+
 class PredictionService:
-    """Revenue prediction service using LightGBM."""
+    """Revenue prediction service using LightGBM, one model per sales type."""
 
-    def __init__(self):
-        self._model = None
-        self._metrics: Dict[str, float] = {}
-        self._dow_corrections: Dict[int, float] = {}
-        self._clip_ratio: float = 1.0
-        self._last_trained: Optional[str] = None
-        self._training = False
-        self._training_lock = asyncio.Lock()
+    def __init__(self, registry: Optional[ModelRegistry] = None):
+        self._registry = registry or ModelRegistry()
+        self._epochs: Dict[str, int] = {}
+        self._training_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
 
     @property
     def is_ready(self) -> bool:
-        return self._model is not None
+        """Whether the retail model, the one the dashboard opens with, is available."""
+        return self.has_model("retail")
+
+    def has_model(self, sales_type: str) -> bool:
+        return self._registry.has(sales_type)
+
+    async def missing_models(self, sales_types: Sequence[str] = SALES_TYPES) -> List[str]:
+        """The sales types with no servable model, loading the others off the event loop."""
+        return [st for st in sales_types if await self._artifact(st) is None]
 
     @property
     def metrics(self) -> Dict[str, float]:
-        return self._metrics
+        artifact = self._registry.peek("retail")
+        return artifact.metrics if artifact else {}
+
+    async def _artifact(self, sales_type: str) -> Optional[ModelArtifact]:
+        """The model serving `sales_type`, loaded off the event loop on first use."""
+        artifact = self._registry.peek(sales_type)
+        if artifact is not None or self._registry.unservable(sales_type):
+            return artifact
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, self._registry.get, sales_type)
+
+    def _forecast_key(
+        self, kind: str, sales_type: str, artifact: Optional[ModelArtifact], *dates: date,
+    ) -> tuple:
+        version = artifact.version if artifact else 0
+        return (kind, sales_type, *dates, version, self._epochs.get(sales_type, 0))
 
     async def evaluate(self, sales_type: str = "retail") -> Dict[str, Any]:
         """Run walk-forward CV evaluation with baselines.
@@ -1208,15 +1812,16 @@ class PredictionService:
         logger.info(f"Running evaluation on {len(df)} days of data (sales_type={sales_type})")
 
         loop = asyncio.get_running_loop()
-        result = await loop.run_in_executor(_executor, _run_evaluation, df)
+        result = await loop.run_in_executor(_tune_executor, _run_evaluation, df)
 
         result["data_info"]["sales_type"] = sales_type
         return result
 
-    async def tune(self, sales_type: str = "retail") -> Dict[str, Any]:
+    async def tune(self, sales_type: str = "retail", halving: bool = False) -> Dict[str, Any]:
         """Run hyperparameter grid search using walk-forward CV.
 
         Saves best params to data/lgbm_best_params.json for use by train/evaluate.
+        `halving` prunes the grid by successive halving over the folds.
         """
         from core.duckdb_store import get_store
         store = await get_store()
@@ -1228,7 +1833,9 @@ class PredictionService:
         logger.info(f"Running hyperparameter tuning on {len(df)} days of data (sales_type={sales_type})")
 
         loop = asyncio.get_running_loop()
-        result = await loop.run_in_executor(_executor, _tune_hyperparameters, df)
+        result = await loop.run_in_executor(
+            _tune_executor, functools.partial(_tune_hyperparameters, df, halving=halving),
+        )
 
         result["sales_type"] = sales_type
         return result
@@ -1244,7 +1851,8 @@ class PredictionService:
         Returns forecast dict compatible with get_forecast() response,
         or None if model is not ready or no future dates in range.
         """
-        if not self.is_ready:
+        artifact = await self._artifact(sales_type)
+        if artifact is None:
             return None
 
         today = _today_kyiv()
@@ -1264,13 +1872,21 @@ class PredictionService:
 
         from core.duckdb_store import get_store
         store = await get_store()
+        return await forecast_cache.get_or_compute(
+            self._forecast_key("range", sales_type, artifact, pred_start, end_date),
+            store.gold_generation,
+            lambda: self._predict_range_uncached(store, artifact, future_dates, sales_type),
+        )
+
+    async def _predict_range_uncached(
+        self, store: Any, artifact: ModelArtifact, future_dates: List[date], sales_type: str,
+    ) -> Dict[str, Any]:
         historical_df = await self._query_daily_revenue(store, sales_type, days_back=780)
 
-        dow_corrections = self._dow_corrections
-        clip_ratio = self._clip_ratio
         loop = asyncio.get_running_loop()
         predictions = await loop.run_in_executor(
-            _executor, _predict_future, self._model, historical_df, future_dates, dow_corrections, clip_ratio
+            _executor, _predict_future, artifact.model, historical_df, future_dates,
+            artifact.dow_corrections, artifact.clip_ratio,
         )
 
         predicted_total = sum(p['predicted_revenue'] for p in predictions)
@@ -1279,21 +1895,23 @@ class PredictionService:
             "predicted_remaining": round(predicted_total, 2),
             "predicted_total": round(predicted_total, 2),
             "daily_predictions": predictions,
-            "model_metrics": self._metrics,
-            "last_trained": self._last_trained,
+            "model_metrics": artifact.metrics,
+            "last_trained": artifact.trained,
         }
 
     async def train(self, sales_type: str = "retail") -> Dict[str, Any]:
-        """Train model on historical daily revenue data from DuckDB."""
-        if self._training_lock.locked():
+        """Train the `sales_type` model on historical daily revenue data from DuckDB."""
+        lock = self._training_locks[sales_type]
+        if lock.locked():
             return {"status": "already_training"}
 
-        async with self._training_lock:
-            self._training = True
-            try:
-                return await self._train_impl(sales_type)
-            finally:
-                self._training = False
+        async with lock:
+            return await self._train_impl(sales_type)
+
+    async def train_all(self, sales_types: Sequence[str] = SALES_TYPES) -> Dict[str, Dict[str, Any]]:
+        """Train each sales type's model concurrently; results by sales type."""
+        results = await asyncio.gather(*(self.train(st) for st in sales_types))
+        return dict(zip(sales_types, results))
 
     async def _train_impl(self, sales_type: str) -> Dict[str, Any]:
         """Internal training implementation."""
@@ -1339,9 +1957,10 @@ class PredictionService:
                     f"{MODEL_WAPE_REJECT_THRESHOLD}%"
                 )
             if reject_reason:
+                had_model = await self._artifact(sales_type) is not None
                 logger.error(
                     f"Model REJECTED ({sales_type}): {reject_reason}. "
-                    f"Keeping previous model (was_ready={self.is_ready}). metrics={metrics}"
+                    f"Keeping previous model (had_model={had_model}). metrics={metrics}"
                 )
                 await self._alert_model_rejected(sales_type, reject_reason, metrics)
                 return {
@@ -1351,17 +1970,40 @@ class PredictionService:
                     "training_rows": len(df),
                 }
 
-            self._model = model
-            self._metrics = metrics
-            self._dow_corrections = dow_corrections
-            self._clip_ratio = clip_ratio
-            self._last_trained = _today_kyiv().isoformat()
-
-            # Save model to disk
-            await loop.run_in_executor(_executor, self._save_model)
+            # Write the new version and swap it in. The previous versions stay
+            # on disk for predict_month to roll back to.
+            artifact = ModelArtifact(
+                model=model,
+                metrics=metrics,
+                dow_corrections=dow_corrections,
+                clip_ratio=clip_ratio,
+                trained=_today_kyiv().isoformat(),
+            )
+            version = await loop.run_in_executor(_executor, self._registry.publish, sales_type, artifact)
 
-            # Generate and store predictions for rest of month
+            # Generate and store predictions for rest of month. If they fail
+            # the sanity gate, predict_month has already put the previous
+            # version back, or withdrawn the model if there was none.
             predictions = await self.predict_month(df, sales_type)
+            serving = self._registry.current_version(sales_type)
+            if serving != version:
+                return {
+                    "status": "rolled_back",
+                    "rejected_version": version,
+                    "serving_version": serving or None,
+                    "metrics": metrics,
+                    "training_rows": len(df),
+                }
+
+            # Forecasts cached for the previous model are retired only now,
+            # once this one's predictions are stored, so nothing cached under
+            # the new epoch can predate them. Then the month view the
+            # dashboard opens with is computed ahead of its first request.
+            self._epochs[sales_type] = next(_MODEL_VERSIONS)
+            try:
+                await self.get_forecast(sales_type)
+            except Exception as e:
+                logger.warning(f"Forecast precompute failed ({sales_type}): {e}")
 
             return {
                 "status": "success",
@@ -1374,8 +2016,20 @@ class PredictionService:
             logger.error(f"Model training failed: {e}", exc_info=True)
             return {"status": "error", "error": str(e)}
 
+    async def rollback(self, sales_type: str) -> Optional[int]:
+        """Serve the previous `sales_type` model again; returns its version.
+
+        None means there was no earlier version and the segment now has no
+        model until it next trains.
+        """
+        loop = asyncio.get_running_loop()
+        version = await loop.run_in_executor(_executor, self._registry.rollback, sales_type)
+        self._epochs[sales_type] = next(_MODEL_VERSIONS)
+        return version
+
     async def _alert_model_rejected(
-        self, sales_type: str, reason: str, metrics: Dict[str, Any]
+        self, sales_type: str, reason: str, metrics: Dict[str, Any],
+        outcome: str = "Previous model kept; forecast unchanged.",
     ) -> None:
         """Notify admins that a freshly trained model was rejected (best-effort)."""
         try:
@@ -1384,7 +2038,7 @@ class PredictionService:
                 f"⚠️ Revenue model retrain REJECTED ({sales_type}).\n"
                 f"Reason: {reason}\n"
                 f"Holdout metrics: {metrics}\n"
-                "Previous model kept; forecast unchanged.",
+                f"{outcome}",
                 key=f"prediction:retrain_rejected:{sales_type}",
             )
         except Exception as e:
@@ -1396,7 +2050,8 @@ class PredictionService:
         sales_type: str = "retail",
     ) -> List[Dict[str, Any]]:
         """Predict revenue for the next 60 days."""
-        if not self.is_ready:
+        artifact = await self._artifact(sales_type)
+        if artifact is None:
             return []
 
         from core.duckdb_store import get_store
@@ -1419,11 +2074,10 @@ class PredictionService:
             return []
 
         # Run prediction in thread pool
-        dow_corrections = self._dow_corrections
-        clip_ratio = self._clip_ratio
         loop = asyncio.get_running_loop()
         predictions = await loop.run_in_executor(
-            _executor, _predict_future, self._model, historical_df, future_dates, dow_corrections, clip_ratio
+            _executor, _predict_future, artifact.model, historical_df, future_dates,
+            artifact.dow_corrections, artifact.clip_ratio,
         )
 
         # ── A11-6: prediction-sanity gate ──
@@ -1442,15 +2096,23 @@ class PredictionService:
                 reason = f"max prediction {max(vals):.0f} > 3x historical max {hist_max:.0f}"
 
         if not sane:
+            # The model that produced these is already current, so put the
+            # last one back rather than let predict_range keep serving it.
             logger.error(
-                f"Predictions REJECTED ({sales_type}): {reason}. Not storing."
+                f"Predictions REJECTED ({sales_type} v{artifact.version}): {reason}. "
+                "Not storing; rolling back."
             )
-            await self._alert_model_rejected(sales_type, reason, self._metrics or {})
+            rolled_back_to = await self.rollback(sales_type)
+            if rolled_back_to:
+                outcome = f"Rolled back to v{rolled_back_to}; stored forecast unchanged."
+            else:
+                outcome = "No earlier version to roll back to; model withdrawn."
+            await self._alert_model_rejected(sales_type, reason, artifact.metrics, outcome)
             return predictions
 
         # Store predictions in DuckDB
         try:
-            await store.store_predictions(predictions, sales_type, self._metrics)
+            await store.store_predictions(predictions, sales_type, artifact.metrics)
         except Exception as e:
             logger.error(f"Failed to store predictions: {e}")
 
@@ -1460,7 +2122,17 @@ class PredictionService:
         """Get stored forecast data (up to 60 days ahead)."""
         from core.duckdb_store import get_store
         store = await get_store()
+        artifact = await self._artifact(sales_type)
+
+        return await forecast_cache.get_or_compute(
+            self._forecast_key("month", sales_type, artifact, _today_kyiv()),
+            store.gold_generation,
+            lambda: self._get_forecast_uncached(store, artifact, sales_type),
+        )
 
+    async def _get_forecast_uncached(
+        self, store: Any, artifact: Optional[ModelArtifact], sales_type: str,
+    ) -> Optional[Dict[str, Any]]:
         today = _today_kyiv()
         month_start = date(today.year, today.month, 1)
         if today.month == 12:
@@ -1486,7 +2158,7 @@ class PredictionService:
         predicted_total = actual_to_date + predicted_remaining
 
         # Recover metrics from stored predictions if in-memory state was lost (server restart)
-        metrics = self._metrics
+        metrics = artifact.metrics if artifact else {}
         if not metrics and predictions:
             metrics = {
                 'mae': predictions[0].get('model_mae', 0),
@@ -1500,7 +2172,7 @@ class PredictionService:
             "predicted_total": round(predicted_total, 2),
             "daily_predictions": predictions,
             "model_metrics": metrics,
-            "last_trained": self._last_trained,
+            "last_trained": artifact.trained if artifact else None,
             "month_start": month_start.isoformat(),
             "month_end": month_end.isoformat(),
             "forecast_end": forecast_end.isoformat(),
@@ -1512,6 +2184,9 @@ class PredictionService:
     ) -> pd.DataFrame:
         """Query daily revenue from Gold layer (pre-aggregated).
 
+        Gold holds one row per (date, sales_type); for 'all' the segments are
+        summed so the model still sees one row per day.
+
         Args:
             exclude_today: If True, excludes today's incomplete data (default for training).
         """
@@ -1530,24 +2205,27 @@ class PredictionService:
             result = conn.execute(f"""
                 SELECT
                     date,
-                    revenue,
-                    instagram_revenue,
-                    telegram_revenue,
-                    shopify_revenue,
-                    orders_count,
-                    unique_customers,
-                    new_customers,
-                    returning_customers,
-                    returns_count,
-                    returns_revenue,
-                    instagram_orders,
-                    telegram_orders,
-                    shopify_orders,
-                    avg_order_value
+                    SUM(revenue) AS revenue,
+                    SUM(instagram_revenue) AS instagram_revenue,
+                    SUM(telegram_revenue) AS telegram_revenue,
+                    SUM(shopify_revenue) AS shopify_revenue,
+                    SUM(orders_count) AS orders_count,
+                    SUM(unique_customers) AS unique_customers,
+                    SUM(new_customers) AS new_customers,
+                    SUM(returning_customers) AS returning_customers,
+                    SUM(returns_count) AS returns_count,
+                    SUM(returns_revenue) AS returns_revenue,
+                    SUM(instagram_orders) AS instagram_orders,
+                    SUM(telegram_orders) AS telegram_orders,
+                    SUM(shopify_orders) AS shopify_orders,
+                    CASE WHEN COUNT(*) = 1 THEN ANY_VALUE(avg_order_value)
+                         ELSE SUM(revenue) / NULLIF(SUM(orders_count), 0)
+                    END AS avg_order_value
                 FROM gold_daily_revenue
                 WHERE date >= ?
                   {date_upper}
                   AND {sales_filter}
+                GROUP BY date
                 ORDER BY date
             """, params).fetchdf()
 
@@ -1572,80 +2250,6 @@ class PredictionService:
 
         return float(result[0]) if result else 0.0
 
-    def _save_model(self) -> None:
-        """Save model, DOW corrections, and clip_ratio to disk."""
-        import joblib
-        MODEL_DIR.mkdir(parents=True, exist_ok=True)
-        joblib.dump(self._model, MODEL_PATH)
-        logger.info(f"Model saved to {MODEL_PATH}")
-
-        # Save DOW corrections
-        if self._dow_corrections:
-            # JSON keys must be strings
-            corrections_str_keys = {str(k): v for k, v in self._dow_corrections.items()}
-            with open(DOW_CORRECTIONS_PATH, 'w') as f:
-                json.dump(corrections_str_keys, f, indent=2)
-            logger.info(f"DOW corrections saved to {DOW_CORRECTIONS_PATH}")
-
-        # Save clip_ratio
-        with open(CLIP_RATIO_PATH, 'w') as f:
-            json.dump({"clip_ratio": self._clip_ratio}, f, indent=2)
-        logger.info(f"Clip ratio saved to {CLIP_RATIO_PATH}: {self._clip_ratio:.4f}")
-
-    def _load_model(self) -> bool:
-        """Load model and DOW corrections from disk if available.
-
-        Validates that the loaded model has the expected number of features.
-        If mismatched (e.g., old 24-feature model), sets model to None so
-        the nightly scheduler will retrain with the current feature set.
-        """
-        import joblib
-        if MODEL_PATH.exists():
-            try:
-                model = joblib.load(MODEL_PATH)
-                # Validate feature count matches current FEATURE_COLUMNS
-                if hasattr(model, 'num_feature') and model.num_feature() != len(FEATURE_COLUMNS):
-                    logger.warning(
-                        f"Model feature count mismatch: model has {model.num_feature()}, "
-                        f"expected {len(FEATURE_COLUMNS)}. Will retrain on next cycle."
-                    )
-                    self._model = None
-                    return False
-                self._model = model
-                logger.info(f"Model loaded from {MODEL_PATH}")
-            except Exception as e:
-                logger.warning(f"Failed to load model: {e}")
-                return False
-        else:
-            return False
-
-        # Load DOW corrections
-        if DOW_CORRECTIONS_PATH.exists():
-            try:
-                with open(DOW_CORRECTIONS_PATH) as f:
-                    corrections_str_keys = json.load(f)
-                # Convert string keys back to int
-                self._dow_corrections = {int(k): v for k, v in corrections_str_keys.items()}
-                logger.info(f"DOW corrections loaded from {DOW_CORRECTIONS_PATH}")
-            except Exception as e:
-                logger.warning(f"Failed to load DOW corrections: {e}")
-                self._dow_corrections = {}
-
-        # Load clip_ratio
-        if CLIP_RATIO_PATH.exists():
-            try:
-                with open(CLIP_RATIO_PATH) as f:
-                    data = json.load(f)
-                self._clip_ratio = float(data.get("clip_ratio", 1.0))
-                logger.info(f"Clip ratio loaded from {CLIP_RATIO_PATH}: {self._clip_ratio:.4f}")
-            except Exception as e:
-                logger.warning(f"Failed to load clip ratio: {e}")
-                self._clip_ratio = 1.0
-        else:
-            self._clip_ratio = 1.0
-
-        return True
-
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # SINGLETON
@@ -1654,13 +2258,59 @@ class PredictionService:
 _service: Optional[PredictionService] = None
 
 
+def _import_legacy_model(registry: ModelRegistry) -> bool:
+    """Seed retail v1 from the single-model files, if the registry has no retail yet.
+
+    Before the registry there was one model, trained on retail, saved as
+    revenue_model.joblib with its DOW corrections and clip ratio beside it.
+    Importing it means an upgrade keeps serving forecasts instead of waiting
+    for a retrain. The old files are left where they are.
+    """
+    if registry.has("retail") or registry.versions("retail") or not MODEL_PATH.exists():
+        return False
+    import joblib
+    try:
+        model = joblib.load(MODEL_PATH)
+    except Exception as e:
+        logger.warning(f"Failed to import legacy model {MODEL_PATH}: {e}")
+        return False
+
+    dow_corrections: Dict[int, float] = {}
+    if DOW_CORRECTIONS_PATH.exists():
+        try:
+            with open(DOW_CORRECTIONS_PATH) as f:
+                dow_corrections = {int(k): v for k, v in json.load(f).items()}
+        except Exception as e:
+            logger.warning(f"Failed to import legacy DOW corrections: {e}")
+
+    clip_ratio = 1.0
+    if CLIP_RATIO_PATH.exists():
+        try:
+            with open(CLIP_RATIO_PATH) as f:
+                clip_ratio = float(json.load(f).get("clip_ratio", 1.0))
+        except Exception as e:
+            logger.warning(f"Failed to import legacy clip ratio: {e}")
+
+    trained = date.fromtimestamp(MODEL_PATH.stat().st_mtime).isoformat()
+    registry.publish("retail", ModelArtifact(
+        model=model, dow_corrections=dow_corrections, clip_ratio=clip_ratio, trained=trained,
+    ))
+    logger.info(f"Imported legacy model {MODEL_PATH} as retail v1")
+    return True
+
+
 def get_prediction_service() -> PredictionService:
-    """Get singleton prediction service instance."""
+    """Get singleton prediction service instance.
+
+    Models are not loaded here; each sales type's is read on first use.
+    """
     global _service
     if _service is None:
         _service = PredictionService()
-        # Try to load existing model from disk
-        _service._load_model()
+        try:
+            _import_legacy_model(_service._registry)
+        except Exception as e:
+            logger.warning(f"Legacy model import skipped: {e}")
     return _service
 
 
@@ -1672,5 +2322,7 @@ def shutdown_prediction_service() -> None:
     """
     global _service
     _executor.shutdown(wait=False)
+    _tune_executor.shutdown(wait=False)
+    _shutdown_ml_pool()
     _service = None
     logger.info("Prediction service shutdown complete")
@@ -0,0 +1,172 @@
+"""
+Versioned result cache for dashboard queries.
+
+Every dashboard tab fires the same handful of queries with the same filters,
+and every one of them used to reach DuckDB. Under a warehouse refresh that was
+the difference between a 6 ms and a multi-second p99. The answers only change
+when the warehouse does, so they are cached against the store's
+`gold_generation` — bumped by `refresh_warehouse_layers` only when Silver or
+Gold actually moved — and a stale generation is a miss, not a lookup.
+
+Three bounds, each for a different failure:
+
+- generation: correctness. A refresh that changed anything retires every entry
+  computed before it.
+- TTL: a backstop for writes that reach the tables some other way (an admin
+  endpoint, a script) without going through the refresh.
+- LRU size: memory. Filter combinations are unbounded; the cache is not.
+
+Concurrent identical requests are coalesced (single-flight): the twelve widget
+requests a page fires at once become one query and eleven waiters.
+
+Usage:
+    from core.query_cache import query_cache
+
+    result = await query_cache.get_or_compute(key, generation, compute)
+"""
+import asyncio
+import copy
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+# A dashboard answer for one (method, filters) pair is a few KB; 512 of them
+# is a couple of MB at most, against a process that runs with a 7 GB limit.
+DEFAULT_MAX_ENTRIES = 512
+
+# Long enough to cover a page load and the tab-switching after it, short
+# enough that a write the generation never heard about is gone in minutes.
+DEFAULT_TTL_SECONDS = 300.0
+
+
+@dataclass
+class _Entry:
+    value: Any
+    generation: int
+    expires_at: float
+
+
+class QueryCache:
+    """Bounded LRU + TTL cache keyed by (method, normalised params).
+
+    Values are deep-copied on the way out: routes decorate the dicts they get
+    back (the revenue trend has the forecast appended to it), and a shared
+    cached object would carry one request's decoration into the next.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    ):
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._evictions = 0
+        self._stale = 0
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        generation: int,
+        compute: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Return the cached value for `key` at `generation`, computing it once."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.generation == generation and entry.expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return copy.deepcopy(entry.value)
+            if entry.generation <= generation:
+                del self._entries[key]
+                self._stale += 1
+
+        flight_key = (key, generation)
+        while True:
+            pending = self._inflight.get(flight_key)
+            if pending is None:
+                break
+            try:
+                value = await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # The request computing it went away; someone has to finish
+                # the job, and it may as well be us. Our own cancellation
+                # leaves `pending` untouched and is re-raised.
+                if pending.cancelled():
+                    continue
+                raise
+            self._coalesced += 1
+            return copy.deepcopy(value)
+
+        self._misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[flight_key] = future
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters re-raise it; with none, this stops asyncio logging it as
+            # "never retrieved".
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(flight_key, None)
+
+        future.set_result(value)
+        self._store(key, generation, value)
+        return copy.deepcopy(value)
+
+    def _store(self, key: Hashable, generation: int, value: Any) -> None:
+        current = self._entries.get(key)
+        if current is not None and current.generation > generation:
+            # A request that started before a refresh finished after one
+            # that started after it; keep the newer answer.
+            return
+        self._entries[key] = _Entry(
+            value=value,
+            generation=generation,
+            expires_at=time.monotonic() + self._ttl,
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry. Counters are kept."""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters for /api/health."""
+        lookups = self._hits + self._misses + self._coalesced
+        return {
+            "entries": len(self._entries),
+            "max_entries": self._max_entries,
+            "ttl_seconds": self._ttl,
+            "hits": self._hits,
+            "misses": self._misses,
+            "coalesced": self._coalesced,
+            "evictions": self._evictions,
+            "stale": self._stale,
+            "in_flight": len(self._inflight),
+            "hit_ratio": round((self._hits + self._coalesced) / lookups, 4) if lookups else None,
+        }
+
+    def reset(self) -> None:
+        """Drop every entry and zero the counters."""
+        self._entries.clear()
+        self._hits = self._misses = self._coalesced = 0
+        self._evictions = self._stale = 0
+
+
+# Global cache instance
+query_cache = QueryCache()
@@ -0,0 +1,262 @@
+"""
+Opt-in profiler for DuckDB statements: who ran what, and how long it took.
+
+When it is on, `DuckDBStore.connection()` and `read_connection()` hand out a
+thin proxy around the DuckDB connection. Each `execute()` through the proxy
+is timed up to the first fetch of its result, and attributed to the method
+that opened the block (`MarginMixin.get_margin_overview`, or
+`DuckDBStore.refresh_warehouse_layers` for the writer's own work). The
+profiler keeps:
+
+- per-caller totals (count, total and max ms, rows), which answer "what is
+  eating the DuckDB worker";
+- the `top_n` slowest statements seen;
+- for a sampled fraction of read-only statements, DuckDB's own profile
+  (`EXPLAIN (ANALYZE, FORMAT JSON)`, which runs the statement a second
+  time), most recent first.
+
+When it is off, which is the default, the store hands out the bare connection
+and the only cost is one attribute check per connection block.
+
+Enable with DUCKDB_PROFILE=1, from the admin endpoint
+(/api/duckdb/profile), or with scripts/profile_queries.py.
+"""
+import heapq
+import itertools
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+DEFAULT_TOP_N = 50
+# Keep the SQL that is shown short enough to read in the admin response
+SQL_PREVIEW_CHARS = 2000
+
+# Methods of DuckDBStore that only hand a connection on. The caller tag is the
+# first frame above them.
+_PLUMBING = frozenset({
+    "connection", "read_connection", "_fetch_one", "_fetch_all",
+    "__aenter__", "__aexit__",
+})
+
+# Result methods that materialise rows; the first call ends the timing.
+_FETCH_METHODS = frozenset({
+    "fetchone", "fetchall", "fetchmany", "fetchdf", "fetch_df", "df",
+    "fetchnumpy", "arrow", "fetch_arrow_table", "pl",
+})
+
+_READ_ONLY_PREFIXES = ("select", "with", "from", "values")
+
+
+def caller_tag(frame) -> str:
+    """`Class.method` of the first frame above the store's connection plumbing."""
+    while frame is not None:
+        code = frame.f_code
+        if code.co_name not in _PLUMBING and "contextlib" not in code.co_filename:
+            return code.co_qualname.split(".<locals>")[0]
+        frame = frame.f_back
+    return "unknown"
+
+
+def _rows(value: Any) -> Optional[int]:
+    if value is None:
+        return 0
+    if isinstance(value, tuple):
+        return 1
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+class QueryProfiler:
+    """Per-caller totals, the slowest statements and sampled DuckDB profiles."""
+
+    def __init__(self, enabled: bool = False, top_n: int = DEFAULT_TOP_N, sample_rate: float = 0.0):
+        self.enabled = enabled
+        self.top_n = top_n
+        self.sample_rate = sample_rate
+        # Statements finish on reader and writer threads as well as the loop
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self.reset()
+
+    @classmethod
+    def from_env(cls) -> "QueryProfiler":
+        """DUCKDB_PROFILE=1 turns it on; DUCKDB_PROFILE_SAMPLE sets the sample rate."""
+        enabled = (os.getenv("DUCKDB_PROFILE") or "").strip().lower() in ("1", "true", "yes")
+        try:
+            sample_rate = float(os.getenv("DUCKDB_PROFILE_SAMPLE") or 0.0)
+        except ValueError:
+            sample_rate = 0.0
+        return cls(enabled=enabled, sample_rate=min(max(sample_rate, 0.0), 1.0))
+
+    def configure(
+        self,
+        enabled: Optional[bool] = None,
+        top_n: Optional[int] = None,
+        sample_rate: Optional[float] = None,
+    ) -> None:
+        with self._lock:
+            if top_n is not None and top_n != self.top_n:
+                self.top_n = top_n
+                self._slowest = heapq.nlargest(top_n, self._slowest)
+                heapq.heapify(self._slowest)
+                self._profiles = deque(self._profiles, maxlen=top_n)
+            if sample_rate is not None:
+                self.sample_rate = sample_rate
+            if enabled is not None:
+                self.enabled = enabled
+
+    def reset(self) -> None:
+        with self._lock:
+            self._statements = 0
+            self._by_caller: Dict[str, Dict[str, float]] = {}
+            self._slowest: List[Tuple[float, int, Dict[str, Any]]] = []
+            self._profiles: Deque[Dict[str, Any]] = deque(maxlen=self.top_n)
+
+    def wrap(self, conn, frame) -> "ProfiledConnection":
+        """`conn` behind a profiling proxy, attributed to the code at `frame`."""
+        return ProfiledConnection(conn, self, caller_tag(frame))
+
+    def record(
+        self,
+        caller: str,
+        sql: str,
+        duration_ms: float,
+        rows: Optional[int],
+        profile: Optional[dict] = None,
+    ) -> None:
+        entry = {
+            "caller": caller,
+            "duration_ms": round(duration_ms, 3),
+            "rows": rows,
+            "sql": " ".join(sql.split())[:SQL_PREVIEW_CHARS],
+            "at": time.time(),
+        }
+        with self._lock:
+            self._statements += 1
+            totals = self._by_caller.get(caller)
+            if totals is None:
+                totals = self._by_caller[caller] = {
+                    "count": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0,
+                }
+            totals["count"] += 1
+            totals["total_ms"] += duration_ms
+            totals["max_ms"] = max(totals["max_ms"], duration_ms)
+            totals["rows"] += rows or 0
+
+            item = (duration_ms, next(self._seq), entry)
+            if len(self._slowest) < self.top_n:
+                heapq.heappush(self._slowest, item)
+            elif self._slowest and duration_ms > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, item)
+            if profile is not None:
+                self._profiles.appendleft({**entry, "profile": profile})
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            by_caller = sorted(
+                ({"caller": caller, **totals} for caller, totals in self._by_caller.items()),
+                key=lambda t: t["total_ms"], reverse=True,
+            )
+            for totals in by_caller:
+                totals["total_ms"] = round(totals["total_ms"], 3)
+                totals["max_ms"] = round(totals["max_ms"], 3)
+                totals["avg_ms"] = round(totals["total_ms"] / totals["count"], 3)
+            return {
+                "enabled": self.enabled,
+                "top_n": self.top_n,
+                "sample_rate": self.sample_rate,
+                "statements": self._statements,
+                "by_caller": by_caller,
+                "slowest": [entry for _, _, entry in sorted(self._slowest, reverse=True)],
+                "profiles": list(self._profiles),
+            }
+
+
+class ProfiledConnection:
+    """A DuckDB connection whose `execute()` reports to a QueryProfiler."""
+
+    __slots__ = ("_conn", "_profiler", "_caller")
+
+    def __init__(self, conn, profiler: QueryProfiler, caller: str):
+        self._conn = conn
+        self._profiler = profiler
+        self._caller = caller
+
+    def execute(self, query: str, *args, **kwargs):
+        profiler = self._profiler
+        profile = None
+        if (
+            profiler.sample_rate
+            and query.lstrip().lower().startswith(_READ_ONLY_PREFIXES)
+            and random.random() < profiler.sample_rate
+        ):
+            profile = self._explain_analyze(query, *args, **kwargs)
+        started = time.perf_counter()
+        self._conn.execute(query, *args, **kwargs)
+        return _ProfiledResult(self, query, started, time.perf_counter(), profile)
+
+    def executemany(self, query: str, *args, **kwargs):
+        started = time.perf_counter()
+        result = self._conn.executemany(query, *args, **kwargs)
+        self._profiler.record(self._caller, query, (time.perf_counter() - started) * 1000, None)
+        return result
+
+    def _explain_analyze(self, query: str, *args, **kwargs) -> Optional[dict]:
+        try:
+            row = self._conn.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) {query}", *args, **kwargs).fetchone()
+            return json.loads(row[1])
+        except Exception as e:  # a statement EXPLAIN cannot take is still run as asked
+            return {"error": str(e)}
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+class _ProfiledResult:
+    """What `ProfiledConnection.execute` returns: the connection, timed to its first fetch."""
+
+    __slots__ = ("_owner", "_sql", "_started", "_executed", "_profile", "_done")
+
+    def __init__(self, owner: ProfiledConnection, sql: str, started: float, executed: float,
+                 profile: Optional[dict]):
+        self._owner = owner
+        self._sql = sql
+        self._started = started
+        self._executed = executed
+        self._profile = profile
+        self._done = False
+
+    def _finish(self, ended: float, rows: Optional[int]) -> None:
+        self._done = True
+        owner = self._owner
+        owner._profiler.record(
+            owner._caller, self._sql, (ended - self._started) * 1000, rows, self._profile,
+        )
+
+    def __getattr__(self, name):
+        attr = getattr(self._owner._conn, name)
+        if self._done or name not in _FETCH_METHODS:
+            return attr
+
+        def fetch(*args, **kwargs):
+            value = attr(*args, **kwargs)
+            if not self._done:
+                self._finish(time.perf_counter(), _rows(value))
+            return value
+        return fetch
+
+    def __del__(self):
+        # Never fetched (INSERT, DDL): the statement ended when execute() did.
+        # Only the profiler is touched here; the connection may be in use again.
+        if not self._done:
+            self._finish(self._executed, None)
+
+
+# Process-wide profiler; the store consults it on every connection block.
+query_profiler = QueryProfiler.from_env()
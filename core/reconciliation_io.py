@@ -159,7 +159,7 @@ async def keycrm_orders_in_window(
 
     Returns: (orders, api_calls_used, inflight_ids).
     """
-    from core.keycrm import KeyCRMClient
+    from core.keycrm import KeyCRMClient, Priority, keycrm_priority
 
     months = _enumerate_months(window_start, window_end)
     orders: OrderFacts = {}
@@ -167,39 +167,42 @@ async def keycrm_orders_in_window(
     inflight: set[int] = set()
     api_calls = 0
 
-    client = KeyCRMClient()
-    await client.connect()
-    try:
-        for m_str in months:
-            m_start, m_end = _month_to_local_bounds(m_str)
-            f_start = (m_start - timedelta(days=2)).isoformat()
-            f_end = (m_end + timedelta(days=2)).isoformat()
-
-            # Pass 1: created_between
-            page_count = 0
-            params = {
-                "include": "products,manager,buyer",
-                "filter[created_between]": f"{f_start},{f_end}",
-            }
-            async for batch in client.paginate("order", params=params, page_size=50):
-                page_count += 1
-                _process_batch(batch, orders, watermark_utc,
-                               window_start, window_end, inflight)
-            # Pass 2: updated_between (status changes on backdated orders)
-            params_upd = {
-                "include": "products,manager,buyer",
-                "filter[updated_between]": f"{f_start},{f_end}",
-            }
-            async for batch in client.paginate("order", params=params_upd, page_size=50):
-                page_count += 1
-                _process_batch(batch, orders, watermark_utc,
-                               window_start, window_end, inflight)
-
-            api_calls += page_count
-            logger.debug(f"DQ reconciliation: month={m_str} pages={page_count}")
-
-    finally:
-        await client.close()
+    # Roughly 250 pages a run, none of them urgent: queued behind the sync and
+    # anything a person is waiting on.
+    with keycrm_priority(Priority.BACKGROUND):
+        client = KeyCRMClient()
+        await client.connect()
+        try:
+            for m_str in months:
+                m_start, m_end = _month_to_local_bounds(m_str)
+                f_start = (m_start - timedelta(days=2)).isoformat()
+                f_end = (m_end + timedelta(days=2)).isoformat()
+
+                # Pass 1: created_between
+                page_count = 0
+                params = {
+                    "include": "products,manager,buyer",
+                    "filter[created_between]": f"{f_start},{f_end}",
+                }
+                async for batch in client.paginate("order", params=params, page_size=50):
+                    page_count += 1
+                    _process_batch(batch, orders, watermark_utc,
+                                   window_start, window_end, inflight)
+                # Pass 2: updated_between (status changes on backdated orders)
+                params_upd = {
+                    "include": "products,manager,buyer",
+                    "filter[updated_between]": f"{f_start},{f_end}",
+                }
+                async for batch in client.paginate("order", params=params_upd, page_size=50):
+                    page_count += 1
+                    _process_batch(batch, orders, watermark_utc,
+                                   window_start, window_end, inflight)
+
+                api_calls += page_count
+                logger.debug(f"DQ reconciliation: month={m_str} pages={page_count}")
+
+        finally:
+            await client.close()
 
     return orders, api_calls, inflight
 
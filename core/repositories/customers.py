@@ -108,8 +108,6 @@ def _compare_groups(
         "incrementalMarginTotal": round(margin_per_contact * t_n, 2),
     }
 
-from core.duckdb_constants import B2B_MANAGER_ID, RETAIL_MANAGER_IDS
-
 # Tier cut-offs per LTV basis for get_sms_segments.
 #
 # The margin figures are calibrated so each tier selects roughly the same
@@ -137,7 +135,7 @@ class CustomersMixin:
         promocode: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Get customer insights: new vs returning, AOV trend (from Gold/Silver layers)."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             # ── Base metrics from gold_daily_revenue ──
             params = [start_date, end_date]
             where_clauses = ["date BETWEEN ? AND ?"]
@@ -185,32 +183,21 @@ class CustomersMixin:
 
             overall_aov = total_revenue / total_orders if total_orders > 0 else 0
 
-            # ── CLV metrics from silver_orders (need per-buyer aggregation) ──
-            sales_where = "s.sales_type = ?" if sales_type != "all" else "1=1"
-            clv_params = [sales_type] if sales_type != "all" else []
-
-            clv_result = conn.execute(f"""
-                WITH customer_stats AS (
-                    SELECT
-                        s.buyer_id,
-                        COUNT(DISTINCT s.id) as order_count,
-                        SUM(s.grand_total) as total_spent,
-                        DATE_DIFF('day', MIN(s.ordered_at), MAX(s.ordered_at)) as lifespan_days
-                    FROM silver_orders s
-                    WHERE s.buyer_id IS NOT NULL
-                      AND NOT s.is_return
-                      AND s.is_active_source
-                      AND {sales_where}
-                    GROUP BY s.buyer_id
-                    HAVING COUNT(DISTINCT s.id) > 1
-                )
+            # ── CLV and all-time repeat rate from silver_buyer_stats ──
+            # One row per buyer already; 'all' is a row of its own.
+            clv_result = conn.execute("""
                 SELECT
-                    COUNT(*) as repeat_customer_count,
-                    AVG(order_count) as avg_purchase_frequency,
-                    AVG(lifespan_days) as avg_lifespan_days,
-                    AVG(total_spent) as avg_customer_value
-                FROM customer_stats
-            """, clv_params).fetchone()
+                    COUNT(*) FILTER (WHERE orders > 1) as repeat_customer_count,
+                    AVG(orders) FILTER (WHERE orders > 1) as avg_purchase_frequency,
+                    AVG(DATE_DIFF('day', first_ordered_at, last_ordered_at))
+                        FILTER (WHERE orders > 1) as avg_lifespan_days,
+                    AVG(revenue) FILTER (WHERE orders > 1) as avg_customer_value,
+                    COUNT(*) as total_customers,
+                    COUNT(*) FILTER (WHERE orders >= 2) as repeat_customers,
+                    AVG(orders) as avg_orders_per_customer
+                FROM silver_buyer_stats
+                WHERE sales_type = ?
+            """, [sales_type]).fetchone()
 
             repeat_customer_count = clv_result[0] or 0
             avg_purchase_frequency = float(clv_result[1] or 0)
@@ -243,29 +230,9 @@ class CustomersMixin:
             total_customers = unique_buyers
             purchase_frequency = total_orders / unique_buyers if unique_buyers > 0 else 0
 
-            # All-time repeat rate from silver_orders
-            alltime_result = conn.execute(f"""
-                WITH customer_orders AS (
-                    SELECT
-                        s.buyer_id,
-                        COUNT(DISTINCT s.id) as order_count
-                    FROM silver_orders s
-                    WHERE s.buyer_id IS NOT NULL
-                      AND NOT s.is_return
-                      AND s.is_active_source
-                      AND {sales_where}
-                    GROUP BY s.buyer_id
-                )
-                SELECT
-                    COUNT(*) as total_customers,
-                    SUM(CASE WHEN order_count >= 2 THEN 1 ELSE 0 END) as repeat_customers,
-                    AVG(order_count) as avg_orders_per_customer
-                FROM customer_orders
-            """, clv_params).fetchone()
-
-            alltime_total_customers = alltime_result[0] or 0
-            alltime_repeat_customers = alltime_result[1] or 0
-            alltime_avg_orders = float(alltime_result[2] or 0)
+            alltime_total_customers = clv_result[4] or 0
+            alltime_repeat_customers = clv_result[5] or 0
+            alltime_avg_orders = float(clv_result[6] or 0)
             true_repeat_rate = (alltime_repeat_customers / alltime_total_customers * 100) if alltime_total_customers > 0 else 0
 
             return {
@@ -323,67 +290,27 @@ class CustomersMixin:
         Returns:
             Dict with cohorts, retention matrix, and summary metrics
         """
-        async with self.connection() as conn:
-            # Build sales type filter
-            sales_type_filter = ""
-            if sales_type == "retail":
-                sales_type_filter = f"""
-                    AND (o.manager_id IN ({','.join(map(str, RETAIL_MANAGER_IDS))})
-                         OR (o.manager_id IS NULL AND o.source_id = 4))
-                """
-            elif sales_type == "b2b":
-                sales_type_filter = f"AND o.manager_id = {B2B_MANAGER_ID}"
-
+        async with self.read_connection() as conn:
+            # Cells of gold_cohort_activity; a cohort's size is its M0 cell.
             query = f"""
-            WITH customer_cohorts AS (
-                -- Get each customer's first order month (their cohort)
-                SELECT
-                    o.buyer_id,
-                    DATE_TRUNC('month', MIN(o.order_date)) AS cohort_month
-                FROM silver_orders o
-                WHERE o.buyer_id IS NOT NULL
-                  AND NOT o.is_return
-                  {sales_type_filter}
-                GROUP BY o.buyer_id
-            ),
-            customer_orders AS (
-                -- Get all order months per customer
-                SELECT DISTINCT
-                    o.buyer_id,
-                    c.cohort_month,
-                    DATEDIFF('month', c.cohort_month, DATE_TRUNC('month', o.order_date)) AS months_since
-                FROM silver_orders o
-                JOIN customer_cohorts c ON o.buyer_id = c.buyer_id
-                WHERE NOT o.is_return
-                  {sales_type_filter}
-            ),
-            cohort_sizes AS (
-                SELECT cohort_month, COUNT(DISTINCT buyer_id) AS size
-                FROM customer_cohorts
-                GROUP BY cohort_month
-            ),
-            retention_data AS (
-                SELECT
-                    r.cohort_month,
-                    r.months_since,
-                    COUNT(DISTINCT r.buyer_id) AS retained_customers
-                FROM customer_orders r
-                WHERE r.months_since <= ?
-                GROUP BY r.cohort_month, r.months_since
-            )
             SELECT
-                strftime(r.cohort_month, '%Y-%m') as cohort,
-                s.size as cohort_size,
-                r.months_since as month_number,
-                r.retained_customers,
-                ROUND(100.0 * r.retained_customers / s.size, 1) as retention_pct
-            FROM retention_data r
-            JOIN cohort_sizes s ON r.cohort_month = s.cohort_month
-            WHERE r.cohort_month >= DATE_TRUNC('month', CURRENT_DATE) - INTERVAL '{int(months_back)} months'
-            ORDER BY r.cohort_month DESC, r.months_since
+                strftime(a.cohort_month, '%Y-%m') as cohort,
+                s.buyers as cohort_size,
+                a.months_since as month_number,
+                a.buyers as retained_customers,
+                ROUND(100.0 * a.buyers / s.buyers, 1) as retention_pct
+            FROM gold_cohort_activity a
+            JOIN gold_cohort_activity s
+              ON s.sales_type = a.sales_type
+             AND s.cohort_month = a.cohort_month
+             AND s.months_since = 0
+            WHERE a.sales_type = ?
+              AND a.months_since <= ?
+              AND a.cohort_month >= DATE_TRUNC('month', CURRENT_DATE) - INTERVAL '{int(months_back)} months'
+            ORDER BY a.cohort_month DESC, a.months_since
             """
 
-            rows = conn.execute(query, [retention_months]).fetchall()
+            rows = conn.execute(query, [sales_type, retention_months]).fetchall()
 
             # Build cohort data structure
             cohorts = {}
@@ -456,87 +383,32 @@ class CustomersMixin:
         Returns:
             Dict with cohorts, customer retention, revenue retention, and summary
         """
-        async with self.connection() as conn:
-            # Build sales type filter
-            sales_type_filter = ""
-            if sales_type == "retail":
-                sales_type_filter = f"""
-                    AND (o.manager_id IN ({','.join(map(str, RETAIL_MANAGER_IDS))})
-                         OR (o.manager_id IS NULL AND o.source_id = 4))
-                """
-            elif sales_type == "b2b":
-                sales_type_filter = f"AND o.manager_id = {B2B_MANAGER_ID}"
-
+        async with self.read_connection() as conn:
+            # Cells of gold_cohort_activity. The M0 cell is the cohort: its
+            # size, and the first-month revenue later months are measured
+            # against.
             query = f"""
-            WITH customer_first_order AS (
-                -- Get each customer's first order month (cohort)
-                SELECT
-                    o.buyer_id,
-                    DATE_TRUNC('month', MIN(o.order_date)) AS cohort_month
-                FROM silver_orders o
-                WHERE o.buyer_id IS NOT NULL
-                  AND NOT o.is_return
-                  {sales_type_filter}
-                GROUP BY o.buyer_id
-            ),
-            customer_cohorts AS (
-                -- Add first month revenue per customer
-                SELECT
-                    c.buyer_id,
-                    c.cohort_month,
-                    COALESCE(SUM(o.grand_total), 0) AS first_month_revenue
-                FROM customer_first_order c
-                LEFT JOIN silver_orders o ON c.buyer_id = o.buyer_id
-                    AND DATE_TRUNC('month', o.order_date) = c.cohort_month
-                    AND NOT o.is_return
-                GROUP BY c.buyer_id, c.cohort_month
-            ),
-            customer_orders AS (
-                -- Get all order months per customer with revenue
-                SELECT
-                    o.buyer_id,
-                    c.cohort_month,
-                    DATEDIFF('month', c.cohort_month, DATE_TRUNC('month', o.order_date)) AS months_since,
-                    o.grand_total AS revenue
-                FROM silver_orders o
-                JOIN customer_cohorts c ON o.buyer_id = c.buyer_id
-                WHERE NOT o.is_return
-                  {sales_type_filter}
-            ),
-            cohort_sizes AS (
-                SELECT
-                    cohort_month,
-                    COUNT(DISTINCT buyer_id) AS size,
-                    SUM(first_month_revenue) AS m0_revenue
-                FROM customer_cohorts
-                GROUP BY cohort_month
-            ),
-            retention_data AS (
-                SELECT
-                    r.cohort_month,
-                    r.months_since,
-                    COUNT(DISTINCT r.buyer_id) AS retained_customers,
-                    SUM(r.revenue) AS period_revenue
-                FROM customer_orders r
-                WHERE r.months_since <= ?
-                GROUP BY r.cohort_month, r.months_since
-            )
             SELECT
-                strftime(r.cohort_month, '%Y-%m') as cohort,
-                s.size as cohort_size,
-                s.m0_revenue,
-                r.months_since as month_number,
-                r.retained_customers,
-                ROUND(100.0 * r.retained_customers / s.size, 1) as retention_pct,
-                r.period_revenue,
-                ROUND(100.0 * r.period_revenue / NULLIF(s.m0_revenue, 0), 1) as revenue_retention_pct
-            FROM retention_data r
-            JOIN cohort_sizes s ON r.cohort_month = s.cohort_month
-            WHERE r.cohort_month >= DATE_TRUNC('month', CURRENT_DATE) - INTERVAL '{int(months_back)} months'
-            ORDER BY r.cohort_month DESC, r.months_since
+                strftime(a.cohort_month, '%Y-%m') as cohort,
+                s.buyers as cohort_size,
+                s.revenue as m0_revenue,
+                a.months_since as month_number,
+                a.buyers as retained_customers,
+                ROUND(100.0 * a.buyers / s.buyers, 1) as retention_pct,
+                a.revenue as period_revenue,
+                ROUND(100.0 * a.revenue / NULLIF(s.revenue, 0), 1) as revenue_retention_pct
+            FROM gold_cohort_activity a
+            JOIN gold_cohort_activity s
+              ON s.sales_type = a.sales_type
+             AND s.cohort_month = a.cohort_month
+             AND s.months_since = 0
+            WHERE a.sales_type = ?
+              AND a.months_since <= ?
+              AND a.cohort_month >= DATE_TRUNC('month', CURRENT_DATE) - INTERVAL '{int(months_back)} months'
+            ORDER BY a.cohort_month DESC, a.months_since
             """
 
-            rows = conn.execute(query, [retention_months]).fetchall()
+            rows = conn.execute(query, [sales_type, retention_months]).fetchall()
 
             # Build cohort data structure
             cohorts = {}
@@ -783,38 +655,16 @@ class CustomersMixin:
         Returns:
             Dict with buckets, customer counts, and summary statistics
         """
-        async with self.connection() as conn:
-            # Build sales type filter
-            sales_type_filter = ""
-            if sales_type == "retail":
-                sales_type_filter = f"""
-                    AND (o.manager_id IN ({','.join(map(str, RETAIL_MANAGER_IDS))})
-                         OR (o.manager_id IS NULL AND o.source_id = 4))
-                """
-            elif sales_type == "b2b":
-                sales_type_filter = f"AND o.manager_id = {B2B_MANAGER_ID}"
-
+        async with self.read_connection() as conn:
             query = f"""
-            WITH customer_orders_ranked AS (
-                SELECT
-                    o.buyer_id,
-                    o.order_date,
-                    ROW_NUMBER() OVER (PARTITION BY o.buyer_id ORDER BY o.order_date) AS order_num
-                FROM silver_orders o
-                WHERE o.buyer_id IS NOT NULL
-                  AND NOT o.is_return
-                  {sales_type_filter}
-            ),
-            second_purchase AS (
-                SELECT
-                    c1.buyer_id,
-                    DATEDIFF('day', c1.order_date, c2.order_date) AS days_to_second
-                FROM customer_orders_ranked c1
-                JOIN customer_orders_ranked c2
-                    ON c1.buyer_id = c2.buyer_id
-                    AND c1.order_num = 1
-                    AND c2.order_num = 2
-                WHERE c1.order_date >= CURRENT_DATE - INTERVAL '{int(months_back)} months'
+            WITH second_purchase AS (
+                -- First and second order dates are kept per buyer and
+                -- sales type by the warehouse refresh (silver_buyer_stats).
+                SELECT DATEDIFF('day', first_order_date, second_order_date) AS days_to_second
+                FROM silver_buyer_stats
+                WHERE sales_type = ?
+                  AND second_order_date IS NOT NULL
+                  AND first_order_date >= CURRENT_DATE - INTERVAL '{int(months_back)} months'
             ),
             bucketed AS (
                 SELECT
@@ -856,7 +706,7 @@ class CustomersMixin:
             ORDER BY b.bucket_order
             """
 
-            rows = conn.execute(query).fetchall()
+            rows = conn.execute(query, [sales_type]).fetchall()
 
             # Extract global stats from first row
             median_days = rows[0][3] if rows else None
@@ -902,68 +752,27 @@ class CustomersMixin:
         Returns:
             Dict with cohort LTV data and summary statistics
         """
-        async with self.connection() as conn:
-            # Build sales type filter
-            sales_type_filter = ""
-            if sales_type == "retail":
-                sales_type_filter = f"""
-                    AND (o.manager_id IN ({','.join(map(str, RETAIL_MANAGER_IDS))})
-                         OR (o.manager_id IS NULL AND o.source_id = 4))
-                """
-            elif sales_type == "b2b":
-                sales_type_filter = f"AND o.manager_id = {B2B_MANAGER_ID}"
-
+        async with self.read_connection() as conn:
+            # Cells of gold_cohort_activity; a cohort's size is its M0 cell.
             query = f"""
-            WITH customer_cohorts AS (
-                SELECT
-                    o.buyer_id,
-                    DATE_TRUNC('month', MIN(o.order_date)) AS cohort_month
-                FROM silver_orders o
-                WHERE o.buyer_id IS NOT NULL
-                  AND NOT o.is_return
-                  {sales_type_filter}
-                GROUP BY o.buyer_id
-            ),
-            customer_revenue AS (
-                SELECT
-                    o.buyer_id,
-                    c.cohort_month,
-                    DATEDIFF('month', c.cohort_month, DATE_TRUNC('month', o.order_date)) AS months_since,
-                    SUM(o.grand_total) AS revenue
-                FROM silver_orders o
-                JOIN customer_cohorts c ON o.buyer_id = c.buyer_id
-                WHERE NOT o.is_return
-                  {sales_type_filter}
-                GROUP BY o.buyer_id, c.cohort_month, DATEDIFF('month', c.cohort_month, DATE_TRUNC('month', o.order_date))
-            ),
-            cohort_monthly AS (
-                SELECT
-                    cohort_month,
-                    months_since,
-                    SUM(revenue) AS total_revenue,
-                    COUNT(DISTINCT buyer_id) AS active_customers
-                FROM customer_revenue
-                WHERE months_since <= ?
-                GROUP BY cohort_month, months_since
-            ),
-            cohort_sizes AS (
-                SELECT cohort_month, COUNT(DISTINCT buyer_id) AS cohort_size
-                FROM customer_cohorts
-                GROUP BY cohort_month
-            )
             SELECT
-                strftime(cm.cohort_month, '%Y-%m') AS cohort,
-                cs.cohort_size,
-                cm.months_since,
-                cm.total_revenue,
-                cm.active_customers
-            FROM cohort_monthly cm
-            JOIN cohort_sizes cs ON cm.cohort_month = cs.cohort_month
-            WHERE cm.cohort_month >= DATE_TRUNC('month', CURRENT_DATE) - INTERVAL '{int(months_back)} months'
-            ORDER BY cm.cohort_month DESC, cm.months_since
+                strftime(a.cohort_month, '%Y-%m') AS cohort,
+                s.buyers AS cohort_size,
+                a.months_since,
+                a.revenue AS total_revenue,
+                a.buyers AS active_customers
+            FROM gold_cohort_activity a
+            JOIN gold_cohort_activity s
+              ON s.sales_type = a.sales_type
+             AND s.cohort_month = a.cohort_month
+             AND s.months_since = 0
+            WHERE a.sales_type = ?
+              AND a.months_since <= ?
+              AND a.cohort_month >= DATE_TRUNC('month', CURRENT_DATE) - INTERVAL '{int(months_back)} months'
+            ORDER BY a.cohort_month DESC, a.months_since
             """
 
-            rows = conn.execute(query, [retention_months]).fetchall()
+            rows = conn.execute(query, [sales_type, retention_months]).fetchall()
 
             # Build cohort LTV structure with cumulative revenue
             cohorts = {}
@@ -1033,33 +842,20 @@ class CustomersMixin:
         Returns:
             Dict with at-risk counts by cohort and summary statistics
         """
-        async with self.connection() as conn:
-            # Build sales type filter
-            sales_type_filter = ""
-            if sales_type == "retail":
-                sales_type_filter = f"""
-                    AND (o.manager_id IN ({','.join(map(str, RETAIL_MANAGER_IDS))})
-                         OR (o.manager_id IS NULL AND o.source_id = 4))
-                """
-            elif sales_type == "b2b":
-                sales_type_filter = f"AND o.manager_id = {B2B_MANAGER_ID}"
-
+        async with self.read_connection() as conn:
             churn_threshold = days_threshold * 2
 
             query = f"""
             WITH customer_activity AS (
                 SELECT
-                    o.buyer_id,
-                    DATE_TRUNC('month', MIN(o.order_date)) AS cohort_month,
-                    MAX(o.order_date) AS last_order_date,
-                    DATEDIFF('day', MAX(o.order_date), CURRENT_DATE) AS days_since_last,
-                    COUNT(*) AS total_orders,
-                    SUM(o.grand_total) AS total_revenue
-                FROM silver_orders o
-                WHERE o.buyer_id IS NOT NULL
-                  AND NOT o.is_return
-                  {sales_type_filter}
-                GROUP BY o.buyer_id
+                    buyer_id,
+                    cohort_month,
+                    last_order_date,
+                    DATEDIFF('day', last_order_date, CURRENT_DATE) AS days_since_last,
+                    orders AS total_orders,
+                    revenue AS total_revenue
+                FROM silver_buyer_stats
+                WHERE sales_type = ?
             )
             SELECT
                 strftime(cohort_month, '%Y-%m') AS cohort,
@@ -1076,6 +872,7 @@ class CustomersMixin:
             """
 
             rows = conn.execute(query, [
+                sales_type,
                 days_threshold, churn_threshold,  # at_risk_count (between threshold and 2x)
                 days_threshold,  # at_risk_pct (> threshold)
                 days_threshold,  # at_risk_revenue
@@ -1562,7 +1359,7 @@ class CustomersMixin:
             ValueError: If the campaign is unknown or has no send date — an
                 unsent campaign has no window to measure over.
         """
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             camp = conn.execute(
                 "SELECT sent_at, promocode, ltv_basis, holdout_pct, cost_total"
                 " FROM sms_campaigns WHERE campaign = ?", [campaign],
@@ -1758,7 +1555,7 @@ class CustomersMixin:
 
     async def list_sms_campaigns(self) -> List[Dict[str, Any]]:
         """List frozen campaigns, newest export first."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             rows = conn.execute(
                 """
                 SELECT c.campaign, c.ltv_basis, c.sales_type, c.holdout_pct,
@@ -1880,11 +1677,7 @@ class CustomersMixin:
             tier = [tier]
         tiers = [t.upper() for t in tier] if tier else None
 
-        async with self.connection() as conn:
-            # Silver already classifies each order, so filter on the column
-            # rather than re-deriving retail/b2b from manager_id here.
-            sales_type_filter = "" if sales_type == "all" else "AND l.sales_type = ?"
-
+        async with self.read_connection() as conn:
             # Phones are stored as free text; normalise to digits and keep only
             # full Ukrainian MSISDNs (380 + 9 digits). Everything shorter is a
             # partial record that no SMS gateway will accept.
@@ -1892,97 +1685,31 @@ class CustomersMixin:
             ltv_column = "revenue_ltv" if ltv_basis == "revenue" else "margin_ltv"
 
             query = f"""
-            WITH line_items AS (
-                SELECT
-                    l.order_id,
-                    l.buyer_id,
-                    l.order_date,
-                    l.order_grand_total AS grand_total,
-                    l.line_amount AS line_revenue,
-                    CASE WHEN os.purchased_price > 0
-                         THEN os.purchased_price * l.quantity END AS line_cogs
-                FROM silver_order_lines l
-                LEFT JOIN offer_stocks os ON os.sku = l.sku
-                WHERE l.buyer_id IS NOT NULL
-                  AND NOT l.is_return
-                  -- Same revenue definition the Gold layer uses: deprecated
-                  -- sources (Opencart et al.) must not inflate LTV or recency.
-                  AND l.is_active_source
-                  {sales_type_filter}
-            ),
-            allocated AS (
-                -- Order-level discounts live in grand_total, not in the line
-                -- prices (line totals run ~1.5% above grand_total), so spread
-                -- each order's grand_total across its lines pro rata. That
-                -- charges the discount to margin, which is where it belongs:
-                -- a customer who only ever buys on discount is worth less.
-                SELECT
-                    buyer_id, order_id, order_date, line_cogs,
-                    COALESCE(
-                        grand_total * line_revenue
-                            / NULLIF(SUM(line_revenue) OVER (PARTITION BY order_id), 0),
-                        0
-                    ) AS revenue
-                FROM line_items
-            ),
-            order_totals AS (
-                SELECT buyer_id, order_id, order_date, SUM(revenue) AS order_total
-                FROM allocated
-                GROUP BY buyer_id, order_id, order_date
-            ),
-            last_order AS (
-                -- What the customer bought last: the hook an SMS is written around.
-                SELECT buyer_id, order_id, order_total
-                FROM order_totals
-                QUALIFY ROW_NUMBER() OVER (
-                    PARTITION BY buyer_id ORDER BY order_date DESC, order_id DESC
-                ) = 1
-            ),
-            last_order_items AS (
-                -- Names run long (up to ~4k chars per order), so keep the three
-                -- biggest lines, truncate each, and note how many were left out.
-                SELECT
-                    lo.buyer_id,
-                    lo.order_id AS last_order_id,
-                    lo.order_total AS last_order_total,
-                    COUNT(*) AS last_order_item_count,
-                    array_to_string(
-                        list_transform(
-                            list_slice(
-                                array_agg(l.product_name ORDER BY l.quantity DESC, l.product_name), 1, 3
-                            ),
-                            x -> CASE WHEN length(x) > 60
-                                      THEN left(x, 57) || chr(8230) ELSE x END
-                        ), ' | '
-                    ) AS last_order_items
-                FROM last_order lo
-                JOIN silver_order_lines l ON l.order_id = lo.order_id
-                GROUP BY lo.buyer_id, lo.order_id, lo.order_total
-            ),
-            cust AS (
+            WITH cust AS (
+                -- One row per buyer, kept by the warehouse refresh: order
+                -- count, revenue, margin priced off offer_stocks with order
+                -- discounts spread over the lines, and the last order. Gold's
+                -- revenue definition, so returns and deprecated sources
+                -- (Opencart et al.) inflate neither LTV nor recency.
                 SELECT
                     buyer_id,
-                    COUNT(DISTINCT order_id) AS orders,
-                    SUM(revenue) AS revenue_ltv,
+                    orders,
+                    revenue AS revenue_ltv,
                     -- Uncosted lines drop out of margin but stay in revenue;
                     -- cost_coverage exposes how much of the customer is costed.
-                    COALESCE(SUM(revenue - line_cogs) FILTER (WHERE line_cogs IS NOT NULL), 0)
-                        AS margin_ltv,
-                    COALESCE(SUM(revenue) FILTER (WHERE line_cogs IS NOT NULL), 0)
-                        / NULLIF(SUM(revenue), 0) AS cost_coverage,
-                    MAX(order_date) AS last_order_date,
-                    MIN(order_date) AS first_order_date,
-                    DATEDIFF('day', MAX(order_date), CURRENT_DATE) AS recency
-                FROM allocated
-                GROUP BY buyer_id
+                    margin AS margin_ltv,
+                    costed_revenue / NULLIF(revenue, 0) AS cost_coverage,
+                    last_order_date,
+                    first_order_date,
+                    DATEDIFF('day', last_order_date, CURRENT_DATE) AS recency,
+                    last_order_id,
+                    last_order_total
+                FROM silver_buyer_stats
+                WHERE sales_type = ?
             ),
             scored AS (
                 SELECT
                     c.*,
-                    lo.last_order_id,
-                    lo.last_order_total,
-                    lo.last_order_item_count,
-                    lo.last_order_items,
                     b.full_name,
                     b.city,
                     regexp_replace(COALESCE(b.phone, ''), '[^0-9]', '', 'g') AS phone,
@@ -1993,7 +1720,6 @@ class CustomersMixin:
                     END AS tier
                 FROM cust c
                 JOIN buyers b ON b.id = c.buyer_id
-                LEFT JOIN last_order_items lo ON lo.buyer_id = c.buyer_id
                 WHERE c.recency <= ?
             ),
             flagged AS (
@@ -2029,6 +1755,27 @@ class CustomersMixin:
                 SELECT * FROM eligible
                 {f"WHERE tier IN ({', '.join('?' * len(tiers))})" if tiers else ""}
             ),
+            last_order_items AS (
+                -- What the customer bought last: the hook an SMS is written
+                -- around. Only for the selected customers. Names run long (up
+                -- to ~4k chars per order), so keep the three biggest lines,
+                -- truncate each, and note how many were left out.
+                SELECT
+                    l.order_id,
+                    COUNT(*) AS last_order_item_count,
+                    array_to_string(
+                        list_transform(
+                            list_slice(
+                                array_agg(l.product_name ORDER BY l.quantity DESC, l.product_name), 1, 3
+                            ),
+                            x -> CASE WHEN length(x) > 60
+                                      THEN left(x, 57) || chr(8230) ELSE x END
+                        ), ' | '
+                    ) AS last_order_items
+                FROM silver_order_lines l
+                WHERE l.order_id IN (SELECT last_order_id FROM selected)
+                GROUP BY l.order_id
+            ),
             funnel AS (
                 -- The selection, stage by stage. Counted in the order the rules
                 -- are applied above, so each figure is "still in after this rule".
@@ -2062,14 +1809,14 @@ class CustomersMixin:
             -- RIGHT JOIN, not CROSS: when nothing survives the filters the
             -- funnel is the only thing left to explain why, so its single row
             -- has to come back regardless.
-            FROM selected RIGHT JOIN funnel ON TRUE
+            FROM selected
+            LEFT JOIN last_order_items lo ON lo.order_id = selected.last_order_id
+            RIGHT JOIN funnel ON TRUE
             ORDER BY tier, ltv DESC, buyer_id
             """
 
             # Bound in textual order of the `?` placeholders above.
-            params: list = []
-            if sales_type != "all":
-                params.append(sales_type)
+            params: list = [sales_type]
             params += [
                 vip_ltv, core_min_orders, core_ltv, reactivation_max_recency,
                 max_recency_days,
@@ -143,7 +143,7 @@ class ExpensesMixin:
 
     async def get_expense_types(self) -> List[Dict[str, Any]]:
         """Get all expense types for filter dropdown."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             results = conn.execute("""
                 SELECT id, name, alias, is_active
                 FROM expense_types
@@ -161,7 +161,7 @@ class ExpensesMixin:
         sales_type: str = "retail"
     ) -> Dict[str, Any]:
         """Get expense summary for a date range."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             params = [start_date, end_date]
             where_clauses = [f"{_date_in_kyiv('o.ordered_at')} BETWEEN ? AND ?"]
 
@@ -274,7 +274,7 @@ class ExpensesMixin:
         sales_type: str = "retail"
     ) -> Dict[str, Any]:
         """Get profit analysis: revenue vs expenses."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             return_statuses = tuple(int(s) for s in OrderStatus.return_statuses())
             params = [start_date, end_date]
             where_clauses = [
@@ -533,7 +533,7 @@ class ExpensesMixin:
         where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
         params.append(limit)
 
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             rows = conn.execute(f"""
                 SELECT id, expense_date, category, expense_type, amount, currency, note, created_at, updated_at, platform
                 FROM manual_expenses
@@ -572,7 +572,7 @@ class ExpensesMixin:
         Returns:
             Dict with by_platform breakdown and total_spend
         """
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             rows = conn.execute("""
                 SELECT platform, SUM(amount) as spend, COUNT(*) as entries
                 FROM manual_expenses
@@ -621,7 +621,7 @@ class ExpensesMixin:
 
         where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
 
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             # Total
             total_row = conn.execute(f"""
                 SELECT COALESCE(SUM(amount), 0) as total, COUNT(*) as count
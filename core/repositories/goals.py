@@ -32,7 +32,7 @@ class GoalsMixin:
         Returns:
             Historical stats including average, min, max, and trend
         """
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             return_statuses = tuple(int(s) for s in OrderStatus.return_statuses())
             sales_filter = self._build_sales_type_filter(sales_type)
 
@@ -215,7 +215,7 @@ class GoalsMixin:
         Returns:
             Goals for daily, weekly, and monthly periods
         """
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             # Get stored goals
             results = conn.execute("""
                 SELECT period_type, goal_amount, is_custom, calculated_goal, growth_factor
@@ -797,7 +797,7 @@ class GoalsMixin:
         """
         # Recalculate indices BEFORE acquiring the connection lock to avoid
         # re-entrant deadlock (each of these methods opens its own connection)
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             indices_exist = conn.execute(
                 "SELECT COUNT(*) FROM seasonal_indices"
             ).fetchone()[0]
@@ -807,7 +807,7 @@ class GoalsMixin:
             await self.calculate_yoy_growth(sales_type)
             await self.calculate_weekly_patterns(sales_type)
 
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             # Dynamic growth cap per-month (replaces flat 0.35)
             dynamic_cap = self._get_dynamic_growth_cap(conn, target_month, sales_type)
 
@@ -1031,7 +1031,7 @@ class GoalsMixin:
         smart = await self.generate_smart_goals(target_year, target_month, sales_type)
 
         # Check for custom overrides
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             stored_goals = conn.execute("""
                 SELECT period_type, goal_amount, is_custom
                 FROM revenue_goals
@@ -1135,7 +1135,7 @@ class GoalsMixin:
         Returns:
             List of dicts with date, predicted_revenue, model_mae, model_mape, model_wape.
         """
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             rows = conn.execute(
                 """SELECT prediction_date, predicted_revenue, model_mae, model_mape, model_wape
                    FROM revenue_predictions
@@ -1157,39 +1157,6 @@ class GoalsMixin:
             for row in rows
         ]
 
-    async def get_daily_revenue_for_dates(
-        self,
-        dates: list,
-        sales_type: str = "retail",
-    ) -> Dict[date, float]:
-        """Get daily revenue for a list of specific dates.
-
-        Returns dict mapping date -> revenue total.
-        Used for extending comparison data to cover forecast dates.
-        """
-        if not dates:
-            return {}
-
-        return_statuses = tuple(int(s) for s in OrderStatus.return_statuses())
-        placeholders = ", ".join(["?"] * len(dates))
-        date_strs = [d.isoformat() for d in dates]
-
-        async with self.connection() as conn:
-            sales_filter = self._build_sales_type_filter(sales_type)
-            rows = conn.execute(
-                f"""SELECT {_date_in_kyiv('o.ordered_at')} as day,
-                           SUM(o.grand_total) as revenue
-                    FROM orders o
-                    WHERE {_date_in_kyiv('o.ordered_at')} IN ({placeholders})
-                      AND o.status_id NOT IN {return_statuses}
-                      AND o.source_id IN (1, 2, 4)
-                      AND {sales_filter}
-                    GROUP BY day""",
-                date_strs,
-            ).fetchall()
-
-        return {row[0]: float(row[1]) for row in rows}
-
     # ═══════════════════════════════════════════════════════════════════════════
     # MANUAL EXPENSES CRUD
     # ═══════════════════════════════════════════════════════════════════════════
@@ -70,8 +70,10 @@ class InventoryMixin:
             try:
                 # Fetch current state for delta detection
                 current = {}
-                for r in conn.execute("SELECT id, quantity, reserve FROM offer_stocks").fetchall():
-                    current[r[0]] = (r[1], r[2])
+                for r in conn.execute(
+                    "SELECT id, quantity, reserve, sku, purchased_price FROM offer_stocks"
+                ).fetchall():
+                    current[r[0]] = (r[1], r[2], r[3], r[4])
 
                 # Build offer_id → product_id mapping for denormalization
                 product_map = {}
@@ -80,6 +82,7 @@ class InventoryMixin:
 
                 count = 0
                 movements = []
+                costs_changed = False
                 for stock in stocks:
                     offer_id = stock.get("id")
                     new_qty = stock.get("quantity", 0)
@@ -87,6 +90,17 @@ class InventoryMixin:
                     old = current.get(offer_id)
                     pid = product_map.get(offer_id)
 
+                    # Compared as numbers: the API sends 120 where DuckDB
+                    # hands back Decimal('120.00').
+                    new_cost = stock.get("purchased_price")
+                    if old is None:
+                        costs_changed = costs_changed or bool(new_cost)
+                    elif old[2] != stock.get("sku") or (
+                        (float(old[3]) if old[3] is not None else None)
+                        != (float(new_cost) if new_cost is not None else None)
+                    ):
+                        costs_changed = True
+
                     if old is None:
                         # New offer — record initial state if it has stock
                         if new_qty > 0 or new_rsv > 0:
@@ -124,6 +138,16 @@ class InventoryMixin:
                     """, movements)
                     logger.info(f"Recorded {len(movements)} stock movements")
 
+                if costs_changed:
+                    # silver_buyer_stats prices margin off these costs, and is
+                    # the only table that does: its own flag, so the hourly
+                    # stock sync does not rebuild the catalog-wide Gold tables.
+                    # Set in this transaction since the writer lock is held.
+                    conn.execute("""
+                        INSERT OR REPLACE INTO sync_metadata (key, value, updated_at)
+                        VALUES ('buyer_stats_dirty', '1', CURRENT_TIMESTAMP)
+                    """)
+
                 conn.execute("COMMIT")
                 logger.info(f"Upserted {count} offer stocks to DuckDB")
                 return count
@@ -247,7 +271,7 @@ class InventoryMixin:
         Returns:
             Dict with total stats and top items by quantity and low stock alerts
         """
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             # Overall stats
             # Note: available = MAX(0, quantity - reserve) to match KeyCRM display
             stats = conn.execute("""
@@ -413,7 +437,7 @@ class InventoryMixin:
         Returns:
             Dict with average inventory metrics
         """
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             # Get beginning and ending inventory for the period
             result = conn.execute(f"""
                 WITH period_data AS (
@@ -501,7 +525,7 @@ class InventoryMixin:
         Returns:
             Dict with labels, values, quantities for trend chart
         """
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             if granularity == "monthly":
                 # Monthly aggregation
                 result = conn.execute(f"""
@@ -589,7 +613,7 @@ class InventoryMixin:
         Returns:
             Dict with summary by status, aging buckets, and category velocity
         """
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             # Summary by status
             summary = conn.execute("SELECT * FROM v_inventory_summary").fetchall()
             summary_dict = {}
@@ -653,7 +677,7 @@ class InventoryMixin:
         Returns:
             List of items with status != healthy
         """
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             items = conn.execute(f"""
                 SELECT
                     offer_id, sku, name, brand, category_name,
@@ -723,7 +747,7 @@ class InventoryMixin:
         ABCS = ["A", "B", "C"]
         OPTIMAL_DAYS = 60  # baseline for excess_capital_cost
 
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             rows = conn.execute("""
                 SELECT
                     offer_id, sku, name, brand, category_name,
@@ -926,7 +950,7 @@ class InventoryMixin:
         Each brand: rotation days, GMROI, cost basis, sale value, 90d revenue,
         SKU count, frozen SKU share.
         """
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             rows = conn.execute("""
                 SELECT
                     COALESCE(NULLIF(brand, ''), '—') as brand,
@@ -993,7 +1017,7 @@ class InventoryMixin:
         Returns:
             List of items with recommended actions
         """
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             items = conn.execute(f"""
                 SELECT * FROM v_recommended_actions
                 WHERE action IS NOT NULL
@@ -1023,7 +1047,7 @@ class InventoryMixin:
         Returns:
             List of items that need restocking
         """
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             items = conn.execute(f"""
                 SELECT * FROM v_restock_alerts
                 WHERE alert_level IS NOT NULL
@@ -1071,7 +1095,7 @@ class InventoryMixin:
             Dict with turnover, currentStock, kpis, optimal, excess,
             sellThrough, abc, and topExcess sections
         """
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             # Q1: Revenue over period (all sales types combined)
             rev = conn.execute(f"""
                 SELECT COALESCE(SUM(revenue), 0), COUNT(DISTINCT date)
@@ -1239,7 +1263,7 @@ class InventoryMixin:
 
     async def get_abc_skus(self, abc_class: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Get SKUs for a specific ABC class, sorted by revenue descending."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             rows = conn.execute("""
                 SELECT offer_id, sku, name, brand, category_name,
                        available, available_value, price,
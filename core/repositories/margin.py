@@ -25,7 +25,7 @@ class MarginMixin:
         sales_type: str = "retail",
     ) -> Dict[str, Any]:
         """Get overall margin KPIs."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             params: list = [start_date, end_date]
             where = self._margin_base_where(sales_type, params)
 
@@ -72,7 +72,7 @@ class MarginMixin:
         limit: int = 20,
     ) -> List[Dict[str, Any]]:
         """Get margin breakdown by brand, sorted by revenue."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             params: list = [start_date, end_date]
             where = self._margin_base_where(sales_type, params)
 
@@ -122,7 +122,7 @@ class MarginMixin:
         sales_type: str = "retail",
     ) -> List[Dict[str, Any]]:
         """Get margin breakdown by root category."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             params: list = [start_date, end_date]
             where = self._margin_base_where(sales_type, params)
 
@@ -177,7 +177,7 @@ class MarginMixin:
         sales_type: str = "retail",
     ) -> List[Dict[str, Any]]:
         """Get monthly margin trend."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             params: list = [start_date, end_date]
             where = self._margin_base_where(sales_type, params)
 
@@ -221,7 +221,7 @@ class MarginMixin:
         min_revenue: float = 500,
     ) -> List[Dict[str, Any]]:
         """Get brand × category cross-tab with margin data."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             params: list = [start_date, end_date]
             where = self._margin_base_where(sales_type, params)
 
@@ -278,7 +278,7 @@ class MarginMixin:
         min_revenue: float = 50000,
     ) -> List[Dict[str, Any]]:
         """Get brands with margin below floor, sorted by revenue impact."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             params: list = [start_date, end_date]
             where = self._margin_base_where(sales_type, params)
 
@@ -7,6 +7,54 @@ from typing import Optional, Dict, Any, List
 from core.duckdb_constants import line_window_where
 
 
+def _basket_pairs_sql(kind: str, sales_type: str, params: list, min_orders: int) -> str:
+    """Pairs of one `kind` from `gold_daily_basket_pairs`, with their metrics.
+
+    One aggregation sums the window's daily partials — the order count, the
+    item counts and the pair counts together — and the pairs are then joined
+    to their two items. Columns: a, b, co_occurrence, a_orders, b_orders,
+    total_orders, a_name, b_name, support, conf_a_to_b, conf_b_to_a, lift.
+    Products are keyed by id, categories and brands by name.
+
+    The caller has already appended the two dates to `params`, as for
+    line_window_where; this appends `sales_type` when it filters.
+    """
+    key_a, key_b = ("a_id", "b_id") if kind == "product" else ("a_name", "b_name")
+    sales_filter = ""
+    if sales_type != "all":
+        sales_filter = "AND g.sales_type = ?"
+        params.append(sales_type)
+    return f"""
+        WITH cells AS (
+            SELECT g.kind, g.{key_a} AS a, g.{key_b} AS b,
+                   SUM(g.orders) AS orders,
+                   ANY_VALUE(g.a_name) AS name
+            FROM gold_daily_basket_pairs g
+            WHERE g.kind IN ('order', '{kind}')
+              AND g.date BETWEEN ? AND ? {sales_filter}
+            GROUP BY g.kind, a, b
+        ),
+        items AS (
+            SELECT a, orders, name FROM cells WHERE kind = '{kind}' AND b IS NULL
+        ),
+        total AS (
+            SELECT COALESCE(SUM(orders), 0) AS total_orders FROM cells WHERE kind = 'order'
+        )
+        SELECT p.a, p.b, p.orders AS co_occurrence,
+               ia.orders AS a_orders, ib.orders AS b_orders, t.total_orders,
+               ia.name AS a_name, ib.name AS b_name,
+               p.orders * 1.0 / t.total_orders AS support,
+               p.orders * 1.0 / ia.orders AS conf_a_to_b,
+               p.orders * 1.0 / ib.orders AS conf_b_to_a,
+               p.orders * t.total_orders * 1.0 / (ia.orders * ib.orders) AS lift
+        FROM cells p
+        JOIN items ia ON ia.a = p.a
+        JOIN items ib ON ib.a = p.b
+        CROSS JOIN total t
+        WHERE p.kind = '{kind}' AND p.b IS NOT NULL AND p.orders >= {min_orders}
+    """
+
+
 class ProductsIntelMixin:
 
     async def get_basket_summary(
@@ -16,7 +64,7 @@ class ProductsIntelMixin:
         sales_type: str = "retail",
     ) -> Dict[str, Any]:
         """Get basket KPIs: avg size, multi-item %, revenue uplift, top pair."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             params: list = [start_date, end_date]
             where_sql = line_window_where(sales_type, params)
 
@@ -46,34 +94,22 @@ class ProductsIntelMixin:
             single_aov = float(result[6] or 0)
             uplift = round(multi_aov / single_aov, 1) if single_aov > 0 else 0
 
-            # Top pair by co-occurrence (date-filtered)
+            # Top pair by co-occurrence (date-filtered), summed by name
+            pair_params: list = [start_date, end_date]
+            pairs_sql = _basket_pairs_sql("product", sales_type, pair_params, 1)
             top_pair = conn.execute(f"""
-                WITH oi AS (
-                    SELECT l.order_id,
-                           COALESCE(l.product_id, l.line_id) AS product_id,
-                           ANY_VALUE(l.product_name) AS product_name
-                    FROM silver_order_lines l
-                    WHERE {where_sql}
-                    GROUP BY l.order_id, COALESCE(l.product_id, l.line_id)
-                ),
-                multi AS (
-                    SELECT order_id, product_id, product_name
-                    FROM oi WHERE order_id IN (
-                        SELECT order_id FROM oi GROUP BY order_id HAVING COUNT(*) >= 2
-                    )
-                )
+                WITH pairs AS ({pairs_sql})
                 SELECT
-                    COALESCE(p_a.name, a.product_name) AS name_a,
-                    COALESCE(p_b.name, b.product_name) AS name_b,
-                    COUNT(DISTINCT a.order_id) AS co_occurrence
-                FROM multi a
-                JOIN multi b ON a.order_id = b.order_id AND a.product_id < b.product_id
-                LEFT JOIN products p_a ON a.product_id = p_a.id
-                LEFT JOIN products p_b ON b.product_id = p_b.id
+                    COALESCE(p_a.name, pairs.a_name) AS name_a,
+                    COALESCE(p_b.name, pairs.b_name) AS name_b,
+                    SUM(pairs.co_occurrence) AS co_occurrence
+                FROM pairs
+                LEFT JOIN products p_a ON pairs.a = p_a.id
+                LEFT JOIN products p_b ON pairs.b = p_b.id
                 GROUP BY name_a, name_b
-                ORDER BY co_occurrence DESC
+                ORDER BY co_occurrence DESC, name_a, name_b
                 LIMIT 1
-            """, params).fetchone()
+            """, pair_params).fetchone()
 
             top_pair_name = f"{top_pair[0]} + {top_pair[1]}" if top_pair else "N/A"
             top_pair_count = int(top_pair[2]) if top_pair else 0
@@ -99,81 +135,30 @@ class ProductsIntelMixin:
         product_id: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """Get top product pairs by co-occurrence within date range."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             params: list = [start_date, end_date]
-            where_sql = line_window_where(sales_type, params)
 
             # Dynamic threshold: >= 2 for 14+ day ranges, >= 1 for shorter
             days_span = (end_date - start_date).days + 1
             having_threshold = 2 if days_span >= 14 else 1
+            pairs_sql = _basket_pairs_sql("product", sales_type, params, having_threshold)
 
             product_filter = ""
             if product_id is not None:
-                product_filter = "WHERE a_id = ? OR b_id = ?"
+                product_filter = "WHERE pairs.a = ? OR pairs.b = ?"
                 params.extend([product_id, product_id])
 
             rows = conn.execute(f"""
-                WITH order_items AS (
-                    SELECT l.order_id,
-                           COALESCE(l.product_id, l.line_id) AS product_id,
-                           ANY_VALUE(l.product_name) AS product_name
-                    FROM silver_order_lines l
-                    WHERE {where_sql}
-                    GROUP BY l.order_id, COALESCE(l.product_id, l.line_id)
-                ),
-                multi_orders AS (
-                    SELECT order_id, product_id, product_name
-                    FROM order_items
-                    WHERE order_id IN (
-                        SELECT order_id FROM order_items
-                        GROUP BY order_id HAVING COUNT(*) >= 2
-                    )
-                ),
-                pair_counts AS (
-                    SELECT a.product_id AS a_id, b.product_id AS b_id,
-                           COUNT(DISTINCT a.order_id) AS co_occurrence
-                    FROM multi_orders a
-                    JOIN multi_orders b ON a.order_id = b.order_id
-                        AND a.product_id < b.product_id
-                    GROUP BY a.product_id, b.product_id
-                    HAVING co_occurrence >= {having_threshold}
-                ),
-                product_orders AS (
-                    SELECT product_id, COUNT(DISTINCT order_id) AS orders
-                    FROM order_items
-                    GROUP BY product_id
-                ),
-                total AS (
-                    SELECT COUNT(DISTINCT order_id) AS total_orders FROM order_items
-                ),
-                with_metrics AS (
-                    SELECT pc.a_id, pc.b_id, pc.co_occurrence,
-                           COALESCE(p_a.name, oi_a.product_name, 'Unknown') AS a_name,
-                           COALESCE(p_b.name, oi_b.product_name, 'Unknown') AS b_name,
-                           po_a.orders AS a_orders,
-                           po_b.orders AS b_orders,
-                           t.total_orders,
-                           pc.co_occurrence * 1.0 / t.total_orders AS support,
-                           pc.co_occurrence * 1.0 / po_a.orders AS conf_a_to_b,
-                           pc.co_occurrence * 1.0 / po_b.orders AS conf_b_to_a,
-                           CASE WHEN po_a.orders * po_b.orders > 0
-                               THEN (pc.co_occurrence * t.total_orders * 1.0) / (po_a.orders * po_b.orders)
-                               ELSE 0 END AS lift
-                    FROM pair_counts pc
-                    LEFT JOIN products p_a ON pc.a_id = p_a.id
-                    LEFT JOIN products p_b ON pc.b_id = p_b.id
-                    LEFT JOIN (SELECT product_id, ANY_VALUE(product_name) AS product_name FROM multi_orders GROUP BY product_id) oi_a ON pc.a_id = oi_a.product_id
-                    LEFT JOIN (SELECT product_id, ANY_VALUE(product_name) AS product_name FROM multi_orders GROUP BY product_id) oi_b ON pc.b_id = oi_b.product_id
-                    LEFT JOIN product_orders po_a ON pc.a_id = po_a.product_id
-                    LEFT JOIN product_orders po_b ON pc.b_id = po_b.product_id
-                    CROSS JOIN total t
-                )
-                SELECT a_id, a_name, b_id, b_name,
+                WITH pairs AS ({pairs_sql})
+                SELECT pairs.a, COALESCE(p_a.name, pairs.a_name, 'Unknown'),
+                       pairs.b, COALESCE(p_b.name, pairs.b_name, 'Unknown'),
                        co_occurrence, support, conf_a_to_b, conf_b_to_a, lift,
                        a_orders, b_orders, total_orders
-                FROM with_metrics
+                FROM pairs
+                LEFT JOIN products p_a ON pairs.a = p_a.id
+                LEFT JOIN products p_b ON pairs.b = p_b.id
                 {product_filter}
-                ORDER BY co_occurrence DESC
+                ORDER BY co_occurrence DESC, pairs.a, pairs.b
                 LIMIT ?
             """, params + [limit]).fetchall()
 
@@ -198,7 +183,7 @@ class ProductsIntelMixin:
         sales_type: str = "retail",
     ) -> List[Dict[str, Any]]:
         """Get basket size distribution with AOV per bucket."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             params: list = [start_date, end_date]
             where_sql = line_window_where(sales_type, params)
 
@@ -258,30 +243,14 @@ class ProductsIntelMixin:
         limit: int = 10,
     ) -> List[Dict[str, Any]]:
         """Get top category pair combinations from multi-item orders."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             params: list = [start_date, end_date]
-            where_sql = line_window_where(sales_type, params)
+            pairs_sql = _basket_pairs_sql("category", sales_type, params, 2)
 
             rows = conn.execute(f"""
-                WITH order_cats AS (
-                    SELECT DISTINCT l.order_id,
-                           COALESCE(l.parent_category_name, l.category_name, 'Unknown') AS category_name,
-                           COALESCE(l.parent_category_id, l.category_id) AS category_id
-                    FROM silver_order_lines l
-                    WHERE {where_sql}
-                ),
-                cat_pairs AS (
-                    SELECT a.category_name AS cat_a, b.category_name AS cat_b,
-                           COUNT(DISTINCT a.order_id) AS co_occurrence
-                    FROM order_cats a
-                    JOIN order_cats b ON a.order_id = b.order_id
-                        AND a.category_name < b.category_name
-                    GROUP BY a.category_name, b.category_name
-                    HAVING co_occurrence >= 2
-                )
-                SELECT cat_a, cat_b, co_occurrence
-                FROM cat_pairs
-                ORDER BY co_occurrence DESC
+                SELECT a, b, co_occurrence, support, lift
+                FROM ({pairs_sql})
+                ORDER BY co_occurrence DESC, a, b
                 LIMIT ?
             """, params + [limit]).fetchall()
 
@@ -290,6 +259,8 @@ class ProductsIntelMixin:
                     "categoryA": r[0],
                     "categoryB": r[1],
                     "coOccurrence": int(r[2]),
+                    "support": round(float(r[3]), 4),
+                    "lift": round(float(r[4]), 2),
                 }
                 for r in rows
             ]
@@ -302,33 +273,17 @@ class ProductsIntelMixin:
         limit: int = 10,
     ) -> List[Dict[str, Any]]:
         """Get top brand pair co-purchases within date range."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             params: list = [start_date, end_date]
-            where_sql = line_window_where(sales_type, params)
 
             days_span = (end_date - start_date).days + 1
             having_threshold = 2 if days_span >= 14 else 1
+            pairs_sql = _basket_pairs_sql("brand", sales_type, params, having_threshold)
 
             rows = conn.execute(f"""
-                WITH order_brands AS (
-                    SELECT DISTINCT l.order_id, l.brand
-                    FROM silver_order_lines l
-                    WHERE {where_sql}
-                      AND l.brand IS NOT NULL AND l.brand != ''
-                ),
-                brand_pairs AS (
-                    SELECT a.brand AS brand_a, b.brand AS brand_b,
-                           COUNT(DISTINCT a.order_id) AS co_occurrence,
-                           0 AS product_pairs
-                    FROM order_brands a
-                    JOIN order_brands b ON a.order_id = b.order_id
-                        AND a.brand < b.brand
-                    GROUP BY a.brand, b.brand
-                    HAVING co_occurrence >= {having_threshold}
-                )
-                SELECT brand_a, brand_b, co_occurrence, product_pairs
-                FROM brand_pairs
-                ORDER BY co_occurrence DESC
+                SELECT a, b, co_occurrence, 0 AS product_pairs, support, lift
+                FROM ({pairs_sql})
+                ORDER BY co_occurrence DESC, a, b
                 LIMIT ?
             """, params + [limit]).fetchall()
 
@@ -338,6 +293,8 @@ class ProductsIntelMixin:
                     "brandB": r[1],
                     "coOccurrence": int(r[2]),
                     "productPairs": int(r[3]),
+                    "support": round(float(r[4]), 4),
+                    "lift": round(float(r[5]), 2),
                 }
                 for r in rows
             ]
@@ -350,7 +307,7 @@ class ProductsIntelMixin:
         limit: int = 5,
     ) -> Dict[str, List[Dict[str, Any]]]:
         """Get products with biggest revenue growth/decline vs previous period."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             from datetime import timedelta
             # Calculate previous period of same length
             days = (end_date - start_date).days + 1
@@ -2,10 +2,13 @@
 from __future__ import annotations
 
 from datetime import date, timedelta
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Sequence, Tuple
 
 from core.models import OrderStatus
 
+# The comparison windows the trend chart offers, in the order they are returned.
+COMPARE_TYPES = ("previous_period", "month_ago", "year_ago")
+
 
 class RevenueMixin:
 
@@ -20,7 +23,7 @@ class RevenueMixin:
         promocode: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Get summary statistics for a date range (from Gold/Silver layers)."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             if category_id or brand or promocode:
                 # Use Silver layer with JOINs for correct distinct order counts
                 # (gold_daily_products can't deduplicate orders with multiple matching products)
@@ -164,7 +167,7 @@ class RevenueMixin:
         # Ensure we have a mapping (safety net)
         STATUS_NAMES.setdefault(19, "Returned")
 
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             params: list = [start_date, end_date]
             where_clauses = [
                 "s.order_date BETWEEN ? AND ?",
@@ -327,139 +330,218 @@ class RevenueMixin:
         """
         return sql, params
 
-    async def get_revenue_trend(
+    @staticmethod
+    def _compare_starts(start_date: date, end_date: date) -> Dict[str, Tuple[date, date]]:
+        """Every comparison window the trend chart offers, keyed by compare_type.
+
+        `previous_period` is the same number of days immediately before. The
+        calendar shifts clamp at month end on both edges, so a comparison
+        window can be shorter than the period: March against a month ago is
+        February's 28 or 29 days, not 31.
+        """
+        from dateutil.relativedelta import relativedelta
+
+        period_days = (end_date - start_date).days + 1
+        prev_end = start_date - timedelta(days=1)
+        return {
+            "previous_period": (prev_end - timedelta(days=period_days - 1), prev_end),
+            "month_ago": (start_date - relativedelta(months=1), end_date - relativedelta(months=1)),
+            "year_ago": (start_date - relativedelta(years=1), end_date - relativedelta(years=1)),
+        }
+
+    async def get_revenue_series(
         self,
         start_date: date,
         end_date: date,
         source_id: Optional[int] = None,
         category_id: Optional[int] = None,
         brand: Optional[str] = None,
-        include_comparison: bool = True,
         sales_type: str = "retail",
-        compare_type: str = "previous_period",
         promocode: Optional[str] = None,
+        compare_types: Sequence[str] = COMPARE_TYPES,
     ) -> Dict[str, Any]:
-        """Get daily revenue trend for chart (from Gold layer)."""
-        async with self.connection() as conn:
-            cat_ids = None
-            if category_id:
-                cat_ids = await self._get_category_with_children(conn, category_id)
+        """The period and its comparison windows, in one query.
+
+        A day spine from `generate_series` is joined to one daily aggregate
+        covering every window at once, each window aligned by its offset from
+        its own start — the way the chart draws them. The trend used to run a
+        query per window and then walk the days in Python to zero-fill, with a
+        dict lookup per day per series; the spine does the fill.
 
-            use_products = bool(category_id or brand or promocode)
+        Only the windows in `compare_types` are joined, and the aggregate
+        reaches back only as far as the earliest of them: a week against the
+        previous week reads two weeks of rows, not the thirteen months
+        `year_ago` would need.
+
+        Returns labels and the current revenue/orders, then each requested
+        comparison as {"start", "end", "revenue"} under its compare_type.
+        """
+        windows = {
+            kind: window
+            for kind, window in self._compare_starts(start_date, end_date).items()
+            if kind in compare_types
+        }
+        lengths = {k: (e - s).days + 1 for k, (s, e) in windows.items()}
+        period_days = (end_date - start_date).days + 1
+        span = max([period_days, *lengths.values()])
+        lo = min([start_date, *(s for s, _ in windows.values())])
 
-            if use_products:
-                sql, params = self._build_silver_products_revenue_query(
-                    start_date, end_date, sales_type, source_id, cat_ids, brand, promocode
+        async with self.read_connection() as conn:
+            if category_id or brand or promocode:
+                cat_ids = None
+                if category_id:
+                    cat_ids = await self._get_category_with_children(conn, category_id)
+                daily_sql, params = self._build_silver_products_revenue_query(
+                    lo, end_date, sales_type, source_id, cat_ids, brand, promocode
                 )
             else:
-                sql, params = self._build_gold_revenue_query(
-                    start_date, end_date, sales_type, source_id
+                daily_sql, params = self._build_gold_revenue_query(
+                    lo, end_date, sales_type, source_id
                 )
 
-            results = conn.execute(sql, params).fetchall()
-            daily_data = {row[0]: (float(row[1]), int(row[2])) for row in results}
-
-            # Build labels and data
-            labels = []
-            data = []
-            orders_data = []
-            current = start_date
-            while current <= end_date:
-                labels.append(current.strftime("%d.%m"))
-                revenue_val, orders_val = daily_data.get(current, (0, 0))
-                data.append(round(revenue_val, 2))
-                orders_data.append(orders_val)
-                current += timedelta(days=1)
-
-            datasets = [{
-                "label": "This Period",
-                "data": data,
-                "borderColor": "#16A34A",
-                "backgroundColor": "rgba(22, 163, 74, 0.1)",
-                "fill": True,
-                "tension": 0.3,
-                "borderWidth": 2
-            }]
-
-            # Add previous period comparison
-            if include_comparison:
-                period_days = (end_date - start_date).days + 1
-
-                if compare_type == "year_ago":
-                    from dateutil.relativedelta import relativedelta
-                    prev_start = start_date - relativedelta(years=1)
-                    prev_end = end_date - relativedelta(years=1)
-                elif compare_type == "month_ago":
-                    from dateutil.relativedelta import relativedelta
-                    prev_start = start_date - relativedelta(months=1)
-                    prev_end = end_date - relativedelta(months=1)
-                else:
-                    prev_end = start_date - timedelta(days=1)
-                    prev_start = prev_end - timedelta(days=period_days - 1)
+            def revenue(alias: str) -> str:
+                return f"CAST(ROUND(COALESCE({alias}.revenue, 0), 2) AS DOUBLE)"
 
-                if use_products:
-                    prev_sql, prev_params = self._build_silver_products_revenue_query(
-                        prev_start, prev_end, sales_type, source_id, cat_ids, brand, promocode
-                    )
-                else:
-                    prev_sql, prev_params = self._build_gold_revenue_query(
-                        prev_start, prev_end, sales_type, source_id
-                    )
-
-                # Only need day + revenue for comparison
-                prev_results = conn.execute(prev_sql, prev_params).fetchall()
-                prev_daily = {row[0]: float(row[1]) for row in prev_results}
-
-                prev_data = []
-                prev_current = prev_start
-                while prev_current <= prev_end:
-                    prev_data.append(round(prev_daily.get(prev_current, 0), 2))
-                    prev_current += timedelta(days=1)
-
-                datasets.append({
-                    "label": "Previous Period",
-                    "data": prev_data,
-                    "borderColor": "#9CA3AF",
-                    "backgroundColor": "rgba(156, 163, 175, 0.1)",
-                    "fill": False,
-                    "tension": 0.3,
-                    "borderWidth": 2,
-                    "borderDash": [5, 5]
-                })
+            kinds = list(windows)
+            aliases = [f"cmp{i}" for i in range(len(kinds))]
+            compared_sql = "".join(f",\n                       {revenue(a)}" for a in aliases)
+            joins_sql = "".join(
+                f"\n                LEFT JOIN daily {a} ON {a}.day = ?::DATE + s.i" for a in aliases
+            )
+            rows = conn.execute(f"""
+                WITH daily(day, revenue, order_count) AS ({daily_sql}),
+                spine AS (SELECT CAST(i AS INTEGER) AS i FROM generate_series(0, ? - 1) t(i))
+                SELECT strftime(?::DATE + s.i, '%d.%m'),
+                       {revenue('cur')},
+                       CAST(COALESCE(cur.order_count, 0) AS BIGINT){compared_sql}
+                FROM spine s
+                LEFT JOIN daily cur ON cur.day = ?::DATE + s.i{joins_sql}
+                ORDER BY s.i
+            """, params + [
+                span, start_date, start_date, *(windows[kind][0] for kind in kinds),
+            ]).fetchall()
+
+        labels, current, orders, *compared = (list(col) for col in zip(*rows))
+        return {
+            "labels": labels[:period_days],
+            "revenue": current[:period_days],
+            "orders": orders[:period_days],
+            **{
+                kind: {
+                    "start": windows[kind][0],
+                    "end": windows[kind][1],
+                    "revenue": series[:lengths[kind]],
+                }
+                for kind, series in zip(kinds, compared)
+            },
+        }
+
+    async def get_comparison_revenue_for_dates(
+        self,
+        dates: List[date],
+        compare_type: str = "year_ago",
+        sales_type: str = "retail",
+    ) -> Dict[date, float]:
+        """Comparison revenue for arbitrary dates, each shifted on its own.
+
+        For the forecast days appended past the end of a trend: those are not a
+        window, so each date is shifted individually (2026-03-31 a month ago is
+        2026-02-28). Reads the same Gold rows as `get_revenue_series`, so the
+        appended points continue the comparison line rather than re-deriving it
+        from raw orders.
+        """
+        if not dates:
+            return {}
+
+        shift = {"year_ago": "INTERVAL 1 YEAR", "month_ago": "INTERVAL 1 MONTH"}.get(compare_type)
+        shifted = f"CAST(d.day - {shift} AS DATE)" if shift else f"d.day - {len(dates)}"
+        lo = min(dates) - timedelta(days=max(366, len(dates)))
+
+        async with self.read_connection() as conn:
+            daily_sql, params = self._build_gold_revenue_query(lo, max(dates), sales_type)
+            rows = conn.execute(f"""
+                WITH daily(day, revenue, order_count) AS ({daily_sql})
+                SELECT d.day, CAST(COALESCE(daily.revenue, 0) AS DOUBLE)
+                FROM (SELECT UNNEST(?::DATE[]) AS day) d
+                LEFT JOIN daily ON daily.day = {shifted}
+            """, params + [list(dates)]).fetchall()
+        return dict(rows)
+
+    async def get_revenue_trend(
+        self,
+        start_date: date,
+        end_date: date,
+        source_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+        brand: Optional[str] = None,
+        include_comparison: bool = True,
+        sales_type: str = "retail",
+        compare_type: str = "previous_period",
+        promocode: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Get daily revenue trend for chart (from Gold layer)."""
+        compared_kind = compare_type if compare_type in ("month_ago", "year_ago") else "previous_period"
+        series = await self.get_revenue_series(
+            start_date, end_date,
+            source_id=source_id, category_id=category_id, brand=brand,
+            sales_type=sales_type, promocode=promocode,
+            compare_types=(compared_kind,) if include_comparison else (),
+        )
+        labels, data = series["labels"], series["revenue"]
+
+        datasets = [{
+            "label": "This Period",
+            "data": data,
+            "borderColor": "#16A34A",
+            "backgroundColor": "rgba(22, 163, 74, 0.1)",
+            "fill": True,
+            "tension": 0.3,
+            "borderWidth": 2
+        }]
+
+        result = {
+            "labels": labels,
+            "revenue": data,
+            "orders": series["orders"],
+            "datasets": datasets
+        }
+
+        # Add previous period comparison
+        if include_comparison:
+            compared = series[compared_kind]
+            prev_data = compared["revenue"]
+            datasets.append({
+                "label": "Previous Period",
+                "data": prev_data,
+                "borderColor": "#9CA3AF",
+                "backgroundColor": "rgba(156, 163, 175, 0.1)",
+                "fill": False,
+                "tension": 0.3,
+                "borderWidth": 2,
+                "borderDash": [5, 5]
+            })
 
             # Build comparison object for v2 frontend
-            comparison = None
-            if include_comparison and len(datasets) > 1:
-                prev_dataset = datasets[1]
-                current_total = sum(data)
-                prev_total = sum(prev_dataset["data"])
-                growth_percent = ((current_total - prev_total) / prev_total * 100) if prev_total > 0 else 0
-
-                comparison = {
-                    "labels": labels,
-                    "revenue": prev_dataset["data"],
-                    "orders": [],
-                    "period": {
-                        "start": prev_start.isoformat(),
-                        "end": prev_end.isoformat(),
-                        "type": compare_type
-                    },
-                    "totals": {
-                        "current": round(current_total, 2),
-                        "previous": round(prev_total, 2),
-                        "growth_percent": round(growth_percent, 1)
-                    }
-                }
+            current_total = sum(data)
+            prev_total = sum(prev_data)
+            growth_percent = ((current_total - prev_total) / prev_total * 100) if prev_total > 0 else 0
 
-            result = {
+            result["comparison"] = {
                 "labels": labels,
-                "revenue": data,
-                "orders": orders_data,
-                "datasets": datasets
+                "revenue": prev_data,
+                "orders": [],
+                "period": {
+                    "start": compared["start"].isoformat(),
+                    "end": compared["end"].isoformat(),
+                    "type": compare_type
+                },
+                "totals": {
+                    "current": round(current_total, 2),
+                    "previous": round(prev_total, 2),
+                    "growth_percent": round(growth_percent, 1)
+                }
             }
-            if comparison:
-                result["comparison"] = comparison
-            return result
+        return result
 
     async def get_sales_by_source(
         self,
@@ -471,7 +553,7 @@ class RevenueMixin:
         sales_type: str = "retail"
     ) -> Dict[str, Any]:
         """Get sales breakdown by source (from Gold/Silver layers)."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             source_names = {1: "Instagram", 2: "Telegram", 4: "Shopify"}
             source_colors = {1: "#7C3AED", 2: "#2563EB", 4: "#eb4200"}
 
@@ -572,7 +654,7 @@ class RevenueMixin:
         sales_type: str = "retail"
     ) -> Dict[str, Any]:
         """Get top products by quantity (from Gold layer)."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             if promocode:
                 # Silver path: gold_daily_products lacks promocode
                 silver_params = [start_date, end_date]
@@ -655,7 +737,7 @@ class RevenueMixin:
 
     async def get_categories(self) -> List[Dict[str, Any]]:
         """Get root categories for filter dropdown."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             results = conn.execute("""
                 SELECT id, name FROM categories
                 WHERE parent_id IS NULL
@@ -665,7 +747,7 @@ class RevenueMixin:
 
     async def get_child_categories(self, parent_id: int) -> List[Dict[str, Any]]:
         """Get child categories for a parent."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             results = conn.execute("""
                 SELECT id, name FROM categories
                 WHERE parent_id = ?
@@ -675,7 +757,7 @@ class RevenueMixin:
 
     async def get_brands(self) -> List[Dict[str, str]]:
         """Get all unique brands for filter dropdown."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             results = conn.execute("""
                 SELECT DISTINCT brand FROM products
                 WHERE brand IS NOT NULL AND brand != ''
@@ -685,7 +767,7 @@ class RevenueMixin:
 
     async def get_promocodes(self) -> List[Dict[str, str]]:
         """Get all unique promocodes for filter dropdown."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             results = conn.execute("""
                 SELECT DISTINCT promocode FROM silver_orders
                 WHERE promocode IS NOT NULL AND promocode != ''
@@ -754,7 +836,7 @@ class RevenueMixin:
         sales_type: str = "retail"
     ) -> Dict[str, Any]:
         """Get product performance: top by revenue, category breakdown (from Gold layer)."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             if promocode:
                 # Silver path: gold_daily_products lacks promocode
                 silver_params = [start_date, end_date]
@@ -878,7 +960,7 @@ class RevenueMixin:
         sales_type: str = "retail"
     ) -> Dict[str, Any]:
         """Get sales breakdown by subcategories for a given parent category."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             params = [start_date, end_date]
             # This was the last query in the file reading raw `orders`, with its
             # own date conversion, its own return-status list and its own copy of
@@ -952,7 +1034,7 @@ class RevenueMixin:
         sales_type: str = "retail"
     ) -> Dict[str, Any]:
         """Get brand analytics: top brands by revenue and quantity (from Gold layer)."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             params = [start_date, end_date]
             where_clauses = ["g.date BETWEEN ? AND ?"]
 
@@ -1035,7 +1117,7 @@ class RevenueMixin:
         """Get per-source breakdown report for a date range."""
         source_names = {1: "Instagram", 2: "Telegram", 4: "Shopify"}
 
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             params: list = [start_date, end_date]
             where_clauses = ["s.order_date BETWEEN ? AND ?", "s.is_active_source"]
 
@@ -1170,7 +1252,7 @@ class RevenueMixin:
         limit: int = 10,
     ) -> List[Dict[str, Any]]:
         """Get top products report with rank, quantity, revenue, orders."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             params: list = [start_date, end_date]
             where_clauses = ["l.order_date BETWEEN ? AND ?", "NOT l.is_return", "l.is_active_source"]
 
@@ -1234,7 +1316,7 @@ class RevenueMixin:
         """Get all products grouped by source (matches bot Excel format)."""
         source_names = {1: "Instagram", 2: "Telegram", 4: "Shopify"}
 
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             params: list = [start_date, end_date]
             where_clauses = ["l.order_date BETWEEN ? AND ?", "NOT l.is_return", "l.is_active_source"]
 
@@ -1280,7 +1362,7 @@ class RevenueMixin:
         sales_type: str = "retail",
     ) -> Dict[str, Any]:
         """Get promocode performance overview: top codes by revenue, orders, AOV."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             params = [start_date, end_date]
             where_clauses = [
                 "s.order_date BETWEEN ? AND ?",
@@ -1419,7 +1501,7 @@ class RevenueMixin:
         yoy_start = start_date.replace(year=start_date.year - 1)
         yoy_end = end_date.replace(year=end_date.year - 1)
 
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             sales_where = "sales_type = ?" if sales_type != "all" else "1=1"
             sales_params = [sales_type] if sales_type != "all" else []
 
@@ -9,6 +9,40 @@ from typing import Optional, List, Dict, Any, Tuple
 logger = logging.getLogger(__name__)
 
 
+# gold_daily_traffic from the two Silver tables. Module level so the warehouse
+# refresh can build it on its own cursor alongside the other Gold tables;
+# `{date_filter}` is a predicate over s.order_date ("TRUE" for every date).
+#
+# GROUP BY must repeat the COALESCE expressions explicitly. Using just the
+# alias name is ambiguous in DuckDB (may resolve to the raw u.platform
+# column), and NULL != 'other' creates separate groups that both map to
+# 'other' after COALESCE → PK violation.
+_TRAFFIC_PLATFORM_EXPR = """COALESCE(u.platform,
+    CASE s.source_id WHEN 1 THEN 'instagram' WHEN 2 THEN 'telegram' ELSE 'other' END)"""
+_TRAFFIC_TYPE_EXPR = """COALESCE(u.traffic_type,
+    CASE WHEN s.source_id IN (1, 2) THEN 'organic' ELSE 'unknown' END)"""
+
+GOLD_TRAFFIC_INSERT_SQL = f"""
+INSERT INTO gold_daily_traffic
+SELECT
+    s.order_date AS date,
+    s.source_id,
+    s.sales_type,
+    {_TRAFFIC_PLATFORM_EXPR} AS platform,
+    {_TRAFFIC_TYPE_EXPR} AS traffic_type,
+    COUNT(DISTINCT s.id) AS orders_count,
+    COALESCE(SUM(s.grand_total), 0) AS revenue
+FROM silver_orders s
+LEFT JOIN silver_order_utm u ON s.id = u.order_id
+WHERE NOT s.is_return
+  AND s.is_active_source
+  AND s.order_date IS NOT NULL
+  AND {{date_filter}}
+GROUP BY s.order_date, s.source_id, s.sales_type,
+         {_TRAFFIC_PLATFORM_EXPR}, {_TRAFFIC_TYPE_EXPR}
+"""
+
+
 class TrafficMixin:
 
     # A pair value runs until a semicolon, newline, or the next ", key:" pair
@@ -300,36 +334,6 @@ class TrafficMixin:
         Returns:
             Number of rows in gold_daily_traffic
         """
-        _traffic_select = """
-            SELECT
-                s.order_date AS date,
-                s.source_id,
-                s.sales_type,
-                COALESCE(u.platform,
-                    CASE s.source_id WHEN 1 THEN 'instagram' WHEN 2 THEN 'telegram' ELSE 'other' END
-                ) AS platform,
-                COALESCE(u.traffic_type,
-                    CASE WHEN s.source_id IN (1, 2) THEN 'organic' ELSE 'unknown' END
-                ) AS traffic_type,
-                COUNT(DISTINCT s.id) AS orders_count,
-                COALESCE(SUM(s.grand_total), 0) AS revenue
-            FROM silver_orders s
-            LEFT JOIN silver_order_utm u ON s.id = u.order_id
-            WHERE NOT s.is_return
-              AND s.is_active_source
-              AND s.order_date IS NOT NULL
-        """
-
-        # GROUP BY must repeat the COALESCE expressions explicitly.
-        # Using just the alias name is ambiguous in DuckDB (may resolve
-        # to the raw u.platform column), and NULL != 'other' creates
-        # separate groups that both map to 'other' after COALESCE → PK violation.
-        _platform_expr = """COALESCE(u.platform,
-            CASE s.source_id WHEN 1 THEN 'instagram' WHEN 2 THEN 'telegram' ELSE 'other' END)"""
-        _traffic_type_expr = """COALESCE(u.traffic_type,
-            CASE WHEN s.source_id IN (1, 2) THEN 'organic' ELSE 'unknown' END)"""
-        _group_by = f"GROUP BY s.order_date, s.source_id, s.sales_type, {_platform_expr}, {_traffic_type_expr}"
-
         async with self.connection() as conn:
             conn.execute("BEGIN TRANSACTION")
             try:
@@ -337,19 +341,15 @@ class TrafficMixin:
                     date_params = list(affected_dates)
                     date_placeholders = ",".join("?" * len(date_params))
                     conn.execute(f"DELETE FROM gold_daily_traffic WHERE date IN ({date_placeholders})", date_params)
-                    conn.execute(f"""
-                        INSERT INTO gold_daily_traffic
-                        {_traffic_select}
-                          AND s.order_date IN ({date_placeholders})
-                        {_group_by}
-                    """, date_params)
+                    conn.execute(
+                        GOLD_TRAFFIC_INSERT_SQL.format(
+                            date_filter=f"s.order_date IN ({date_placeholders})",
+                        ),
+                        date_params,
+                    )
                 else:
                     conn.execute("DELETE FROM gold_daily_traffic")
-                    conn.execute(f"""
-                        INSERT INTO gold_daily_traffic
-                        {_traffic_select}
-                        {_group_by}
-                    """)
+                    conn.execute(GOLD_TRAFFIC_INSERT_SQL.format(date_filter="TRUE"))
 
                 row_count = conn.execute("SELECT COUNT(*) FROM gold_daily_traffic").fetchone()[0]
                 conn.execute("COMMIT")
@@ -766,7 +766,7 @@ class TrafficMixin:
 
         where_clause = " AND ".join(filters)
 
-        # GROUP BY must repeat the COALESCE expressions (see refresh_traffic_gold_layer)
+        # GROUP BY must repeat the COALESCE expressions (see GOLD_TRAFFIC_INSERT_SQL)
         campaign_expr = "COALESCE(u.utm_campaign, '')"
         platform_expr = """COALESCE(u.platform,
             CASE s.source_id WHEN 1 THEN 'instagram' WHEN 2 THEN 'telegram' ELSE 'other' END)"""
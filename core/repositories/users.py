@@ -8,10 +8,16 @@ logger = logging.getLogger(__name__)
 
 
 class UsersMixin:
+    """Users and role permissions.
+
+    Every method that writes either table bumps `users_generation` once its
+    connection is released, so sessions resolved from the cache see the
+    change on their next request.
+    """
 
     async def get_user(self, user_id: int) -> Optional[Dict[str, Any]]:
         """Get user by ID."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             row = conn.execute("""
                 SELECT user_id, username, first_name, last_name, photo_url,
                        role, status, requested_at, reviewed_at, reviewed_by,
@@ -40,7 +46,7 @@ class UsersMixin:
 
     async def get_user_by_status(self, status: str) -> List[Dict[str, Any]]:
         """Get all users with a given status."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             rows = conn.execute("""
                 SELECT user_id, username, first_name, last_name, photo_url,
                        role, status, requested_at, reviewed_at, last_activity
@@ -85,7 +91,7 @@ class UsersMixin:
         where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
         params.extend([limit, offset])
 
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             rows = conn.execute(f"""
                 SELECT user_id, username, first_name, last_name, photo_url,
                        role, status, requested_at, reviewed_at, last_activity
@@ -139,6 +145,7 @@ class UsersMixin:
                     last_name = COALESCE(excluded.last_name, users.last_name),
                     photo_url = COALESCE(excluded.photo_url, users.photo_url)
             """, [user_id, username, first_name, last_name, photo_url, status, role])
+        self.bump_users_generation()
 
         return await self.get_user(user_id)
 
@@ -159,8 +166,9 @@ class UsersMixin:
                 WHERE user_id = ?
                 RETURNING user_id
             """, [role, changed_by, user_id]).fetchone()
+        self.bump_users_generation()
 
-            return result is not None
+        return result is not None
 
     async def update_user_status(
         self,
@@ -189,8 +197,9 @@ class UsersMixin:
                     WHERE user_id = ?
                     RETURNING user_id
                 """, [status, reviewed_by, user_id]).fetchone()
+        self.bump_users_generation()
 
-            return result is not None
+        return result is not None
 
     async def update_user_activity(self, user_id: int) -> bool:
         """Update user's last activity timestamp. Returns True if updated."""
@@ -229,8 +238,9 @@ class UsersMixin:
                     reviewed_at = CURRENT_TIMESTAMP, reviewed_by = ?
                 WHERE user_id = ?
             """, [new_status, new_count, admin_id, user_id])
+        self.bump_users_generation()
 
-            return True, is_frozen
+        return True, is_frozen
 
     async def update_last_activity(self, user_id: int) -> None:
         """Update user's last activity timestamp."""
@@ -243,7 +253,7 @@ class UsersMixin:
 
     async def is_user_authorized(self, user_id: int) -> bool:
         """Check if user is authorized (approved status)."""
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             row = conn.execute(
                 "SELECT status FROM users WHERE user_id = ?", [user_id]
             ).fetchone()
@@ -266,7 +276,7 @@ class UsersMixin:
 
         Returns dict of feature -> {view: bool, edit: bool, delete: bool}
         """
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             rows = conn.execute("""
                 SELECT feature, can_view, can_edit, can_delete
                 FROM role_permissions
@@ -288,7 +298,7 @@ class UsersMixin:
 
         Returns dict of role -> feature -> {view: bool, edit: bool, delete: bool}
         """
-        async with self.connection() as conn:
+        async with self.read_connection() as conn:
             rows = conn.execute("""
                 SELECT role, feature, can_view, can_edit, can_delete
                 FROM role_permissions
@@ -328,7 +338,8 @@ class UsersMixin:
                     updated_at = excluded.updated_at,
                     updated_by = excluded.updated_by
             """, [role, feature, can_view, can_edit, can_delete, updated_by])
-            return True
+        self.bump_users_generation()
+        return True
 
     async def seed_default_permissions(self) -> None:
         """Seed default permissions if table is empty."""
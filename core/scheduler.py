@@ -770,7 +770,7 @@ class BackgroundScheduler:
                 from core.prediction_service import get_prediction_service
                 service = get_prediction_service()
 
-                result = await service.train(sales_type="retail")
+                result = await service.train_all()
 
                 logger.info(
                     "Revenue prediction job complete",
@@ -1661,9 +1661,10 @@ class BackgroundScheduler:
         drains them a batch at a time until there is nothing left to ask for.
         """
         from core.duckdb_store import get_store
+        from core.keycrm import Priority, keycrm_priority
         from core.sync_service import get_sync_service
 
-        with correlation_context():
+        with correlation_context(), keycrm_priority(Priority.BACKGROUND):
             store = await get_store()
             gaps = await store.find_order_id_gaps(limit=200)
             if not gaps:
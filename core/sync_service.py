@@ -10,11 +10,15 @@ Features:
 - Observability: Correlation IDs and timing metrics
 """
 import asyncio
+import time
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import AsyncIterator, Optional, Dict, Any, Tuple
 from zoneinfo import ZoneInfo
 
-from core.keycrm import get_async_client
+from core.config import memory_limit_bytes, workers_from_env
+from core.keycrm import (
+    Priority, get_async_client, paginate_prefetch, with_keycrm_priority,
+)
 from core.duckdb_store import get_store, DuckDBStore
 from core.exceptions import KeyCRMError, KeyCRMConnectionError, KeyCRMAPIError
 from core.observability import get_logger, correlation_context
@@ -26,13 +30,163 @@ from core.events import (
     emit_sync_failed,
     emit_orders_synced,
 )
-from core.meilisearch_client import get_meili_client, init_meilisearch
+from core.meilisearch_client import (
+    DEFAULT_MEILI_IN_FLIGHT, get_meili_client, init_meilisearch,
+)
 from bot.config import DEFAULT_TIMEZONE
 
 logger = get_logger(__name__)
 
 DEFAULT_TZ = ZoneInfo(DEFAULT_TIMEZONE)
 
+# Full sync walks history in windows this long. KeyCRM stops paginating at 100
+# pages × 50, so a window has to stay well under 5000 orders.
+FULL_SYNC_CHUNK_DAYS = 30
+
+# Windows fetched side by side while the writer upserts the one before them.
+# Fetching a chunk is a few hundred paced KeyCRM requests and writing it is one
+# DuckDB upsert plus a CHECKPOINT; run in a row, each side sat idle for the
+# whole of the other. Every fetcher draws on the one KeyCRM rate governor, so
+# more of them hide DuckDB's time, not KeyCRM's limit.
+DEFAULT_FULL_SYNC_FETCHERS = 2
+
+# A fetched window waits for the writer as parsed JSON — orders with products,
+# buyer and expenses included. This is a generous estimate of one 30-day window
+# on that side. It sits outside DuckDB's memory limit but inside the same
+# container, so the number of windows waiting is capped at an eighth of that
+# limit, and never more than FULL_SYNC_MAX_QUEUED_CHUNKS.
+FULL_SYNC_CHUNK_BYTES = 64 * 1024 * 1024
+FULL_SYNC_QUEUE_SHARE = 8
+FULL_SYNC_MAX_QUEUED_CHUNKS = 4
+
+# A full sync that died records the window it would have written next. Within
+# this long a restart carries on from there; after it, the committed windows
+# are old enough that re-checking them is the point of running one.
+FULL_SYNC_RESUME_MAX_AGE = timedelta(hours=24)
+
+
+def _full_sync_fetchers() -> int:
+    """Resolve the window fetch concurrency from FULL_SYNC_FETCHERS (min 1)."""
+    return max(1, workers_from_env("FULL_SYNC_FETCHERS", DEFAULT_FULL_SYNC_FETCHERS))
+
+
+def _full_sync_queue_depth() -> int:
+    """How many fetched windows may wait for the writer, from DUCKDB_MEMORY_LIMIT."""
+    budget = memory_limit_bytes() // FULL_SYNC_QUEUE_SHARE
+    return max(1, min(FULL_SYNC_MAX_QUEUED_CHUNKS, budget // FULL_SYNC_CHUNK_BYTES))
+
+
+def _full_sync_windows(
+    start: datetime, end: datetime, chunk_days: int = FULL_SYNC_CHUNK_DAYS,
+) -> list[tuple[datetime, datetime]]:
+    """[start, end) cut into windows; each begins the day after the last ended.
+
+    The date filters are inclusive day strings, so back-to-back windows sharing
+    a boundary day would fetch it twice.
+    """
+    windows = []
+    while start < end:
+        stop = min(start + timedelta(days=chunk_days), end)
+        windows.append((start, stop))
+        start = stop + timedelta(days=1)
+    return windows
+
+
+# Documents per Meilisearch page: one NDJSON body, one add-documents task.
+# Pages follow the id, so a full reindex reads each row once however many
+# pages it takes.
+MEILI_PAGE_SIZE = 10_000
+
+
+def _meili_in_flight() -> int:
+    """Resolve the Meili batches kept in flight from MEILI_IN_FLIGHT (min 1)."""
+    return max(1, workers_from_env("MEILI_IN_FLIGHT", DEFAULT_MEILI_IN_FLIGHT))
+
+
+def _iso_sql(column: str) -> str:
+    """SQL rendering a TIMESTAMPTZ as Python's UTC isoformat() would.
+
+    "2026-09-01T10:00:00+00:00", with ".ffffff" only when there are
+    microseconds to show. NULL stays NULL, and so null in the document.
+    """
+    utc = f"timezone('UTC', {column})"
+    return (
+        f"strftime({utc}, '%Y-%m-%dT%H:%M:%S')"
+        f" || CASE WHEN microsecond({utc}) % 1000000 <> 0"
+        f" THEN strftime({utc}, '.%f') ELSE '' END || '+00:00'"
+    )
+
+
+# One JSON document per row, rendered by DuckDB. An incremental sync appends
+# its WHERE clause. Every query exposes `id` for the pager to follow.
+MEILI_BUYERS_SQL = """
+    SELECT b.id, to_json({
+        'id': b.id, 'full_name': b.full_name, 'phone': b.phone,
+        'email': b.email, 'city': b.city, 'note': b.note,
+        'manager_id': b.manager_id, 'created_at': """ + _iso_sql("b.created_at") + """,
+        'order_count': COALESCE(st.orders, 0)
+    }) AS doc
+    FROM buyers b
+    LEFT JOIN silver_buyer_stats st
+        ON st.buyer_id = b.id AND st.sales_type = 'all'
+"""
+
+MEILI_ORDERS_SQL = """
+    SELECT o.id, to_json({
+        'id': o.id, 'grand_total': o.grand_total,
+        'ordered_at': """ + _iso_sql("o.ordered_at") + """, 'status_id': o.status_id,
+        'source_name': o.source_name, 'buyer_id': o.buyer_id,
+        'order_date': o.order_date, 'buyer_name': b.full_name
+    }) AS doc
+    FROM silver_orders o
+    LEFT JOIN buyers b ON o.buyer_id = b.id
+"""
+
+MEILI_PRODUCTS_SQL = """
+    SELECT p.id, to_json({
+        'id': p.id, 'name': p.name, 'sku': p.sku, 'brand': p.brand,
+        'price': p.price, 'category_id': p.category_id,
+        'category_name': c.name
+    }) AS doc
+    FROM products p
+    LEFT JOIN categories c ON p.category_id = c.id
+"""
+
+
+async def _ndjson_pages(
+    store: DuckDBStore, docs_sql: str, params: list, page_size: int = MEILI_PAGE_SIZE,
+) -> AsyncIterator[Tuple[int, bytes]]:
+    """Yield (count, NDJSON body) pages of `docs_sql`, in id order.
+
+    Each page resumes after the last id of the one before, so no page re-reads
+    or re-sorts the rows already sent — unlike LIMIT/OFFSET, where every page
+    ordered everything up to its offset again. A page first finds its last id
+    over the ids alone, then renders just the rows in that range: a LIMIT over
+    the documents themselves would render every remaining row to sort them.
+
+    The body is joined in DuckDB and never becomes Python rows; a reader
+    cursor is held per page only, not while the page is uploaded.
+    """
+    bound_sql = f"""
+        SELECT MAX(id) FROM (
+            SELECT id FROM ({docs_sql}) AS docs WHERE id > ? ORDER BY id LIMIT ?
+        )
+    """
+    page_sql = f"""
+        SELECT COUNT(*), string_agg(doc, chr(10) ORDER BY id)
+        FROM ({docs_sql}) AS docs WHERE id > ? AND id <= ?
+    """
+    after = -1
+    while True:
+        async with store.read_connection() as conn:
+            last = conn.execute(bound_sql, [*params, after, page_size]).fetchone()[0]
+            if last is None:
+                return
+            count, body = conn.execute(page_sql, [*params, after, last]).fetchone()
+        if count:
+            yield count, body.encode()
+        after = last
+
 
 def _get_max_updated_at(orders: list) -> Optional[datetime]:
     """
@@ -177,6 +331,8 @@ class SyncService:
             include_updated: If True, also fetch by updated_between (for incremental sync)
         """
         orders_by_id = {}
+        # These scans are latency-bound — see DEFAULT_PAGINATE_PREFETCH.
+        prefetch = paginate_prefetch()
 
         # Fetch by created_between
         logger.debug(f"Fetching orders created between {start_date} and {end_date}")
@@ -184,7 +340,9 @@ class SyncService:
             "include": include,
             "filter[created_between]": f"{start_date}, {end_date}",
         }
-        async for batch in client.paginate("order", params=params, page_size=50):
+        async for batch in client.paginate(
+            "order", params=params, page_size=50, prefetch=prefetch,
+        ):
             for order in batch:
                 orders_by_id[order["id"]] = order
 
@@ -198,7 +356,9 @@ class SyncService:
                 "filter[updated_between]": f"{start_date}, {end_date}",
             }
             try:
-                async for batch in client.paginate("order", params=params, page_size=50):
+                async for batch in client.paginate(
+                    "order", params=params, page_size=50, prefetch=prefetch,
+                ):
                     for order in batch:
                         orders_by_id[order["id"]] = order  # Overwrites with latest data
             except KeyCRMError as e:
@@ -215,6 +375,7 @@ class SyncService:
         self, orders: list, force_update: bool = False, skip_products: bool = False,
         bronze_source: str = "sync_delta",
         changed_ids_out: "list[int] | None" = None,
+        skip_unchanged_payload: bool = False,
     ) -> tuple:
         """Upsert orders and their expenses.
 
@@ -235,6 +396,8 @@ class SyncService:
                           incremental sync needs to know what moved. In staging
                           mode nothing is written to `orders` here, so it stays
                           empty and the promotion job owns dirtiness.
+            skip_unchanged_payload: With force_update, write only orders whose
+                          payload_hash moved (see DuckDBStore.upsert_orders).
 
         Returns:
             Tuple of (order_count, expense_count)
@@ -278,6 +441,7 @@ class SyncService:
         # Legacy mode: direct upsert to orders table
         result = await self.store.upsert_orders(
             orders, force_update=force_update, skip_products=skip_products,
+            skip_unchanged_payload=skip_unchanged_payload,
         )
         if changed_ids_out is not None:
             changed_ids_out.extend(result.changed_ids)
@@ -321,6 +485,7 @@ class SyncService:
             logger.error(f"Manager sync error: {e}")
             return 0
 
+    @with_keycrm_priority(Priority.BACKGROUND)
     async def sync_missing_buyers(self, limit: int = 500) -> int:
         """
         Sync buyers that are referenced in orders but not yet in buyers table.
@@ -430,7 +595,9 @@ class SyncService:
         Incremental: uses `synced_at` as a watermark. On the 5-minute scheduler
         tick, only rows touched since the last successful Meili sync are pushed
         — a no-op tick costs one MAX(synced_at) query, not a full 37K re-index.
-        First run (no watermark) falls back to a full sync.
+        First run (no watermark) falls back to a full sync. A batch Meilisearch
+        did not apply ends the sync before the watermark moves, so the next
+        tick sends the same rows again.
 
         Returns:
             Dict with counts for each synced entity
@@ -464,120 +631,41 @@ class SyncService:
                 "full" if full_sync else f"incremental since {last_sync.isoformat()}"
             )
 
-            # ── Buyers ─────────────────────────────────────────────────────
-            # Incremental: only buyers whose row was re-synced (profile edit)
-            # OR whose order activity was re-synced (order_count changed).
-            async with self.store.connection() as conn:
-                if full_sync:
-                    buyers_df = conn.execute("""
-                        SELECT
-                            b.id, b.full_name, b.phone, b.email, b.city, b.note,
-                            b.manager_id, b.created_at,
-                            COUNT(DISTINCT o.id) as order_count
-                        FROM buyers b
-                        LEFT JOIN silver_orders o ON b.id = o.buyer_id AND NOT o.is_return
-                        GROUP BY b.id, b.full_name, b.phone, b.email, b.city,
-                                 b.note, b.manager_id, b.created_at
-                    """).fetchdf()
-                else:
-                    buyers_df = conn.execute("""
-                        WITH touched AS (
+            exports = [
+                ("buyers", MEILI_BUYERS_SQL, []),
+                ("orders", MEILI_ORDERS_SQL, []),
+                ("products", MEILI_PRODUCTS_SQL, []),
+            ]
+            if not full_sync:
+                exports = [
+                    # Buyers whose row was re-synced (profile edit) OR whose
+                    # order activity was re-synced (order_count changed).
+                    ("buyers", MEILI_BUYERS_SQL + """
+                        WHERE b.id IN (
                             SELECT id FROM buyers WHERE synced_at > ?
                             UNION
-                            SELECT DISTINCT buyer_id AS id FROM orders
+                            SELECT buyer_id FROM orders
                             WHERE synced_at > ? AND buyer_id IS NOT NULL
                         )
-                        SELECT
-                            b.id, b.full_name, b.phone, b.email, b.city, b.note,
-                            b.manager_id, b.created_at,
-                            COUNT(DISTINCT o.id) as order_count
-                        FROM buyers b
-                        JOIN touched t ON t.id = b.id
-                        LEFT JOIN silver_orders o ON b.id = o.buyer_id AND NOT o.is_return
-                        GROUP BY b.id, b.full_name, b.phone, b.email, b.city,
-                                 b.note, b.manager_id, b.created_at
-                    """, [last_sync, last_sync]).fetchdf()
-
-                if not buyers_df.empty:
-                    if 'created_at' in buyers_df.columns:
-                        buyers_df['created_at'] = buyers_df['created_at'].apply(
-                            lambda x: x.isoformat() if x else None
-                        )
-                    stats["buyers"] = await meili.index_buyers(buyers_df.to_dict('records'))
-
-            # ── Orders ─────────────────────────────────────────────────────
-            MEILI_CHUNK = 10_000
-            offset = 0
-            while True:
-                async with self.store.connection() as conn:
-                    if full_sync:
-                        orders_df = conn.execute("""
-                            SELECT
-                                o.id, o.grand_total, o.ordered_at, o.status_id,
-                                o.source_name, o.buyer_id, o.order_date,
-                                b.full_name as buyer_name
-                            FROM silver_orders o
-                            LEFT JOIN buyers b ON o.buyer_id = b.id
-                            ORDER BY o.ordered_at DESC
-                            LIMIT ? OFFSET ?
-                        """, [MEILI_CHUNK, offset]).fetchdf()
-                    else:
-                        # silver_orders doesn't have synced_at; join to bronze orders.
-                        # Also catch orders whose buyer was renamed (buyers.synced_at moved)
-                        # so buyer_name in the Meili index doesn't go stale until that
-                        # buyer places another order.
-                        orders_df = conn.execute("""
-                            SELECT
-                                o.id, o.grand_total, o.ordered_at, o.status_id,
-                                o.source_name, o.buyer_id, o.order_date,
-                                b.full_name as buyer_name
-                            FROM silver_orders o
-                            LEFT JOIN orders src ON src.id = o.id
-                            LEFT JOIN buyers b ON o.buyer_id = b.id
-                            WHERE src.synced_at > ? OR b.synced_at > ?
-                            ORDER BY o.ordered_at DESC
-                            LIMIT ? OFFSET ?
-                        """, [last_sync, last_sync, MEILI_CHUNK, offset]).fetchdf()
-
-                if orders_df.empty:
-                    break
-
-                if 'ordered_at' in orders_df.columns:
-                    orders_df['ordered_at'] = orders_df['ordered_at'].apply(
-                        lambda x: x.isoformat() if x else None
-                    )
-                if 'order_date' in orders_df.columns:
-                    orders_df['order_date'] = orders_df['order_date'].apply(
-                        lambda x: x.isoformat() if x else None
-                    )
-                stats["orders"] += await meili.index_orders(orders_df.to_dict('records'))
-                offset += MEILI_CHUNK
-
-                if len(orders_df) < MEILI_CHUNK:
-                    break
-
-            # ── Products ───────────────────────────────────────────────────
-            async with self.store.connection() as conn:
-                if full_sync:
-                    products_df = conn.execute("""
-                        SELECT
-                            p.id, p.name, p.sku, p.brand, p.price, p.category_id,
-                            c.name as category_name
-                        FROM products p
-                        LEFT JOIN categories c ON p.category_id = c.id
-                    """).fetchdf()
-                else:
-                    products_df = conn.execute("""
-                        SELECT
-                            p.id, p.name, p.sku, p.brand, p.price, p.category_id,
-                            c.name as category_name
-                        FROM products p
-                        LEFT JOIN categories c ON p.category_id = c.id
+                    """, [last_sync, last_sync]),
+                    # silver_orders doesn't have synced_at; check bronze orders.
+                    # Also catch orders whose buyer was renamed (buyers.synced_at
+                    # moved) so buyer_name in the Meili index doesn't go stale
+                    # until that buyer places another order.
+                    ("orders", MEILI_ORDERS_SQL + """
+                        WHERE o.id IN (SELECT id FROM orders WHERE synced_at > ?)
+                           OR b.synced_at > ?
+                    """, [last_sync, last_sync]),
+                    ("products", MEILI_PRODUCTS_SQL + """
                         WHERE p.synced_at > ?
-                    """, [last_sync]).fetchdf()
+                    """, [last_sync]),
+                ]
 
-                if not products_df.empty:
-                    stats["products"] = await meili.index_products(products_df.to_dict('records'))
+            in_flight = _meili_in_flight()
+            for index_name, docs_sql, params in exports:
+                stats[index_name] = await meili.index_ndjson(
+                    index_name, _ndjson_pages(self.store, docs_sql, params), in_flight,
+                )
 
             logger.info(f"Meilisearch sync complete: {stats}")
             # Persist the watermark we actually covered, not wall-clock now().
@@ -592,6 +680,7 @@ class SyncService:
             logger.error(f"Meilisearch sync error: {e}")
             return stats
 
+    @with_keycrm_priority(Priority.BACKGROUND)
     async def full_sync(self, days_back: int = 730) -> Dict[str, Any]:
         """
         Perform full sync of all data from KeyCRM.
@@ -654,41 +743,24 @@ class SyncService:
             stats["products"] = await self.store.upsert_products(products)
             await self.store.set_last_sync_time("products")
 
-            # Sync orders with expenses - in chunks to avoid pagination limit (100 pages × 50 = 5000 orders max)
-            # IMPORTANT: Save each chunk immediately to preserve progress on timeout/crash
+            # Orders with expenses, window by window: fetchers run ahead while
+            # the writer commits in date order, and each committed window is
+            # recorded so a crash resumes after it instead of at day 0.
             logger.info("Syncing orders...")
             final_end_date = datetime.now(DEFAULT_TZ) + timedelta(days=1)
-            chunk_days = 30  # Sync in 1-month chunks to limit memory usage during bulk insert
-            chunk_num = 0
-
             current_start = datetime.now(DEFAULT_TZ) - timedelta(days=days_back)
 
-            while current_start < final_end_date:
-                chunk_num += 1
-                current_end = min(current_start + timedelta(days=chunk_days), final_end_date)
-                logger.info(f"Chunk {chunk_num}: Fetching orders from {current_start.strftime('%Y-%m-%d')} to {current_end.strftime('%Y-%m-%d')}...")
-
-                chunk_orders = await self._fetch_orders_with_date_filter(
-                    client,
-                    current_start.strftime('%Y-%m-%d'),
-                    current_end.strftime('%Y-%m-%d')
-                )
-                logger.info(f"  Chunk {chunk_num}: Got {len(chunk_orders)} orders, saving to DB...")
-
-                # Save chunk immediately to preserve progress
-                if chunk_orders:
-                    order_count, expense_count = await self._upsert_orders_with_expenses(
-                        chunk_orders, bronze_source="sync_full",
-                    )
-                    stats["orders"] += order_count
-                    stats["expenses"] += expense_count
-                    logger.info(f"  Chunk {chunk_num}: Saved {order_count} orders, {expense_count} expenses")
-
-                    # Force WAL checkpoint after each chunk to prevent WAL corruption
-                    # on aarch64 (DuckDB 1.4.x bug with large WAL files)
-                    await self.store.checkpoint()
+            resumed_from = None
+            progress = await self.store.get_full_sync_progress(FULL_SYNC_RESUME_MAX_AGE)
+            if progress is not None and progress > current_start:
+                resumed_from = progress.strftime('%Y-%m-%d')
+                logger.info(f"Resuming interrupted full sync from {resumed_from}")
+                current_start = progress
 
-                current_start = current_end + timedelta(days=1)
+            stats["pipeline"] = await self._sync_order_windows(
+                client, _full_sync_windows(current_start, final_end_date), stats,
+            )
+            stats["pipeline"]["resumed_from"] = resumed_from
 
             logger.info(f"All chunks complete. Total: {stats['orders']} orders, {stats['expenses']} expenses")
 
@@ -710,6 +782,7 @@ class SyncService:
             # Update sync checkpoint with latest order timestamp
             last_order_time = await self.store.get_latest_order_time()
             await self.store.set_last_sync_time("orders", last_order_time)
+            await self.store.set_full_sync_progress(None)
             logger.info(f"Full sync complete: {stats}, checkpoint: {last_order_time}")
 
         except KeyCRMConnectionError as e:
@@ -724,6 +797,118 @@ class SyncService:
 
         return stats
 
+    async def _sync_order_windows(
+        self, client, windows: list[tuple[datetime, datetime]], stats: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Fetch windows ahead on a few tasks; write them one at a time, in order.
+
+        Fetchers claim windows in date order, and each holds a slot from the
+        moment it claims one until the writer has committed it. So at most
+        fetchers + queue depth windows are in memory, and a fetcher that gets
+        ahead waits instead of piling windows up behind a slow write.
+
+        The writer commits in date order no matter which fetch finishes first,
+        which is what makes the recorded progress mean "everything before this
+        is written". A failed fetch is raised when the writer reaches that
+        window, after everything before it has been committed.
+
+        Returns per-stage timings. Fetch seconds are summed over the fetchers;
+        writer_wait is the time the writer spent waiting for the next window,
+        which is the part of the fetch the pipeline failed to hide.
+        """
+        fetchers = max(1, min(_full_sync_fetchers(), len(windows)))
+        depth = _full_sync_queue_depth()
+        slots = asyncio.Semaphore(fetchers + depth)
+        ready: Dict[int, Any] = {}
+        arrived = asyncio.Condition()
+        claims = iter(range(len(windows)))
+        timing = {"fetch": 0.0, "write": 0.0, "writer_wait": 0.0}
+        fetched_orders = 0
+
+        async def fetch_windows() -> None:
+            nonlocal fetched_orders
+            while True:
+                await slots.acquire()
+                idx = next(claims, None)
+                if idx is None:
+                    slots.release()
+                    return
+                start, end = windows[idx]
+                t0 = time.perf_counter()
+                try:
+                    result = await self._fetch_orders_with_date_filter(
+                        client, start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'),
+                    )
+                except Exception as e:
+                    result = e
+                else:
+                    timing["fetch"] += time.perf_counter() - t0
+                    fetched_orders += len(result)
+                async with arrived:
+                    ready[idx] = result
+                    arrived.notify_all()
+                if isinstance(result, Exception):
+                    return
+
+        wall_t0 = time.perf_counter()
+        written = 0
+        tasks = [asyncio.create_task(fetch_windows()) for _ in range(fetchers)]
+        try:
+            for idx, (start, end) in enumerate(windows):
+                t0 = time.perf_counter()
+                async with arrived:
+                    await arrived.wait_for(lambda i=idx: i in ready)
+                timing["writer_wait"] += time.perf_counter() - t0
+                chunk_orders = ready.pop(idx)
+                if isinstance(chunk_orders, Exception):
+                    raise chunk_orders
+
+                chunk_num = idx + 1
+                logger.info(
+                    f"  Chunk {chunk_num}/{len(windows)} ({start.strftime('%Y-%m-%d')} to "
+                    f"{end.strftime('%Y-%m-%d')}): got {len(chunk_orders)} orders, saving to DB..."
+                )
+                t0 = time.perf_counter()
+                if chunk_orders:
+                    order_count, expense_count = await self._upsert_orders_with_expenses(
+                        chunk_orders, bronze_source="sync_full",
+                    )
+                    stats["orders"] += order_count
+                    stats["expenses"] += expense_count
+                    written += order_count
+                    logger.info(f"  Chunk {chunk_num}: Saved {order_count} orders, {expense_count} expenses")
+
+                    # Force WAL checkpoint after each chunk to prevent WAL corruption
+                    # on aarch64 (DuckDB 1.4.x bug with large WAL files)
+                    await self.store.checkpoint()
+                await self.store.set_full_sync_progress(end + timedelta(days=1))
+                timing["write"] += time.perf_counter() - t0
+                del chunk_orders
+                slots.release()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        wall = time.perf_counter() - wall_t0
+
+        def rate(n: int, seconds: float) -> Optional[float]:
+            return round(n / seconds, 1) if seconds > 0 else None
+
+        return {
+            "chunks": len(windows),
+            "fetchers": fetchers,
+            "queue_depth": depth,
+            "fetched_orders": fetched_orders,
+            "fetch_seconds": round(timing["fetch"], 2),
+            "write_seconds": round(timing["write"], 2),
+            "writer_wait_seconds": round(timing["writer_wait"], 2),
+            "wall_seconds": round(wall, 2),
+            "fetch_orders_per_second": rate(fetched_orders, timing["fetch"]),
+            "write_orders_per_second": rate(written, timing["write"]),
+            "orders_per_second": rate(fetched_orders, wall),
+        }
+
     async def incremental_sync(self) -> Dict[str, Any]:
         """
         Perform incremental sync - only fetch new/updated data since last sync.
@@ -960,13 +1145,24 @@ class SyncService:
         so the incremental sync (which relies on updated_between) misses these.
         This method re-fetches orders by created_between to refresh all statuses.
 
+        Every fetched order is compared with what we hold by its payload_hash
+        (status and line items included), and only those that differ are
+        written and handed to the warehouse refresh. Forcing the whole window
+        used to rewrite ~2000 identical orders a run and rebuild Silver for
+        all of them.
+
         Args:
             days_back: Number of days to look back (default 30)
 
         Returns:
-            Dict with sync statistics
+            Dict with sync statistics; `written` and `unchanged` split `orders`.
+            In staging mode nothing is compared here: the orders are only
+            appended to Bronze, counted as `staged`, and the promotion job
+            decides what changed.
         """
-        stats = {"orders": 0, "expenses": 0, "days_back": days_back}
+        from core.config import config
+
+        stats = {"orders": 0, "written": 0, "unchanged": 0, "expenses": 0, "days_back": days_back}
 
         try:
             client = await get_async_client()
@@ -990,17 +1186,28 @@ class SyncService:
             orders = list(orders_by_id.values())
 
             if orders:
-                order_ids = [o["id"] for o in orders if "id" in o]
-
                 # Use force_update=True because KeyCRM doesn't update updated_at on status changes
-                # Without this, orders with changed status but same updated_at won't be updated
+                # Without this, orders with changed status but same updated_at won't be updated.
+                # The payload hash then narrows "forced" down to "actually different";
+                # line items are written too, since the hash vouches for them.
+                changed_ids: list[int] = []
                 order_count, expense_count = await self._upsert_orders_with_expenses(
-                    orders, force_update=True, skip_products=True,
-                    bronze_source="sync_status",
+                    orders, force_update=True, skip_unchanged_payload=True,
+                    bronze_source="sync_status", changed_ids_out=changed_ids,
                 )
                 stats["orders"] = order_count
+                stats["written"] = len(changed_ids)
+                if config.sync.is_staging:
+                    stats["staged"] = order_count
+                else:
+                    # Forced with a payload hash, the only rows upsert_orders
+                    # skips are those whose stored hash matched.
+                    stats["unchanged"] = max(order_count - len(changed_ids), 0)
                 stats["expenses"] = expense_count
-                logger.info(f"Status refresh: force-updated {order_count} orders, {expense_count} expenses")
+                logger.info(
+                    f"Status refresh: {len(changed_ids)} of {order_count} orders changed, "
+                    f"{expense_count} expenses"
+                )
 
                 # Log return orders from API for diagnostics
                 api_returns = {
@@ -1015,11 +1222,13 @@ class SyncService:
                     )
 
                 # Incremental warehouse refresh — only rebuild Silver for changed
-                # orders instead of DELETE+INSERT all 36K rows (prevents OOM)
-                await self.store.refresh_warehouse_layers(
-                    trigger="status_refresh",
-                    changed_order_ids=order_ids,
-                )
+                # orders instead of DELETE+INSERT all 36K rows (prevents OOM).
+                # Nothing changed, nothing to rebuild.
+                if changed_ids:
+                    await self.store.refresh_warehouse_layers(
+                        trigger="status_refresh",
+                        changed_order_ids=changed_ids,
+                    )
 
                 # Post-refresh verification: check Silver matches API for return orders
                 if api_returns:
@@ -1276,45 +1485,57 @@ async def get_sync_service() -> SyncService:
     return _sync_service
 
 
-async def init_and_sync(full_sync_days: int = 730) -> None:
-    """
-    Initialize store and perform initial sync if needed.
-
-    Called on application startup.
-    """
+async def initial_sync(full_sync_days: int = 730) -> None:
+    """Bring DuckDB up to date: a full sync if it is empty, else an incremental one."""
     store = await get_store()
     stats = await store.get_stats()
 
-    # If no orders, do a full sync
+    sync_service = await get_sync_service()
     if stats["orders"] == 0:
         logger.info("No data in DuckDB, performing initial full sync...")
-        sync_service = await get_sync_service()
         await sync_service.full_sync(days_back=full_sync_days)
     else:
         logger.info(f"DuckDB has {stats['orders']} orders, {stats['products']} products")
-        # Do incremental sync
-        sync_service = await get_sync_service()
         await sync_service.incremental_sync()
 
-    # Ensure sku_inventory_status is populated (Layer 1)
+    # Warehouse layers (Silver/Gold) are refreshed inside incremental_sync()
+    # or full_sync() when data changes. With DELETE+INSERT, tables persist across
+    # restarts so existing data remains valid without a redundant second refresh.
+
+
+async def ensure_sku_inventory() -> int:
+    """Ensure sku_inventory_status is populated (Layer 1). Returns the SKU count."""
+    store = await get_store()
     sku_count = await store.refresh_sku_inventory_status()
     if sku_count > 0:
         logger.info(f"Initialized sku_inventory_status: {sku_count} SKUs")
+    return sku_count
 
-    # Warehouse layers (Silver/Gold) are refreshed inside incremental_sync()
-    # or full_sync() when data changes. With DELETE+INSERT, tables persist across
-    # restarts so existing data remains valid without a redundant second refresh.
 
-    # Initialize Meilisearch for chat search
+async def init_search() -> bool:
+    """Create the Meilisearch indexes and fill them. False if Meilisearch is unavailable."""
     try:
         if await init_meilisearch():
             sync_service = await get_sync_service()
             meili_stats = await sync_service.sync_to_meilisearch()
             logger.info(f"Meilisearch initialized: {meili_stats}")
-        else:
-            logger.warning("Meilisearch not available, chat search will be limited")
+            return True
+        logger.warning("Meilisearch not available, chat search will be limited")
     except Exception as e:
         logger.warning(f"Meilisearch initialization failed: {e}")
+    return False
+
+
+async def init_and_sync(full_sync_days: int = 730) -> None:
+    """
+    Initialize store and perform initial sync if needed.
+
+    The three startup steps in order. The web app runs them itself, as
+    tracked phases after it has started serving (see web/startup.py).
+    """
+    await initial_sync(full_sync_days)
+    await ensure_sku_inventory()
+    await init_search()
 
     # Note: Background sync is now handled by APScheduler (core/scheduler.py)
     # The scheduler runs incremental_sync every 60 seconds, plus other jobs:
@@ -1349,6 +1570,8 @@ async def force_resync(days_back: int = 730) -> dict:
             conn.execute("DELETE FROM order_products")
             conn.execute("DELETE FROM orders")
             conn.execute("DELETE FROM sync_metadata WHERE key LIKE 'last_sync_orders%'")
+            # The orders a resume would skip are the ones just deleted.
+            conn.execute("DELETE FROM sync_metadata WHERE key = 'full_sync_progress'")
             conn.execute("COMMIT")
         except Exception:
             try:
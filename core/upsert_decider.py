@@ -5,8 +5,49 @@ I/O so it can be unit-tested exhaustively without spinning up DuckDB.
 """
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Optional
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, Iterable, Mapping, Optional
+
+# What order_payload_hash covers: every column upsert_orders persists for the
+# order, then each line item in payload order (the position is part of the
+# stored order_products id, so a reorder is a change too).
+PAYLOAD_HASH_ORDER_FIELDS = (
+    "source_id", "status_id", "status_group_id", "grand_total",
+    "ordered_at", "created_at", "updated_at", "buyer_id", "manager_id",
+    "manager_comment", "promocode",
+)
+PAYLOAD_HASH_LINE_FIELDS = ("product_id", "name", "quantity", "price_sold")
+_MONEY_FIELDS = frozenset({"grand_total", "price_sold"})
+
+
+def _normalise(field: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if field in _MONEY_FIELDS:
+        # Stored as DECIMAL(12, 2): 100, 100.0 and 100.001 are the same row
+        return f"{float(value):.2f}"
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.isoformat()
+    return value
+
+
+def order_payload_hash(
+    order: Mapping[str, Any],
+    lines: Iterable[Mapping[str, Any]] = (),
+) -> int:
+    """A signed 64-bit fingerprint of an order as upsert_orders would persist it.
+
+    ``order`` and ``lines`` are the row dicts upsert_orders builds, so the
+    hash changes exactly when a column it writes would. Fits ``BIGINT``.
+    """
+    h = hashlib.blake2b(digest_size=8)
+    h.update(repr(tuple(_normalise(f, order.get(f)) for f in PAYLOAD_HASH_ORDER_FIELDS)).encode())
+    for line in lines:
+        h.update(repr(tuple(_normalise(f, line.get(f)) for f in PAYLOAD_HASH_LINE_FIELDS)).encode())
+    return int.from_bytes(h.digest(), "big", signed=True)
 
 
 def should_update_order(
@@ -14,6 +55,8 @@ def should_update_order(
     incoming_updated_at: Optional[datetime],
     *,
     force: bool = False,
+    existing_hash: Optional[int] = None,
+    incoming_hash: Optional[int] = None,
 ) -> bool:
     """Return True iff we should issue an UPDATE for this order.
 
@@ -30,6 +73,11 @@ def should_update_order(
       status changes (a known KeyCRM behaviour). Callers who detect status
       drift out-of-band must pass force.
 
+    - ``force`` with ``incoming_hash`` — UPDATE only if the payload moved:
+      the stored ``payload_hash`` is missing or differs. The status refresh
+      re-fetches a whole lookback window; without this every order in it was
+      rewritten and cascaded into the warehouse, changed or not.
+
     - existing is None      — UPDATE. We don't have a stored timestamp to
       compare against (legacy row pre-migration), so be safe and write.
 
@@ -45,13 +93,46 @@ def should_update_order(
     Args:
         existing_updated_at: stored ``orders.updated_at`` from DuckDB.
         incoming_updated_at: ``updated_at`` field from the KeyCRM payload.
-        force: bypass all checks; behaves like the old "always UPDATE" path.
+        force: bypass the timestamp checks; on its own, the old "always UPDATE".
+        existing_hash: stored ``orders.payload_hash`` (NULL before the first
+            hashed write).
+        incoming_hash: ``order_payload_hash`` of the payload; only read with
+            ``force``.
 
     Returns:
         True = issue UPDATE. False = skip (and skip line-item DELETE+INSERT).
     """
     if force:
-        return True
+        if incoming_hash is None:
+            return True
+        return existing_hash is None or existing_hash != incoming_hash
     if existing_updated_at is None or incoming_updated_at is None:
         return True
     return incoming_updated_at > existing_updated_at
+
+
+def should_update_order_sql(
+    existing: str,
+    incoming: str,
+    *,
+    force: bool = False,
+    existing_hash: Optional[str] = None,
+    incoming_hash: Optional[str] = None,
+) -> str:
+    """The same decision as a SQL boolean expression over two column references.
+
+    ``upsert_orders`` decides a whole batch in one JOIN rather than row by
+    row in Python; this keeps that JOIN and ``should_update_order`` on one
+    contract. ``existing`` and ``incoming`` are column expressions (e.g.
+    ``"o.updated_at"``) and are interpolated verbatim — never pass user input.
+    ``existing_hash`` and ``incoming_hash`` likewise name the fingerprint
+    columns, and only matter with ``force``.
+    """
+    if force:
+        if incoming_hash is None:
+            return "TRUE"
+        return (
+            f"({existing_hash} IS NULL OR {incoming_hash} IS NULL "
+            f"OR {existing_hash} <> {incoming_hash})"
+        )
+    return f"({existing} IS NULL OR {incoming} IS NULL OR {incoming} > {existing})"
@@ -12,19 +12,47 @@ Usage:
 
     # Broadcast to all dashboard clients
     await manager.broadcast("dashboard", "orders_synced", {"count": 10})
+
+A broadcast encodes its message once and queues the same string on every
+connection in the room; each connection has its own writer task that drains
+that queue. One slow client therefore delays nobody else. A client that falls
+SEND_QUEUE_LIMIT messages behind is evicted and left to reconnect.
 """
 import asyncio
 import json
 import logging
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, Optional
+from typing import Any, Deque, Dict, Iterable, Optional, Set, Tuple
 
+import orjson
 from fastapi import WebSocket
 
+from core.gold_delta import DASHBOARD_SALES_TYPES
+
 logger = logging.getLogger(__name__)
 
+# Messages a connection may have queued and unsent. A browser tab that keeps
+# up drains to zero between syncs; one this far behind is on a dead network or
+# a suspended laptop, and is closed (1013, try again later) instead of buffered.
+SEND_QUEUE_LIMIT = 64
+
+# How long an evicted client gets to accept the close frame.
+EVICT_CLOSE_TIMEOUT_SECONDS = 5.0
+
+# Events whose only effect on the client is to refetch some queries (see
+# web/frontend/src/hooks/useWebSocket.ts). A newer one makes any still-queued
+# older one pointless, so it is dropped rather than sent late. Not gold_delta:
+# deltas add up, and the dashboard needs every one of them.
+COALESCED_EVENTS = frozenset({
+    "orders_synced",
+    "products_synced",
+    "inventory_updated",
+    "goal_progress",
+})
+
 
 class WebSocketEvent(Enum):
     """Events that can be sent via WebSocket."""
@@ -39,9 +67,13 @@ class WebSocketEvent(Enum):
     GOAL_PROGRESS = "goal_progress"
     MILESTONE_REACHED = "milestone_reached"
 
+    # Warehouse events: Gold cell differences for one sales-type filter
+    GOLD_DELTA = "gold_delta"
+
     # System events
     SYNC_STATUS = "sync_status"
     CONNECTED = "connected"
+    SUBSCRIBED = "subscribed"
     PONG = "pong"
 
 
@@ -55,6 +87,14 @@ class ConnectionInfo:
     connected_at: datetime = field(default_factory=datetime.now)
     last_activity: datetime = field(default_factory=datetime.now)
     message_count: int = 0
+    # The dashboard's sales-type filter, once the client has subscribed to it
+    sales_type: Optional[str] = None
+    # (event name, encoded message) waiting for the writer task
+    outbox: Deque[Tuple[str, str]] = field(default_factory=deque)
+    wakeup: asyncio.Event = field(default_factory=asyncio.Event)
+    drained: asyncio.Event = field(default_factory=asyncio.Event)
+    writer: Optional[asyncio.Task] = None
+    closed: bool = False
 
 
 class ConnectionManager:
@@ -64,18 +104,25 @@ class ConnectionManager:
     Features:
     - Multiple rooms (dashboard, admin, etc.)
     - Thread-safe connection management
-    - Broadcast to all connections in a room
+    - Broadcast to all connections in a room, encoded once
+    - A bounded send queue and writer task per connection
     - Connection statistics
-    - Automatic cleanup of dead connections
+    - Automatic cleanup of dead and slow connections
     """
 
-    def __init__(self):
+    def __init__(self, send_queue_limit: int = SEND_QUEUE_LIMIT):
         # Room -> Dict of connection_id -> ConnectionInfo
         self._rooms: Dict[str, Dict[int, ConnectionInfo]] = {}
         self._lock = asyncio.Lock()
+        self._send_queue_limit = send_queue_limit
         self._total_connections = 0
         self._total_messages_sent = 0
         self._next_connection_id = 1
+        self._coalesced = 0
+        self._evicted = 0
+        self._send_failures = 0
+        # Close handshakes of evicted clients, held so they are not collected
+        self._closing: Set[asyncio.Task] = set()
 
     async def connect(
         self, websocket: WebSocket, room: str = "dashboard"
@@ -96,20 +143,12 @@ class ConnectionManager:
             conn_id = self._next_connection_id
             self._next_connection_id += 1
 
-            conn_info = ConnectionInfo(id=conn_id, websocket=websocket, room=room)
-
-            if room not in self._rooms:
-                self._rooms[room] = {}
-            self._rooms[room][conn_id] = conn_info
-            self._total_connections += 1
-
-        logger.info(
-            f"WebSocket connected to room '{room}' "
-            f"(total: {self.connection_count(room)} in room, "
-            f"{self.total_connections} total)"
-        )
+        conn_info = ConnectionInfo(id=conn_id, websocket=websocket, room=room)
+        conn_info.drained.set()
 
-        # Send welcome message with connection info
+        # Send welcome message with connection info. Nothing else can write to
+        # the socket yet: broadcasts only see the connection once it is in a
+        # room, and from then on only its writer task sends.
         await self._send_to_connection(
             conn_info,
             WebSocketEvent.CONNECTED,
@@ -119,6 +158,19 @@ class ConnectionManager:
             },
         )
 
+        conn_info.writer = asyncio.create_task(
+            self._write(conn_info), name=f"ws-writer-{conn_id}"
+        )
+        async with self._lock:
+            self._rooms.setdefault(room, {})[conn_id] = conn_info
+            self._total_connections += 1
+
+        logger.info(
+            f"WebSocket connected to room '{room}' "
+            f"(total: {self.connection_count(room)} in room, "
+            f"{self.total_connections} total)"
+        )
+
         return conn_info
 
     async def disconnect(self, conn_info: ConnectionInfo) -> None:
@@ -129,31 +181,49 @@ class ConnectionManager:
             conn_info: The connection to remove
         """
         async with self._lock:
-            room = conn_info.room
-            if room in self._rooms:
-                self._rooms[room].pop(conn_info.id, None)
-                # Clean up empty rooms
-                if not self._rooms[room]:
-                    del self._rooms[room]
+            self._remove(conn_info)
 
         logger.info(
             f"WebSocket disconnected from room '{conn_info.room}' "
             f"(remaining: {self.connection_count(conn_info.room)} in room)"
         )
 
+    def _remove(self, conn: ConnectionInfo) -> None:
+        """Take a connection out of its room and stop its writer. Hold the lock."""
+        room = self._rooms.get(conn.room)
+        if room is not None:
+            room.pop(conn.id, None)
+            # Clean up empty rooms
+            if not room:
+                del self._rooms[conn.room]
+        conn.closed = True
+        conn.outbox.clear()
+        conn.drained.set()
+        if conn.writer is not None and conn.writer is not asyncio.current_task():
+            conn.writer.cancel()
+
     async def broadcast(
-        self, room: str, event: WebSocketEvent | str, data: Dict[str, Any]
+        self,
+        room: str,
+        event: WebSocketEvent | str,
+        data: Dict[str, Any],
+        sales_type: Optional[str] = None,
     ) -> int:
         """
         Broadcast a message to all connections in a room.
 
+        The message is encoded once and queued on each connection; the
+        connections' writer tasks deliver it. Returns without waiting for
+        them, so a slow client cannot hold up the caller.
+
         Args:
             room: Room to broadcast to
             event: Event type (WebSocketEvent or string)
             data: Event payload
+            sales_type: Only connections subscribed to this sales-type filter
 
         Returns:
-            Number of connections that received the message
+            Number of connections the message was queued for
         """
         if isinstance(event, WebSocketEvent):
             event_name = event.value
@@ -162,44 +232,116 @@ class ConnectionManager:
 
         async with self._lock:
             connections = list(self._rooms.get(room, {}).values())
+        if sales_type is not None:
+            connections = [c for c in connections if c.sales_type == sales_type]
 
         if not connections:
             logger.debug(f"No connections in room '{room}' for broadcast")
             return 0
 
-        # Send to all connections concurrently
-        tasks = [
-            self._send_to_connection(conn, event_name, data)
-            for conn in connections
-        ]
-
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Count successful sends and handle failures
-        sent_count = 0
-        failed_connections = []
-
-        for conn, result in zip(connections, results):
-            if isinstance(result, Exception):
-                logger.warning(f"Failed to send to connection: {result}")
-                failed_connections.append(conn)
-            elif result is True:
-                sent_count += 1
-            else:
-                # result is False - send failed
-                failed_connections.append(conn)
-
-        # Clean up failed connections
-        for conn in failed_connections:
-            await self.disconnect(conn)
+        message = self._encode(event_name, data)
+        queued = 0
+        too_slow = []
+        for conn in connections:
+            if self._enqueue(conn, event_name, message):
+                queued += 1
+            elif not conn.closed:
+                too_slow.append(conn)
+
+        if too_slow:
+            await self._evict(too_slow)
 
-        self._total_messages_sent += sent_count
         logger.debug(
-            f"Broadcast '{event_name}' to {sent_count}/{len(connections)} "
+            f"Broadcast '{event_name}' queued for {queued}/{len(connections)} "
             f"connections in room '{room}'"
         )
 
-        return sent_count
+        return queued
+
+    def _enqueue(self, conn: ConnectionInfo, event_name: str, message: str) -> bool:
+        """Queue an encoded message. False if the connection is closed or too far behind."""
+        if conn.closed:
+            return False
+        if event_name in COALESCED_EVENTS and conn.outbox:
+            before = len(conn.outbox)
+            kept = [item for item in conn.outbox if item[0] != event_name]
+            if len(kept) < before:
+                conn.outbox.clear()
+                conn.outbox.extend(kept)
+                self._coalesced += before - len(kept)
+        if len(conn.outbox) >= self._send_queue_limit:
+            return False
+        conn.outbox.append((event_name, message))
+        conn.drained.clear()
+        conn.wakeup.set()
+        return True
+
+    async def _write(self, conn: ConnectionInfo) -> None:
+        """Writer task: send whatever is queued for one connection, in order."""
+        try:
+            while True:
+                await conn.wakeup.wait()
+                conn.wakeup.clear()
+                while conn.outbox:
+                    _, message = conn.outbox.popleft()
+                    await conn.websocket.send_text(message)
+                    conn.last_activity = datetime.now()
+                    conn.message_count += 1
+                    self._total_messages_sent += 1
+                conn.drained.set()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"Failed to send to connection {conn.id}: {e}")
+            self._send_failures += 1
+            await self.disconnect(conn)
+
+    async def _evict(self, connections: Iterable[ConnectionInfo]) -> None:
+        """Drop connections whose queue is full and close them in the background."""
+        connections = list(connections)
+        async with self._lock:
+            for conn in connections:
+                self._remove(conn)
+        self._evicted += len(connections)
+        logger.warning(
+            f"Evicted {len(connections)} WebSocket connection(s) more than "
+            f"{self._send_queue_limit} messages behind"
+        )
+        for conn in connections:
+            task = asyncio.create_task(self._close_evicted(conn))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close_evicted(conn: ConnectionInfo) -> None:
+        try:
+            await asyncio.wait_for(
+                conn.websocket.close(code=1013, reason="Too slow; reconnect"),
+                timeout=EVICT_CLOSE_TIMEOUT_SECONDS,
+            )
+        except Exception:
+            pass
+
+    async def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every connection has sent what is queued for it.
+
+        Args:
+            timeout: Seconds to wait at most, or None to wait indefinitely
+
+        Returns:
+            True if everything was sent (or dropped with its connection)
+        """
+        async with self._lock:
+            connections = [c for room in self._rooms.values() for c in room.values()]
+        waits = [c.drained.wait() for c in connections if not c.drained.is_set()]
+        if not waits:
+            return True
+        try:
+            await asyncio.wait_for(asyncio.gather(*waits), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
 
     async def broadcast_all(
         self, event: WebSocketEvent | str, data: Dict[str, Any]
@@ -224,11 +366,29 @@ class ConnectionManager:
 
         return total_sent
 
+    @staticmethod
+    def _encode(event_name: str, data: Dict[str, Any]) -> str:
+        """The wire form of an event, shared by every connection it goes to.
+
+        Text, not bytes: the dashboard parses `event.data` as a string, and a
+        binary frame would arrive as a Blob.
+        """
+        return orjson.dumps(
+            {
+                "event": event_name,
+                "data": data,
+                "timestamp": datetime.now().isoformat(),
+            }
+        ).decode()
+
     async def _send_to_connection(
         self, conn: ConnectionInfo, event: str | WebSocketEvent, data: Dict[str, Any]
     ) -> bool:
         """
-        Send a message to a specific connection.
+        Send a message to a specific connection, bypassing its queue.
+
+        Only for the welcome message, before the writer task exists; replies
+        after that go through `_reply`.
 
         Args:
             conn: Connection to send to
@@ -243,13 +403,7 @@ class ConnectionManager:
         else:
             event_name = event
 
-        message = json.dumps(
-            {
-                "event": event_name,
-                "data": data,
-                "timestamp": datetime.now().isoformat(),
-            }
-        )
+        message = self._encode(event_name, data)
 
         try:
             await conn.websocket.send_text(message)
@@ -260,6 +414,14 @@ class ConnectionManager:
             logger.debug(f"Failed to send message: {e}")
             return False
 
+    async def _reply(
+        self, conn: ConnectionInfo, event: WebSocketEvent, data: Dict[str, Any]
+    ) -> None:
+        """Queue a message for one connection, behind whatever it already has."""
+        if not self._enqueue(conn, event.value, self._encode(event.value, data)):
+            if not conn.closed:
+                await self._evict([conn])
+
     async def handle_message(
         self, conn_info: ConnectionInfo, message: str
     ) -> Optional[str]:
@@ -277,7 +439,7 @@ class ConnectionManager:
 
         # Handle ping/pong for keep-alive
         if message == "ping":
-            await self._send_to_connection(
+            await self._reply(
                 conn_info, WebSocketEvent.PONG, {"timestamp": datetime.now().isoformat()}
             )
             return None
@@ -288,12 +450,17 @@ class ConnectionManager:
             action = data.get("action")
 
             if action == "subscribe":
-                # Future: handle room switching
-                pass
+                # Rooms stay fixed; a sales type selects the gold_delta feed.
+                # One without a feed (exhibition, internal) ends the previous
+                # subscription, and the client goes back to refetching.
+                sales_type = data.get("sales_type")
+                conn_info.sales_type = sales_type if sales_type in DASHBOARD_SALES_TYPES else None
+                if conn_info.sales_type:
+                    await self._reply(
+                        conn_info, WebSocketEvent.SUBSCRIBED, {"sales_type": sales_type}
+                    )
             elif action == "ping":
-                await self._send_to_connection(
-                    conn_info, WebSocketEvent.PONG, {}
-                )
+                await self._reply(conn_info, WebSocketEvent.PONG, {})
 
         except json.JSONDecodeError:
             logger.debug(f"Received non-JSON message: {message[:100]}")
@@ -344,6 +511,12 @@ class ConnectionManager:
             "active_connections": self.connection_count(),
             "total_connections_ever": self._total_connections,
             "total_messages_sent": self._total_messages_sent,
+            "queued_messages": sum(
+                len(c.outbox) for conns in self._rooms.values() for c in conns.values()
+            ),
+            "coalesced_messages": self._coalesced,
+            "evicted_slow_connections": self._evicted,
+            "send_failures": self._send_failures,
             "rooms": rooms_info,
         }
 
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Cost of the basket pages, and of keeping gold_daily_basket_pairs current.
+
+Loads `--orders` orders of one to six lines over two years of `--products`
+products (some lines with no product_id), then times frequently-bought-together,
+category combinations, brand affinity and the basket summary over a 30, 90 and
+365-day window (`--repeat` runs, best of), and the Gold stages of one
+incremental warehouse refresh over `--changed` re-synced orders.
+
+Usage:
+    python scripts/bench_basket_pairs.py
+    python scripts/bench_basket_pairs.py --orders 200000 --products 800
+"""
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.duckdb_store import DuckDBStore
+
+END = date(2026, 9, 30)
+WINDOWS = (30, 90, 365)
+
+
+def _order(oid: int, rng: random.Random, products: int, updated_at: str) -> dict:
+    ordered_at = datetime(END.year, END.month, END.day, 10, tzinfo=timezone.utc) - timedelta(
+        days=rng.randrange(730), minutes=rng.randrange(600),
+    )
+    lines = []
+    for n in range(rng.choice((1, 1, 2, 2, 3, 4, 6))):
+        line = {"id": oid * 10 + n, "name": f"product {oid}-{n}",
+                "quantity": 1, "price_sold": f"{rng.randint(100, 900)}.00"}
+        if rng.random() > 0.08:
+            p = min(int(rng.paretovariate(1.2)), products)
+            line["offer"] = {"product_id": p, "sku": f"SKU-{p}"}
+            line["name"] = f"product {p}"
+        lines.append(line)
+    return {
+        "id": oid,
+        "source_id": rng.choice((1, 1, 1, 2, 4)),
+        "status_id": rng.choice((12, 12, 12, 12, 19)),
+        "grand_total": f"{sum(float(line['price_sold']) for line in lines):.2f}",
+        "ordered_at": ordered_at.isoformat(),
+        "created_at": ordered_at.isoformat(),
+        "updated_at": updated_at,
+        "buyer": {"id": rng.randint(1, 20_000)},
+        "manager": None,
+        "manager_comment": None,
+        "promocode": None,
+        "products": lines,
+    }
+
+
+async def _best(repeat: int, call) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        await call()
+        best = min(best, (time.perf_counter() - t0) * 1000)
+    return best
+
+
+async def _run(args) -> None:
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DuckDBStore(db_path=Path(tmp) / "bench.duckdb")
+        await store.connect()
+        try:
+            async with store.connection() as conn:
+                conn.executemany(
+                    "INSERT INTO categories (id, name, parent_id) VALUES (?, ?, ?)",
+                    [(c, f"category {c}", None if c <= 8 else c % 8 + 1) for c in range(1, 41)],
+                )
+                conn.executemany(
+                    "INSERT INTO products (id, name, category_id, brand, sku, price) "
+                    "VALUES (?, ?, ?, ?, ?, 500)",
+                    [(p, f"product {p}", p % 40 + 1, f"brand {p % 30}", f"SKU-{p}")
+                     for p in range(1, args.products + 1)],
+                )
+            orders = [
+                _order(i, rng, args.products, "2026-09-30T10:00:00+00:00")
+                for i in range(1, args.orders + 1)
+            ]
+            for i in range(0, len(orders), 20_000):
+                await store.upsert_orders(orders[i:i + 20_000])
+            await store.refresh_warehouse_layers(trigger="bench")
+
+            readers = [
+                ("get_frequently_bought_together", store.get_frequently_bought_together),
+                ("get_category_combinations", store.get_category_combinations),
+                ("get_brand_affinity", store.get_brand_affinity),
+                ("get_basket_summary", store.get_basket_summary),
+            ]
+            print(f"{args.orders} orders, {args.products} products")
+            print(f"{'reader':<32}" + "".join(f"{f'{d}d ms':>10}" for d in WINDOWS))
+            for label, reader in readers:
+                timings = [
+                    await _best(args.repeat, lambda: reader(END - timedelta(days=d - 1), END))
+                    for d in WINDOWS
+                ]
+                print(f"{label:<32}" + "".join(f"{t:>10.1f}" for t in timings))
+
+            changed = rng.sample(range(1, args.orders + 1), args.changed)
+            result = await store.upsert_orders(
+                [_order(i, random.Random(i), args.products, "2026-10-01T10:00:00+00:00")
+                 for i in changed],
+            )
+            t0 = time.perf_counter()
+            res = await store.refresh_warehouse_layers(
+                trigger="bench", changed_order_ids=result.changed_ids,
+            )
+            refresh_ms = (time.perf_counter() - t0) * 1000
+            stages = {k: v for k, v in res["stage_ms"].items() if k.startswith("gold_")}
+            print(f"refresh, {args.changed} changed: {refresh_ms:.0f} ms {stages}")
+        finally:
+            await store.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the basket pages")
+    parser.add_argument("--orders", type=int, default=60_000)
+    parser.add_argument("--products", type=int, default=400)
+    parser.add_argument("--changed", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(_run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Cost of the per-buyer customer reads, and of keeping their table current.
+
+Loads `--orders` orders spread over `--buyers` buyers and two years, then
+times each customer reader (`--repeat` runs, best of) and one incremental
+warehouse refresh over `--changed` re-synced orders — the refresh that now
+also rewrites silver_buyer_stats for the buyers of those orders.
+
+Usage:
+    python scripts/bench_buyer_stats.py
+    python scripts/bench_buyer_stats.py --orders 200000 --buyers 40000
+"""
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.duckdb_store import DuckDBStore
+
+PRODUCTS = 300
+
+
+def _order(oid: int, rng: random.Random, buyers: int, updated_at: str) -> dict:
+    ordered_at = datetime(2024, 10, 1, 10, tzinfo=timezone.utc) + timedelta(
+        days=rng.randrange(730), minutes=rng.randrange(600),
+    )
+    lines = [
+        {
+            "offer": {"product_id": p, "sku": f"SKU-{p}"},
+            "name": f"product {p}",
+            "quantity": rng.randint(1, 3),
+            "price_sold": f"{rng.randint(100, 900)}.00",
+        }
+        for p in rng.sample(range(1, PRODUCTS + 1), rng.randint(1, 4))
+    ]
+    total = sum(int(line["quantity"]) * float(line["price_sold"]) for line in lines)
+    return {
+        "id": oid,
+        "source_id": rng.choice((1, 1, 1, 2, 4)),
+        "status_id": rng.choice((12, 12, 12, 12, 19)),
+        "grand_total": f"{total:.2f}",
+        "ordered_at": ordered_at.isoformat(),
+        "created_at": ordered_at.isoformat(),
+        "updated_at": updated_at,
+        "buyer": {"id": rng.randint(1, buyers), "phone": f"38096{rng.randrange(10**7):07d}"},
+        "manager": None,
+        "manager_comment": None,
+        "promocode": None,
+        "products": lines,
+    }
+
+
+async def _best(repeat: int, call) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        await call()
+        best = min(best, (time.perf_counter() - t0) * 1000)
+    return best
+
+
+async def _run(args) -> None:
+    rng = random.Random(0)
+    end = date(2026, 9, 30)
+    start = end - timedelta(days=89)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DuckDBStore(db_path=Path(tmp) / "bench.duckdb")
+        await store.connect()
+        try:
+            async with store.connection() as conn:
+                conn.executemany(
+                    "INSERT INTO products (id, name, sku, price) VALUES (?, ?, ?, 500)",
+                    [(p, f"product {p}", f"SKU-{p}") for p in range(1, PRODUCTS + 1)],
+                )
+            await store.upsert_stocks([
+                {"id": p, "sku": f"SKU-{p}", "price": 500, "purchased_price": rng.randint(50, 400)}
+                for p in range(1, PRODUCTS + 1)
+            ])
+            orders = [
+                _order(i, rng, args.buyers, "2026-09-30T10:00:00+00:00")
+                for i in range(1, args.orders + 1)
+            ]
+            for i in range(0, len(orders), 20_000):
+                await store.upsert_orders(orders[i:i + 20_000])
+            await store.refresh_warehouse_layers(trigger="bench")
+
+            readers = [
+                ("get_sms_segments", lambda: store.get_sms_segments(include_customers=True)),
+                ("get_at_risk_customers", lambda: store.get_at_risk_customers()),
+                ("get_customer_insights", lambda: store.get_customer_insights(start, end)),
+                ("get_cohort_ltv", lambda: store.get_cohort_ltv()),
+            ]
+            print(f"{args.orders} orders, {args.buyers} buyers")
+            print(f"{'reader':<26}{'ms':>10}")
+            for label, call in readers:
+                print(f"{label:<26}{await _best(args.repeat, call):>10.1f}")
+
+            changed = rng.sample(range(1, args.orders + 1), args.changed)
+            result = await store.upsert_orders(
+                [_order(i, random.Random(i), args.buyers, "2026-10-01T10:00:00+00:00")
+                 for i in changed],
+            )
+            t0 = time.perf_counter()
+            await store.refresh_warehouse_layers(trigger="bench", changed_order_ids=result.changed_ids)
+            refresh_ms = (time.perf_counter() - t0) * 1000
+            print(f"{f'refresh, {args.changed} changed':<26}{refresh_ms:>10.1f}")
+        finally:
+            await store.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark per-buyer customer reads")
+    parser.add_argument("--orders", type=int, default=60_000)
+    parser.add_argument("--buyers", type=int, default=15_000)
+    parser.add_argument("--changed", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(_run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Cost of the cohort pages, and of keeping gold_cohort_activity current.
+
+Loads `--orders` orders spread over `--buyers` buyers and two years, then
+times the retention, revenue-retention, cohort-LTV and purchase-timing reads
+(`--repeat` runs, best of) for each sales type, and the cohort stage of one
+incremental warehouse refresh over `--changed` re-synced orders.
+
+Usage:
+    python scripts/bench_cohort_activity.py
+    python scripts/bench_cohort_activity.py --orders 200000 --buyers 40000
+"""
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.duckdb_store import DuckDBStore
+
+
+def _order(oid: int, rng: random.Random, buyers: int, updated_at: str) -> dict:
+    ordered_at = datetime.now(timezone.utc) - timedelta(
+        days=rng.randrange(730), minutes=rng.randrange(600),
+    )
+    return {
+        "id": oid,
+        "source_id": rng.choice((1, 1, 1, 2, 4)),
+        "status_id": rng.choice((12, 12, 12, 12, 19)),
+        "grand_total": f"{rng.randint(100, 3000)}.00",
+        "ordered_at": ordered_at.isoformat(),
+        "created_at": ordered_at.isoformat(),
+        "updated_at": updated_at,
+        "buyer": {"id": rng.randint(1, buyers)},
+        "manager": {"id": 15} if rng.random() < 0.1 else None,
+        "manager_comment": None,
+        "promocode": None,
+        "products": [],
+    }
+
+
+async def _best(repeat: int, call) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        await call()
+        best = min(best, (time.perf_counter() - t0) * 1000)
+    return best
+
+
+async def _run(args) -> None:
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DuckDBStore(db_path=Path(tmp) / "bench.duckdb")
+        await store.connect()
+        try:
+            orders = [
+                _order(i, rng, args.buyers, "2026-09-30T10:00:00+00:00")
+                for i in range(1, args.orders + 1)
+            ]
+            for i in range(0, len(orders), 20_000):
+                await store.upsert_orders(orders[i:i + 20_000])
+            await store.refresh_warehouse_layers(trigger="bench")
+
+            print(f"{args.orders} orders, {args.buyers} buyers")
+            print(f"{'reader':<32}{'retail ms':>11}{'all ms':>10}")
+            readers = [
+                ("get_cohort_retention", store.get_cohort_retention),
+                ("get_enhanced_cohort_retention", store.get_enhanced_cohort_retention),
+                ("get_cohort_ltv", store.get_cohort_ltv),
+                ("get_days_to_second_purchase", store.get_days_to_second_purchase),
+            ]
+            for label, reader in readers:
+                timings = [
+                    await _best(args.repeat, lambda: reader(months_back=24, sales_type=st))
+                    for st in ("retail", "all")
+                ]
+                print(f"{label:<32}{timings[0]:>11.1f}{timings[1]:>10.1f}")
+
+            changed = rng.sample(range(1, args.orders + 1), args.changed)
+            result = await store.upsert_orders(
+                [_order(i, random.Random(i), args.buyers, "2026-10-01T10:00:00+00:00")
+                 for i in changed],
+            )
+            res = await store.refresh_warehouse_layers(
+                trigger="bench", changed_order_ids=result.changed_ids,
+            )
+            print(f"refresh, {args.changed} changed: {res['stage_ms']}")
+        finally:
+            await store.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the cohort pages")
+    parser.add_argument("--orders", type=int, default=60_000)
+    parser.add_argument("--buyers", type=int, default=15_000)
+    parser.add_argument("--changed", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(_run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Throughput of a full Meilisearch reindex out of DuckDB.
+
+Loads `--orders` orders over `--buyers` buyers and `--products` products, then
+runs SyncService.sync_to_meilisearch with no watermark (`--repeat` runs, best
+of) against an in-process stand-in for the `meilisearch` client. The stand-in
+serialises what it is given, as the real client does before it posts, and
+holds each upload for `--latency-ms` to stand for the HTTP round trip; it
+applies tasks instantly, so the numbers are the exporter's, not Meilisearch's.
+
+Usage:
+    python scripts/bench_meili_sync.py
+    python scripts/bench_meili_sync.py --orders 200000 --latency-ms 20
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import core.sync_service as sync_service
+from core.duckdb_store import DuckDBStore
+from core.meilisearch_client import MeiliClient
+from core.sync_service import SyncService
+
+
+class _FakeMeili:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.documents = 0
+
+    def index(self, name: str):
+        return SimpleNamespace(
+            add_documents=self._add_documents,
+            add_documents_ndjson=self._add_documents_ndjson,
+        )
+
+    def _add_documents(self, documents, primary_key=None):
+        json.dumps(documents)
+        time.sleep(self.latency)
+        self.documents += len(documents)
+        return SimpleNamespace(task_uid=0)
+
+    def _add_documents_ndjson(self, body, primary_key=None):
+        time.sleep(self.latency)
+        self.documents += body.count(b"\n") + 1
+        return SimpleNamespace(task_uid=0)
+
+    def wait_for_task(self, uid, timeout_in_ms=5000, interval_in_ms=50):
+        return SimpleNamespace(uid=uid, status="succeeded", error=None)
+
+
+def _order(oid: int, rng: random.Random, buyers: int) -> dict:
+    ordered_at = datetime(2026, 9, 30, 10, tzinfo=timezone.utc) - timedelta(
+        days=rng.randrange(730), minutes=rng.randrange(600),
+    )
+    return {
+        "id": oid,
+        "source_id": rng.choice((1, 1, 1, 2, 4)),
+        "status_id": rng.choice((12, 12, 12, 12, 19)),
+        "grand_total": f"{rng.randint(100, 3000)}.00",
+        "ordered_at": ordered_at.isoformat(),
+        "created_at": ordered_at.isoformat(),
+        "updated_at": "2026-09-30T10:00:00+00:00",
+        "buyer": {"id": rng.randint(1, buyers)},
+        "manager": None,
+        "manager_comment": None,
+        "promocode": None,
+        "products": [],
+    }
+
+
+async def _run(args) -> None:
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DuckDBStore(db_path=Path(tmp) / "bench.duckdb")
+        await store.connect()
+        try:
+            async with store.connection() as conn:
+                conn.executemany(
+                    "INSERT INTO buyers (id, full_name, phone, email, city, manager_id, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(b, f"Buyer {b}", f"+38050{b:07d}", f"b{b}@example.com",
+                      rng.choice(("Kyiv", "Lviv", None)), rng.choice((15, None)),
+                      datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=b))
+                     for b in range(1, args.buyers + 1)],
+                )
+                conn.executemany(
+                    "INSERT INTO categories (id, name, parent_id) VALUES (?, ?, NULL)",
+                    [(c, f"category {c}") for c in range(1, 41)],
+                )
+                conn.executemany(
+                    "INSERT INTO products (id, name, category_id, brand, sku, price) "
+                    "VALUES (?, ?, ?, ?, ?, 500)",
+                    [(p, f"product {p}", p % 40 + 1, f"brand {p % 30}", f"SKU-{p}")
+                     for p in range(1, args.products + 1)],
+                )
+            orders = [_order(i, rng, args.buyers) for i in range(1, args.orders + 1)]
+            for i in range(0, len(orders), 20_000):
+                await store.upsert_orders(orders[i:i + 20_000])
+            await store.refresh_warehouse_layers(trigger="bench")
+
+            print(f"{args.orders} orders, {args.buyers} buyers, {args.products} products, "
+                  f"{args.latency_ms} ms per upload")
+            print(f"{'latency ms':>10}{'docs':>10}{'best s':>10}{'docs/s':>12}")
+            for latency_ms in sorted({0, args.latency_ms}):
+                best, docs = float("inf"), 0
+                for _ in range(args.repeat):
+                    async with store.connection() as conn:
+                        conn.execute("DELETE FROM sync_metadata WHERE key = 'last_sync_meilisearch'")
+                    fake = _FakeMeili(latency_ms / 1000)
+                    client = MeiliClient(url="http://meili.bench", master_key="key")
+                    client._client = fake
+                    sync_service.get_meili_client = lambda: client
+                    t0 = time.perf_counter()
+                    await SyncService(store).sync_to_meilisearch()
+                    best = min(best, time.perf_counter() - t0)
+                    docs = fake.documents
+                print(f"{latency_ms:>10}{docs:>10}{best:>10.2f}{docs / best:>12,.0f}")
+        finally:
+            await store.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Meilisearch full reindex")
+    parser.add_argument("--orders", type=int, default=200_000)
+    parser.add_argument("--buyers", type=int, default=40_000)
+    parser.add_argument("--products", type=int, default=2_000)
+    parser.add_argument("--latency-ms", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(_run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Cost of recording and reading MetricsCollector timings.
+
+Records `--samples` timings spread over `--series` operations, first through
+`record_timing` (unlabelled) and then through `observe` with the three labels
+the request middleware sets, then reads the snapshot back with `get_stats()`
+and `prometheus_text()`.
+
+Usage:
+    python scripts/bench_metrics.py
+    python scripts/bench_metrics.py --series 500 --samples 1000000
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.observability import MetricsCollector
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark metrics recording")
+    parser.add_argument("--series", type=int, default=200)
+    parser.add_argument("--samples", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    values = [rng.lognormvariate(3, 1) for _ in range(args.samples)]
+    names = [f"GET /api/route_{i % args.series}" for i in range(args.samples)]
+
+    m = MetricsCollector()
+    t0 = time.perf_counter()
+    for name, value in zip(names, values):
+        m.record_timing(name, value)
+    unlabelled = (time.perf_counter() - t0) / args.samples * 1e9
+
+    labelled_m = MetricsCollector()
+    t0 = time.perf_counter()
+    for name, value in zip(names, values):
+        labelled_m.observe("http_request_duration", value, method="GET", route=name[4:], status="200")
+    labelled = (time.perf_counter() - t0) / args.samples * 1e9
+
+    t0 = time.perf_counter()
+    m.get_stats()
+    stats_ms = (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    text = labelled_m.prometheus_text()
+    prom_ms = (time.perf_counter() - t0) * 1000
+
+    print(f"{args.samples} samples over {args.series} series")
+    print(f"{'record_timing':<26}{unlabelled:>10.0f} ns/op")
+    print(f"{'observe (3 labels)':<26}{labelled:>10.0f} ns/op")
+    print(f"{'get_stats':<26}{stats_ms:>10.2f} ms")
+    print(f"{'prometheus_text':<26}{prom_ms:>10.2f} ms  ({len(text) // 1024} KiB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
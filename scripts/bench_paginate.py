@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+KeyCRMClient.paginate against a local stub server with injected latency.
+
+The stub speaks just enough HTTP/1.1 (keep-alive, Content-Length) to serve
+`GET /order?page=N&limit=M` as KeyCRM would: `limit` items per page up to
+`--pages`, Laravel-style `last_page` / `next_page_url`, after a fixed delay
+that stands in for KeyCRM building a page with everything included. The
+scan is timed sequentially and at each prefetch window; `--governed` runs it
+under a rate governor at `--rate-per-minute` instead of an unlimited one.
+
+Usage:
+    python scripts/bench_paginate.py
+    python scripts/bench_paginate.py --pages 100 --latency-ms 400 --windows 1 2 4 8
+    python scripts/bench_paginate.py --latency-ms 1000 --governed
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import keycrm
+from core.keycrm import DEFAULT_KEYCRM_RATE_PER_MINUTE, KeyCRMClient, RateGovernor
+
+
+def _stub(pages: int, latency: float):
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                target = request_line.split()[1].decode()
+                query = parse_qs(urlsplit(target).query)
+                page = int(query.get("page", ["1"])[0])
+                limit = int(query.get("limit", ["50"])[0])
+
+                await asyncio.sleep(latency)
+                data = (
+                    [{"id": (page - 1) * limit + i} for i in range(limit)]
+                    if page <= pages else []
+                )
+                body = json.dumps({
+                    "data": data,
+                    "current_page": page,
+                    "last_page": pages,
+                    "next_page_url": f"/order?page={page + 1}" if page < pages else None,
+                }).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    return handle
+
+
+async def _scan(base_url: str, prefetch: int, page_size: int, max_pages: int) -> tuple:
+    async with KeyCRMClient(api_key="bench", base_url=base_url) as client:
+        t0 = time.perf_counter()
+        items = 0
+        async for batch in client.paginate(
+            "order", page_size=page_size, max_pages=max_pages, prefetch=prefetch,
+        ):
+            items += len(batch)
+        return time.perf_counter() - t0, items
+
+
+async def _run(pages: int, latency_ms: float, windows: list, page_size: int,
+               governed: float | None) -> None:
+    # The stub has no rate limit; unless asked for, the governor's would
+    # measure itself, not the prefetch window.
+    per_minute, burst = (governed, None) if governed else (1e6, 1000)
+    server = await asyncio.start_server(_stub(pages, latency_ms / 1000), "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        print(f"{pages} pages x {page_size} items, {latency_ms:.0f} ms per page, "
+              + (f"governed at {governed:g}/min" if governed else "ungoverned"))
+        print(f"{'prefetch':>9}{'seconds':>10}{'items':>8}{'speedup':>9}")
+        baseline = None
+        for window in windows:
+            # A fresh bucket per scan, so no window starts on another's tokens.
+            keycrm.rate_governor = (
+                RateGovernor(per_minute=per_minute, burst=burst) if burst
+                else RateGovernor(per_minute=per_minute)
+            )
+            seconds, items = await _scan(base_url, window, page_size, pages + 10)
+            baseline = baseline or seconds
+            print(f"{window:>9}{seconds:>10.2f}{items:>8}{baseline / seconds:>8.1f}x")
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark prefetching pagination")
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--windows", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--governed", action="store_true")
+    parser.add_argument("--rate-per-minute", type=float, default=DEFAULT_KEYCRM_RATE_PER_MINUTE)
+    args = parser.parse_args()
+    asyncio.run(_run(
+        args.pages, args.latency_ms, args.windows, args.page_size,
+        args.rate_per_minute if args.governed else None,
+    ))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Recursive forecast cost by horizon: per-step feature rebuild against the
+incremental forecaster.
+
+Trains a model on 780 days of synthetic Gold-shaped revenue (the window
+predict_range and predict_month read), then forecasts 7, 31 and 90 days two
+ways:
+
+  rebuild      — the old loop: _build_features over the whole history plus the
+                 days predicted so far, once per forecast day.
+  incremental  — `_predict_future`: features built once, revenue features
+                 derived per step from the days before it.
+
+Checks the two agree before timing.
+
+Usage:
+    python scripts/bench_predict_future.py
+    python scripts/bench_predict_future.py --history 400 --repeat 3
+"""
+import argparse
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.prediction_service import (
+    FEATURE_COLUMNS, _build_features, _predict_future, _train_model,
+)
+
+
+def _history(days: int) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    dates = pd.date_range(end=pd.Timestamp.today().normalize() - pd.Timedelta(days=1), periods=days)
+    weekly = 1 + 0.25 * np.sin(2 * np.pi * np.arange(days) / 7)
+    revenue = (rng.normal(120_000, 20_000, days) * weekly).clip(min=10_000)
+    orders = rng.integers(80, 250, days)
+    unique = (orders * 0.9).astype(int)
+    return pd.DataFrame({
+        "date": dates,
+        "revenue": revenue,
+        "instagram_revenue": revenue * 0.5,
+        "telegram_revenue": revenue * 0.2,
+        "shopify_revenue": revenue * 0.3,
+        "orders_count": orders,
+        "unique_customers": unique,
+        "new_customers": unique // 3,
+        "returning_customers": unique - unique // 3,
+        "returns_count": rng.integers(0, 8, days),
+    })
+
+
+def _rebuild(model, hist, future_dates, dow_corrections, clip_ratio):
+    hist = hist.copy()
+    future = pd.DataFrame({"date": pd.to_datetime(future_dates), "revenue": np.nan})
+    combined = pd.concat([hist, future], ignore_index=True)
+    out = []
+    for idx in range(len(hist), len(combined)):
+        featured = _build_features(combined.iloc[:idx + 1])
+        featured["yoy_ratio"] = featured["yoy_ratio"].fillna(1.0)
+        row = featured.iloc[-1][FEATURE_COLUMNS].fillna(0).values.reshape(1, -1)
+        pred = max(float(model.predict(row)[0]), 0) * clip_ratio
+        pred *= dow_corrections.get(combined.loc[idx, "date"].dayofweek, 1.0)
+        combined.loc[idx, "revenue"] = pred
+        out.append(round(pred, 2))
+    return out
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the recursive revenue forecaster")
+    parser.add_argument("--history", type=int, default=780)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    hist = _history(args.history)
+    model, _, dow_corrections, clip_ratio = _train_model(hist)
+    start = hist["date"].max().date() + timedelta(days=1)
+
+    print(f"{args.history} days of history")
+    print(f"{'horizon':>8}{'rebuild ms':>12}{'incr ms':>10}{'speedup':>9}")
+    for horizon in (7, 31, 90):
+        future = [start + timedelta(days=i) for i in range(horizon)]
+        new = [p["predicted_revenue"] for p in _predict_future(model, hist, future, dow_corrections, clip_ratio)]
+        old = _rebuild(model, hist, future, dow_corrections, clip_ratio)
+        assert np.allclose(new, old, rtol=1e-9, atol=0.01), "forecasters disagree"
+
+        rebuild = _best(lambda: _rebuild(model, hist, future, dow_corrections, clip_ratio), args.repeat)
+        incremental = _best(lambda: _predict_future(model, hist, future, dow_corrections, clip_ratio), args.repeat)
+        print(f"{horizon:>8}{rebuild:>12.0f}{incremental:>10.0f}{rebuild / incremental:>8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
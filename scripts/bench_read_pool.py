@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Dashboard read latency while a warehouse refresh is running.
+
+Builds a throwaway database of synthetic orders, then keeps full
+`refresh_warehouse_layers` rebuilds going while a fixed set of dashboard
+readers hammers `get_summary_stats` and `get_revenue_trend`. Runs once with
+the reader lane off (DUCKDB_READ_WORKERS=0, the old single-lock behaviour) and
+once with it on, and prints p50/p99 for each.
+
+Usage:
+    python scripts/bench_read_pool.py
+    python scripts/bench_read_pool.py --orders 200000 --seconds 20 --readers 4
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.duckdb_store import DuckDBStore
+
+
+async def _seed(store: DuckDBStore, orders: int) -> None:
+    async with store.connection() as conn:
+        conn.execute("""
+            INSERT INTO orders (id, source_id, status_id, grand_total, ordered_at,
+                                created_at, updated_at, buyer_id, manager_id)
+            SELECT i, [1, 2, 4][1 + i % 3], CASE WHEN i % 17 = 0 THEN 19 ELSE 12 END,
+                   100 + (i % 900), now() - (i % 730) * INTERVAL 1 DAY,
+                   now(), now(), i % (? // 3 + 1), NULL
+            FROM range(1, ? + 1) t(i)
+        """, [orders, orders])
+        conn.execute("""
+            INSERT INTO order_products (id, order_id, product_id, name, quantity, price_sold)
+            SELECT o.id * 1000 + k, o.id, (o.id * 7 + k) % 500, 'p', 1, 50
+            FROM orders o, range(0, 2) r(k)
+        """)
+
+
+async def _run(orders: int, seconds: float, readers: int, clients: int) -> list:
+    os.environ["DUCKDB_READ_WORKERS"] = str(readers)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DuckDBStore(db_path=Path(tmp) / "bench.duckdb")
+        await store.connect()
+        await _seed(store, orders)
+        await store.refresh_warehouse_layers(trigger="bench")
+
+        stop = time.perf_counter() + seconds
+        latencies: list = []
+        refreshes = 0
+
+        async def _writer():
+            nonlocal refreshes
+            while time.perf_counter() < stop:
+                await store.refresh_warehouse_layers(trigger="bench")
+                refreshes += 1
+
+        async def _reader():
+            end = date.today()
+            start = end - timedelta(days=30)
+            while time.perf_counter() < stop:
+                t0 = time.perf_counter()
+                await store.get_summary_stats(start, end, sales_type="retail")
+                await store.get_revenue_trend(start, end, sales_type="retail")
+                latencies.append((time.perf_counter() - t0) * 1000)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(_writer(), *(_reader() for _ in range(clients)))
+        await store.close()
+        return latencies, refreshes
+
+
+def _pct(values: list, p: float) -> float:
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the DuckDB reader lane")
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--readers", type=int, default=4, help="reader pool size for the 'on' run")
+    parser.add_argument("--clients", type=int, default=12, help="concurrent dashboard requests")
+    args = parser.parse_args()
+
+    print(f"{args.orders:,} orders, {args.clients} clients, {args.seconds:.0f}s under continuous full refresh")
+    print(f"{'lane':<14}{'requests':>10}{'refreshes':>11}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for label, readers in (("single lock", 0), (f"{args.readers} readers", args.readers)):
+        lat, refreshes = asyncio.run(_run(args.orders, args.seconds, readers, args.clients))
+        print(
+            f"{label:<14}{len(lat):>10}{refreshes:>11}"
+            f"{statistics.median(lat) if lat else float('nan'):>10.1f}"
+            f"{_pct(lat, 0.99):>10.1f}{max(lat) if lat else float('nan'):>10.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
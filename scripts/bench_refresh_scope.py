@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Incremental warehouse refresh cost as the change scope grows.
+
+Builds a throwaway database of synthetic orders (about three per buyer, so
+the buyer cascade roughly triples every scope), then times
+`refresh_warehouse_layers` scoped to 10 … 20 000 changed ids against a full
+rebuild of the same database. The crossover is where
+SILVER_INCREMENTAL_MAX_SCOPE should sit.
+
+Usage:
+    python scripts/bench_refresh_scope.py
+    python scripts/bench_refresh_scope.py --orders 300000 --sizes 10 1000 50000
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import core.duckdb_store as duckdb_store
+from core.duckdb_store import DuckDBStore
+
+
+async def _seed(store: DuckDBStore, orders: int) -> None:
+    async with store.connection() as conn:
+        conn.execute("""
+            INSERT INTO orders (id, source_id, status_id, grand_total, ordered_at,
+                                created_at, updated_at, buyer_id, manager_id)
+            SELECT i, [1, 2, 4][1 + i % 3], CASE WHEN i % 17 = 0 THEN 19 ELSE 12 END,
+                   100 + (i % 900), now() - (i % 730) * INTERVAL 1 DAY,
+                   now(), now(), i % (? // 3 + 1), NULL
+            FROM range(1, ? + 1) t(i)
+        """, [orders, orders])
+        conn.execute("""
+            INSERT INTO order_products (id, order_id, product_id, name, quantity, price_sold)
+            SELECT o.id * 1000 + k, o.id, (o.id * 7 + k) % 500, 'p', 1, 50
+            FROM orders o, range(0, 2) r(k)
+        """)
+
+
+async def _timed(store: DuckDBStore, ids, repeat: int) -> tuple:
+    samples = []
+    res = {}
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        res = await store.refresh_warehouse_layers(trigger="bench", changed_order_ids=ids)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples), res
+
+
+async def _run(orders: int, sizes: list, repeat: int) -> None:
+    # Measure the incremental path at every size, whatever the guardrail says.
+    if hasattr(duckdb_store, "SILVER_INCREMENTAL_MAX_SCOPE"):
+        duckdb_store.SILVER_INCREMENTAL_MAX_SCOPE = 1.0
+    duckdb_store.logger.disabled = True
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DuckDBStore(db_path=Path(tmp) / "bench.duckdb")
+        await store.connect()
+        try:
+            await _seed(store, orders)
+            await store.refresh_warehouse_layers(trigger="bench")
+            full_ms, _ = await _timed(store, None, repeat)
+
+            rng = random.Random(42)
+            print(f"{orders:,} orders; full rebuild {full_ms:.0f} ms (median of {repeat})")
+            print(f"{'changed ids':>12}{'scope rows':>12}{'scope %':>9}{'incr ms':>10}{'vs full':>9}")
+            for n in sizes:
+                ids = rng.sample(range(1, orders + 1), min(n, orders))
+                ms, res = await _timed(store, ids, repeat)
+                async with store.connection() as conn:
+                    mode = conn.execute(
+                        "SELECT silver_mode FROM warehouse_refreshes "
+                        "ORDER BY refreshed_at DESC LIMIT 1"
+                    ).fetchone()[0] or ""
+                scope = int(mode.split("_")[1]) if mode.startswith("incremental_") else orders
+                print(
+                    f"{n:>12,}{scope:>12,}{scope / orders:>9.1%}{ms:>10.0f}"
+                    f"{ms / full_ms:>8.2f}x"
+                )
+        finally:
+            await store.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark incremental refresh scope")
+    parser.add_argument("--orders", type=int, default=200_000)
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[10, 100, 1_000, 5_000, 10_000, 20_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(_run(args.orders, args.sizes, args.repeat))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
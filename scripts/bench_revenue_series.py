@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Revenue trend series: one spine query against the old per-window loop.
+
+Fills gold_daily_revenue with several years of synthetic days, then times the
+trend for 365- and 730-day ranges two ways:
+
+  loop   — the old path: the current window and one comparison window as two
+           Gold queries, each zero-filled by walking the days in Python, and
+           the other two comparisons as further round trips.
+  spine  — `get_revenue_series`: all four series in one query.
+
+Both produce the same four aligned series; the loop is reconstructed here from
+the query builders the repository still uses.
+
+Usage:
+    python scripts/bench_revenue_series.py
+    python scripts/bench_revenue_series.py --repeat 200
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.duckdb_store import DuckDBStore
+
+
+async def _seed(store: DuckDBStore, days: int) -> None:
+    async with store.connection() as conn:
+        conn.execute("""
+            INSERT INTO gold_daily_revenue (date, sales_type, revenue, orders_count)
+            SELECT CURRENT_DATE - CAST(i AS INTEGER), st, 1000 + (i * 37) % 5000, 5 + i % 40
+            FROM range(0, ?) t(i), (VALUES ('retail'), ('b2b')) s(st)
+            WHERE i % 11 <> 0
+        """, [days])
+
+
+async def _loop(store: DuckDBStore, start: date, end: date) -> list:
+    """The per-window path this replaced, one round trip per series."""
+    windows = store._compare_starts(start, end)
+    series = []
+    async with store.read_connection() as conn:
+        for lo, hi in [(start, end), *windows.values()]:
+            sql, params = store._build_gold_revenue_query(lo, hi, "retail")
+            daily = {row[0]: float(row[1]) for row in conn.execute(sql, params).fetchall()}
+            data = []
+            current = lo
+            while current <= hi:
+                data.append(round(daily.get(current, 0), 2))
+                current += timedelta(days=1)
+            series.append(data)
+    return series
+
+
+async def _spine(store: DuckDBStore, start: date, end: date) -> list:
+    r = await store.get_revenue_series(start, end)
+    return [r["revenue"], *(r[k]["revenue"] for k in ("previous_period", "month_ago", "year_ago"))]
+
+
+async def _time(fn, store, start, end, repeat: int) -> float:
+    await fn(store, start, end)  # warm
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        await fn(store, start, end)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+async def _run(repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DuckDBStore(db_path=Path(tmp) / "bench.duckdb")
+        await store.connect()
+        await _seed(store, 4 * 365)
+
+        print(f"{'days':>6}{'loop ms':>10}{'spine ms':>10}{'speedup':>9}")
+        for days in (365, 730):
+            end = date.today()
+            start = end - timedelta(days=days - 1)
+            assert await _loop(store, start, end) == await _spine(store, start, end)
+            loop = await _time(_loop, store, start, end, repeat)
+            spine = await _time(_spine, store, start, end, repeat)
+            print(f"{days:>6}{loop:>10.2f}{spine:>10.2f}{loop / spine:>8.1f}x")
+        await store.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the revenue trend series query")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(_run(args.repeat))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
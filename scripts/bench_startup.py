@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Web startup: how long until the dashboard answers.
+
+Each measurement runs in a fresh interpreter so imports are cold:
+
+  import      — `import web.main`, the app and every route module.
+  deferred    — pandas, anthropic, meilisearch and openpyxl, which web.main
+                used to import at module level and now loads on first use.
+  startup     — `startup_event()` against a temporary DuckDB holding one
+                order, until it returns and uvicorn would accept requests.
+  health      — the first /api/health after that.
+
+The background warm-up (KeyCRM sync, SKU refresh, Meilisearch, scheduler) is
+cancelled as soon as startup returns; it no longer delays serving, which is
+the point. The child runs in a temporary directory with the SQLite and DuckDB
+paths pointed into it, so nothing under data/ is touched.
+
+Usage:
+    python scripts/bench_startup.py
+    python scripts/bench_startup.py --repeat 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# Add project root to path
+sys.path.insert(0, str(ROOT))
+
+DEFERRED = ("pandas", "anthropic", "meilisearch", "openpyxl")
+
+
+def _child_import() -> dict:
+    t0 = time.perf_counter()
+    import web.main  # noqa: F401
+    return {"import": (time.perf_counter() - t0) * 1000}
+
+
+def _child_deferred() -> dict:
+    import importlib
+    t0 = time.perf_counter()
+    for name in DEFERRED:
+        importlib.import_module(name)
+    return {"deferred": (time.perf_counter() - t0) * 1000}
+
+
+def _child_startup() -> dict:
+    import asyncio
+    import tempfile
+
+    tmp = Path(tempfile.mkdtemp())
+    # The SQLite user migration opens data/bot.db relative to the cwd.
+    os.chdir(tmp)
+    import bot.database
+    import core.duckdb_store
+    bot.database.DB_PATH = tmp / "bot.db"
+    core.duckdb_store.DB_PATH = tmp / "analytics.duckdb"
+
+    import httpx
+    import web.main
+
+    async def run() -> dict:
+        store = await core.duckdb_store.get_store()
+        async with store.connection() as conn:
+            conn.execute(
+                "INSERT INTO orders (id, source_id, status_id, grand_total, ordered_at) "
+                "VALUES (1, 1, 1, 100, now())"
+            )
+        t0 = time.perf_counter()
+        await web.main.startup_event()
+        startup = (time.perf_counter() - t0) * 1000
+
+        transport = httpx.ASGITransport(app=web.main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            t0 = time.perf_counter()
+            r = await client.get("/api/health")
+            health = (time.perf_counter() - t0) * 1000
+        assert r.status_code == 200 and r.json()["ready"], r.text
+        return {"startup": startup, "health": health}
+
+    result = asyncio.run(run())
+    # Leave the cancelled warm-up and the scheduler to the process exit.
+    sys.stdout.write(json.dumps(result) + "\n")
+    sys.stdout.flush()
+    os._exit(0)
+
+
+CHILDREN = {"import": _child_import, "deferred": _child_deferred, "startup": _child_startup}
+
+
+def _spawn(kind: str) -> dict:
+    env = {
+        **os.environ,
+        "DASHBOARD_SECRET_KEY": os.environ.get("DASHBOARD_SECRET_KEY") or "bench-secret",
+        "KEYCRM_API_KEY": os.environ.get("KEYCRM_API_KEY") or "bench-key-not-a-real-one",
+        "LOG_LEVEL": "WARNING",
+    }
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", kind],
+        capture_output=True, text=True, check=True, env=env, cwd=ROOT,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark web startup")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--child", choices=sorted(CHILDREN), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(CHILDREN[args.child]()))
+        return 0
+
+    samples: dict = {}
+    for _ in range(args.repeat):
+        for kind in ("import", "deferred", "startup"):
+            for key, ms in _spawn(kind).items():
+                samples.setdefault(key, []).append(ms)
+
+    print(f"{'step':<10}{'median ms':>11}{'min ms':>9}")
+    for key in ("import", "deferred", "startup", "health"):
+        values = samples[key]
+        print(f"{key:<10}{statistics.median(values):>11.1f}{min(values):>9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Cost of a status refresh over a window where almost nothing changed.
+
+Loads `--history` orders, then re-upserts the newest `--orders` of them the
+way refresh_order_statuses does, with `--changed` of them carrying a new status:
+once the old way (force every row, skip line items) and once gated on the
+payload hash. Prints the time of the upsert, how many orders it wrote, and
+the time of the incremental warehouse refresh those orders then trigger.
+
+Usage:
+    python scripts/bench_status_refresh.py
+    python scripts/bench_status_refresh.py --history 100000 --orders 5000 --changed 50
+"""
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.duckdb_store import DuckDBStore
+
+
+def _order(oid: int, status_id: int = 12) -> dict:
+    return {
+        "id": oid,
+        "source_id": 1,
+        "status_id": status_id,
+        "grand_total": "150.00",
+        "ordered_at": "2026-09-01T10:00:00+00:00",
+        "created_at": "2026-09-01T09:00:00+00:00",
+        "updated_at": "2026-09-01T10:00:00+00:00",
+        "buyer": {"id": oid % 700},
+        "manager": None,
+        "manager_comment": None,
+        "promocode": None,
+        "products": [
+            {"product_id": p, "name": f"product {p}", "quantity": 1, "price_sold": "50.00"}
+            for p in range(3)
+        ],
+    }
+
+
+async def _run(args) -> None:
+    first = args.history - args.orders + 1
+    ids = range(first, args.history + 1)
+    changed = set(range(first, first + args.changed))
+    window = [_order(i, 19 if i in changed else 12) for i in ids]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DuckDBStore(db_path=Path(tmp) / "bench.duckdb")
+        await store.connect()
+        try:
+            paths = [
+                ("force all (before)", dict(force_update=True, skip_products=True)),
+                ("payload hash", dict(force_update=True, skip_unchanged_payload=True)),
+            ]
+            await store.upsert_orders([_order(i) for i in range(1, args.history + 1)])
+            await store.refresh_warehouse_layers(trigger="bench")
+            print(f"{args.history} orders, window of {args.orders}, {args.changed} with a new status")
+            print(f"{'path':<22}{'upsert ms':>11}{'written':>10}{'refresh ms':>12}")
+            for label, kwargs in paths:
+                # Same starting point for both: the window as it was, hashed
+                await store.upsert_orders([_order(i) for i in ids], force_update=True)
+                t0 = time.perf_counter()
+                result = await store.upsert_orders(window, **kwargs)
+                upsert_ms = (time.perf_counter() - t0) * 1000
+                t0 = time.perf_counter()
+                await store.refresh_warehouse_layers(
+                    trigger="bench", changed_order_ids=result.changed_ids,
+                )
+                refresh_ms = (time.perf_counter() - t0) * 1000
+                print(f"{label:<22}{upsert_ms:>11.1f}{len(result.changed_ids):>10}{refresh_ms:>12.1f}")
+        finally:
+            await store.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the status refresh upsert")
+    parser.add_argument("--history", type=int, default=36000)
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--changed", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(_run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
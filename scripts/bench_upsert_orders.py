@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Order upsert throughput: per-row statements vs the set-based batch.
+
+Builds KeyCRM-shaped payloads and times `upsert_orders` three ways on a fresh
+database per size: a first load (all inserts), a re-sync of the same payload
+(all skipped), and a re-sync with every `updated_at` advanced (all updates).
+The per-row baseline is the fallback path (`_upsert_orders_row_by_row`), which
+is the loop upsert_orders used to run for every batch.
+
+Usage:
+    python scripts/bench_upsert_orders.py
+    python scripts/bench_upsert_orders.py --sizes 5000 50000 --products 3
+"""
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import core.duckdb_store as duckdb_store
+from core.duckdb_store import DuckDBStore
+
+
+def _payload(n: int, products: int, updated_at: datetime) -> list:
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "id": i,
+            "source_id": [1, 2, 4][i % 3],
+            "status_id": 12,
+            "grand_total": f"{100 + i % 900}.00",
+            "ordered_at": (base + timedelta(minutes=i)).isoformat(),
+            "created_at": (base + timedelta(minutes=i)).isoformat(),
+            "updated_at": updated_at.isoformat(),
+            "buyer": {"id": i % 5000},
+            "manager": None,
+            "manager_comment": None,
+            "promocode": None,
+            "products": [
+                {"product_id": (i * 7 + k) % 500, "name": f"p{k}", "quantity": 1, "price_sold": "50.00"}
+                for k in range(products)
+            ],
+        }
+        for i in range(1, n + 1)
+    ]
+
+
+class _RowByRow:
+    """Swap the batch statement for one that fails, forcing the per-row path."""
+
+    def __enter__(self):
+        self._saved = duckdb_store._BULK_ORDER_INSERT_SQL, duckdb_store._BULK_ORDER_UPDATE_SQL
+        broken = "INSERT INTO orders (id, ordered_at) VALUES (NULL, now())"
+        duckdb_store._BULK_ORDER_INSERT_SQL = broken
+        duckdb_store._BULK_ORDER_UPDATE_SQL = broken
+        duckdb_store.logger.disabled = True
+        return self
+
+    def __exit__(self, *exc):
+        duckdb_store._BULK_ORDER_INSERT_SQL, duckdb_store._BULK_ORDER_UPDATE_SQL = self._saved
+        duckdb_store.logger.disabled = False
+
+
+async def _run(n: int, products: int, row_by_row: bool) -> dict:
+    t1 = datetime(2026, 2, 1, tzinfo=timezone.utc)
+    first = _payload(n, products, t1)
+    moved = _payload(n, products, t1 + timedelta(hours=1))
+    timings = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DuckDBStore(db_path=Path(tmp) / "bench.duckdb")
+        await store.connect()
+        try:
+            ctx = _RowByRow() if row_by_row else None
+            if ctx:
+                ctx.__enter__()
+            try:
+                for label, payload in (("insert", first), ("skip", first), ("update", moved)):
+                    t0 = time.perf_counter()
+                    await store.upsert_orders(payload)
+                    timings[label] = time.perf_counter() - t0
+            finally:
+                if ctx:
+                    ctx.__exit__(None, None, None)
+        finally:
+            await store.close()
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark upsert_orders")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5_000, 50_000])
+    parser.add_argument("--products", type=int, default=2, help="line items per order")
+    args = parser.parse_args()
+
+    print(f"{'orders':>8}  {'path':<12}{'insert s':>10}{'skip s':>10}{'update s':>10}{'orders/s':>11}")
+    for n in args.sizes:
+        for label, row_by_row in (("row-by-row", True), ("set-based", False)):
+            t = asyncio.run(_run(n, args.products, row_by_row))
+            rate = n / t["update"] if t["update"] else float("inf")
+            print(
+                f"{n:>8,}  {label:<12}{t['insert']:>10.2f}{t['skip']:>10.2f}"
+                f"{t['update']:>10.2f}{rate:>11,.0f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
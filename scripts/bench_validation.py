@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+What refresh validation costs on a quiet tick, swept versus scoped.
+
+Seeds the same synthetic history as bench_refresh_scope.py, then runs small
+incremental refreshes twice over: once with every tick forced to the full
+sweep, once letting it validate only the dates it rebuilt. Reports the
+`validation_ms` stage of each, which is Step 4 alone — the Silver and Gold
+work in front of it is identical either way.
+
+Usage:
+    python scripts/bench_validation.py
+    python scripts/bench_validation.py --orders 500000 --changed 1 10 100
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import core.duckdb_store as duckdb_store
+from core.duckdb_store import DuckDBStore
+from scripts.bench_refresh_scope import _seed
+
+
+async def _validation_ms(store: DuckDBStore, ids, full: bool, repeat: int) -> tuple:
+    samples = []
+    mode = None
+    for _ in range(repeat):
+        if full:
+            store.request_full_validation()
+        res = await store.refresh_warehouse_layers(trigger="bench", changed_order_ids=ids)
+        samples.append(res["stage_ms"]["validation_ms"])
+        mode = res["validation_mode"]
+    return statistics.median(samples), mode
+
+
+async def _run(orders: int, changed: list, repeat: int) -> None:
+    duckdb_store.logger.disabled = True
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DuckDBStore(db_path=Path(tmp) / "bench.duckdb")
+        await store.connect()
+        try:
+            await _seed(store, orders)
+            await store.refresh_warehouse_layers(trigger="bench")
+
+            rng = random.Random(42)
+            print(f"{orders:,} orders; validation stage, median of {repeat}")
+            print(f"{'changed ids':>12}{'full ms':>10}{'dates ms':>10}{'speedup':>9}")
+            for n in changed:
+                ids = rng.sample(range(1, orders + 1), n)
+                full_ms, _ = await _validation_ms(store, ids, True, repeat)
+                scoped_ms, mode = await _validation_ms(store, ids, False, repeat)
+                assert mode == "dates", f"scoped tick ran as {mode}"
+                print(f"{n:>12,}{full_ms:>10.1f}{scoped_ms:>10.1f}{full_ms / scoped_ms:>8.1f}x")
+        finally:
+            await store.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark refresh validation")
+    parser.add_argument("--orders", type=int, default=200_000)
+    parser.add_argument("--changed", type=int, nargs="+", default=[1, 10, 100, 1_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(_run(args.orders, args.changed, args.repeat))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+WebSocket broadcast with a room full of clients, a few of them slow.
+
+Connects simulated clients to a ConnectionManager — most answer each send at
+once, `--slow` of them take `--slow-ms` per frame — then sends a series of
+`milestone_reached` broadcasts (not coalesced, so every one must arrive)
+`--interval-ms` apart. For each broadcast it records how long `broadcast()`
+held the caller (the sync event handler, in production) and how long until
+every fast client had the message.
+
+Usage:
+    python scripts/bench_ws_broadcast.py
+    python scripts/bench_ws_broadcast.py --clients 5000 --slow 20 --slow-ms 2000
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.websocket_manager import ConnectionManager
+
+
+class _Client:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.received = 0
+        self.arrived = asyncio.Event()
+        self.expect = 0
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message: str):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        else:
+            await asyncio.sleep(0)
+        self.received += 1
+        if self.received >= self.expect:
+            self.arrived.set()
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        pass
+
+
+def _payload() -> dict:
+    # The size of a goal_progress update: a few dozen numbers and labels.
+    return {f"metric_{i}": {"value": i * 1.5, "label": f"Metric {i}", "ok": True} for i in range(40)}
+
+
+async def _run(clients: int, slow: int, slow_ms: float, broadcasts: int, interval_ms: float):
+    manager = ConnectionManager()
+    fast = [_Client(0) for _ in range(clients - slow)]
+    laggards = [_Client(slow_ms / 1000) for _ in range(slow)]
+    for c in fast + laggards:
+        await manager.connect(c, room="dashboard")
+
+    held, delivered = [], []
+    for i in range(broadcasts):
+        for c in fast:
+            c.expect = c.received + 1
+            c.arrived.clear()
+        t0 = time.perf_counter()
+        await manager.broadcast("dashboard", "milestone_reached", {"n": i, **_payload()})
+        held.append((time.perf_counter() - t0) * 1000)
+        await asyncio.gather(*(c.arrived.wait() for c in fast))
+        delivered.append((time.perf_counter() - t0) * 1000)
+        await asyncio.sleep(interval_ms / 1000)
+
+    stats = manager.get_stats()
+    return held, delivered, stats
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark WebSocket broadcast fan-out")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--slow", type=int, default=5)
+    parser.add_argument("--slow-ms", type=float, default=500.0)
+    parser.add_argument("--broadcasts", type=int, default=20)
+    parser.add_argument("--interval-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    held, delivered, stats = asyncio.run(
+        _run(args.clients, args.slow, args.slow_ms, args.broadcasts, args.interval_ms)
+    )
+    print(
+        f"{args.clients} clients ({args.slow} at {args.slow_ms:.0f} ms/frame), "
+        f"{args.broadcasts} broadcasts {args.interval_ms:.0f} ms apart"
+    )
+    print(f"{'':<22}{'p50 ms':>10}{'max ms':>10}")
+    print(f"{'caller held':<22}{statistics.median(held):>10.1f}{max(held):>10.1f}")
+    print(f"{'all fast delivered':<22}{statistics.median(delivered):>10.1f}{max(delivered):>10.1f}")
+    print(f"still connected: {stats['active_connections']}, "
+          f"evicted: {stats.get('evicted_slow_connections', 0)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
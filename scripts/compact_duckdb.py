@@ -35,9 +35,9 @@ NEW_DB = DATA_DIR / "analytics_clean.duckdb"
 MANIFEST_PATH = EXPORT_DIR / "_manifest.json"
 
 DERIVED_TABLES = frozenset({
-    "silver_orders", "silver_order_utm",
+    "silver_orders", "silver_order_utm", "silver_buyer_stats",
     "gold_daily_revenue", "gold_daily_products",
-    "gold_daily_traffic",
+    "gold_daily_traffic", "gold_cohort_activity", "gold_daily_basket_pairs",
 
     # ── Dropped from the schema, still present in the production database ──
     #
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Profile the dashboard's DuckDB queries against a database file.
+
+Turns on the query profiler (core/query_profiler.py), runs the heavy
+dashboard reads once — revenue, customers, cohorts, basket, margin — for the
+last `--days` days, and prints the time spent per repository method and the
+slowest statements. With `--sample` a fraction of the reads is also run
+through EXPLAIN ANALYZE; `--json` writes everything, plans included, to a file.
+
+DuckDB lets one process open the file for writing, so point `--db` at a copy
+of the production database, or stop the web container first. On a running
+server use the admin endpoint (/api/duckdb/profile) instead.
+
+Usage:
+    python scripts/profile_queries.py --db /tmp/analytics.duckdb
+    python scripts/profile_queries.py --db /tmp/analytics.duckdb --days 90 --sample 1 --json profile.json
+"""
+import argparse
+import asyncio
+import json
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.duckdb_store import DuckDBStore
+from core.query_profiler import query_profiler
+
+
+async def _workload(store: DuckDBStore, days: int, sales_type: str) -> None:
+    end = date.today()
+    start = end - timedelta(days=days - 1)
+    calls = [
+        store.get_summary_stats(start, end, sales_type=sales_type),
+        store.get_revenue_trend(start, end, sales_type=sales_type),
+        store.get_sales_by_source(start, end, sales_type=sales_type),
+        store.get_top_products(start, end, sales_type=sales_type),
+        store.get_customer_insights(start, end, sales_type=sales_type),
+        store.get_cohort_retention(sales_type=sales_type),
+        store.get_basket_summary(start, end, sales_type=sales_type),
+        store.get_frequently_bought_together(start, end, sales_type=sales_type),
+        store.get_margin_overview(start, end, sales_type=sales_type),
+        store.get_margin_by_brand(start, end, sales_type=sales_type),
+    ]
+    for call in calls:
+        try:
+            await call
+        except Exception as e:
+            print(f"  {call.__qualname__}: {e}", file=sys.stderr)
+
+
+async def _run(args) -> dict:
+    store = DuckDBStore(db_path=Path(args.db))
+    await store.connect()
+    query_profiler.configure(enabled=True, top_n=args.top, sample_rate=args.sample)
+    query_profiler.reset()
+    try:
+        await _workload(store, args.days, args.sales_type)
+    finally:
+        query_profiler.configure(enabled=False)
+        await store.close()
+    return query_profiler.snapshot()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Profile dashboard DuckDB queries")
+    parser.add_argument("--db", required=True, help="DuckDB file (a copy, or with web stopped)")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--sales-type", default="retail")
+    parser.add_argument("--top", type=int, default=10, help="Slowest statements to list")
+    parser.add_argument("--sample", type=float, default=0.0,
+                        help="Fraction of reads to EXPLAIN ANALYZE (0..1)")
+    parser.add_argument("--json", help="Write the full snapshot, plans included, here")
+    args = parser.parse_args()
+
+    snapshot = asyncio.run(_run(args))
+
+    print(f"{snapshot['statements']} statements, last {args.days} days, {args.sales_type}")
+    print(f"{'caller':<56}{'count':>7}{'total ms':>11}{'max ms':>10}{'rows':>10}")
+    for t in snapshot["by_caller"]:
+        print(f"{t['caller'][:55]:<56}{t['count']:>7}{t['total_ms']:>11.1f}{t['max_ms']:>10.1f}{t['rows']:>10}")
+    print(f"\nslowest {len(snapshot['slowest'])}:")
+    for entry in snapshot["slowest"]:
+        print(f"{entry['duration_ms']:>10.1f} ms  {entry['caller']}  {entry['sql'][:80]}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(snapshot, indent=2, default=str))
+        print(f"\nwrote {args.json} ({len(snapshot['profiles'])} plans)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
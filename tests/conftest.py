@@ -1,8 +1,10 @@
 """Shared fixtures.
 
-Both of the fixtures here are autouse guards rather than conveniences: they
-stop the suite from reaching something real — the Telegram Bot API and the
-production database. Markers and collection settings live in pytest.ini.
+Every fixture here is an autouse guard rather than a convenience. The first
+three stop the suite from reaching something real — the Telegram Bot API, the
+production database and the production models; the last stops the shared
+KeyCRM rate governor carrying one test's state into the next. Markers and collection settings live in
+pytest.ini.
 """
 import pytest
 
@@ -62,3 +64,36 @@ def _never_the_production_database(monkeypatch, tmp_path):
     monkeypatch.setattr("core.duckdb_store._store_instance", None, raising=False)
 
 
+@pytest.fixture(autouse=True)
+def _never_the_production_models(monkeypatch, tmp_path):
+    """No test may read or replace the models in data/.
+
+    A `PredictionService()` publishes every model it trains into the registry
+    under MODEL_DIR, and `get_prediction_service()` imports the legacy model
+    file from beside it. Both resolve their paths at call time, so pointing
+    them at tmp_path is enough; the singleton is dropped so it is rebuilt
+    against the redirected paths.
+    """
+    from core import prediction_service as ps
+
+    model_dir = tmp_path / "models-data"
+    monkeypatch.setattr(ps, "MODEL_DIR", model_dir)
+    for name in ("MODEL_PATH", "DOW_CORRECTIONS_PATH", "CLIP_RATIO_PATH", "TUNED_PARAMS_PATH"):
+        monkeypatch.setattr(ps, name, model_dir / getattr(ps, name).name)
+    monkeypatch.setattr(ps, "_service", None)
+
+
+@pytest.fixture(autouse=True)
+def _a_fresh_keycrm_governor(monkeypatch):
+    """Each test gets its own KeyCRM rate governor.
+
+    The governor is process state on purpose — it is the one budget every
+    consumer shares. In a test run that means one test's 429 would hold the
+    next for Retry-After, and a few hundred mocked requests would drain the
+    bucket and slow everything after them to a request a second.
+    """
+    from core import keycrm
+
+    monkeypatch.setattr(
+        keycrm, "rate_governor", keycrm.RateGovernor(per_minute=60_000, burst=1_000),
+    )
@@ -200,6 +200,8 @@ class TestSmsSegmentsAuth:
         assert viewer_id not in ADMIN_USER_IDS
 
         class _Store:
+            users_generation = 0
+
             async def get_user(self, uid):
                 return {"status": "approved", "role": "viewer"}
 
@@ -100,6 +100,7 @@ class TestConnectionManager:
             WebSocketEvent.ORDERS_SYNCED,
             {"count": 10}
         )
+        await manager.flush()
 
         assert sent_count == 2
         ws1.send_text.assert_called_once()
@@ -129,13 +130,14 @@ class TestConnectionManager:
         ws_admin.send_text.reset_mock()
 
         await manager.broadcast("dashboard", "test_event", {"data": "value"})
+        await manager.flush()
 
         ws_dashboard.send_text.assert_called_once()
         ws_admin.send_text.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_broadcast_handles_failed_connections(self, manager):
-        """Test that broadcast() removes failed connections."""
+        """Test that a failed send removes the connection."""
         ws_good = AsyncMock(spec=WebSocket)
         ws_good.accept = AsyncMock()
         ws_good.send_text = AsyncMock()
@@ -152,10 +154,12 @@ class TestConnectionManager:
 
         assert manager.connection_count("dashboard") == 2
 
-        sent_count = await manager.broadcast("dashboard", "test", {})
+        queued = await manager.broadcast("dashboard", "test", {})
+        await manager.flush()
 
-        # Only one should have received it
-        assert sent_count == 1
+        # Queued for both; only one received it
+        assert queued == 2
+        ws_good.send_text.assert_called_once()
         # Failed connection should be removed
         assert manager.connection_count("dashboard") == 1
 
@@ -177,6 +181,7 @@ class TestConnectionManager:
         ws2.send_text.reset_mock()
 
         total_sent = await manager.broadcast_all("global_event", {"global": True})
+        await manager.flush()
 
         assert total_sent == 2
         ws1.send_text.assert_called_once()
@@ -189,6 +194,7 @@ class TestConnectionManager:
         mock_websocket.send_text.reset_mock()
 
         await manager.handle_message(conn_info, "ping")
+        await manager.flush()
 
         # Should have sent a pong response
         mock_websocket.send_text.assert_called()
@@ -203,6 +209,7 @@ class TestConnectionManager:
 
         # Send a JSON ping
         await manager.handle_message(conn_info, '{"action": "ping"}')
+        await manager.flush()
 
         mock_websocket.send_text.assert_called()
 
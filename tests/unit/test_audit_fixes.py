@@ -263,7 +263,7 @@ class TestModelValidationGate:
         res = await svc._train_impl("retail")
 
         assert res["status"] == "rejected"
-        assert svc._model is None, "rejected model must NOT be committed"
+        assert not svc.has_model("retail"), "rejected model must NOT be committed"
         svc._alert_model_rejected.assert_awaited_once()
 
     @pytest.mark.asyncio
@@ -280,20 +280,18 @@ class TestModelValidationGate:
         sentinel_model = object()
         monkeypatch.setattr(ps, "_train_model",
                             lambda df: (sentinel_model, {"wape": 27.66, "mape": 30.0, "mae": 1.0}, {}, 1.0))
-        monkeypatch.setattr(svc, "_save_model", lambda: None)
         monkeypatch.setattr(svc, "predict_month", AsyncMock(return_value=[]))
 
         res = await svc._train_impl("retail")
 
         assert res["status"] == "success"
-        assert svc._model is sentinel_model
+        assert svc._registry.peek("retail").model is sentinel_model
 
     @pytest.mark.asyncio
     async def test_negative_predictions_not_stored(self, monkeypatch):
         from core import prediction_service as ps
         svc = ps.PredictionService()
-        svc._model = object()  # is_ready
-        svc._metrics = {"wape": 27.66}
+        svc._registry.publish("retail", ps.ModelArtifact(model=object(), metrics={"wape": 27.66}))
 
         fake_store = AsyncMock()
         async def fake_get_store():
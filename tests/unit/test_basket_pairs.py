@@ -0,0 +1,407 @@
+"""gold_daily_basket_pairs: the pair counts the basket pages sum over a window.
+
+The parity tests run the self-join queries these pages used before the table
+existed, verbatim, next to the new readers over one synthetic history — with
+lines that carry no product_id, repeated lines of one product, uncategorised
+and unbranded products, returns and a retired source among them.
+"""
+import random
+from datetime import date, datetime, time, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from core.duckdb_constants import B2B_MANAGER_ID, line_window_where
+from core.duckdb_store import DuckDBStore
+from core.models import OrderStatus
+
+TODAY = date.today()
+WINDOWS = {
+    "week": (TODAY - timedelta(days=6), TODAY),        # threshold 1
+    "quarter": (TODAY - timedelta(days=89), TODAY),    # threshold 2
+}
+PRODUCTS = 14
+
+
+async def _make_store(tmp_path: Path) -> DuckDBStore:
+    store = DuckDBStore(db_path=tmp_path / "test.duckdb")
+    await store.connect()
+    async with store.connection() as conn:
+        conn.execute(
+            "INSERT INTO categories (id, name, parent_id) VALUES "
+            "(1, 'Care', NULL), (2, 'Serums', 1), (3, 'Makeup', NULL), "
+            "(4, 'Lips', 3), (5, 'Hair', NULL)"
+        )
+        brands = ("BrandA", "BrandB", "BrandC", "", None)
+        categories = (2, 4, 5, 1, None)
+        for p in range(1, PRODUCTS + 1):
+            conn.execute(
+                "INSERT INTO products (id, name, category_id, brand, sku, price) "
+                "VALUES (?, ?, ?, ?, ?, 100)",
+                [p, f"Product {p}", categories[p % 5], brands[p % 5], f"SKU-{p}"],
+            )
+    return store
+
+
+def _order(oid: int, day: date, products: list, *, source_id: int = 1,
+           manager_id: int | None = None, status_id: int = 12,
+           updated_at: str = "2026-01-01T00:00:00+00:00") -> dict:
+    """`products` holds product ids; None is a line with no product_id."""
+    ordered_at = datetime.combine(day, time(12), tzinfo=timezone.utc).isoformat()
+    lines = []
+    for n, product_id in enumerate(products):
+        line = {"id": oid * 10 + n, "name": f"Product {product_id}" if product_id else f"Custom {oid}",
+                "quantity": 1, "price_sold": "100.00"}
+        if product_id:
+            line["offer"] = {"product_id": product_id, "sku": f"SKU-{product_id}"}
+        lines.append(line)
+    return {
+        "id": oid,
+        "source_id": source_id,
+        "status_id": status_id,
+        "grand_total": f"{100 * len(lines)}.00",
+        "ordered_at": ordered_at,
+        "created_at": ordered_at,
+        "updated_at": updated_at,
+        "buyer": {"id": oid % 50 + 1},
+        "manager": {"id": manager_id} if manager_id else None,
+        "manager_comment": None,
+        "promocode": None,
+        "products": lines,
+    }
+
+
+def _history(seed: int = 3, orders: int = 1500) -> list:
+    rng = random.Random(seed)
+    history = []
+    for oid in range(1, orders + 1):
+        basket = [rng.randint(1, PRODUCTS) for _ in range(rng.choice((1, 1, 2, 3, 4)))]
+        if rng.random() < 0.15:
+            basket.append(None)
+        kwargs: dict = {}
+        roll = rng.random()
+        if roll < 0.2:
+            kwargs["manager_id"] = B2B_MANAGER_ID
+        elif roll < 0.25:
+            kwargs["source_id"] = 3
+        if rng.random() < 0.08:
+            kwargs["status_id"] = int(OrderStatus.RETURNED)
+        history.append(_order(oid, TODAY - timedelta(days=rng.randrange(100)), basket, **kwargs))
+    return history
+
+
+async def _load(store: DuckDBStore, orders: list) -> None:
+    result = await store.upsert_orders(orders)
+    await store.refresh_warehouse_layers(trigger="test", changed_order_ids=result.changed_ids)
+
+
+# ─── The queries as they were ────────────────────────────────────────────────
+
+def _legacy_pairs(conn, start, end, sales_type):
+    params: list = [start, end]
+    where_sql = line_window_where(sales_type, params)
+    having_threshold = 2 if (end - start).days + 1 >= 14 else 1
+    rows = conn.execute(f"""
+        WITH order_items AS (
+            SELECT l.order_id,
+                   COALESCE(l.product_id, l.line_id) AS product_id,
+                   ANY_VALUE(l.product_name) AS product_name
+            FROM silver_order_lines l
+            WHERE {where_sql}
+            GROUP BY l.order_id, COALESCE(l.product_id, l.line_id)
+        ),
+        multi_orders AS (
+            SELECT order_id, product_id, product_name
+            FROM order_items
+            WHERE order_id IN (
+                SELECT order_id FROM order_items
+                GROUP BY order_id HAVING COUNT(*) >= 2
+            )
+        ),
+        pair_counts AS (
+            SELECT a.product_id AS a_id, b.product_id AS b_id,
+                   COUNT(DISTINCT a.order_id) AS co_occurrence
+            FROM multi_orders a
+            JOIN multi_orders b ON a.order_id = b.order_id
+                AND a.product_id < b.product_id
+            GROUP BY a.product_id, b.product_id
+            HAVING co_occurrence >= {having_threshold}
+        ),
+        product_orders AS (
+            SELECT product_id, COUNT(DISTINCT order_id) AS orders
+            FROM order_items
+            GROUP BY product_id
+        ),
+        total AS (
+            SELECT COUNT(DISTINCT order_id) AS total_orders FROM order_items
+        )
+        SELECT pc.a_id, pc.b_id, pc.co_occurrence,
+               COALESCE(p_a.name, oi_a.product_name, 'Unknown'),
+               COALESCE(p_b.name, oi_b.product_name, 'Unknown'),
+               po_a.orders, po_b.orders, t.total_orders,
+               pc.co_occurrence * 1.0 / t.total_orders,
+               pc.co_occurrence * 1.0 / po_a.orders,
+               pc.co_occurrence * 1.0 / po_b.orders,
+               (pc.co_occurrence * t.total_orders * 1.0) / (po_a.orders * po_b.orders)
+        FROM pair_counts pc
+        LEFT JOIN products p_a ON pc.a_id = p_a.id
+        LEFT JOIN products p_b ON pc.b_id = p_b.id
+        LEFT JOIN (SELECT product_id, ANY_VALUE(product_name) AS product_name FROM multi_orders GROUP BY product_id) oi_a ON pc.a_id = oi_a.product_id
+        LEFT JOIN (SELECT product_id, ANY_VALUE(product_name) AS product_name FROM multi_orders GROUP BY product_id) oi_b ON pc.b_id = oi_b.product_id
+        LEFT JOIN product_orders po_a ON pc.a_id = po_a.product_id
+        LEFT JOIN product_orders po_b ON pc.b_id = po_b.product_id
+        CROSS JOIN total t
+    """, params).fetchall()
+    return {
+        (r[0], r[1]): {
+            "coOccurrence": int(r[2]), "names": (r[3], r[4]),
+            "orders": (int(r[5]), int(r[6])), "totalOrders": int(r[7]),
+            "support": round(float(r[8]), 4),
+            "confidenceAtoB": round(float(r[9]), 3),
+            "confidenceBtoA": round(float(r[10]), 3),
+            "lift": round(float(r[11]), 2),
+        }
+        for r in rows
+    }
+
+
+def _legacy_categories(conn, start, end, sales_type):
+    params: list = [start, end]
+    where_sql = line_window_where(sales_type, params)
+    rows = conn.execute(f"""
+        WITH order_cats AS (
+            SELECT DISTINCT l.order_id,
+                   COALESCE(l.parent_category_name, l.category_name, 'Unknown') AS category_name,
+                   COALESCE(l.parent_category_id, l.category_id) AS category_id
+            FROM silver_order_lines l
+            WHERE {where_sql}
+        )
+        SELECT a.category_name, b.category_name, COUNT(DISTINCT a.order_id) AS co_occurrence
+        FROM order_cats a
+        JOIN order_cats b ON a.order_id = b.order_id
+            AND a.category_name < b.category_name
+        GROUP BY a.category_name, b.category_name
+        HAVING co_occurrence >= 2
+    """, params).fetchall()
+    return {(r[0], r[1]): int(r[2]) for r in rows}
+
+
+def _legacy_brands(conn, start, end, sales_type):
+    params: list = [start, end]
+    where_sql = line_window_where(sales_type, params)
+    having_threshold = 2 if (end - start).days + 1 >= 14 else 1
+    rows = conn.execute(f"""
+        WITH order_brands AS (
+            SELECT DISTINCT l.order_id, l.brand
+            FROM silver_order_lines l
+            WHERE {where_sql}
+              AND l.brand IS NOT NULL AND l.brand != ''
+        )
+        SELECT a.brand, b.brand, COUNT(DISTINCT a.order_id) AS co_occurrence
+        FROM order_brands a
+        JOIN order_brands b ON a.order_id = b.order_id
+            AND a.brand < b.brand
+        GROUP BY a.brand, b.brand
+        HAVING co_occurrence >= {having_threshold}
+    """, params).fetchall()
+    return {(r[0], r[1]): int(r[2]) for r in rows}
+
+
+async def _pairs(store, start, end, sales_type, **kwargs):
+    rows = await store.get_frequently_bought_together(
+        start, end, sales_type=sales_type, limit=10_000, **kwargs,
+    )
+    return {
+        (r["productA"]["id"], r["productB"]["id"]): {
+            "coOccurrence": r["coOccurrence"],
+            "names": (r["productA"]["name"], r["productB"]["name"]),
+            "orders": (r["productA"]["orders"], r["productB"]["orders"]),
+            "totalOrders": r["totalOrders"],
+            "support": r["support"],
+            "confidenceAtoB": r["confidenceAtoB"],
+            "confidenceBtoA": r["confidenceBtoA"],
+            "lift": r["lift"],
+        }
+        for r in rows
+    }
+
+
+async def _table(store) -> list:
+    async with store.connection() as conn:
+        return sorted(
+            conn.execute("SELECT * FROM gold_daily_basket_pairs").fetchall(), key=repr,
+        )
+
+
+class TestParity:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("window", sorted(WINDOWS))
+    @pytest.mark.parametrize("sales_type", ("retail", "b2b", "all"))
+    async def test_every_reader_matches_the_old_query(self, tmp_path, window, sales_type):
+        start, end = WINDOWS[window]
+        store = await _make_store(tmp_path)
+        try:
+            await _load(store, _history())
+            async with store.connection() as conn:
+                legacy_pairs = _legacy_pairs(conn, start, end, sales_type)
+                legacy_categories = _legacy_categories(conn, start, end, sales_type)
+                legacy_brands = _legacy_brands(conn, start, end, sales_type)
+            pairs = await _pairs(store, start, end, sales_type)
+            categories = {
+                (r["categoryA"], r["categoryB"]): r["coOccurrence"]
+                for r in await store.get_category_combinations(
+                    start, end, sales_type=sales_type, limit=10_000,
+                )
+            }
+            brands = {
+                (r["brandA"], r["brandB"]): r["coOccurrence"]
+                for r in await store.get_brand_affinity(
+                    start, end, sales_type=sales_type, limit=10_000,
+                )
+            }
+        finally:
+            await store.close()
+
+        assert legacy_pairs and legacy_categories and legacy_brands
+        assert pairs == legacy_pairs
+        assert categories == legacy_categories
+        assert brands == legacy_brands
+
+    @pytest.mark.asyncio
+    async def test_the_product_filter_keeps_its_pairs(self, tmp_path):
+        start, end = WINDOWS["quarter"]
+        store = await _make_store(tmp_path)
+        try:
+            await _load(store, _history())
+            async with store.connection() as conn:
+                legacy = _legacy_pairs(conn, start, end, "retail")
+            filtered = await _pairs(store, start, end, "retail", product_id=3)
+        finally:
+            await store.close()
+
+        assert filtered
+        assert filtered == {k: v for k, v in legacy.items() if 3 in k}
+
+    @pytest.mark.asyncio
+    async def test_a_line_without_a_product_is_its_own_item(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            await _load(store, [_order(7, TODAY, [1, None, None])])
+            pairs = await _pairs(store, TODAY, TODAY, "retail")
+        finally:
+            await store.close()
+
+        # Each keyed by its own line id and named as sold
+        assert len(pairs) == 3
+        (a, b), = [k for k in pairs if 1 not in k]
+        assert a != b and min(a, b) > PRODUCTS
+        assert pairs[(a, b)]["names"] == ("Custom 7", "Custom 7")
+        assert {(1, a), (1, b)} <= set(pairs)
+
+    @pytest.mark.asyncio
+    async def test_ranked_by_co_occurrence(self, tmp_path):
+        start, end = WINDOWS["quarter"]
+        store = await _make_store(tmp_path)
+        try:
+            await _load(store, _history())
+            top = await store.get_frequently_bought_together(start, end, limit=5)
+            summary = await store.get_basket_summary(start, end)
+        finally:
+            await store.close()
+
+        counts = [r["coOccurrence"] for r in top]
+        assert len(top) == 5 and counts == sorted(counts, reverse=True)
+        assert summary["topPairCount"] == counts[0]
+
+
+class TestRefresh:
+    @pytest.mark.asyncio
+    async def test_incremental_refresh_lands_where_a_full_rebuild_does(self, tmp_path):
+        history = _history()
+        store = await _make_store(tmp_path)
+        try:
+            await _load(store, history)
+            later = "2026-02-01T00:00:00+00:00"
+            await _load(store, [
+                # Moved to another day, with a different basket
+                _order(1, TODAY - timedelta(days=40), [2, 5, None], updated_at=later),
+                # Now a return
+                {**history[1], "status_id": int(OrderStatus.RETURNED), "updated_at": later},
+                # A product swapped in a basket
+                {**_order(3, TODAY - timedelta(days=2), [7, 8]), "updated_at": later},
+            ])
+            incremental = await _table(store)
+            await store.refresh_warehouse_layers(trigger="manual")
+            full = await _table(store)
+        finally:
+            await store.close()
+
+        assert incremental == full
+
+    @pytest.mark.asyncio
+    async def test_only_the_changed_orders_dates_are_rewritten(self, tmp_path):
+        """Not the buyer's other dates: order 51 has order 1's buyer."""
+        store = await _make_store(tmp_path)
+        try:
+            await _load(store, [
+                _order(1, TODAY - timedelta(days=10), [1, 2]),
+                _order(51, TODAY - timedelta(days=20), [1, 2]),
+                # Enough history that two orders stay an incremental scope
+                *(_order(i, TODAY - timedelta(days=40), [3]) for i in range(100, 140)),
+            ])
+            # A row no refresh would write: survives only if its day is left alone
+            async with store.connection() as conn:
+                conn.execute(
+                    "UPDATE gold_daily_basket_pairs SET orders = 99 "
+                    "WHERE date = ? AND kind = 'order'", [TODAY - timedelta(days=20)],
+                )
+            await _load(store, [
+                _order(1, TODAY - timedelta(days=10), [1, 3],
+                       updated_at="2026-02-01T00:00:00+00:00"),
+            ])
+            async with store.connection() as conn:
+                untouched = conn.execute(
+                    "SELECT orders FROM gold_daily_basket_pairs WHERE date = ? AND kind = 'order'",
+                    [TODAY - timedelta(days=20)],
+                ).fetchone()[0]
+            pairs = await _pairs(store, TODAY - timedelta(days=10), TODAY, "retail")
+        finally:
+            await store.close()
+
+        assert untouched == 99
+        assert set(pairs) == {(1, 3)}
+
+    @pytest.mark.asyncio
+    async def test_a_catalog_change_regroups_every_date(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            await _load(store, [_order(i, TODAY - timedelta(days=i), [1, 2]) for i in range(1, 6)])
+            async with store.connection() as conn:
+                conn.execute("UPDATE products SET brand = 'BrandZ' WHERE id = 2")
+            await store.mark_catalog_dirty()
+            # An incremental refresh over one order still rebrands all five
+            await store.refresh_warehouse_layers(trigger="test", changed_order_ids=[1])
+            brands = await store.get_brand_affinity(TODAY - timedelta(days=30), TODAY)
+        finally:
+            await store.close()
+
+        assert [(r["brandA"], r["brandB"], r["coOccurrence"]) for r in brands] == [
+            ("BrandB", "BrandZ", 5),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_an_empty_table_is_filled_whole(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            await _load(store, [_order(i, TODAY - timedelta(days=i), [1, 2]) for i in range(1, 6)])
+            async with store.connection() as conn:
+                conn.execute("DELETE FROM gold_daily_basket_pairs")
+            await _load(store, [
+                _order(1, TODAY - timedelta(days=1), [1, 2],
+                       updated_at="2026-02-01T00:00:00+00:00"),
+            ])
+            pairs = await _pairs(store, TODAY - timedelta(days=30), TODAY, "retail")
+        finally:
+            await store.close()
+
+        assert pairs[(1, 2)]["coOccurrence"] == 5
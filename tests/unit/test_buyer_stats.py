@@ -0,0 +1,248 @@
+"""silver_buyer_stats: the per-buyer table the customer readers scan.
+
+Orders go through upsert_orders and refresh_warehouse_layers, the way the
+sync writes them, so these cover the incremental scoping as well as the
+numbers themselves.
+"""
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from core.duckdb_constants import B2B_MANAGER_ID
+from core.duckdb_store import DuckDBStore
+from core.models import OrderStatus
+
+
+async def _make_store(tmp_path: Path) -> DuckDBStore:
+    store = DuckDBStore(db_path=tmp_path / "test.duckdb")
+    await store.connect()
+    async with store.connection() as conn:
+        conn.execute("INSERT INTO products (id, name, sku, price) VALUES (1, 'Cream', 'SKU-1', 100)")
+    return store
+
+
+def _order(
+    oid: int,
+    buyer_id: int,
+    *,
+    total: str = "100.00",
+    day: int = 1,
+    month: int = 8,
+    source_id: int = 1,
+    status_id: int = 12,
+    manager_id: int | None = None,
+    updated_at: str = "2026-09-01T10:00:00+00:00",
+) -> dict:
+    ordered_at = f"2026-{month:02d}-{day:02d}T10:00:00+00:00"
+    return {
+        "id": oid,
+        "source_id": source_id,
+        "status_id": status_id,
+        "grand_total": total,
+        "ordered_at": ordered_at,
+        "created_at": ordered_at,
+        "updated_at": updated_at,
+        "buyer": {"id": buyer_id},
+        "manager": {"id": manager_id} if manager_id else None,
+        "manager_comment": None,
+        "promocode": None,
+        "products": [
+            {"offer": {"product_id": 1, "sku": "SKU-1"}, "name": "Cream",
+             "quantity": 1, "price_sold": total},
+        ],
+    }
+
+
+async def _load(store: DuckDBStore, orders: list, **kwargs) -> None:
+    result = await store.upsert_orders(orders, **kwargs)
+    await store.refresh_warehouse_layers(trigger="test", changed_order_ids=result.changed_ids)
+
+
+async def _stats(store: DuckDBStore, sales_type: str = "all") -> dict:
+    async with store.connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT buyer_id, orders, revenue, margin, costed_revenue,
+                   first_order_date, last_order_date, cohort_month,
+                   last_order_id, last_order_total
+            FROM silver_buyer_stats WHERE sales_type = ?
+            """,
+            [sales_type],
+        ).fetchall()
+    keys = ("orders", "revenue", "margin", "costed_revenue", "first_order_date",
+            "last_order_date", "cohort_month", "last_order_id", "last_order_total")
+    return {r[0]: dict(zip(keys, r[1:])) for r in rows}
+
+
+class TestValues:
+    @pytest.mark.asyncio
+    async def test_orders_revenue_and_last_order(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            await _load(store, [
+                _order(1, 7, total="100.00", day=3, month=7),
+                _order(2, 7, total="250.00", day=20, month=8),
+            ])
+            buyer = (await _stats(store))[7]
+        finally:
+            await store.close()
+
+        assert buyer["orders"] == 2
+        assert float(buyer["revenue"]) == 350.0
+        assert buyer["first_order_date"] == date(2026, 7, 3)
+        assert buyer["last_order_date"] == date(2026, 8, 20)
+        assert buyer["cohort_month"] == date(2026, 7, 1)
+        assert buyer["last_order_id"] == 2
+        assert float(buyer["last_order_total"]) == 250.0
+
+    @pytest.mark.asyncio
+    async def test_returns_and_retired_sources_do_not_count(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            await _load(store, [
+                _order(1, 7, total="100.00"),
+                _order(2, 7, total="900.00", day=5, status_id=int(OrderStatus.RETURNED)),
+                _order(3, 7, total="900.00", day=6, source_id=3),
+                # Only ever returned: no row at all
+                _order(4, 8, status_id=int(OrderStatus.RETURNED)),
+            ])
+            stats = await _stats(store)
+        finally:
+            await store.close()
+
+        assert set(stats) == {7}
+        assert stats[7]["orders"] == 1
+        assert float(stats[7]["revenue"]) == 100.0
+        assert stats[7]["last_order_id"] == 1
+
+    @pytest.mark.asyncio
+    async def test_all_row_spans_every_sales_type(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            await _load(store, [
+                _order(1, 7, total="100.00"),
+                _order(2, 7, total="300.00", day=2, manager_id=B2B_MANAGER_ID),
+            ])
+            everything = await _stats(store)
+            retail = await _stats(store, "retail")
+            b2b = await _stats(store, "b2b")
+        finally:
+            await store.close()
+
+        assert everything[7]["orders"] == 2
+        assert float(everything[7]["revenue"]) == 400.0
+        assert retail[7]["orders"] == 1 and float(retail[7]["revenue"]) == 100.0
+        assert b2b[7]["orders"] == 1 and float(b2b[7]["revenue"]) == 300.0
+
+    @pytest.mark.asyncio
+    async def test_margin_is_priced_off_offer_stocks(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            await store.upsert_stocks([{"id": 1, "sku": "SKU-1", "price": 100, "purchased_price": 40}])
+            await _load(store, [_order(1, 7, total="100.00")])
+            buyer = (await _stats(store))[7]
+        finally:
+            await store.close()
+
+        assert float(buyer["margin"]) == 60.0
+        assert float(buyer["costed_revenue"]) == 100.0
+
+
+class TestRefresh:
+    @pytest.mark.asyncio
+    async def test_incremental_refresh_rewrites_only_the_affected_buyers(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            await _load(store, [_order(i, i, total="100.00") for i in range(1, 41)])
+            # A row no refresh would write: survives only if buyer 2 is left alone
+            async with store.connection() as conn:
+                conn.execute("UPDATE silver_buyer_stats SET orders = 99 WHERE buyer_id = 2")
+
+            await _load(store, [
+                _order(1, 1, total="500.00", updated_at="2026-09-02T10:00:00+00:00"),
+            ])
+            stats = await _stats(store)
+        finally:
+            await store.close()
+
+        assert float(stats[1]["revenue"]) == 500.0
+        assert stats[2]["orders"] == 99
+
+    @pytest.mark.asyncio
+    async def test_an_order_moving_buyer_updates_both(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            await _load(store, [_order(i, i) for i in range(1, 41)] + [_order(100, 1, day=9)])
+            await _load(store, [_order(100, 2, day=9, updated_at="2026-09-02T10:00:00+00:00")])
+            stats = await _stats(store)
+        finally:
+            await store.close()
+
+        assert stats[1]["orders"] == 1
+        assert stats[2]["orders"] == 2
+        assert stats[2]["last_order_id"] == 100
+
+    @pytest.mark.asyncio
+    async def test_a_cost_change_reprices_every_buyer(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            await store.upsert_stocks([{"id": 1, "sku": "SKU-1", "price": 100, "purchased_price": 40}])
+            await _load(store, [_order(i, i) for i in range(1, 41)])
+
+            await store.upsert_stocks([{"id": 1, "sku": "SKU-1", "price": 100, "purchased_price": 70}])
+            # An incremental refresh over one order still reprices all 40
+            await store.refresh_warehouse_layers(trigger="test", changed_order_ids=[1])
+            stats = await _stats(store)
+        finally:
+            await store.close()
+
+        assert {float(s["margin"]) for s in stats.values()} == {30.0}
+
+    @pytest.mark.asyncio
+    async def test_unchanged_stock_leaves_the_buyer_stats_clean(self, tmp_path):
+        store = await _make_store(tmp_path)
+        stock = {"id": 1, "sku": "SKU-1", "price": 100, "purchased_price": 40, "quantity": 5}
+        try:
+            await store.upsert_stocks([stock])
+            assert await store._consume_buyer_stats_dirty()
+
+            await store.upsert_stocks([{**stock, "quantity": 4}])
+            assert not await store._consume_buyer_stats_dirty()
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_a_cost_change_leaves_the_catalog_tables_alone(self, tmp_path):
+        """Only silver_buyer_stats reads offer_stocks; the product tables stay incremental."""
+        store = await _make_store(tmp_path)
+        try:
+            await store.upsert_stocks([{"id": 1, "sku": "SKU-1", "price": 100, "purchased_price": 40}])
+            await _load(store, [_order(i, i, day=i % 28 + 1) for i in range(1, 41)])
+
+            await store.upsert_stocks([{"id": 1, "sku": "SKU-1", "price": 100, "purchased_price": 70}])
+            assert not await store._consume_catalog_dirty()
+            await store.refresh_warehouse_layers(trigger="test", changed_order_ids=[1])
+            async with store.connection() as conn:
+                mode = conn.execute(
+                    "SELECT silver_mode FROM warehouse_refreshes ORDER BY refreshed_at DESC LIMIT 1"
+                ).fetchone()[0]
+        finally:
+            await store.close()
+
+        assert mode.endswith("+costs") and "+catalog" not in mode
+
+    @pytest.mark.asyncio
+    async def test_an_empty_table_is_filled_whole(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            await _load(store, [_order(i, i) for i in range(1, 41)])
+            async with store.connection() as conn:
+                conn.execute("DELETE FROM silver_buyer_stats")
+
+            await _load(store, [_order(1, 1, total="500.00", updated_at="2026-09-02T10:00:00+00:00")])
+            stats = await _stats(store)
+        finally:
+            await store.close()
+
+        assert len(stats) == 40
@@ -0,0 +1,337 @@
+"""gold_cohort_activity: the cohort grid the retention, LTV and timing pages read.
+
+The parity tests run the queries these pages used before the grid existed,
+verbatim, next to the new readers over one synthetic history. The history is
+kept inside what both definitions agree on: every order is on an active
+source, each buyer sticks to one sales type, and the retail orders are ones
+the old manager-based filter and Silver's sales_type both call retail. Outside
+that the grid follows Gold's revenue definition on purpose.
+"""
+import random
+from datetime import date, datetime, time, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from core.duckdb_constants import B2B_MANAGER_ID, RETAIL_MANAGER_IDS
+from core.duckdb_store import DuckDBStore
+from core.models import OrderStatus
+
+SALES_TYPES = ("retail", "b2b", "all")
+MONTHS_BACK = 24
+RETENTION_MONTHS = 12
+
+
+async def _make_store(tmp_path: Path) -> DuckDBStore:
+    store = DuckDBStore(db_path=tmp_path / "test.duckdb")
+    await store.connect()
+    return store
+
+
+def _order(oid: int, buyer_id: int, day: date, *, total: str = "100.00",
+           source_id: int = 4, manager_id: int | None = None,
+           status_id: int = 12, updated_at: str = "2026-01-01T00:00:00+00:00") -> dict:
+    # Noon UTC is the same calendar day in Kyiv
+    ordered_at = datetime.combine(day, time(12), tzinfo=timezone.utc).isoformat()
+    return {
+        "id": oid,
+        "source_id": source_id,
+        "status_id": status_id,
+        "grand_total": total,
+        "ordered_at": ordered_at,
+        "created_at": ordered_at,
+        "updated_at": updated_at,
+        "buyer": {"id": buyer_id},
+        "manager": {"id": manager_id} if manager_id else None,
+        "manager_comment": None,
+        "promocode": None,
+        "products": [],
+    }
+
+
+def _history(seed: int = 7, buyers: int = 240) -> list:
+    """Twenty months of orders, a few per buyer, some of them returns."""
+    rng = random.Random(seed)
+    today = date.today()
+    orders = []
+    oid = 1
+    for buyer_id in range(1, buyers + 1):
+        b2b = buyer_id % 4 == 0
+        first = today - timedelta(days=rng.randrange(20, 600))
+        for n in range(rng.choice((1, 1, 2, 3, 5))):
+            day = first + timedelta(days=n * rng.randrange(0, 90))
+            if day > today:
+                break
+            if b2b:
+                kwargs = dict(source_id=rng.choice((1, 2)), manager_id=B2B_MANAGER_ID)
+            elif rng.random() < 0.5:
+                kwargs = dict(source_id=4)
+            else:
+                kwargs = dict(source_id=rng.choice((1, 2)), manager_id=rng.choice(RETAIL_MANAGER_IDS))
+            if rng.random() < 0.1:
+                kwargs["status_id"] = int(OrderStatus.RETURNED)
+            orders.append(_order(oid, buyer_id, day, total=f"{rng.randint(50, 900)}.00", **kwargs))
+            oid += 1
+    return orders
+
+
+async def _load(store: DuckDBStore, orders: list) -> None:
+    result = await store.upsert_orders(orders)
+    await store.refresh_warehouse_layers(trigger="test", changed_order_ids=result.changed_ids)
+
+
+# ─── The queries as they were ────────────────────────────────────────────────
+
+def _legacy_filter(sales_type: str) -> str:
+    if sales_type == "retail":
+        return f"""
+            AND (o.manager_id IN ({','.join(map(str, RETAIL_MANAGER_IDS))})
+                 OR (o.manager_id IS NULL AND o.source_id = 4))
+        """
+    if sales_type == "b2b":
+        return f"AND o.manager_id = {B2B_MANAGER_ID}"
+    return ""
+
+
+def _legacy_enhanced_sql(sales_type: str) -> str:
+    sales_type_filter = _legacy_filter(sales_type)
+    return f"""
+    WITH customer_first_order AS (
+        SELECT o.buyer_id, DATE_TRUNC('month', MIN(o.order_date)) AS cohort_month
+        FROM silver_orders o
+        WHERE o.buyer_id IS NOT NULL AND NOT o.is_return {sales_type_filter}
+        GROUP BY o.buyer_id
+    ),
+    customer_cohorts AS (
+        SELECT c.buyer_id, c.cohort_month, COALESCE(SUM(o.grand_total), 0) AS first_month_revenue
+        FROM customer_first_order c
+        LEFT JOIN silver_orders o ON c.buyer_id = o.buyer_id
+            AND DATE_TRUNC('month', o.order_date) = c.cohort_month
+            AND NOT o.is_return
+        GROUP BY c.buyer_id, c.cohort_month
+    ),
+    customer_orders AS (
+        SELECT o.buyer_id, c.cohort_month,
+               DATEDIFF('month', c.cohort_month, DATE_TRUNC('month', o.order_date)) AS months_since,
+               o.grand_total AS revenue
+        FROM silver_orders o
+        JOIN customer_cohorts c ON o.buyer_id = c.buyer_id
+        WHERE NOT o.is_return {sales_type_filter}
+    ),
+    cohort_sizes AS (
+        SELECT cohort_month, COUNT(DISTINCT buyer_id) AS size, SUM(first_month_revenue) AS m0_revenue
+        FROM customer_cohorts GROUP BY cohort_month
+    ),
+    retention_data AS (
+        SELECT r.cohort_month, r.months_since,
+               COUNT(DISTINCT r.buyer_id) AS retained_customers, SUM(r.revenue) AS period_revenue
+        FROM customer_orders r WHERE r.months_since <= ?
+        GROUP BY r.cohort_month, r.months_since
+    )
+    SELECT
+        strftime(r.cohort_month, '%Y-%m') as cohort,
+        s.size as cohort_size,
+        r.months_since as month_number,
+        ROUND(100.0 * r.retained_customers / s.size, 1) as retention_pct,
+        r.period_revenue,
+        ROUND(100.0 * r.period_revenue / NULLIF(s.m0_revenue, 0), 1) as revenue_retention_pct
+    FROM retention_data r
+    JOIN cohort_sizes s ON r.cohort_month = s.cohort_month
+    WHERE r.cohort_month >= DATE_TRUNC('month', CURRENT_DATE) - INTERVAL '{MONTHS_BACK} months'
+    ORDER BY r.cohort_month DESC, r.months_since
+    """
+
+
+def _legacy_days_to_second_sql(sales_type: str) -> str:
+    return f"""
+    WITH customer_orders_ranked AS (
+        SELECT o.buyer_id, o.order_date,
+               ROW_NUMBER() OVER (PARTITION BY o.buyer_id ORDER BY o.order_date) AS order_num
+        FROM silver_orders o
+        WHERE o.buyer_id IS NOT NULL AND NOT o.is_return {_legacy_filter(sales_type)}
+    )
+    SELECT DATEDIFF('day', c1.order_date, c2.order_date) AS days_to_second
+    FROM customer_orders_ranked c1
+    JOIN customer_orders_ranked c2
+        ON c1.buyer_id = c2.buyer_id AND c1.order_num = 1 AND c2.order_num = 2
+    WHERE c1.order_date >= CURRENT_DATE - INTERVAL '{MONTHS_BACK} months'
+    """
+
+
+async def _legacy_cohorts(store: DuckDBStore, sales_type: str) -> dict:
+    """{cohort: (size, retention by month, revenue by month, revenue retention by month)}"""
+    async with store.connection() as conn:
+        rows = conn.execute(_legacy_enhanced_sql(sales_type), [RETENTION_MONTHS]).fetchall()
+    cohorts: dict = {}
+    for cohort, size, month, pct, revenue, rev_pct in rows:
+        entry = cohorts.setdefault(cohort, (size, {}, {}, {}))
+        entry[1][month] = float(pct)
+        entry[2][month] = float(revenue)
+        entry[3][month] = float(rev_pct) if rev_pct is not None else None
+    return cohorts
+
+
+async def _grid(store: DuckDBStore) -> list:
+    async with store.connection() as conn:
+        return conn.execute(
+            "SELECT * FROM gold_cohort_activity ORDER BY ALL"
+        ).fetchall()
+
+
+# ─── Parity ──────────────────────────────────────────────────────────────────
+
+class TestParity:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("sales_type", SALES_TYPES)
+    async def test_retention_matches_the_old_query(self, tmp_path, sales_type):
+        store = await _make_store(tmp_path)
+        try:
+            await _load(store, _history())
+            legacy = await _legacy_cohorts(store, sales_type)
+            plain = await store.get_cohort_retention(
+                months_back=MONTHS_BACK, retention_months=RETENTION_MONTHS, sales_type=sales_type,
+            )
+            enhanced = await store.get_enhanced_cohort_retention(
+                months_back=MONTHS_BACK, retention_months=RETENTION_MONTHS, sales_type=sales_type,
+            )
+        finally:
+            await store.close()
+
+        assert len(legacy) >= 15
+        months = range(RETENTION_MONTHS + 1)
+        for result in (plain, enhanced):
+            assert [c["month"] for c in result["cohorts"]] == sorted(legacy, reverse=True)
+        for cohort in plain["cohorts"]:
+            size, retention, _, _ = legacy[cohort["month"]]
+            assert cohort["size"] == size
+            assert [float(p) if p is not None else None for p in cohort["retention"]] == [
+                retention.get(m) for m in months
+            ]
+        for cohort in enhanced["cohorts"]:
+            size, retention, revenue, revenue_retention = legacy[cohort["month"]]
+            assert cohort["size"] == size
+            assert cohort["retention"] == [retention.get(m) for m in months]
+            assert cohort["revenue"] == [round(revenue.get(m, 0), 2) for m in months]
+            assert cohort["revenueRetention"] == [revenue_retention.get(m) for m in months]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("sales_type", SALES_TYPES)
+    async def test_ltv_matches_the_old_query(self, tmp_path, sales_type):
+        store = await _make_store(tmp_path)
+        try:
+            await _load(store, _history())
+            legacy = await _legacy_cohorts(store, sales_type)
+            ltv = await store.get_cohort_ltv(
+                months_back=MONTHS_BACK, retention_months=RETENTION_MONTHS, sales_type=sales_type,
+            )
+        finally:
+            await store.close()
+
+        assert [c["month"] for c in ltv["cohorts"]] == sorted(legacy, reverse=True)
+        for cohort in ltv["cohorts"]:
+            size, _, revenue, _ = legacy[cohort["month"]]
+            running, expected = 0.0, []
+            for m in range(RETENTION_MONTHS + 1):
+                running += revenue.get(m, 0)
+                expected.append(round(running, 2))
+            assert cohort["customerCount"] == size
+            assert [float(v) for v in cohort["cumulativeRevenue"]] == pytest.approx(expected)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("sales_type", SALES_TYPES)
+    async def test_purchase_timing_matches_the_old_query(self, tmp_path, sales_type):
+        store = await _make_store(tmp_path)
+        try:
+            await _load(store, _history())
+            async with store.connection() as conn:
+                legacy = sorted(
+                    r[0] for r in conn.execute(_legacy_days_to_second_sql(sales_type)).fetchall()
+                )
+            timing = await store.get_days_to_second_purchase(
+                months_back=MONTHS_BACK, sales_type=sales_type,
+            )
+        finally:
+            await store.close()
+
+        edges = ((30, "0-30"), (60, "31-60"), (90, "61-90"), (120, "91-120"), (180, "121-180"))
+        expected: dict = {}
+        for days in legacy:
+            bucket = next((name for edge, name in edges if days <= edge), "180+")
+            expected[bucket] = expected.get(bucket, 0) + 1
+
+        assert legacy
+        assert {b["bucket"]: b["customers"] for b in timing["buckets"]} == expected
+        assert timing["summary"]["totalRepeatCustomers"] == len(legacy)
+
+
+# ─── Keeping the grid current ────────────────────────────────────────────────
+
+class TestRefresh:
+    @pytest.mark.asyncio
+    async def test_incremental_refresh_lands_where_a_full_rebuild_does(self, tmp_path):
+        store = await _make_store(tmp_path)
+        today = date.today()
+        try:
+            history = _history(buyers=120)
+            await _load(store, history)
+            last_id = history[-1]["id"]
+            later = "2026-02-01T00:00:00+00:00"
+            await _load(store, [
+                # A repeat order, a brand new buyer, and a buyer whose first
+                # order moves a month earlier — out of one cohort, into another
+                _order(last_id + 1, 5, today, total="321.00"),
+                _order(last_id + 2, 9_999, today - timedelta(days=40)),
+                {**next(o for o in history if o["buyer"]["id"] == 3),
+                 "ordered_at": datetime.combine(today - timedelta(days=700), time(12),
+                                                tzinfo=timezone.utc).isoformat(),
+                 "updated_at": later},
+            ])
+            incremental = await _grid(store)
+
+            await store.refresh_buyer_stats()
+            assert await _grid(store) == incremental
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_only_the_touched_cohorts_are_rewritten(self, tmp_path):
+        store = await _make_store(tmp_path)
+        today = date.today()
+        try:
+            await _load(store, [_order(i, i, today - timedelta(days=31 * i)) for i in range(1, 41)])
+            # A cell no rebuild would produce: survives only if its cohort is left alone
+            async with store.connection() as conn:
+                conn.execute("""
+                    UPDATE gold_cohort_activity SET buyers = 99
+                    WHERE sales_type = 'all' AND cohort_month = (
+                        SELECT cohort_month FROM silver_buyer_stats
+                        WHERE buyer_id = 20 AND sales_type = 'all'
+                    )
+                """)
+
+            await _load(store, [_order(100, 1, today)])
+            async with store.connection() as conn:
+                cells = dict(conn.execute("""
+                    SELECT st.buyer_id, g.buyers
+                    FROM gold_cohort_activity g
+                    JOIN silver_buyer_stats st
+                      ON st.sales_type = g.sales_type AND st.cohort_month = g.cohort_month
+                    WHERE g.sales_type = 'all' AND g.months_since = 0 AND st.buyer_id IN (1, 20)
+                """).fetchall())
+        finally:
+            await store.close()
+
+        assert cells[20] == 99
+        assert cells[1] == 1
+
+    @pytest.mark.asyncio
+    async def test_a_new_database_fills_the_grid(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            await _load(store, _history(buyers=30))
+            assert await _grid(store)
+
+            status = await store.get_warehouse_status()
+            assert status["stage_ms"]["gold_cohort"] is not None
+        finally:
+            await store.close()
@@ -5,13 +5,13 @@ container still had ~6GB of its budget free.
 """
 import pytest
 
-from core.duckdb_store import DEFAULT_DUCKDB_MEMORY_LIMIT, _memory_limit
+from core.config import DEFAULT_DUCKDB_MEMORY_LIMIT, memory_limit, memory_limit_bytes
 
 
 class TestMemoryLimitResolution:
     def test_defaults_when_unset(self, monkeypatch):
         monkeypatch.delenv("DUCKDB_MEMORY_LIMIT", raising=False)
-        assert _memory_limit() == DEFAULT_DUCKDB_MEMORY_LIMIT
+        assert memory_limit() == DEFAULT_DUCKDB_MEMORY_LIMIT
 
     def test_default_is_above_the_ceiling_that_failed(self):
         assert DEFAULT_DUCKDB_MEMORY_LIMIT != "3GB"
@@ -20,7 +20,7 @@ class TestMemoryLimitResolution:
     @pytest.mark.parametrize("value", ["5GB", "512MB", "2.5GB", "6GiB", "4gb", " 4GB "])
     def test_accepts_duckdb_size_syntax(self, monkeypatch, value):
         monkeypatch.setenv("DUCKDB_MEMORY_LIMIT", value)
-        assert _memory_limit() == value.strip()
+        assert memory_limit() == value.strip()
 
     @pytest.mark.parametrize("value", [
         "4",                      # no unit — DuckDB reads bare digits as bytes
@@ -30,8 +30,21 @@ class TestMemoryLimitResolution:
     ])
     def test_rejects_anything_else(self, monkeypatch, value):
         monkeypatch.setenv("DUCKDB_MEMORY_LIMIT", value)
-        assert _memory_limit() == DEFAULT_DUCKDB_MEMORY_LIMIT
+        assert memory_limit() == DEFAULT_DUCKDB_MEMORY_LIMIT
 
     def test_blank_is_treated_as_unset(self, monkeypatch):
         monkeypatch.setenv("DUCKDB_MEMORY_LIMIT", "   ")
-        assert _memory_limit() == DEFAULT_DUCKDB_MEMORY_LIMIT
+        assert memory_limit() == DEFAULT_DUCKDB_MEMORY_LIMIT
+
+
+class TestMemoryLimitBytes:
+    @pytest.mark.parametrize("value, expected", [
+        ("4GB", 4 * 1000 ** 3),
+        ("6GiB", 6 * 1024 ** 3),
+        ("512mb", 512 * 1000 ** 2),
+        ("2.5GB", int(2.5 * 1000 ** 3)),
+        ("lots", 4 * 1000 ** 3),
+    ])
+    def test_reads_sizes_the_way_duckdb_does(self, monkeypatch, value, expected):
+        monkeypatch.setenv("DUCKDB_MEMORY_LIMIT", value)
+        assert memory_limit_bytes() == expected
@@ -0,0 +1,124 @@
+"""Forecasts are computed once per model and Gold generation.
+
+Every `/api/revenue/trend?include_forecast=true` used to re-read 780 days of
+Gold and re-run inference, though neither the model nor its inputs had moved.
+"""
+from datetime import date
+from unittest.mock import AsyncMock
+
+import pandas as pd
+import pytest
+
+from core import prediction_service as ps
+from core.query_cache import QueryCache
+
+
+class _Store:
+    def __init__(self):
+        self.gold_generation = 1
+        self.get_predictions = AsyncMock(return_value=[
+            {"date": "2026-03-20", "predicted_revenue": 100.0},
+        ])
+        self.store_predictions = AsyncMock()
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(ps, "forecast_cache", QueryCache())
+    store = _Store()
+
+    async def fake_get_store():
+        return store
+
+    monkeypatch.setattr("core.duckdb_store.get_store", fake_get_store)
+    monkeypatch.setattr(ps, "_today_kyiv", lambda: date(2026, 3, 10))
+
+    calls = {"n": 0}
+
+    def fake_predict(model, hist, future_dates, *args):
+        calls["n"] += 1
+        return [{"date": d.isoformat(), "predicted_revenue": 10.0} for d in future_dates]
+
+    monkeypatch.setattr(ps, "_predict_future", fake_predict)
+
+    svc = ps.PredictionService()
+    svc._registry.publish("retail", ps.ModelArtifact(model=object()))
+    svc._registry.publish("b2b", ps.ModelArtifact(model=object()))
+    monkeypatch.setattr(svc, "_query_daily_revenue", AsyncMock(return_value=pd.DataFrame()))
+    monkeypatch.setattr(svc, "_get_actual_month_revenue", AsyncMock(return_value=500.0))
+    return svc, store, calls
+
+
+class TestPredictRangeCache:
+    @pytest.mark.asyncio
+    async def test_a_repeat_request_does_not_run_inference(self, service):
+        svc, _, calls = service
+
+        first = await svc.predict_range(date(2026, 3, 10), date(2026, 3, 15))
+        again = await svc.predict_range(date(2026, 3, 10), date(2026, 3, 15))
+
+        assert first == again
+        assert first["predicted_total"] == 60.0
+        assert calls["n"] == 1
+        svc._query_daily_revenue.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_each_horizon_and_sales_type_is_its_own_entry(self, service):
+        svc, _, calls = service
+
+        await svc.predict_range(date(2026, 3, 10), date(2026, 3, 15))
+        await svc.predict_range(date(2026, 3, 10), date(2026, 3, 31))
+        await svc.predict_range(date(2026, 3, 10), date(2026, 3, 15), sales_type="b2b")
+
+        assert calls["n"] == 3
+
+    @pytest.mark.asyncio
+    async def test_a_gold_refresh_retires_it(self, service):
+        svc, store, calls = service
+
+        await svc.predict_range(date(2026, 3, 10), date(2026, 3, 15))
+        store.gold_generation += 1
+        await svc.predict_range(date(2026, 3, 10), date(2026, 3, 15))
+
+        assert calls["n"] == 2
+
+    @pytest.mark.asyncio
+    async def test_a_new_model_retires_it(self, service):
+        svc, _, calls = service
+
+        await svc.predict_range(date(2026, 3, 10), date(2026, 3, 15))
+        svc._registry.publish("retail", ps.ModelArtifact(model=object()))
+        await svc.predict_range(date(2026, 3, 10), date(2026, 3, 15))
+
+        assert calls["n"] == 2
+
+    @pytest.mark.asyncio
+    async def test_callers_cannot_change_what_the_next_one_gets(self, service):
+        """The trend route trims daily_predictions to the month in place."""
+        svc, _, _ = service
+
+        first = await svc.predict_range(date(2026, 3, 10), date(2026, 3, 15))
+        first["daily_predictions"].clear()
+
+        again = await svc.predict_range(date(2026, 3, 10), date(2026, 3, 15))
+        assert len(again["daily_predictions"]) == 6
+
+
+class TestMonthForecast:
+    @pytest.mark.asyncio
+    async def test_training_precomputes_it(self, service, monkeypatch):
+        svc, store, _ = service
+        monkeypatch.setattr(svc, "_query_daily_revenue", AsyncMock(return_value=pd.DataFrame({
+            "date": pd.date_range("2025-06-01", periods=200), "revenue": 1000.0,
+        })))
+        monkeypatch.setattr(ps, "_train_model", lambda df: (object(), {"wape": 25.0}, {}, 1.0))
+        monkeypatch.setattr(svc, "predict_month", AsyncMock(return_value=[]))
+        before = svc._epochs.get("retail")
+
+        assert (await svc._train_impl("retail"))["status"] == "success"
+        assert svc._epochs["retail"] != before
+        store.get_predictions.assert_awaited_once()
+
+        forecast = await svc.get_forecast("retail")
+        assert forecast["predicted_total"] == 600.0
+        store.get_predictions.assert_awaited_once()
@@ -0,0 +1,221 @@
+"""Full sync fetches windows ahead and writes them in order, resumably.
+
+Windows used to be fetched and written strictly in turn. Now a few fetchers run
+ahead of one writer, which still commits in date order and records after each
+window where a restart should pick up.
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+import core.sync_service as sync_service
+from core.duckdb_store import DuckDBStore
+from core.sync_service import DEFAULT_TZ, SyncService, _full_sync_windows
+
+
+async def _make_store(tmp_path) -> DuckDBStore:
+    store = DuckDBStore(db_path=tmp_path / "test.duckdb")
+    await store.connect()
+    return store
+
+
+def _order(oid: int, day: str) -> dict:
+    ts = f"{day}T10:00:00+00:00"
+    return {
+        "id": oid, "source_id": 1, "status_id": 12, "grand_total": "100.00",
+        "ordered_at": ts, "created_at": ts, "updated_at": ts,
+        "buyer": None, "manager": None, "manager_comment": None, "promocode": None,
+        "products": [{
+            "id": oid * 1000 + 1, "product_id": 1, "name": "p",
+            "quantity": 1, "price_sold": "100.00",
+        }],
+    }
+
+
+def _windows(n: int):
+    start = datetime(2026, 1, 1, tzinfo=DEFAULT_TZ)
+    return _full_sync_windows(start, start + timedelta(days=31 * n - 1))
+
+
+class _Fetcher:
+    """Stands in for _fetch_orders_with_date_filter: one order per window.
+
+    Earlier windows are slower, so fetches finish out of order; `fail_at`
+    raises for that window's start date instead.
+    """
+
+    def __init__(self, windows, fail_at=None):
+        self.starts = [w[0].strftime('%Y-%m-%d') for w in windows]
+        self.fail_at = fail_at
+        self.in_flight = 0
+        self.peak = 0
+
+    async def __call__(self, client, start, end, **kwargs):
+        idx = self.starts.index(start)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.01 * (len(self.starts) - idx))
+            if start == self.fail_at:
+                raise sync_service.KeyCRMConnectionError("boom")
+            return [_order(idx + 1, start)]
+        finally:
+            self.in_flight -= 1
+
+
+def _service(store, fetcher) -> SyncService:
+    service = SyncService(store)
+    service._fetch_orders_with_date_filter = fetcher
+    return service
+
+
+def _stats():
+    return {"orders": 0, "expenses": 0}
+
+
+class TestThePipeline:
+    @pytest.mark.asyncio
+    async def test_windows_are_written_in_date_order(self, tmp_path, monkeypatch):
+        store = await _make_store(tmp_path)
+        try:
+            windows = _windows(5)
+            fetcher = _Fetcher(windows)
+            service = _service(store, fetcher)
+            written = []
+            upsert = service._upsert_orders_with_expenses
+
+            async def recording(orders, **kwargs):
+                written.extend(o["id"] for o in orders)
+                return await upsert(orders, **kwargs)
+
+            monkeypatch.setattr(service, "_upsert_orders_with_expenses", recording)
+            stats = _stats()
+            pipeline = await service._sync_order_windows(None, windows, stats)
+
+            assert written == [1, 2, 3, 4, 5]
+            assert stats["orders"] == 5
+            assert fetcher.peak > 1, "the fetchers never overlapped"
+            assert pipeline["chunks"] == 5 and pipeline["fetched_orders"] == 5
+            assert pipeline["fetch_orders_per_second"] > 0
+            assert pipeline["write_orders_per_second"] > 0
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_fetchers_cannot_run_away_from_the_writer(self, tmp_path, monkeypatch):
+        """Two fetchers and a queue of one: never more than three windows claimed
+        and not yet written, however slow the writer."""
+        store = await _make_store(tmp_path)
+        try:
+            monkeypatch.setattr(sync_service, "_full_sync_fetchers", lambda: 2)
+            monkeypatch.setattr(sync_service, "_full_sync_queue_depth", lambda: 1)
+            windows = _windows(8)
+            fetch = _Fetcher(windows)
+            claimed, written = [], []
+
+            async def counting(client, start, end, **kwargs):
+                claimed.append(start)
+                return await fetch(client, start, end, **kwargs)
+
+            service = _service(store, counting)
+            upsert = service._upsert_orders_with_expenses
+            ahead = []
+
+            async def slow(orders, **kwargs):
+                ahead.append(len(claimed) - len(written))
+                written.append(orders[0]["id"])
+                await asyncio.sleep(0.05)
+                return await upsert(orders, **kwargs)
+
+            monkeypatch.setattr(service, "_upsert_orders_with_expenses", slow)
+            await service._sync_order_windows(None, windows, _stats())
+
+            assert written == list(range(1, 9))
+            assert max(ahead) == 3
+        finally:
+            await store.close()
+
+
+class TestResuming:
+    @pytest.mark.asyncio
+    async def test_a_failed_fetch_leaves_progress_at_that_window(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            windows = _windows(5)
+            third = windows[2][0].strftime('%Y-%m-%d')
+            service = _service(store, _Fetcher(windows, fail_at=third))
+
+            stats = _stats()
+            with pytest.raises(sync_service.KeyCRMConnectionError):
+                await service._sync_order_windows(None, windows, stats)
+
+            assert stats["orders"] == 2
+            progress = await store.get_full_sync_progress(timedelta(hours=1))
+            assert progress.strftime('%Y-%m-%d') == third
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_stale_progress_is_ignored(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            await store.set_full_sync_progress(datetime(2026, 3, 1, tzinfo=DEFAULT_TZ))
+            assert await store.get_full_sync_progress(timedelta(hours=1)) is not None
+            async with store.connection() as conn:
+                conn.execute(
+                    "UPDATE sync_metadata SET updated_at = now() - INTERVAL 2 DAY "
+                    "WHERE key = 'full_sync_progress'"
+                )
+            assert await store.get_full_sync_progress(timedelta(hours=24)) is None
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_full_sync_starts_after_the_last_committed_window(self, tmp_path, monkeypatch):
+        store = await _make_store(tmp_path)
+        try:
+            resume = datetime.now(DEFAULT_TZ) - timedelta(days=40)
+            await store.set_full_sync_progress(resume)
+
+            starts = []
+
+            async def fetch(client, start, end, **kwargs):
+                starts.append(start)
+                return []
+
+            service = _service(store, fetch)
+
+            class _Client:
+                async def paginate(self, *args, **kwargs):
+                    return
+                    yield
+
+            async def nothing(*args, **kwargs):
+                return 0
+
+            async def client():
+                return _Client()
+
+            monkeypatch.setattr(sync_service, "get_async_client", client)
+            for name in ("sync_managers", "sync_offers", "sync_stocks"):
+                monkeypatch.setattr(service, name, nothing)
+
+            stats = await service.full_sync(days_back=730)
+
+            assert starts[0] == resume.strftime('%Y-%m-%d')
+            assert len(starts) == 2
+            assert stats["pipeline"]["resumed_from"] == resume.strftime('%Y-%m-%d')
+            assert await store.get_full_sync_progress(timedelta(hours=1)) is None
+        finally:
+            await store.close()
+
+
+def test_windows_do_not_share_a_boundary_day():
+    start = datetime(2026, 1, 1, tzinfo=DEFAULT_TZ)
+    windows = _full_sync_windows(start, start + timedelta(days=95))
+    assert [(a.day, a.month, b.day, b.month) for a, b in windows] == [
+        (1, 1, 31, 1), (1, 2, 3, 3), (4, 3, 3, 4), (4, 4, 6, 4),
+    ]
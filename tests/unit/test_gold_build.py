@@ -0,0 +1,169 @@
+"""Gold tables are planned together and built side by side.
+
+Each Gold table used to be its own step — its own lock, its own scope, one
+after another. The plan is now made once, the builds run on separate cursors,
+and each one still commits (or rolls back) alone.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import core.duckdb_store as duckdb_store
+from core.duckdb_store import DuckDBStore, GoldBuild
+
+
+async def _make_store(tmp_path, monkeypatch, workers=None, name="test.duckdb"):
+    if workers is None:
+        monkeypatch.delenv("DUCKDB_GOLD_WORKERS", raising=False)
+    else:
+        monkeypatch.setenv("DUCKDB_GOLD_WORKERS", str(workers))
+    store = DuckDBStore(db_path=tmp_path / name)
+    await store.connect()
+    return store
+
+
+async def _seed(store):
+    when = datetime.now(timezone.utc).replace(hour=12) - timedelta(days=1)
+    async with store.connection() as conn:
+        for oid in range(1, 41):
+            conn.execute(
+                """
+                INSERT INTO orders (id, source_id, status_id, grand_total, ordered_at,
+                                    created_at, updated_at, buyer_id, manager_comment)
+                VALUES (?, ?, 12, ?, ?, ?, ?, ?, ?)
+                """,
+                [oid, [1, 2, 4][oid % 3], 100 + oid, when - timedelta(days=oid % 7),
+                 when, when, oid % 9,
+                 "UTM: utm_source: facebook; utm_medium: paid" if oid % 4 == 0 else None],
+            )
+            conn.execute(
+                "INSERT INTO order_products (id, order_id, product_id, name, quantity, price_sold) "
+                "VALUES (?, ?, ?, 'p', 1, 50)",
+                [oid * 1000, oid, oid % 5],
+            )
+
+
+async def _gold(store):
+    async with store.connection() as conn:
+        return {
+            table: sorted(conn.execute(f"SELECT * FROM {table}").fetchall(), key=repr)
+            for table in duckdb_store.GOLD_BUILDS
+        }
+
+
+class TestThePlan:
+    @pytest.mark.asyncio
+    async def test_a_catalog_change_widens_the_catalog_tables_alone(self, tmp_path, monkeypatch):
+        store = await _make_store(tmp_path, monkeypatch)
+        try:
+            await _seed(store)
+            await store.refresh_warehouse_layers(trigger="manual")
+            scope = {datetime(2026, 8, 1).date()}
+            plan = await store._plan_gold_build(scope, True, set())
+            assert plan == {
+                "gold_daily_revenue": scope,
+                "gold_daily_products": None,
+                "gold_daily_basket_pairs": None,
+                "gold_daily_traffic": scope,
+            }
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_a_failed_utm_parse_leaves_traffic_out(self, tmp_path, monkeypatch):
+        store = await _make_store(tmp_path, monkeypatch)
+        try:
+            plan = await store._plan_gold_build(None, False, None)
+            assert "gold_daily_traffic" not in plan
+        finally:
+            await store.close()
+
+
+class TestTheBuilds:
+    @pytest.mark.asyncio
+    async def test_parallel_and_serial_builds_agree(self, tmp_path, monkeypatch):
+        serial = await _make_store(tmp_path, monkeypatch, workers=1, name="serial.duckdb")
+        parallel = await _make_store(tmp_path, monkeypatch, workers=3, name="parallel.duckdb")
+        try:
+            assert serial._gold_executor is None
+            assert parallel._gold_executor is not None
+            for store in (serial, parallel):
+                await _seed(store)
+                res = await store.refresh_warehouse_layers(trigger="manual")
+                assert res["validation_passed"] is True
+                res = await store.refresh_warehouse_layers(
+                    trigger="dirty_flag", changed_order_ids=[3, 8],
+                )
+                assert res["validation_passed"] is True
+
+            assert await _gold(serial) == await _gold(parallel)
+        finally:
+            await serial.close()
+            await parallel.close()
+
+    @pytest.mark.asyncio
+    async def test_one_table_failing_rolls_back_that_table_alone(self, tmp_path, monkeypatch):
+        store = await _make_store(tmp_path, monkeypatch)
+        try:
+            await _seed(store)
+            await store.refresh_warehouse_layers(trigger="manual")
+            before = await _gold(store)
+
+            monkeypatch.setitem(
+                duckdb_store.GOLD_BUILDS, "gold_daily_products",
+                ("INSERT INTO gold_daily_products SELECT * FROM no_such_table "
+                 "WHERE {date_filter}", "date"),
+            )
+            async with store.connection() as conn:
+                conn.execute("UPDATE orders SET grand_total = grand_total + 1")
+                conn.execute("DELETE FROM silver_orders")
+                conn.execute(
+                    f"INSERT INTO silver_orders SELECT {duckdb_store.silver_select_sql()} FROM orders o"
+                )
+                conn.execute(duckdb_store.silver_pass2_sql())
+            out = await store._run_gold_builds({
+                "gold_daily_revenue": None, "gold_daily_products": None,
+            })
+
+            assert isinstance(out["gold_daily_revenue"], GoldBuild)
+            assert out["gold_daily_revenue"].changed is True
+            assert isinstance(out["gold_daily_products"], Exception)
+            assert (await _gold(store))["gold_daily_products"] == before["gold_daily_products"]
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_a_traffic_failure_does_not_fail_the_refresh(self, tmp_path, monkeypatch):
+        store = await _make_store(tmp_path, monkeypatch)
+        try:
+            await _seed(store)
+            monkeypatch.setitem(
+                duckdb_store.GOLD_BUILDS, "gold_daily_traffic",
+                ("INSERT INTO gold_daily_traffic SELECT * FROM no_such_table "
+                 "WHERE {date_filter}", "date"),
+            )
+            res = await store.refresh_warehouse_layers(trigger="manual")
+
+            assert res["status"] == "success"
+            assert res["validation_passed"] is True
+            assert res["stage_ms"]["gold_traffic_ms"] is None
+        finally:
+            await store.close()
+
+
+class TestTheAuditRow:
+    @pytest.mark.asyncio
+    async def test_every_stage_is_timed(self, tmp_path, monkeypatch):
+        store = await _make_store(tmp_path, monkeypatch)
+        try:
+            await _seed(store)
+            await store.refresh_warehouse_layers(trigger="manual")
+
+            status = await store.get_warehouse_status()
+            assert set(status["stage_ms"]) == {
+                "silver", "gold_revenue", "gold_products", "gold_traffic",
+                "validation", "gold_cohort", "gold_pairs",
+            }
+            assert all(v is not None and v >= 0 for v in status["stage_ms"].values())
+        finally:
+            await store.close()
@@ -78,7 +78,10 @@ class TestOneDefinitionOfACell:
         from core import data_quality, duckdb_store
 
         assert "{date_filter}" in GOLD_REVENUE_SELECT_SQL
-        assert "GOLD_REVENUE_SELECT_SQL" in inspect.getsource(
+        # The refresh builds every Gold table from GOLD_BUILDS.
+        revenue_sql, _ = duckdb_store.GOLD_BUILDS["gold_daily_revenue"]
+        assert GOLD_REVENUE_SELECT_SQL in revenue_sql
+        assert "_run_gold_builds" in inspect.getsource(
             duckdb_store.DuckDBStore.refresh_warehouse_layers
         )
         assert "GOLD_REVENUE_SELECT_SQL" in inspect.getsource(
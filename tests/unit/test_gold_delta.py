@@ -0,0 +1,265 @@
+"""A warehouse refresh announces the Gold cells it moved, for live dashboards.
+
+Every open dashboard used to refetch its revenue widgets on each
+`orders_synced`, all at the same moment and all for the same answer.
+"""
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from core.duckdb_store import DuckDBStore
+from core.events import SyncEvent
+from core.gold_delta import delta_for_sales_type
+from core.websocket_manager import ConnectionManager
+
+
+async def _make_store(tmp_path: Path) -> DuckDBStore:
+    store = DuckDBStore(db_path=tmp_path / "test.duckdb")
+    await store.connect()
+    return store
+
+
+def _insert_order(conn, *, oid, ordered_at, grand_total="1000.00"):
+    conn.execute(
+        """
+        INSERT INTO orders (
+            id, source_id, status_id, grand_total, ordered_at, created_at,
+            updated_at, buyer_id, manager_id, manager_comment, promocode
+        ) VALUES (?, 4, 1, ?, ?, ?, ?, ?, NULL, NULL, NULL)
+        """,
+        [oid, grand_total, ordered_at, ordered_at, ordered_at, oid * 10],
+    )
+
+
+class TestRefreshAnnouncesDelta:
+    @pytest.mark.asyncio
+    async def test_a_moved_order_is_two_cell_differences(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            async with store.connection() as conn:
+                _insert_order(conn, oid=1, ordered_at="2026-08-01T10:00:00+03:00")
+                _insert_order(conn, oid=2, ordered_at="2026-08-09T10:00:00+03:00")
+            await store.refresh_warehouse_layers(trigger="manual")
+            async with store.connection() as conn:
+                conn.execute("UPDATE orders SET ordered_at = ? WHERE id = 1",
+                             ["2026-08-05T10:00:00+03:00"])
+            store._announce_warehouse_refresh = AsyncMock()
+
+            await store.refresh_warehouse_layers(trigger="dirty_flag", changed_order_ids=[1])
+
+            trigger, cells = store._announce_warehouse_refresh.await_args.args
+            assert trigger == "dirty_flag"
+            assert [(c["date"], c["revenue"], c["orders_count"]) for c in cells] == [
+                ("2026-08-01", -1000.0, -1.0),
+                ("2026-08-05", 1000.0, 1.0),
+            ]
+            assert cells[0]["shopify_revenue"] == -1000.0
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_a_full_rebuild_is_announced_without_cells(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            async with store.connection() as conn:
+                _insert_order(conn, oid=1, ordered_at="2026-08-01T10:00:00+03:00")
+            store._announce_warehouse_refresh = AsyncMock()
+
+            await store.refresh_warehouse_layers(trigger="manual")
+
+            assert store._announce_warehouse_refresh.await_args.args == ("manual", None)
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_too_many_dates_are_announced_without_cells(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("core.duckdb_store.GOLD_DELTA_MAX_DATES", 1)
+        store = await _make_store(tmp_path)
+        try:
+            async with store.connection() as conn:
+                _insert_order(conn, oid=1, ordered_at="2026-08-01T10:00:00+03:00")
+            await store.refresh_warehouse_layers(trigger="manual")
+            async with store.connection() as conn:
+                conn.execute("UPDATE orders SET ordered_at = ? WHERE id = 1",
+                             ["2026-08-05T10:00:00+03:00"])
+            store._announce_warehouse_refresh = AsyncMock()
+
+            await store.refresh_warehouse_layers(trigger="dirty_flag", changed_order_ids=[1])
+
+            assert store._announce_warehouse_refresh.await_args.args == ("dirty_flag", None)
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_a_refresh_that_moved_nothing_is_not_announced(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            async with store.connection() as conn:
+                _insert_order(conn, oid=1, ordered_at="2026-08-01T10:00:00+03:00")
+            await store.refresh_warehouse_layers(trigger="manual")
+            store._announce_warehouse_refresh = AsyncMock()
+
+            await store.refresh_warehouse_layers(trigger="dirty_flag", changed_order_ids=[1])
+
+            store._announce_warehouse_refresh.assert_not_awaited()
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_the_announcement_is_an_event(self, tmp_path, monkeypatch):
+        emit = AsyncMock()
+        monkeypatch.setattr("core.events.events.emit", emit)
+        store = await _make_store(tmp_path)
+        try:
+            await store._announce_warehouse_refresh("dirty_flag", [])
+        finally:
+            await store.close()
+
+        event, data = emit.await_args.args
+        assert event is SyncEvent.WAREHOUSE_REFRESHED
+        assert data == {"trigger": "dirty_flag", "gold_generation": store.gold_generation,
+                        "gold_delta": []}
+
+
+def _cell(day, sales_type, revenue, orders):
+    cell = dict.fromkeys(
+        ("revenue", "orders_count", "returns_count", "returns_revenue",
+         "instagram_revenue", "instagram_orders", "telegram_revenue",
+         "telegram_orders", "shopify_revenue", "shopify_orders"), 0.0,
+    )
+    return {"date": day, "sales_type": sales_type, **cell, "revenue": revenue, "orders_count": orders}
+
+
+class TestPayloads:
+    CELLS = [
+        _cell("2026-08-05", "retail", 500.0, 1.0),
+        _cell("2026-08-05", "b2b", 2000.0, 1.0),
+        _cell("2026-08-06", "retail", -100.0, 0.0),
+    ]
+
+    def test_a_sales_type_gets_its_own_cells(self):
+        payload = delta_for_sales_type(self.CELLS, "b2b", generation=7)
+
+        assert payload["generation"] == 7
+        assert not payload["full"]
+        assert [(c["date"], c["revenue"]) for c in payload["cells"]] == [("2026-08-05", 2000.0)]
+
+    def test_all_is_the_sum_per_date(self):
+        payload = delta_for_sales_type(self.CELLS, "all")
+
+        assert [(c["date"], c["revenue"], c["orders_count"]) for c in payload["cells"]] == [
+            ("2026-08-05", 2500.0, 2.0),
+            ("2026-08-06", -100.0, 0.0),
+        ]
+
+    def test_no_cells_means_refetch(self):
+        assert delta_for_sales_type(None, "retail")["full"] is True
+
+
+class _Client:
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message):
+        self.sent.append(json.loads(message))
+
+    async def close(self, code=1000, reason=""):
+        pass
+
+
+class TestSubscriptions:
+    @pytest.mark.asyncio
+    async def test_deltas_reach_only_their_filter(self):
+        manager = ConnectionManager()
+        retail, b2b, unsubscribed = _Client(), _Client(), _Client()
+        conns = [await manager.connect(c) for c in (retail, b2b, unsubscribed)]
+        await manager.handle_message(conns[0], json.dumps({"action": "subscribe", "sales_type": "retail"}))
+        await manager.handle_message(conns[1], json.dumps({"action": "subscribe", "sales_type": "b2b"}))
+
+        queued = await manager.broadcast(
+            "dashboard", "gold_delta", delta_for_sales_type([], "retail"), sales_type="retail",
+        )
+        await manager.flush()
+
+        assert queued == 1
+        assert [m["event"] for m in retail.sent] == ["connected", "subscribed", "gold_delta"]
+        assert [m["event"] for m in b2b.sent] == ["connected", "subscribed"]
+        assert [m["event"] for m in unsubscribed.sent] == ["connected"]
+
+    @pytest.mark.asyncio
+    async def test_a_sales_type_without_a_feed_unsubscribes(self):
+        manager = ConnectionManager()
+        client = _Client()
+        conn = await manager.connect(client)
+        await manager.handle_message(conn, json.dumps({"action": "subscribe", "sales_type": "retail"}))
+
+        await manager.handle_message(conn, json.dumps({"action": "subscribe", "sales_type": "exhibition"}))
+        await manager.flush()
+
+        assert conn.sales_type is None
+        assert [m["event"] for m in client.sent] == ["connected", "subscribed"]
+
+    @pytest.mark.asyncio
+    async def test_deltas_are_never_coalesced(self):
+        manager = ConnectionManager()
+        client = _Client()
+        conn = await manager.connect(client)
+        conn.sales_type = "retail"
+
+        for revenue in (100.0, 200.0):
+            await manager.broadcast(
+                "dashboard", "gold_delta",
+                delta_for_sales_type([_cell("2026-08-05", "retail", revenue, 1.0)], "retail"),
+                sales_type="retail",
+            )
+        await manager.flush()
+
+        assert [m["data"]["cells"][0]["revenue"] for m in client.sent[1:]] == [100.0, 200.0]
+
+
+class TestResponsesCarryTheGeneration:
+    """The dashboard patches only what was read before the delta's refresh."""
+
+    @staticmethod
+    def _service(monkeypatch, store):
+        from core.query_cache import QueryCache
+        from web.services import dashboard_service
+
+        async def get_store():
+            return store
+
+        monkeypatch.setattr(dashboard_service, "get_store", get_store)
+        monkeypatch.setattr(dashboard_service, "query_cache", QueryCache())
+        return dashboard_service
+
+    @pytest.mark.asyncio
+    async def test_a_summary_is_stamped_with_its_generation(self, monkeypatch):
+        store = AsyncMock()
+        store.gold_generation = 7
+        store.get_summary_stats = AsyncMock(return_value={"totalRevenue": 100.0})
+        service = self._service(monkeypatch, store)
+
+        result = await service.get_summary_stats("2026-08-01", "2026-08-03")
+
+        assert result == {"totalRevenue": 100.0, "gold_generation": 7}
+
+    @pytest.mark.asyncio
+    async def test_one_a_refresh_overtook_is_left_unstamped(self, monkeypatch):
+        store = AsyncMock()
+        store.gold_generation = 7
+
+        async def refreshed_meanwhile(*args, **kwargs):
+            store.gold_generation = 8
+            return {"totalRevenue": 100.0}
+
+        store.get_summary_stats = refreshed_meanwhile
+        service = self._service(monkeypatch, store)
+
+        result = await service.get_summary_stats("2026-08-01", "2026-08-03")
+
+        assert "gold_generation" not in result
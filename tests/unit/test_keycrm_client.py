@@ -1,9 +1,13 @@
 """
 Tests for core.keycrm module.
 """
+import asyncio
+import time
+
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 
+from core import keycrm
 from core.keycrm import KeyCRMClient
 from core.exceptions import KeyCRMAPIError, KeyCRMConnectionError
 
@@ -163,3 +167,127 @@ class TestKeyCRMClient:
         assert len(batches) == 2
         assert batches[0] == [{"id": 1}, {"id": 2}]
         assert batches[1] == [{"id": 3}]
+
+
+def _paged(pages, delays=None, **meta):
+    """A fake _request serving `pages` (lists of items) with per-page delays."""
+    calls = []
+    state = {"in_flight": 0, "peak": 0}
+
+    async def request(method, endpoint, params=None, json=None):
+        page = params["page"]
+        calls.append(page)
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        try:
+            await asyncio.sleep((delays or {}).get(page, 0.01))
+            data = pages[page - 1] if page <= len(pages) else []
+            if isinstance(data, Exception):
+                raise data
+            return {"data": data, **meta}
+        finally:
+            state["in_flight"] -= 1
+
+    return request, calls, state
+
+
+def _http(pages):
+    """A fake httpx client serving `pages`, so requests go through _do_request
+    and the rate governor on their way to it."""
+    sent = []
+
+    async def request(method, url, params=None, json=None, headers=None):
+        page = params["page"]
+        sent.append((page, time.monotonic()))
+        await asyncio.sleep(0.01)
+        response = MagicMock(status_code=200, content=b"{}")
+        response.json.return_value = {"data": pages[page - 1] if page <= len(pages) else []}
+        return response
+
+    http = MagicMock()
+    http.request = request
+    return http, sent
+
+
+class TestPrefetchingPaginate:
+    """paginate(prefetch=N): N requests in flight, pages still yielded in order."""
+
+    @pytest.mark.asyncio
+    async def test_pages_come_out_in_order_whatever_order_they_finish_in(self):
+        client = KeyCRMClient(api_key="test-key")
+        pages = [[{"id": p * 10 + i} for i in range(2)] for p in range(1, 6)] + [[{"id": 99}]]
+        request, _, state = _paged(pages, delays={1: 0.05, 2: 0.01, 3: 0.03})
+        client._request = request
+
+        batches = [b async for b in client.paginate("order", page_size=2, prefetch=3)]
+
+        assert batches == pages
+        assert state["peak"] == 3
+
+    @pytest.mark.asyncio
+    async def test_stops_at_the_short_page_and_cancels_what_is_past_it(self):
+        client = KeyCRMClient(api_key="test-key")
+        pages = [[{"id": 1}, {"id": 2}], [{"id": 3}]]
+        request, calls, state = _paged(pages, delays={3: 1.0, 4: 1.0})
+        client._request = request
+
+        batches = [b async for b in client.paginate("order", page_size=2, prefetch=4)]
+
+        assert batches == pages
+        await asyncio.sleep(0)
+        assert state["in_flight"] == 0, "nothing is left running past the last page"
+
+    @pytest.mark.asyncio
+    async def test_last_page_metadata_bounds_the_launches(self):
+        client = KeyCRMClient(api_key="test-key")
+        pages = [[{"id": 1}, {"id": 2}], [{"id": 3}, {"id": 4}]]
+        request, calls, _ = _paged(pages, last_page=2)
+        client._request = request
+
+        batches = [b async for b in client.paginate("order", page_size=2, prefetch=2)]
+
+        assert batches == pages
+        assert sorted(calls) == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_a_failed_page_raises_after_the_pages_before_it(self):
+        client = KeyCRMClient(api_key="test-key")
+        pages = [[{"id": 1}, {"id": 2}], [{"id": 3}, {"id": 4}], KeyCRMConnectionError("boom")]
+        request, _, _ = _paged(pages, delays={3: 0.0, 1: 0.05})
+        client._request = request
+
+        seen = []
+        with pytest.raises(KeyCRMConnectionError):
+            async for batch in client.paginate("order", page_size=2, prefetch=3):
+                seen.append(batch)
+        assert seen == pages[:2]
+
+    @pytest.mark.asyncio
+    async def test_no_page_is_launched_while_retry_after_runs(self):
+        client = KeyCRMClient(api_key="test-key")
+        pages = [[{"id": 1}, {"id": 2}], [{"id": 3}]]
+        client._client, sent = _http(pages)
+        keycrm.rate_governor.record_throttled(0.2)
+
+        started = time.monotonic()
+        batches = [b async for b in client.paginate("order", page_size=2, prefetch=2)]
+
+        assert batches == pages
+        assert sent and all(at - started >= 0.19 for _, at in sent)
+
+    @pytest.mark.asyncio
+    async def test_a_429_sets_the_throttle(self):
+        client = KeyCRMClient(api_key="test-key")
+        response = MagicMock()
+        response.status_code = 429
+        response.headers = {"Retry-After": "3"}
+        response.text = ""
+        client._client = MagicMock()
+        client._client.request = AsyncMock(return_value=response)
+
+        with pytest.raises(KeyCRMConnectionError):
+            await client._do_request("GET", "order")
+
+        stats = keycrm.rate_governor.get_stats()
+        assert stats["throttle_events"] == 1
+        assert stats["paused_seconds"] > 2.5
@@ -0,0 +1,262 @@
+"""One rate budget for every KeyCRM consumer, in this process and the others.
+
+Reconciliation, buyer backfill, the sync and the bot all spend the same API
+key. The governor hands out its requests: a token bucket whose rate backs off
+on 429s, 5xx and slow replies and creeps back otherwise, served by priority so
+a bot command does not queue behind a reconciliation run — the bot being a
+separate container, through a bucket file both share.
+"""
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from core import keycrm
+from core.exceptions import KeyCRMConnectionError
+from core.keycrm import (
+    KEYCRM_SLOW_RESPONSE_SECONDS,
+    KeyCRMClient,
+    Priority,
+    RateGovernor,
+    keycrm_priority,
+)
+
+
+class TestTheBucket:
+    @pytest.mark.asyncio
+    async def test_a_burst_goes_straight_through_then_the_rate_holds(self):
+        governor = RateGovernor(per_minute=600, burst=3)  # 10/s
+        started = time.monotonic()
+        for _ in range(5):
+            await governor.acquire(Priority.SYNC)
+        elapsed = time.monotonic() - started
+        assert 0.15 <= elapsed < 0.5, "three free, then two at 100 ms each"
+
+    @pytest.mark.asyncio
+    async def test_interactive_goes_before_background_that_was_waiting_first(self):
+        governor = RateGovernor(per_minute=1200, burst=1)  # 20/s
+        await governor.acquire(Priority.SYNC)  # empty the bucket
+        order = []
+
+        async def take(priority, name):
+            await governor.acquire(priority)
+            order.append(name)
+
+        background = [
+            asyncio.create_task(take(Priority.BACKGROUND, f"bg{i}")) for i in range(3)
+        ]
+        await asyncio.sleep(0.01)
+        interactive = asyncio.create_task(take(Priority.INTERACTIVE, "bot"))
+        await asyncio.gather(interactive, *background)
+
+        assert order[0] == "bot"
+
+    @pytest.mark.asyncio
+    async def test_background_leaves_a_reserve_for_the_bot(self):
+        governor = RateGovernor(per_minute=60, burst=3)
+        await governor.acquire(Priority.BACKGROUND)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(governor.acquire(Priority.BACKGROUND), 0.2)
+        # …and the tokens it would not take are there for an interactive call.
+        await asyncio.wait_for(governor.acquire(Priority.INTERACTIVE), 0.1)
+
+    @pytest.mark.asyncio
+    async def test_a_cancelled_waiter_leaves_the_queue(self):
+        governor = RateGovernor(per_minute=60, burst=1)
+        await governor.acquire(Priority.SYNC)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(governor.acquire(Priority.INTERACTIVE), 0.1)
+        assert governor.get_stats()["queued"]["interactive"] == 0
+
+    @pytest.mark.asyncio
+    async def test_a_waiter_sleeps_until_its_token_not_in_polls(self, monkeypatch):
+        governor = RateGovernor(per_minute=120, burst=1)  # one every 0.5 s
+        await governor.acquire(Priority.SYNC)
+        sleeps = []
+        real_sleep = asyncio.sleep
+
+        async def sleep(seconds):
+            sleeps.append(seconds)
+            await real_sleep(seconds)
+
+        monkeypatch.setattr(keycrm.asyncio, "sleep", sleep)
+        await governor.acquire(Priority.SYNC)
+        assert len(sleeps) == 1 and 0.4 < sleeps[0] <= 0.5
+
+    @pytest.mark.asyncio
+    async def test_a_queued_waiter_sleeps_past_those_ahead_of_it(self, monkeypatch):
+        governor = RateGovernor(per_minute=600, burst=1)  # one every 0.1 s
+        await governor.acquire(Priority.SYNC)
+        sleeps = []
+        real_sleep = asyncio.sleep
+
+        async def sleep(seconds):
+            sleeps.append(seconds)
+            await real_sleep(seconds)
+
+        monkeypatch.setattr(keycrm.asyncio, "sleep", sleep)
+        await asyncio.gather(*(governor.acquire(Priority.SYNC) for _ in range(3)))
+        # Three waiters, three tokens 0.1 s apart: a handful of sleeps, not a
+        # poll every few milliseconds.
+        assert len(sleeps) <= 6
+        assert max(sleeps) > 0.25, "the third in line sleeps for all three"
+
+    @pytest.mark.asyncio
+    async def test_the_priority_comes_from_the_context(self):
+        governor = RateGovernor(per_minute=6000, burst=5)
+        with keycrm_priority(Priority.BACKGROUND):
+            await governor.acquire()
+        await governor.acquire()
+        granted = governor.get_stats()["granted"]
+        assert granted["background"] == 1 and granted["sync"] == 1
+
+
+class TestAimd:
+    def test_a_429_halves_the_rate_and_pauses_everyone(self):
+        governor = RateGovernor(per_minute=60, burst=5)
+        governor.record_throttled(3.0)
+        stats = governor.get_stats()
+        assert stats["rate_per_minute"] == 30.0
+        assert stats["tokens"] < 1
+        assert 2.5 < stats["paused_seconds"] <= 3.0
+        assert stats["throttle_events"] == 1
+
+    def test_a_window_of_429s_is_one_cut(self):
+        governor = RateGovernor(per_minute=60, burst=5)
+        for _ in range(4):
+            governor.record_throttled(1.0)
+        assert governor.get_stats()["rate_per_minute"] == 30.0
+
+    def test_a_slow_reply_cuts_and_fast_ones_win_it_back(self):
+        governor = RateGovernor(per_minute=60, burst=5)
+        governor.record_response(KEYCRM_SLOW_RESPONSE_SECONDS)
+        assert governor.get_stats()["rate_per_minute"] == 45.0
+        for _ in range(100):
+            governor.record_response(0.2)
+        assert governor.get_stats()["rate_per_minute"] == 60.0, "never past the ceiling"
+
+    def test_a_server_error_halves_the_rate_without_a_pause(self):
+        governor = RateGovernor(per_minute=60, burst=5)
+        governor.record_server_error()
+        stats = governor.get_stats()
+        assert stats["rate_per_minute"] == 30.0
+        assert stats["paused_seconds"] == 0
+        assert stats["server_error_events"] == 1
+
+    @pytest.mark.asyncio
+    async def test_a_paused_governor_holds_new_requests(self):
+        governor = RateGovernor(per_minute=6000, burst=5)
+        governor.record_throttled(0.2)
+        started = time.monotonic()
+        await governor.acquire(Priority.INTERACTIVE)
+        assert time.monotonic() - started >= 0.19
+
+
+class TestTheClientSpendsIt:
+    @pytest.mark.asyncio
+    async def test_every_request_takes_a_token(self):
+        client = KeyCRMClient(api_key="test-key")
+        response = MagicMock(status_code=200, content=b"{}")
+        response.json.return_value = {"data": []}
+        client._client = MagicMock()
+        client._client.request = AsyncMock(return_value=response)
+
+        with keycrm_priority(Priority.BACKGROUND):
+            await client._do_request("GET", "order")
+        await client._do_request("GET", "order")
+
+        granted = keycrm.rate_governor.get_stats()["granted"]
+        assert granted == {"interactive": 0, "sync": 1, "background": 1}
+
+    @pytest.mark.asyncio
+    async def test_a_503_does_not_speed_the_governor_up(self):
+        governor = keycrm.rate_governor
+        governor.rate = governor.max_rate / 2
+        before = governor.rate
+        client = KeyCRMClient(api_key="test-key")
+        client._client = MagicMock()
+        client._client.request = AsyncMock(
+            return_value=MagicMock(status_code=503, text="overloaded", headers={}),
+        )
+
+        with pytest.raises(KeyCRMConnectionError):
+            await client._do_request("GET", "order")
+
+        assert governor.rate < before
+
+    def test_the_bot_client_asks_as_interactive(self):
+        client = keycrm.SyncKeyCRMClient(api_key="test-key")
+        seen = []
+
+        async def get_orders(params=None):
+            seen.append(keycrm._priority.get())
+            return {}
+
+        client._async_client.get_orders = get_orders
+        client.get_orders()
+        assert seen == [Priority.INTERACTIVE]
+
+
+def _process(path, name: str, **kwargs) -> RateGovernor:
+    """A governor as another process on the host would build it."""
+    governor = RateGovernor(state_path=path, **kwargs)
+    governor._shared.process = name
+    return governor
+
+
+class TestTheBucketIsSharedBetweenProcesses:
+    @pytest.mark.asyncio
+    async def test_two_processes_spend_one_bucket(self, tmp_path):
+        web = _process(tmp_path / "rate.json", "web", per_minute=60, burst=3)
+        bot = _process(tmp_path / "rate.json", "bot", per_minute=60, burst=3)
+        for _ in range(3):
+            await web.acquire(Priority.SYNC)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(bot.acquire(Priority.SYNC), 0.2)
+
+    def test_a_cut_in_one_process_slows_the_other(self, tmp_path):
+        web = _process(tmp_path / "rate.json", "web", per_minute=60, burst=5)
+        bot = _process(tmp_path / "rate.json", "bot", per_minute=60, burst=5)
+        web.record_throttled(1.0)
+        stats = bot.get_stats()
+        assert stats["rate_per_minute"] == 30.0
+        assert stats["paused_seconds"] > 0.5
+
+    @pytest.mark.asyncio
+    async def test_the_bot_goes_before_background_waiting_in_the_web(self, tmp_path):
+        web = _process(tmp_path / "rate.json", "web", per_minute=1200, burst=1)  # 20/s
+        bot = _process(tmp_path / "rate.json", "bot", per_minute=1200, burst=1)
+        await web.acquire(Priority.SYNC)  # empty the bucket
+        order = []
+
+        async def take(governor, priority, name):
+            await governor.acquire(priority)
+            order.append(name)
+
+        background = [
+            asyncio.create_task(take(web, Priority.BACKGROUND, f"bg{i}")) for i in range(3)
+        ]
+        await asyncio.sleep(0.01)
+        interactive = asyncio.create_task(take(bot, Priority.INTERACTIVE, "bot"))
+        await asyncio.gather(interactive, *background)
+
+        assert order[0] == "bot"
+
+    @pytest.mark.asyncio
+    async def test_a_waiter_left_by_a_dead_process_stops_counting(self, tmp_path):
+        path = tmp_path / "rate.json"
+        web = _process(path, "web", per_minute=60, burst=5)
+        web.get_stats()  # writes the file
+        state = json.loads(path.read_text())
+        state["waiting"] = {"bot": {"counts": [3, 0, 0], "expires": time.monotonic() - 1}}
+        path.write_text(json.dumps(state))
+
+        await asyncio.wait_for(web.acquire(Priority.BACKGROUND), 0.1)
+
+    @pytest.mark.asyncio
+    async def test_an_unusable_file_leaves_the_process_its_own_bucket(self, tmp_path):
+        governor = RateGovernor(per_minute=6000, burst=5, state_path=tmp_path / "missing" / "rate.json")
+        await asyncio.wait_for(governor.acquire(Priority.SYNC), 0.1)
+        assert governor.get_stats()["granted"]["sync"] == 1
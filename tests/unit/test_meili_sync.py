@@ -0,0 +1,263 @@
+"""sync_to_meilisearch: documents paged out of DuckDB as NDJSON, uploaded side by side.
+
+Meilisearch itself is replaced by an in-process stand-in at the level of the
+`meilisearch` client, so MeiliClient.index_ndjson runs as it does in production:
+add_documents_ndjson, then wait_for_task, on the default executor.
+"""
+import json
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+import core.sync_service as sync_service
+from core.duckdb_store import DuckDBStore
+from core.meilisearch_client import MeiliClient, MeiliIndexError
+from core.sync_service import SyncService, _ndjson_pages
+
+BASE = datetime(2026, 9, 1, 10, tzinfo=timezone.utc)
+
+
+class _FakeMeili:
+    """Keeps what was indexed; `fail` names indexes whose tasks fail."""
+
+    def __init__(self, fail: tuple = (), delay: float = 0.0):
+        self.fail = fail
+        self.delay = delay
+        self.docs = defaultdict(list)
+        self._lock = threading.Lock()
+        self._tasks = {}
+        self.in_flight = 0
+        self.peak = 0
+
+    def index(self, name: str):
+        return SimpleNamespace(
+            add_documents_ndjson=lambda body, primary_key=None: self._enqueue(name, body),
+        )
+
+    def _enqueue(self, name: str, body: bytes):
+        with self._lock:
+            uid = len(self._tasks)
+            self._tasks[uid] = (name, body)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        return SimpleNamespace(task_uid=uid)
+
+    def wait_for_task(self, uid: int, timeout_in_ms: int = 5000, interval_in_ms: int = 50):
+        time.sleep(self.delay)
+        name, body = self._tasks[uid]
+        with self._lock:
+            self.in_flight -= 1
+        if name in self.fail:
+            return SimpleNamespace(uid=uid, status="failed", error={"code": "invalid_document_id"})
+        self.docs[name].extend(json.loads(line) for line in body.decode().split("\n"))
+        return SimpleNamespace(uid=uid, status="succeeded", error=None)
+
+
+def _meili(fake: _FakeMeili) -> MeiliClient:
+    client = MeiliClient(url="http://meili.test", master_key="key")
+    client._client = fake
+    return client
+
+
+def _order(oid: int, buyer_id: int | None, *, minutes: int = 0,
+           updated_at: str = "2026-09-30T10:00:00+00:00") -> dict:
+    ordered_at = (BASE - timedelta(days=oid % 40, minutes=minutes)).isoformat()
+    return {
+        "id": oid,
+        "source_id": 1,
+        "status_id": 12,
+        "grand_total": f"{100 + oid}.50",
+        "ordered_at": ordered_at,
+        "created_at": ordered_at,
+        "updated_at": updated_at,
+        "buyer": {"id": buyer_id} if buyer_id else None,
+        "manager": None,
+        "manager_comment": None,
+        "promocode": None,
+        "products": [],
+    }
+
+
+async def _make_store(tmp_path: Path, orders: int = 60) -> DuckDBStore:
+    store = DuckDBStore(db_path=tmp_path / "test.duckdb")
+    await store.connect()
+    async with store.connection() as conn:
+        conn.executemany(
+            "INSERT INTO buyers (id, full_name, phone, email, city, note, manager_id, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (1, 'Olena "O" Kovalenko', "+380501112233", "o@example.com", "Kyiv",
+                 "line one\nline two", 15, BASE),
+                (2, "Ivan", None, None, None, None, None, None),
+                (3, "Мар'яна", "+380671234567", None, "Lviv", None, None,
+                 BASE + timedelta(microseconds=120)),
+            ],
+        )
+        conn.execute("INSERT INTO categories (id, name, parent_id) VALUES (1, 'Care', NULL)")
+        conn.executemany(
+            "INSERT INTO products (id, name, category_id, brand, sku, price) VALUES (?, ?, ?, ?, ?, ?)",
+            [(1, "Serum", 1, "BrandA", "SKU-1", Decimal("450.50")),
+             (2, "Balm", None, None, None, None)],
+        )
+    await store.upsert_orders([_order(i, (i % 4) or None, minutes=i) for i in range(1, orders + 1)])
+    await store.refresh_warehouse_layers(trigger="test")
+    return store
+
+
+def _iso(value: datetime | None) -> str | None:
+    return value.astimezone(timezone.utc).isoformat() if value else None
+
+
+async def _expected(store: DuckDBStore) -> dict:
+    """The documents, built in Python the way the pandas pipeline built them."""
+    async with store.connection() as conn:
+        buyers = conn.execute("""
+            SELECT b.id, b.full_name, b.phone, b.email, b.city, b.note,
+                   b.manager_id, b.created_at, COALESCE(st.orders, 0)
+            FROM buyers b
+            LEFT JOIN silver_buyer_stats st ON st.buyer_id = b.id AND st.sales_type = 'all'
+        """).fetchall()
+        orders = conn.execute("""
+            SELECT o.id, o.grand_total, o.ordered_at, o.status_id, o.source_name,
+                   o.buyer_id, o.order_date, b.full_name
+            FROM silver_orders o LEFT JOIN buyers b ON o.buyer_id = b.id
+        """).fetchall()
+        products = conn.execute("""
+            SELECT p.id, p.name, p.sku, p.brand, p.price, p.category_id, c.name
+            FROM products p LEFT JOIN categories c ON p.category_id = c.id
+        """).fetchall()
+    return {
+        "buyers": {r[0]: {
+            "id": r[0], "full_name": r[1], "phone": r[2], "email": r[3], "city": r[4],
+            "note": r[5], "manager_id": r[6], "created_at": _iso(r[7]), "order_count": r[8],
+        } for r in buyers},
+        "orders": {r[0]: {
+            "id": r[0], "grand_total": float(r[1]), "ordered_at": _iso(r[2]),
+            "status_id": r[3], "source_name": r[4], "buyer_id": r[5],
+            "order_date": r[6].isoformat(), "buyer_name": r[7],
+        } for r in orders},
+        "products": {r[0]: {
+            "id": r[0], "name": r[1], "sku": r[2], "brand": r[3],
+            "price": float(r[4]) if r[4] is not None else None,
+            "category_id": r[5], "category_name": r[6],
+        } for r in products},
+    }
+
+
+class TestDocuments:
+    @pytest.mark.asyncio
+    async def test_a_full_sync_sends_the_documents_the_old_pipeline_built(self, tmp_path, monkeypatch):
+        store = await _make_store(tmp_path)
+        try:
+            fake = _FakeMeili()
+            monkeypatch.setattr(sync_service, "get_meili_client", lambda: _meili(fake))
+            stats = await SyncService(store).sync_to_meilisearch()
+
+            expected = await _expected(store)
+            assert stats == {name: len(docs) for name, docs in expected.items()}
+            for name, docs in expected.items():
+                assert {d["id"]: d for d in fake.docs[name]} == docs
+            buyers = {d["id"]: d for d in fake.docs["buyers"]}
+            assert buyers[1]["created_at"] == "2026-09-01T10:00:00+00:00"
+            assert buyers[3]["created_at"] == "2026-09-01T10:00:00.000120+00:00"
+            assert buyers[2]["created_at"] is None
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_an_incremental_sync_sends_only_what_moved(self, tmp_path, monkeypatch):
+        store = await _make_store(tmp_path)
+        try:
+            monkeypatch.setattr(sync_service, "get_meili_client", lambda: _meili(_FakeMeili()))
+            await SyncService(store).sync_to_meilisearch()
+
+            await store.upsert_orders([_order(7, 3, updated_at="2026-10-01T10:00:00+00:00")])
+            await store.refresh_warehouse_layers(trigger="test")
+            fake = _FakeMeili()
+            monkeypatch.setattr(sync_service, "get_meili_client", lambda: _meili(fake))
+            stats = await SyncService(store).sync_to_meilisearch()
+
+            assert [d["id"] for d in fake.docs["orders"]] == [7]
+            assert [d["id"] for d in fake.docs["buyers"]] == [3]
+            assert stats == {"buyers": 1, "orders": 1, "products": 0}
+        finally:
+            await store.close()
+
+
+class TestPaging:
+    @pytest.mark.asyncio
+    async def test_pages_follow_the_id_and_cover_every_row_once(self, tmp_path):
+        store = await _make_store(tmp_path, orders=45)
+        try:
+            pages = [
+                (count, [json.loads(line)["id"] for line in body.decode().split("\n")])
+                for count, body in [
+                    page async for page in
+                    _ndjson_pages(store, sync_service.MEILI_ORDERS_SQL, [], page_size=7)
+                ]
+            ]
+            assert [count for count, _ in pages] == [7] * 6 + [3]
+            assert all(count == len(ids) for count, ids in pages)
+            ids = [i for _, page_ids in pages for i in page_ids]
+            assert ids == list(range(1, 46))
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_an_exact_multiple_of_the_page_size_ends_cleanly(self, tmp_path):
+        store = await _make_store(tmp_path, orders=14)
+        try:
+            pages = [
+                count async for count, _ in
+                _ndjson_pages(store, sync_service.MEILI_ORDERS_SQL, [], page_size=7)
+            ]
+            assert pages == [7, 7]
+        finally:
+            await store.close()
+
+
+class TestUpload:
+    @pytest.mark.asyncio
+    async def test_batches_overlap_up_to_the_in_flight_bound(self):
+        async def pages():
+            for n in range(12):
+                yield 1, json.dumps({"id": n}).encode()
+
+        fake = _FakeMeili(delay=0.02)
+        indexed = await _meili(fake).index_ndjson("orders", pages(), max_in_flight=3)
+        assert indexed == 12
+        assert fake.peak == 3
+        assert sorted(d["id"] for d in fake.docs["orders"]) == list(range(12))
+
+    @pytest.mark.asyncio
+    async def test_a_failed_task_stops_reading_pages_and_raises(self):
+        read = []
+
+        async def pages():
+            for n in range(20):
+                read.append(n)
+                yield 1, json.dumps({"id": n}).encode()
+
+        with pytest.raises(MeiliIndexError, match="invalid_document_id"):
+            await _meili(_FakeMeili(fail=("orders",))).index_ndjson("orders", pages(), max_in_flight=2)
+        assert len(read) <= 3
+
+    @pytest.mark.asyncio
+    async def test_a_failed_index_leaves_the_watermark_where_it_was(self, tmp_path, monkeypatch):
+        store = await _make_store(tmp_path)
+        try:
+            fake = _FakeMeili(fail=("orders",))
+            monkeypatch.setattr(sync_service, "get_meili_client", lambda: _meili(fake))
+            stats = await SyncService(store).sync_to_meilisearch()
+
+            assert stats["buyers"] == 3 and stats["orders"] == 0
+            assert fake.docs["products"] == []
+            assert await store.get_last_sync_time("meilisearch") is None
+        finally:
+            await store.close()
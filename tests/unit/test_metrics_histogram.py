@@ -0,0 +1,155 @@
+"""Latency histograms behind /api/metrics and /api/metrics/prometheus.
+
+The collector used to keep the last 100 samples per operation and sort them
+on every read, with no p95 before the 20th sample and no labels.
+"""
+import asyncio
+import random
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core.duckdb_store import DuckDBStore
+from core.observability import Histogram, MetricsCollector
+
+
+class TestHistogram:
+    def test_quantiles_are_within_a_bucket_of_the_truth(self):
+        rng = random.Random(7)
+        samples = sorted(rng.lognormvariate(3, 1.2) for _ in range(50_000))
+        h = Histogram()
+        for s in samples:
+            h.record(s)
+
+        for q in (0.5, 0.95, 0.99):
+            exact = samples[int(q * len(samples))]
+            assert h.quantile(q) == pytest.approx(exact, rel=0.125)
+
+    def test_memory_does_not_grow_with_samples(self):
+        h = Histogram()
+        size = len(h.counts)
+        for i in range(10_000):
+            h.record(i * 0.37)
+        assert len(h.counts) == size
+        assert h.count == 10_000
+
+    def test_extremes_land_in_the_edge_buckets(self):
+        h = Histogram()
+        for value in (0.0, 1e-9, 10 * 60 * 60 * 1000.0):
+            h.record(value)
+        assert h.count == 3
+        assert h.quantile(1.0) == 10 * 60 * 60 * 1000.0
+
+    def test_an_empty_histogram_has_no_quantiles(self):
+        assert Histogram().quantile(0.5) is None
+
+
+class TestCollector:
+    def test_p95_is_reported_from_the_first_sample(self):
+        m = MetricsCollector()
+        m.record_timing("/api/test", 40.0)
+
+        assert m.get_stats()["timing"]["/api/test"]["p95_ms"] == 40.0
+
+    def test_labels_are_separate_series(self):
+        m = MetricsCollector()
+        m.observe("http_request_duration", 5.0, method="GET", route="/api/x", status="200")
+        m.observe("http_request_duration", 500.0, method="GET", route="/api/x", status="500")
+
+        timing = m.get_stats()["timing"]
+        assert timing["http_request_duration{method=GET,route=/api/x,status=200}"]["max_ms"] == 5.0
+        assert timing["http_request_duration{method=GET,route=/api/x,status=500}"]["max_ms"] == 500.0
+
+
+def _samples(text: str) -> dict:
+    out = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            out[name] = float(value)
+    return out
+
+
+class TestPrometheusText:
+    def test_buckets_are_cumulative_and_end_at_the_count(self):
+        m = MetricsCollector()
+        for value in (0.3, 3.0, 30.0, 300.0, 3000.0):
+            m.observe("duckdb_lock_wait", value, lane="writer")
+
+        samples = _samples(m.prometheus_text())
+        buckets = [v for k, v in samples.items() if k.startswith("duckdb_lock_wait_seconds_bucket")]
+        assert buckets == sorted(buckets)
+        assert samples['duckdb_lock_wait_seconds_bucket{lane="writer",le="+Inf"}'] == 5
+        assert samples['duckdb_lock_wait_seconds_bucket{lane="writer",le="0.004"}'] == 2
+        assert samples['duckdb_lock_wait_seconds_count{lane="writer"}'] == 5
+        assert samples['duckdb_lock_wait_seconds_sum{lane="writer"}'] == pytest.approx(3.3333)
+
+    def test_free_form_operations_become_a_label(self):
+        m = MetricsCollector()
+        m.record_timing("GET /api/health", 1.0)
+        m.record_request("GET /api/health")
+
+        samples = _samples(m.prometheus_text())
+        assert samples['operation_duration_seconds_count{operation="GET /api/health"}'] == 1
+        assert samples['http_requests_total{endpoint="GET /api/health"}'] == 1
+
+    def test_label_values_are_escaped(self):
+        m = MetricsCollector()
+        m.observe("x", 1.0, route='a"b\\c\nd')
+
+        assert 'x_seconds_count{route="a\\"b\\\\c\\nd"} 1' in m.prometheus_text()
+
+
+class TestRequestLabels:
+    def test_requests_are_labelled_by_route_template(self, monkeypatch):
+        from web import middleware
+
+        collector = MetricsCollector()
+        monkeypatch.setattr(middleware, "metrics", collector)
+        app = FastAPI()
+        app.add_middleware(middleware.RequestLoggingMiddleware)
+
+        @app.get("/api/orders/{order_id}")
+        async def order(order_id: int):
+            return {}
+
+        client = TestClient(app)
+        client.get("/api/orders/1")
+        client.get("/api/orders/2")
+        client.get("/nowhere")
+
+        timing = collector.get_stats()["timing"]
+        assert timing["http_request_duration{method=GET,route=/api/orders/{order_id},status=200}"]["count"] == 2
+        assert timing["http_request_duration{method=GET,route=unmatched,status=404}"]["count"] == 1
+
+
+class TestDuckDBTimers:
+    @pytest.mark.asyncio
+    async def test_lock_wait_and_execution_are_timed_apart(self, tmp_path, monkeypatch):
+        import core.duckdb_store as duckdb_store
+
+        collector = MetricsCollector()
+        monkeypatch.setattr(duckdb_store, "metrics", collector)
+        store = DuckDBStore(db_path=tmp_path / "test.duckdb")
+        await store.connect()
+        try:
+            async def hold():
+                async with store.connection():
+                    await asyncio.sleep(0.05)
+
+            holder = asyncio.create_task(hold())
+            await asyncio.sleep(0)
+            async with store.connection():
+                pass
+            await holder
+            await store._fetch_one("SELECT 1")
+            await store._fetch_all("SELECT 1")
+        finally:
+            await store.close()
+
+        timing = collector.get_stats()["timing"]
+        assert timing["duckdb_lock_wait{lane=writer}"]["max_ms"] >= 40
+        assert timing["duckdb_execute{lane=writer,op=connection}"]["max_ms"] >= 40
+        assert timing["duckdb_execute{lane=reader,op=fetch_one}"]["count"] == 1
+        assert timing["duckdb_execute{lane=reader,op=fetch_all}"]["count"] == 1
@@ -0,0 +1,243 @@
+"""One model per sales type, versioned on disk.
+
+`PredictionService` used to hold a single model whatever sales_type it was
+asked about, so b2b and 'all' forecasts came from the retail model and a
+retrain of any segment overwrote it.
+"""
+import json
+from datetime import date, timedelta
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import prediction_service as ps
+from core.query_cache import QueryCache
+
+
+class _Model:
+    """Picklable stand-in for a Booster."""
+
+    def __init__(self, name: str, features: int = len(ps.FEATURE_COLUMNS)):
+        self.name = name
+        self.features = features
+
+    def num_feature(self) -> int:
+        return self.features
+
+
+def _artifact(name: str, **kwargs) -> ps.ModelArtifact:
+    return ps.ModelArtifact(model=_Model(name), trained="2026-03-01", **kwargs)
+
+
+class TestModelRegistry:
+    def test_a_published_model_survives_a_restart(self, tmp_path):
+        ps.ModelRegistry(tmp_path).publish("retail", _artifact(
+            "a", metrics={"wape": 27.0}, dow_corrections={0: 1.1}, clip_ratio=1.0732,
+        ))
+
+        loaded = ps.ModelRegistry(tmp_path).get("retail")
+
+        assert loaded.model.name == "a"
+        assert loaded.version == 1
+        assert loaded.metrics == {"wape": 27.0}
+        assert loaded.dow_corrections == {0: 1.1}
+        assert abs(loaded.clip_ratio - 1.0732) < 1e-9
+
+    def test_a_booster_round_trips(self, tmp_path):
+        from tests.unit.test_prediction_service import _make_daily_df
+        model, metrics, dow, clip = ps._train_model(_make_daily_df(n_days=200))
+        ps.ModelRegistry(tmp_path).publish("retail", ps.ModelArtifact(model, metrics, dow, clip))
+
+        loaded = ps.ModelRegistry(tmp_path).get("retail")
+
+        future = [date(2024, 7, 19) + timedelta(days=i) for i in range(3)]
+        hist = _make_daily_df(n_days=200)
+        assert ps._predict_future(loaded.model, hist, future, dow, clip) == \
+            ps._predict_future(model, hist, future, dow, clip)
+
+    def test_sales_types_do_not_share_a_model(self, tmp_path):
+        registry = ps.ModelRegistry(tmp_path)
+        registry.publish("retail", _artifact("r"))
+        registry.publish("b2b", _artifact("b"))
+
+        assert registry.get("retail").model.name == "r"
+        assert registry.get("b2b").model.name == "b"
+        assert registry.get("all") is None
+
+    def test_nothing_is_loaded_until_asked_for(self, tmp_path):
+        ps.ModelRegistry(tmp_path).publish("retail", _artifact("a"))
+
+        registry = ps.ModelRegistry(tmp_path)
+        assert registry.peek("retail") is None
+        assert registry.has("retail")
+        assert registry.peek("retail").model.name == "a"
+
+    def test_rollback_serves_the_previous_version(self, tmp_path):
+        registry = ps.ModelRegistry(tmp_path)
+        registry.publish("retail", _artifact("good"))
+        registry.publish("retail", _artifact("bad"))
+
+        assert registry.rollback("retail") == 1
+        assert registry.get("retail").model.name == "good"
+        assert ps.ModelRegistry(tmp_path).get("retail").model.name == "good"
+        assert registry.versions("retail") == [1, 2]
+
+    def test_rollback_with_no_earlier_version_withdraws_the_model(self, tmp_path):
+        registry = ps.ModelRegistry(tmp_path)
+        registry.publish("retail", _artifact("bad"))
+
+        assert registry.rollback("retail") is None
+        assert not registry.has("retail")
+        assert registry.get("retail") is None
+
+    def test_a_rollback_never_returns_to_a_rejected_version(self, tmp_path):
+        registry = ps.ModelRegistry(tmp_path)
+        registry.publish("retail", _artifact("good"))
+        registry.publish("retail", _artifact("bad"))
+        assert registry.rollback("retail") == 1
+
+        registry.publish("retail", _artifact("worse"))
+        assert ps.ModelRegistry(tmp_path).rollback("retail") == 1
+
+        restarted = ps.ModelRegistry(tmp_path)
+        assert restarted.rollback("retail") is None
+        assert not restarted.has("retail")
+
+    def test_old_versions_are_pruned(self, tmp_path):
+        registry = ps.ModelRegistry(tmp_path)
+        for i in range(ps.MODEL_KEEP_VERSIONS + 3):
+            registry.publish("retail", _artifact(str(i)))
+
+        versions = registry.versions("retail")
+        assert len(versions) == ps.MODEL_KEEP_VERSIONS
+        assert versions[-1] == registry.current_version("retail") == ps.MODEL_KEEP_VERSIONS + 3
+
+    def test_a_model_for_other_features_is_not_served(self, tmp_path):
+        ps.ModelRegistry(tmp_path).publish("retail", ps.ModelArtifact(model=_Model("old", features=24)))
+
+        assert ps.ModelRegistry(tmp_path).get("retail") is None
+
+    def test_a_model_for_other_features_counts_as_none_and_is_read_once(self, tmp_path, monkeypatch):
+        ps.ModelRegistry(tmp_path).publish("retail", ps.ModelArtifact(model=_Model("old", features=24)))
+        registry = ps.ModelRegistry(tmp_path)
+        loads = []
+        load = registry._load
+        monkeypatch.setattr(registry, "_load", lambda *a: loads.append(a) or load(*a))
+
+        assert not registry.has("retail")
+        assert registry.get("retail") is None
+        assert registry.unservable("retail")
+        assert len(loads) == 1
+
+        registry.publish("retail", _artifact("new"))
+        assert registry.has("retail")
+
+
+class TestLegacyImport:
+    def test_the_single_model_becomes_retail_v1(self):
+        ps.MODEL_DIR.mkdir(parents=True)
+        import joblib
+        joblib.dump(_Model("legacy"), ps.MODEL_PATH)
+        ps.DOW_CORRECTIONS_PATH.write_text(json.dumps({"0": 1.2}))
+        ps.CLIP_RATIO_PATH.write_text(json.dumps({"clip_ratio": 1.0732}))
+
+        svc = ps.get_prediction_service()
+
+        artifact = svc._registry.get("retail")
+        assert artifact.model.name == "legacy"
+        assert artifact.dow_corrections == {0: 1.2}
+        assert abs(artifact.clip_ratio - 1.0732) < 1e-9
+        assert not svc.has_model("b2b")
+
+    def test_missing_clip_ratio_defaults_to_one(self):
+        ps.MODEL_DIR.mkdir(parents=True)
+        import joblib
+        joblib.dump(_Model("legacy"), ps.MODEL_PATH)
+
+        assert ps.get_prediction_service()._registry.get("retail").clip_ratio == 1.0
+
+    def test_it_runs_once(self):
+        registry = ps.ModelRegistry()
+        ps.MODEL_DIR.mkdir(parents=True)
+        import joblib
+        joblib.dump(_Model("legacy"), ps.MODEL_PATH)
+
+        assert ps._import_legacy_model(registry)
+        assert not ps._import_legacy_model(registry)
+        assert registry.versions("retail") == [1]
+
+
+def _history(n: int = 120) -> pd.DataFrame:
+    return pd.DataFrame({
+        "date": pd.date_range("2025-06-01", periods=n),
+        "revenue": np.linspace(10000, 20000, n),
+    })
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(ps, "forecast_cache", QueryCache())
+    store = AsyncMock()
+    store.gold_generation = 1
+    store.get_predictions = AsyncMock(return_value=[])
+
+    async def fake_get_store():
+        return store
+
+    monkeypatch.setattr("core.duckdb_store.get_store", fake_get_store)
+    monkeypatch.setattr(ps, "_today_kyiv", lambda: date(2026, 3, 10))
+
+    svc = ps.PredictionService()
+    monkeypatch.setattr(svc, "_query_daily_revenue", AsyncMock(return_value=_history()))
+    monkeypatch.setattr(svc, "_get_actual_month_revenue", AsyncMock(return_value=0.0))
+    return svc, store
+
+
+class TestPerSalesTypeServing:
+    @pytest.mark.asyncio
+    async def test_each_sales_type_is_predicted_by_its_own_model(self, service, monkeypatch):
+        svc, _ = service
+        svc._registry.publish("retail", _artifact("r"))
+        svc._registry.publish("b2b", _artifact("b"))
+        monkeypatch.setattr(ps, "_predict_future", lambda model, hist, dates, *a: [
+            {"date": d.isoformat(), "predicted_revenue": 1.0, "model": model.name} for d in dates
+        ])
+
+        retail = await svc.predict_range(date(2026, 3, 10), date(2026, 3, 11), "retail")
+        b2b = await svc.predict_range(date(2026, 3, 10), date(2026, 3, 11), "b2b")
+
+        assert retail["daily_predictions"][0]["model"] == "r"
+        assert b2b["daily_predictions"][0]["model"] == "b"
+        assert await svc.predict_range(date(2026, 3, 10), date(2026, 3, 11), "all") is None
+
+    @pytest.mark.asyncio
+    async def test_train_all_trains_every_segment(self, service, monkeypatch):
+        svc, _ = service
+        monkeypatch.setattr(ps, "_train_model", lambda df: (_Model("new"), {"wape": 25.0}, {}, 1.0))
+        monkeypatch.setattr(svc, "predict_month", AsyncMock(return_value=[]))
+
+        results = await svc.train_all()
+
+        assert {st: r["status"] for st, r in results.items()} == {st: "success" for st in ps.SALES_TYPES}
+        assert all(svc.has_model(st) for st in ps.SALES_TYPES)
+
+    @pytest.mark.asyncio
+    async def test_rejected_predictions_roll_the_model_back(self, service, monkeypatch):
+        svc, store = service
+        svc._registry.publish("retail", _artifact("good"))
+        monkeypatch.setattr(ps, "_train_model", lambda df: (_Model("bad"), {"wape": 25.0}, {}, 1.0))
+        monkeypatch.setattr(ps, "_predict_future", lambda model, hist, dates, *a: [
+            {"date": d.isoformat(), "predicted_revenue": -1.0} for d in dates
+        ])
+        monkeypatch.setattr(svc, "_alert_model_rejected", AsyncMock())
+
+        result = await svc._train_impl("retail")
+
+        assert result["status"] == "rolled_back"
+        assert (result["rejected_version"], result["serving_version"]) == (2, 1)
+        assert (await svc._artifact("retail")).model.name == "good"
+        store.store_predictions.assert_not_called()
+        outcome = svc._alert_model_rejected.await_args.args[3]
+        assert outcome.startswith("Rolled back to v1")
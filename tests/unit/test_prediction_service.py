@@ -1,9 +1,8 @@
 """Tests for winsorized LightGBM revenue prediction."""
-import json
 import tempfile
 from datetime import date, timedelta
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
 import numpy as np
 import pandas as pd
@@ -178,73 +177,6 @@ class TestPredictFutureClipRatio:
         assert sig.parameters["clip_ratio"].default == 1.0
 
 
-# ---------------------------------------------------------------------------
-# Tests for save/load clip_ratio
-# ---------------------------------------------------------------------------
-
-class TestSaveLoadClipRatio:
-    def test_save_and_load_clip_ratio(self, tmp_path):
-        """clip_ratio should round-trip through save/load."""
-        from core.prediction_service import PredictionService
-
-        service = PredictionService()
-        service._clip_ratio = 1.0732
-
-        clip_path = tmp_path / "clip_ratio.json"
-        model_path = tmp_path / "revenue_model.joblib"
-        dow_path = tmp_path / "dow_corrections.json"
-
-        mock_model = MagicMock()
-        mock_model.num_feature.return_value = 31
-        service._model = mock_model
-        service._dow_corrections = {i: 1.0 for i in range(7)}
-
-        with patch("core.prediction_service.CLIP_RATIO_PATH", clip_path), \
-             patch("core.prediction_service.MODEL_PATH", model_path), \
-             patch("core.prediction_service.MODEL_DIR", tmp_path), \
-             patch("core.prediction_service.DOW_CORRECTIONS_PATH", dow_path), \
-             patch("joblib.dump"):  # Skip actual model pickle
-            service._save_model()
-
-        # Verify clip_ratio file content
-        assert clip_path.exists()
-        data = json.loads(clip_path.read_text())
-        assert abs(data["clip_ratio"] - 1.0732) < 1e-6
-
-        # Create a fake model file so MODEL_PATH.exists() returns True
-        model_path.touch()
-
-        # Load into new service
-        service2 = PredictionService()
-        with patch("core.prediction_service.MODEL_PATH", model_path), \
-             patch("core.prediction_service.DOW_CORRECTIONS_PATH", dow_path), \
-             patch("core.prediction_service.CLIP_RATIO_PATH", clip_path), \
-             patch("joblib.load", return_value=mock_model):
-            service2._load_model()
-
-        assert abs(service2._clip_ratio - 1.0732) < 1e-6
-
-    def test_load_missing_clip_ratio_defaults_to_one(self, tmp_path):
-        """When clip_ratio.json doesn't exist, should default to 1.0."""
-        from core.prediction_service import PredictionService
-
-        service = PredictionService()
-        clip_path = tmp_path / "clip_ratio.json"
-        model_path = tmp_path / "revenue_model.joblib"
-        dow_path = tmp_path / "dow_corrections.json"
-
-        mock_model = MagicMock()
-        mock_model.num_feature.return_value = 31
-
-        with patch("core.prediction_service.MODEL_PATH", model_path), \
-             patch("core.prediction_service.DOW_CORRECTIONS_PATH", dow_path), \
-             patch("core.prediction_service.CLIP_RATIO_PATH", clip_path), \
-             patch("joblib.load", return_value=mock_model):
-            service._load_model()
-
-        assert service._clip_ratio == 1.0
-
-
 # ---------------------------------------------------------------------------
 # Tests for _run_evaluation with winsorization
 # ---------------------------------------------------------------------------
@@ -305,6 +237,185 @@ class TestTuneWinsorized:
 
 class TestPredictionServiceInit:
     def test_clip_ratio_initialized(self):
-        from core.prediction_service import PredictionService
+        from core.prediction_service import ModelArtifact
+        assert ModelArtifact(model=None).clip_ratio == 1.0
+
+    def test_starts_without_models(self):
+        from core.prediction_service import PredictionService, SALES_TYPES
         svc = PredictionService()
-        assert svc._clip_ratio == 1.0
+        assert not svc.is_ready
+        assert not any(svc.has_model(st) for st in SALES_TYPES)
+
+
+# ---------------------------------------------------------------------------
+# Tests for the incremental recursive forecaster
+# ---------------------------------------------------------------------------
+
+def _predict_future_rebuilding(model, historical_df, future_dates, dow_corrections=None, clip_ratio=1.0):
+    """The forecaster as it was: _build_features over the whole prefix per day."""
+    from core.prediction_service import _build_features, FEATURE_COLUMNS
+
+    hist = historical_df.copy()
+    hist['date'] = pd.to_datetime(hist['date'])
+    future_rows = pd.DataFrame({'date': pd.to_datetime(future_dates), 'revenue': np.nan})
+    combined = pd.concat([hist, future_rows], ignore_index=True)
+    combined = combined.sort_values('date').reset_index(drop=True)
+
+    predictions = []
+    for idx in range(len(hist), len(combined)):
+        featured = _build_features(combined.iloc[:idx + 1])
+        featured['yoy_ratio'] = featured['yoy_ratio'].fillna(1.0)
+        row_features = featured.iloc[-1][FEATURE_COLUMNS].fillna(0).values.reshape(1, -1)
+        pred = max(float(model.predict(row_features)[0]), 0) * clip_ratio
+        if dow_corrections:
+            pred *= dow_corrections.get(combined.loc[idx, 'date'].dayofweek, 1.0)
+        combined.loc[idx, 'revenue'] = pred
+        predictions.append({
+            'date': combined.loc[idx, 'date'].strftime('%Y-%m-%d'),
+            'predicted_revenue': round(pred, 2),
+        })
+    return predictions
+
+
+@pytest.fixture(scope="module")
+def trained():
+    """One model for the incremental-forecast comparisons; training is the slow part."""
+    from core.prediction_service import _train_model
+    df = _make_daily_df(n_days=400, spike_days=10)
+    model, _, dow_corrections, clip_ratio = _train_model(df)
+    return model, df, dow_corrections, clip_ratio
+
+
+class TestPredictFutureIncremental:
+    @staticmethod
+    def _assert_same(got, expected):
+        assert [p['date'] for p in got] == [p['date'] for p in expected]
+        for g, e in zip(got, expected):
+            assert g['predicted_revenue'] == pytest.approx(e['predicted_revenue'], rel=1e-9, abs=0.01)
+
+    def test_revenue_features_match_build_features(self):
+        """Every revenue feature, every day, including across history gaps."""
+        from core.prediction_service import _build_features, _revenue_features, _REVENUE_FEATURES
+
+        df = _make_daily_df(n_days=420, spike_days=10)
+        df = df.drop(index=[5, 50, 51, 52, 200, 399]).reset_index(drop=True)
+        featured = _build_features(df)
+
+        offsets = (featured['date'] - featured['date'].iloc[0]).dt.days.to_numpy()
+        grid = np.full(offsets[-1] + 1, np.nan)
+        grid[offsets] = featured['revenue'].to_numpy()
+
+        for i, p in enumerate(offsets):
+            computed = _revenue_features(grid, p)
+            for col in _REVENUE_FEATURES:
+                expected = featured.loc[i, col]
+                if pd.isna(expected):
+                    assert np.isnan(computed[col]), (col, i)
+                else:
+                    assert computed[col] == pytest.approx(expected, rel=1e-9, abs=1e-9), (col, i)
+
+    def test_matches_the_rebuilding_forecaster_right_after_history(self, trained):
+        from core.prediction_service import _predict_future
+        model, df, dow_corrections, clip_ratio = trained
+        start = df['date'].max().date() + timedelta(days=1)
+        future_dates = [start + timedelta(days=i) for i in range(31)]
+
+        self._assert_same(
+            _predict_future(model, df, future_dates, dow_corrections, clip_ratio),
+            _predict_future_rebuilding(model, df, future_dates, dow_corrections, clip_ratio),
+        )
+
+    def test_matches_the_rebuilding_forecaster_after_a_gap(self, trained):
+        """predict_range can start past tomorrow; the days between stay unknown."""
+        from core.prediction_service import _predict_future
+        model, df, dow_corrections, clip_ratio = trained
+        future_dates = [date(2025, 2, 15) + timedelta(days=i) for i in range(10)]
+
+        self._assert_same(
+            _predict_future(model, df, future_dates, dow_corrections, clip_ratio),
+            _predict_future_rebuilding(model, df, future_dates, dow_corrections, clip_ratio),
+        )
+
+
+# ---------------------------------------------------------------------------
+# Tests for the tune/evaluate process pool
+# ---------------------------------------------------------------------------
+
+class TestMlWorkers:
+    def test_the_environment_wins(self, monkeypatch):
+        from core import prediction_service as ps
+        monkeypatch.setenv("ML_TUNE_WORKERS", "3")
+        assert ps._ml_workers() == 3
+
+    def test_memory_caps_the_cpu_count(self, monkeypatch):
+        from core import prediction_service as ps
+        monkeypatch.delenv("ML_TUNE_WORKERS", raising=False)
+        monkeypatch.setenv("DUCKDB_MEMORY_LIMIT", "4GiB")
+        monkeypatch.setattr(ps, "_cpu_limit", lambda: 8)
+        # 7 GiB container: (7 - 4) / 2 = 1.5 GiB spare → 4 workers of 384 MiB
+        monkeypatch.setattr("core.memory_monitor.read_cgroup_memory",
+                            lambda: {"limit": 7 * 1024 ** 3})
+        assert ps._ml_workers() == 4
+
+    def test_never_below_one(self, monkeypatch):
+        from core import prediction_service as ps
+        monkeypatch.delenv("ML_TUNE_WORKERS", raising=False)
+        monkeypatch.setattr(ps, "_cpu_limit", lambda: 8)
+        monkeypatch.setattr("core.memory_monitor.read_cgroup_memory",
+                            lambda: {"limit": 1024 ** 3})
+        assert ps._ml_workers() == 1
+
+    def test_cpu_quota_is_read_from_the_cgroup(self, tmp_path, monkeypatch):
+        import os
+        from core import prediction_service as ps
+        monkeypatch.setattr(os, "sched_getaffinity", lambda pid: set(range(16)), raising=False)
+
+        (tmp_path / "cpu.max").write_text("150000 100000\n")
+        assert ps._cpu_limit(str(tmp_path)) == 2
+
+        (tmp_path / "cpu.max").write_text("max 100000\n")
+        assert ps._cpu_limit(str(tmp_path)) == 16
+
+
+class TestMlPool:
+    def test_runs_share_one_pool_until_its_size_changes(self):
+        from core import prediction_service as ps
+        try:
+            with ps._ml_pool(1) as first:
+                assert first.submit(abs, -3).result() == 3
+            with ps._ml_pool(1) as again:
+                pass
+            with ps._ml_pool(2) as resized:
+                pass
+            assert again is first
+            assert resized is not first
+        finally:
+            ps._shutdown_ml_pool()
+
+    def test_the_frame_round_trips_through_memory_mapped_columns(self, tmp_path):
+        from core.prediction_service import _read_frame, _write_frame
+
+        df = _make_daily_df(n_days=30)
+        df['orders_count'] = df['revenue'].round().astype(object)
+        _write_frame(tmp_path, df)
+        back = _read_frame(str(tmp_path))
+
+        pd.testing.assert_frame_equal(back, df.astype({'orders_count': np.float64}))
+
+
+class TestTuneParallel:
+    def test_halving_scores_fewer_fits_and_reports_the_pool(self, tmp_path):
+        from core.prediction_service import _tune_hyperparameters
+
+        df = _make_daily_df(n_days=600, spike_days=25, start_date="2023-06-01")
+        with patch("core.prediction_service.TUNED_PARAMS_PATH", tmp_path / "params.json"), \
+             patch("core.prediction_service.MODEL_DIR", tmp_path):
+            result = _tune_hyperparameters(df, workers=2, halving=True)
+
+        full_grid = (result["combos_tested"] + 1) * result["folds"]
+        assert result["halving"] is True
+        assert result["combos_fully_evaluated"] < result["combos_tested"]
+        assert result["jobs"] < full_grid
+        assert result["workers"] == 2
+        assert sum(w["jobs"] for w in result["worker_utilization"]) == result["jobs"]
+        assert all(0 < w["utilization"] <= 1 for w in result["worker_utilization"])
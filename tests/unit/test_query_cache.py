@@ -0,0 +1,169 @@
+"""Dashboard answers are cached against the warehouse generation.
+
+The contract: identical questions at one generation reach DuckDB once, a
+refresh that changed Silver or Gold retires them, and a refresh that only
+rewrote cells with the values they already had does not.
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from core.duckdb_store import DuckDBStore
+from core.query_cache import QueryCache
+
+
+def _counting(value):
+    calls = {"n": 0}
+
+    async def compute():
+        calls["n"] += 1
+        await asyncio.sleep(0.01)
+        return value
+
+    return compute, calls
+
+
+class TestTheCache:
+    @pytest.mark.asyncio
+    async def test_a_repeat_question_is_a_hit(self):
+        cache = QueryCache()
+        compute, calls = _counting({"revenue": [1, 2]})
+
+        await cache.get_or_compute("k", 0, compute)
+        await cache.get_or_compute("k", 0, compute)
+
+        assert calls["n"] == 1
+        assert cache.get_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_a_new_generation_is_a_miss(self):
+        cache = QueryCache()
+        compute, calls = _counting({"revenue": [1]})
+
+        await cache.get_or_compute("k", 0, compute)
+        await cache.get_or_compute("k", 1, compute)
+
+        assert calls["n"] == 2
+        assert cache.get_stats()["stale"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_requests_run_once(self):
+        cache = QueryCache()
+        compute, calls = _counting({"revenue": [1]})
+
+        results = await asyncio.gather(
+            *(cache.get_or_compute("k", 0, compute) for _ in range(12))
+        )
+
+        assert calls["n"] == 1
+        assert all(r == {"revenue": [1]} for r in results)
+        assert cache.get_stats()["coalesced"] == 11
+
+    @pytest.mark.asyncio
+    async def test_callers_cannot_change_what_the_next_one_gets(self):
+        """analytics.get_revenue_trend appends forecast labels to its result."""
+        cache = QueryCache()
+        compute, _ = _counting({"labels": ["01.01"]})
+
+        first = await cache.get_or_compute("k", 0, compute)
+        first["labels"].append("02.01")
+        first["forecast"] = {}
+
+        assert await cache.get_or_compute("k", 0, compute) == {"labels": ["01.01"]}
+
+    @pytest.mark.asyncio
+    async def test_the_oldest_entry_is_evicted_at_capacity(self):
+        cache = QueryCache(max_entries=2)
+        for key in ("a", "b", "c"):
+            compute, _ = _counting(key)
+            await cache.get_or_compute(key, 0, compute)
+
+        stats = cache.get_stats()
+        assert stats["entries"] == 2
+        assert stats["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_an_expired_entry_is_recomputed(self):
+        cache = QueryCache(ttl_seconds=0)
+        compute, calls = _counting(1)
+
+        await cache.get_or_compute("k", 0, compute)
+        await cache.get_or_compute("k", 0, compute)
+
+        assert calls["n"] == 2
+
+    @pytest.mark.asyncio
+    async def test_a_failure_reaches_every_waiter_and_is_not_cached(self):
+        cache = QueryCache()
+        calls = {"n": 0}
+
+        async def boom():
+            calls["n"] += 1
+            await asyncio.sleep(0.01)
+            raise RuntimeError("db gone")
+
+        results = await asyncio.gather(
+            *(cache.get_or_compute("k", 0, boom) for _ in range(3)),
+            return_exceptions=True,
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert calls["n"] == 1
+        assert cache.get_stats()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_a_waiter_takes_over_when_the_leader_is_cancelled(self):
+        cache = QueryCache()
+        compute, calls = _counting("ok")
+
+        leader = asyncio.create_task(cache.get_or_compute("k", 0, compute))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(cache.get_or_compute("k", 0, compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == "ok"
+        assert calls["n"] == 2
+
+
+def _insert_order(conn, oid, when, total="1000.00"):
+    conn.execute(
+        """
+        INSERT INTO orders (id, source_id, status_id, grand_total, ordered_at,
+                            created_at, updated_at, buyer_id)
+        VALUES (?, 4, 12, ?, ?, ?, ?, ?)
+        """,
+        [oid, total, when, when, when, oid * 10],
+    )
+
+
+class TestTheGeneration:
+    @pytest.mark.asyncio
+    async def test_only_a_refresh_that_changed_something_bumps_it(self, tmp_path):
+        store = DuckDBStore(db_path=tmp_path / "test.duckdb")
+        await store.connect()
+        try:
+            when = datetime.now(timezone.utc) - timedelta(days=1)
+            async with store.connection() as conn:
+                _insert_order(conn, 1, when)
+
+            res = await store.refresh_warehouse_layers(trigger="manual")
+            first = store.gold_generation
+            assert res["warehouse_changed"] is True
+
+            # Same data, rewritten: nothing a cached answer describes moved.
+            res = await store.refresh_warehouse_layers(
+                trigger="manual", changed_order_ids=[1],
+            )
+            assert res["warehouse_changed"] is False
+            assert store.gold_generation == first
+
+            async with store.connection() as conn:
+                conn.execute("UPDATE orders SET grand_total = 1500 WHERE id = 1")
+            res = await store.refresh_warehouse_layers(
+                trigger="manual", changed_order_ids=[1],
+            )
+            assert res["warehouse_changed"] is True
+            assert store.gold_generation > first
+        finally:
+            await store.close()
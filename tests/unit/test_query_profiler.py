@@ -0,0 +1,127 @@
+"""The opt-in DuckDB statement profiler (core/query_profiler.py)."""
+from datetime import date
+from pathlib import Path
+
+import duckdb
+import pytest
+
+from core.duckdb_store import DuckDBStore
+from core.query_profiler import QueryProfiler, query_profiler
+
+
+@pytest.fixture
+def profiling():
+    query_profiler.reset()
+    query_profiler.configure(enabled=True, top_n=50, sample_rate=0.0)
+    yield query_profiler
+    query_profiler.configure(enabled=False, sample_rate=0.0)
+    query_profiler.reset()
+
+
+async def _make_store(tmp_path: Path) -> DuckDBStore:
+    store = DuckDBStore(db_path=tmp_path / "test.duckdb")
+    await store.connect()
+    return store
+
+
+class TestStore:
+    @pytest.mark.asyncio
+    async def test_off_hands_out_the_bare_connection(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            async with store.connection() as conn:
+                assert isinstance(conn, duckdb.DuckDBPyConnection)
+            async with store.read_connection() as conn:
+                assert isinstance(conn, duckdb.DuckDBPyConnection)
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_statements_are_attributed_to_the_repository_method(self, tmp_path, profiling):
+        store = await _make_store(tmp_path)
+        try:
+            await store.get_summary_stats(date(2026, 8, 1), date(2026, 8, 31))
+            await store.get_margin_overview(date(2026, 8, 1), date(2026, 8, 31))
+        finally:
+            await store.close()
+
+        callers = {t["caller"]: t for t in profiling.snapshot()["by_caller"]}
+        assert callers["RevenueMixin.get_summary_stats"]["rows"] == 1
+        assert "MarginMixin.get_margin_overview" in callers
+
+    @pytest.mark.asyncio
+    async def test_fetch_helpers_name_their_caller(self, tmp_path, profiling):
+        store = await _make_store(tmp_path)
+
+        async def count_orders():
+            return await store._fetch_all("SELECT * FROM range(3)")
+
+        try:
+            assert len(await count_orders()) == 3
+        finally:
+            await store.close()
+
+        # A nested function counts toward the method it is defined in
+        [totals] = profiling.snapshot()["by_caller"]
+        assert totals["caller"] == "TestStore.test_fetch_helpers_name_their_caller"
+        assert totals["rows"] == 3
+
+    @pytest.mark.asyncio
+    async def test_writes_are_recorded_without_a_fetch(self, tmp_path, profiling):
+        store = await _make_store(tmp_path)
+        try:
+            async with store.connection() as conn:
+                conn.execute("CREATE TABLE t (a INTEGER)")
+                conn.executemany("INSERT INTO t VALUES (?)", [[1], [2]])
+        finally:
+            await store.close()
+
+        sql = [e["sql"] for e in profiling.snapshot()["slowest"]]
+        assert "CREATE TABLE t (a INTEGER)" in sql
+        assert "INSERT INTO t VALUES (?)" in sql
+
+
+class TestProfiler:
+    def _conn(self, profiler):
+        return profiler.wrap(duckdb.connect(), None)
+
+    def test_only_the_slowest_are_kept(self):
+        profiler = QueryProfiler(enabled=True, top_n=2)
+        for ms in (5.0, 50.0, 1.0, 20.0):
+            profiler.record("X.y", f"SELECT {ms}", ms, 1)
+
+        snapshot = profiler.snapshot()
+        assert [e["duration_ms"] for e in snapshot["slowest"]] == [50.0, 20.0]
+        assert snapshot["by_caller"][0] == {
+            "caller": "X.y", "count": 4, "total_ms": 76.0, "max_ms": 50.0, "rows": 4, "avg_ms": 19.0,
+        }
+
+    def test_sampled_reads_carry_duckdbs_plan(self):
+        profiler = QueryProfiler(enabled=True, sample_rate=1.0)
+        conn = self._conn(profiler)
+
+        rows = conn.execute("SELECT i % 3 AS k, COUNT(*) FROM range(100) t(i) GROUP BY k").fetchall()
+
+        assert len(rows) == 3
+        [sampled] = profiler.snapshot()["profiles"]
+        assert sampled["rows"] == 3
+        assert sampled["profile"]["children"]
+
+    def test_writes_are_never_explained(self):
+        profiler = QueryProfiler(enabled=True, sample_rate=1.0)
+        conn = self._conn(profiler)
+
+        conn.execute("CREATE TABLE t (a INTEGER)")
+        conn.execute("INSERT INTO t VALUES (1)")
+
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone() == (1,)
+        assert [p["sql"] for p in profiler.snapshot()["profiles"]] == ["SELECT COUNT(*) FROM t"]
+
+    def test_shrinking_top_n_keeps_the_slowest(self):
+        profiler = QueryProfiler(enabled=True, top_n=3)
+        for ms in (1.0, 3.0, 2.0):
+            profiler.record("X.y", "SELECT 1", ms, 1)
+
+        profiler.configure(top_n=1)
+
+        assert [e["duration_ms"] for e in profiler.snapshot()["slowest"]] == [3.0]
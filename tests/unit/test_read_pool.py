@@ -0,0 +1,154 @@
+"""Dashboard reads must not queue behind the writer.
+
+Every query used to take the one store lock, so a 30-second warehouse refresh
+held every `/api/summary` behind it. Reads now borrow a cursor of their own;
+the writer lane keeps the lock to itself.
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from core.duckdb_store import (
+    DEFAULT_DUCKDB_READ_WORKERS, DuckDBStore, _read_workers,
+)
+from core.exceptions import QueryTimeoutError
+
+
+async def _make_store(tmp_path, monkeypatch, readers=None):
+    if readers is None:
+        monkeypatch.delenv("DUCKDB_READ_WORKERS", raising=False)
+    else:
+        monkeypatch.setenv("DUCKDB_READ_WORKERS", str(readers))
+    store = DuckDBStore(db_path=tmp_path / "test.duckdb")
+    await store.connect()
+    return store
+
+
+class TestReadWorkersResolution:
+    def test_defaults_when_unset(self, monkeypatch):
+        monkeypatch.delenv("DUCKDB_READ_WORKERS", raising=False)
+        assert _read_workers() == DEFAULT_DUCKDB_READ_WORKERS
+
+    def test_zero_turns_the_lane_off(self, monkeypatch):
+        monkeypatch.setenv("DUCKDB_READ_WORKERS", "0")
+        assert _read_workers() == 0
+
+    @pytest.mark.parametrize("value", ["many", "-2", "2.5"])
+    def test_rejects_anything_else(self, monkeypatch, value):
+        monkeypatch.setenv("DUCKDB_READ_WORKERS", value)
+        assert _read_workers() == DEFAULT_DUCKDB_READ_WORKERS
+
+
+class TestTheReadLane:
+    @pytest.mark.asyncio
+    async def test_a_read_does_not_wait_for_the_writer_lock(self, tmp_path, monkeypatch):
+        store = await _make_store(tmp_path, monkeypatch)
+        try:
+            async with store.connection():
+                # The writer lane is held; a reader must still get through.
+                row = await asyncio.wait_for(
+                    store._fetch_one("SELECT COUNT(*) FROM orders"), timeout=5,
+                )
+            assert row == (0,)
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_a_reader_sees_the_last_commit_not_the_open_transaction(
+        self, tmp_path, monkeypatch,
+    ):
+        store = await _make_store(tmp_path, monkeypatch)
+        try:
+            when = datetime.now(timezone.utc) - timedelta(days=1)
+            async with store.connection() as conn:
+                conn.execute("BEGIN TRANSACTION")
+                conn.execute(
+                    "INSERT INTO orders (id, source_id, status_id, grand_total, "
+                    "ordered_at) VALUES (1, 4, 12, 100, ?)", [when],
+                )
+                mid = await store._fetch_one("SELECT COUNT(*) FROM orders")
+                conn.execute("COMMIT")
+            after = await store._fetch_one("SELECT COUNT(*) FROM orders")
+
+            assert mid == (0,)
+            assert after == (1,)
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_with_the_lane_off_reads_take_the_writer_lock(self, tmp_path, monkeypatch):
+        store = await _make_store(tmp_path, monkeypatch, readers=0)
+        try:
+            assert store._read_cursors is None
+            async with store.connection():
+                with pytest.raises(asyncio.TimeoutError):
+                    await asyncio.wait_for(
+                        store._fetch_one("SELECT 1"), timeout=0.2,
+                    )
+            assert await store._fetch_one("SELECT 1") == (1,)
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_a_timed_out_read_frees_its_cursor_before_returning_it(
+        self, tmp_path, monkeypatch,
+    ):
+        store = await _make_store(tmp_path, monkeypatch, readers=1)
+        try:
+            def nap(x: int) -> int:
+                time.sleep(0.3)  # a UDF is not interruptible mid-call
+                return x
+
+            store._connection.create_function("nap", nap)
+            with pytest.raises(QueryTimeoutError):
+                await store._fetch_one("SELECT nap(1)", timeout=0.05)
+            # The one reader thread has let go of the cursor by now.
+            assert store._read_executor.submit(lambda: True).result(timeout=0.05)
+            assert await store._fetch_one("SELECT 1") == (1,)
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_waits_for_every_reader(self, tmp_path, monkeypatch):
+        store = await _make_store(tmp_path, monkeypatch, readers=2)
+        try:
+            async with store.read_connection():
+                checkpoint = asyncio.create_task(store.checkpoint())
+                await asyncio.sleep(0.1)
+                assert not checkpoint.done()
+            await asyncio.wait_for(checkpoint, timeout=5)
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_refresh_leaves_the_event_loop_free(self, tmp_path, monkeypatch):
+        """The Silver and Gold statements run on the writer thread."""
+        store = await _make_store(tmp_path, monkeypatch)
+        try:
+            when = datetime.now(timezone.utc) - timedelta(days=1)
+            async with store.connection() as conn:
+                conn.execute("""
+                    INSERT INTO orders (id, source_id, status_id, grand_total,
+                                        ordered_at, buyer_id)
+                    SELECT i, 4, 12, 100, ?::TIMESTAMPTZ - (i % 300) * INTERVAL 1 DAY, i % 997
+                    FROM range(1, 20001) t(i)
+                """, [when])
+
+            ticks = 0
+
+            async def _ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0)
+                    ticks += 1
+
+            ticker = asyncio.create_task(_ticker())
+            res = await store.refresh_warehouse_layers(trigger="manual")
+            ticker.cancel()
+
+            assert res["validation_passed"] is True
+            assert ticks > 0
+        finally:
+            await store.close()
@@ -0,0 +1,203 @@
+"""The trend chart's series come from one spine query.
+
+`get_revenue_trend` used to run a Gold query per window and zero-fill each in a
+Python loop; the forecast extension made a third trip through raw orders. All
+of it is `get_revenue_series` now. These pin what the chart relies on: every
+day present, each comparison aligned from its own start, and calendar shifts
+that clamp at month end the way `relativedelta` does.
+"""
+from __future__ import annotations
+
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+from core.duckdb_store import DuckDBStore
+
+
+async def _make_store(tmp_path: Path) -> DuckDBStore:
+    s = DuckDBStore(db_path=tmp_path / "series.duckdb")
+    await s.connect()
+    return s
+
+
+async def _gold(store, rows):
+    """rows: (date, revenue, orders[, sales_type])."""
+    async with store.connection() as conn:
+        for d, revenue, orders, *rest in rows:
+            conn.execute(
+                "INSERT INTO gold_daily_revenue (date, sales_type, revenue, orders_count, "
+                "instagram_revenue, instagram_orders) VALUES (?, ?, ?, ?, ?, ?)",
+                [d, rest[0] if rest else "retail", revenue, orders, revenue, orders],
+            )
+
+
+class TestRevenueSeries:
+    @pytest.mark.asyncio
+    async def test_days_without_gold_rows_are_zero_filled(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            await _gold(store, [(date(2026, 3, 2), 150.5, 3)])
+            r = await store.get_revenue_series(date(2026, 3, 1), date(2026, 3, 3))
+
+            assert r["labels"] == ["01.03", "02.03", "03.03"]
+            assert r["revenue"] == [0.0, 150.5, 0.0]
+            assert r["orders"] == [0, 3, 0]
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_every_window_is_aligned_from_its_own_start(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            await _gold(store, [
+                (date(2026, 3, 1), 10, 1),     # current, day 0
+                (date(2026, 2, 26), 20, 1),    # previous_period, day 0 (26.02–28.02)
+                (date(2026, 2, 2), 30, 1),     # month_ago, day 1
+                (date(2025, 3, 3), 40, 1),     # year_ago, day 2
+            ])
+            r = await store.get_revenue_series(date(2026, 3, 1), date(2026, 3, 3))
+
+            assert r["revenue"] == [10.0, 0.0, 0.0]
+            assert r["previous_period"]["revenue"] == [20.0, 0.0, 0.0]
+            assert r["month_ago"]["revenue"] == [0.0, 30.0, 0.0]
+            assert r["year_ago"]["revenue"] == [0.0, 0.0, 40.0]
+            assert r["previous_period"]["start"] == date(2026, 2, 26)
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_a_month_ago_window_can_be_shorter_than_the_period(self, tmp_path):
+        """March against a month ago is February: 28 points, not 31."""
+        store = await _make_store(tmp_path)
+        try:
+            r = await store.get_revenue_series(date(2026, 3, 1), date(2026, 3, 31))
+
+            assert len(r["labels"]) == 31
+            assert (r["month_ago"]["start"], r["month_ago"]["end"]) == (date(2026, 2, 1), date(2026, 2, 28))
+            assert len(r["month_ago"]["revenue"]) == 28
+            assert len(r["year_ago"]["revenue"]) == 31
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_other_sales_types_stay_out_unless_asked_for(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            await _gold(store, [
+                (date(2026, 3, 1), 100, 1, "retail"),
+                (date(2026, 3, 1), 50, 1, "b2b"),
+            ])
+            retail = await store.get_revenue_series(date(2026, 3, 1), date(2026, 3, 1))
+            everything = await store.get_revenue_series(
+                date(2026, 3, 1), date(2026, 3, 1), sales_type="all"
+            )
+
+            assert retail["revenue"] == [100.0]
+            assert everything["revenue"] == [150.0]
+            assert everything["orders"] == [2]
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_only_the_requested_windows_are_read(self, tmp_path, monkeypatch):
+        store = await _make_store(tmp_path)
+        try:
+            await _gold(store, [
+                (date(2026, 3, 1), 10, 1),
+                (date(2026, 2, 26), 20, 1),
+                (date(2025, 3, 1), 40, 1),
+            ])
+            starts = []
+            build = store._build_gold_revenue_query
+
+            def spy(start, end, *args):
+                starts.append(start)
+                return build(start, end, *args)
+
+            monkeypatch.setattr(store, "_build_gold_revenue_query", spy)
+            r = await store.get_revenue_series(
+                date(2026, 3, 1), date(2026, 3, 3), compare_types=("previous_period",)
+            )
+            bare = await store.get_revenue_series(date(2026, 3, 1), date(2026, 3, 3), compare_types=())
+
+            assert starts == [date(2026, 2, 26), date(2026, 3, 1)]
+            assert r["previous_period"]["revenue"] == [20.0, 0.0, 0.0]
+            assert "month_ago" not in r and "year_ago" not in r
+            assert bare["revenue"] == [10.0, 0.0, 0.0]
+            assert "previous_period" not in bare
+        finally:
+            await store.close()
+
+
+class TestRevenueTrend:
+    @pytest.mark.asyncio
+    async def test_the_comparison_follows_compare_type(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            await _gold(store, [
+                (date(2026, 3, 1), 200, 2),
+                (date(2025, 3, 1), 100, 1),
+            ])
+            r = await store.get_revenue_trend(
+                date(2026, 3, 1), date(2026, 3, 2), compare_type="year_ago"
+            )
+
+            assert r["datasets"][1]["data"] == [100.0, 0.0]
+            assert r["comparison"]["period"] == {
+                "start": "2025-03-01", "end": "2025-03-02", "type": "year_ago",
+            }
+            assert r["comparison"]["totals"] == {
+                "current": 200.0, "previous": 100.0, "growth_percent": 100.0,
+            }
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_without_comparison_there_is_one_dataset(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            r = await store.get_revenue_trend(
+                date(2026, 3, 1), date(2026, 3, 2), include_comparison=False
+            )
+
+            assert len(r["datasets"]) == 1
+            assert "comparison" not in r
+        finally:
+            await store.close()
+
+
+class TestComparisonForDates:
+    @pytest.mark.asyncio
+    async def test_each_date_is_shifted_on_its_own(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            await _gold(store, [
+                (date(2026, 2, 28), 70, 1),
+                (date(2025, 4, 1), 90, 1),
+            ])
+            month = await store.get_comparison_revenue_for_dates(
+                [date(2026, 3, 31), date(2026, 4, 1)], "month_ago"
+            )
+            year = await store.get_comparison_revenue_for_dates([date(2026, 4, 1)], "year_ago")
+
+            assert month == {date(2026, 3, 31): 70.0, date(2026, 4, 1): 0.0}
+            assert year == {date(2026, 4, 1): 90.0}
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_previous_period_shifts_by_the_number_of_dates(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            day = date(2026, 4, 10)
+            await _gold(store, [(day - timedelta(days=3), 55, 1)])
+            r = await store.get_comparison_revenue_for_dates(
+                [day, day + timedelta(days=1), day + timedelta(days=2)], "previous_period"
+            )
+
+            assert r[day] == 55.0
+            assert await store.get_comparison_revenue_for_dates([]) == {}
+        finally:
+            await store.close()
@@ -0,0 +1,118 @@
+"""Session checks read role/status from a cache that user writes retire.
+
+`_resolve_session` used to call `store.get_user` on every /api request and
+every WebSocket handshake, so a dashboard page load was a dozen identical
+users-table queries.
+"""
+import time
+
+import pytest
+
+from core.duckdb_store import get_store
+from core.query_cache import QueryCache
+from web.routes import auth
+from web.routes.auth import create_session_data, session_serializer
+from web.schemas import MetricsResponse
+
+USER_ID = 555_000_333
+ADMIN_ID = 1
+
+
+def _cookie(user_id: int = USER_ID) -> str:
+    return session_serializer.dumps(create_session_data(
+        {"id": str(user_id), "first_name": "Test", "auth_date": str(int(time.time()))},
+        role="admin",
+    ))
+
+
+class _Conn:
+    def __init__(self, cookie: str):
+        self.cookies = {auth.SESSION_COOKIE: cookie}
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = QueryCache(max_entries=16, ttl_seconds=60)
+    monkeypatch.setattr(auth, "session_cache", cache)
+    return cache
+
+
+async def _store_with_user(monkeypatch):
+    """An approved viewer, and a record of every get_user the store serves."""
+    store = await get_store()
+    await store.create_user(USER_ID, username="tester", status="approved", role="viewer")
+
+    calls = []
+    get_user = store.get_user
+
+    async def counting_get_user(user_id):
+        calls.append(user_id)
+        return await get_user(user_id)
+
+    monkeypatch.setattr(store, "get_user", counting_get_user)
+    return store, calls
+
+
+class TestSessionCache:
+    @pytest.mark.asyncio
+    async def test_repeat_requests_do_not_query_the_store(self, cache, monkeypatch):
+        _, calls = await _store_with_user(monkeypatch)
+        for _ in range(5):
+            user = await auth.get_current_user(_Conn(_cookie()))
+            assert user["role"] == "viewer"
+
+        assert calls == [USER_ID]
+
+    @pytest.mark.asyncio
+    async def test_http_and_websocket_share_entries(self, cache, monkeypatch):
+        _, calls = await _store_with_user(monkeypatch)
+        await auth.get_current_user(_Conn(_cookie()))
+        await auth.get_current_user_ws(_Conn(_cookie()))
+
+        assert calls == [USER_ID]
+
+    @pytest.mark.asyncio
+    async def test_a_role_change_applies_on_the_next_request(self, cache, monkeypatch):
+        store, _ = await _store_with_user(monkeypatch)
+        assert (await auth.get_current_user(_Conn(_cookie())))["role"] == "viewer"
+
+        await store.update_user_role(USER_ID, "editor", changed_by=ADMIN_ID)
+
+        assert (await auth.get_current_user(_Conn(_cookie())))["role"] == "editor"
+
+    @pytest.mark.asyncio
+    async def test_a_freeze_applies_on_the_next_request(self, cache, monkeypatch):
+        store, _ = await _store_with_user(monkeypatch)
+        assert await auth.get_current_user_ws(_Conn(_cookie())) is not None
+
+        await store.update_user_status(USER_ID, "frozen", reviewed_by=ADMIN_ID)
+
+        assert await auth.get_current_user_ws(_Conn(_cookie())) is None
+
+    @pytest.mark.asyncio
+    async def test_a_denial_applies_on_the_next_request(self, cache, monkeypatch):
+        store, _ = await _store_with_user(monkeypatch)
+        assert await auth.get_current_user(_Conn(_cookie())) is not None
+
+        await store.deny_user(USER_ID, admin_id=ADMIN_ID)
+
+        assert await auth.get_current_user(_Conn(_cookie())) is None
+
+    @pytest.mark.asyncio
+    async def test_a_permission_change_retires_entries(self, cache, monkeypatch):
+        store, calls = await _store_with_user(monkeypatch)
+        await auth.get_current_user(_Conn(_cookie()))
+
+        await store.set_permission("viewer", "dashboard", True, False, False, ADMIN_ID)
+        await auth.get_current_user(_Conn(_cookie()))
+
+        assert calls == [USER_ID, USER_ID]
+
+    @pytest.mark.asyncio
+    async def test_hit_ratio_is_reported(self, cache, monkeypatch):
+        await _store_with_user(monkeypatch)
+        for _ in range(4):
+            await auth.get_current_user(_Conn(_cookie()))
+
+        assert cache.get_stats()["hit_ratio"] == 0.75
+        assert "session_cache" in MetricsResponse.model_fields
@@ -383,3 +383,54 @@ class TestSilverIncrementalPath:
             assert 1 in state
         finally:
             await store.close()
+
+
+class TestScopeTables:
+    """The scope is joined from temp tables, not bound as IN lists."""
+
+    async def _last_mode(self, store) -> str:
+        async with store.connection() as conn:
+            return conn.execute(
+                "SELECT silver_mode FROM warehouse_refreshes "
+                "ORDER BY refreshed_at DESC LIMIT 1"
+            ).fetchone()[0]
+
+    @pytest.mark.asyncio
+    async def test_a_scope_past_the_old_half_stays_incremental(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            async with store.connection() as conn:
+                for i in range(1, 11):
+                    _insert_order(conn, oid=i, buyer_id=100 + i)
+                    _insert_silver(conn, oid=i, buyer_id=100 + i)
+
+            await store.refresh_warehouse_layers(
+                trigger="dirty_flag", changed_order_ids=[1, 2, 3, 4, 5, 6],
+            )
+
+            assert await self._last_mode(store) == "incremental_6"
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_the_scope_tables_are_dropped_afterwards(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            async with store.connection() as conn:
+                for i in range(1, 11):
+                    _insert_order(conn, oid=i, buyer_id=100 + i % 3)
+                    _insert_silver(conn, oid=i, buyer_id=100 + i % 3)
+
+            await store.refresh_warehouse_layers(
+                trigger="dirty_flag", changed_order_ids=[1],
+            )
+
+            async with store.connection() as conn:
+                left = conn.execute(
+                    "SELECT table_name FROM duckdb_tables() "
+                    "WHERE temporary AND table_name LIKE '_refresh_scope_%'"
+                ).fetchall()
+            assert left == []
+            assert (await self._last_mode(store)).startswith("incremental_")
+        finally:
+            await store.close()
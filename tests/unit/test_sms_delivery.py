@@ -220,6 +220,7 @@ async def test_optout_excludes_the_customer_from_future_segments(tmp_path):
             conn.execute("INSERT INTO order_products (id, order_id, product_id,"
                          " name, quantity, price_sold) VALUES (?, ?, 1, 'Cream',"
                          " 9, '1000.00')", [bid, bid])
+    await store.refresh_buyer_stats()
 
     before = await store.get_sms_segments(include_customers=True, holdout_pct=0)
     assert {c["buyerId"] for c in before["customers"]} == {1, 2}
@@ -17,6 +17,12 @@ async def _make_store(tmp_path: Path) -> DuckDBStore:
     return store
 
 
+async def _segments(store: DuckDBStore, **kwargs) -> dict:
+    """Segment after rebuilding silver_buyer_stats from the hand-written Silver rows."""
+    await store.refresh_buyer_stats()
+    return await store.get_sms_segments(**kwargs)
+
+
 def _add_buyer(conn, buyer_id: int, phone: str | None, name: str = "Buyer") -> None:
     conn.execute(
         "INSERT INTO buyers (id, full_name, phone, city) VALUES (?, ?, ?, ?)",
@@ -143,7 +149,7 @@ async def test_tier_assignment_and_eligibility(tmp_path):
     store = await _make_store(tmp_path)
     await _seed(store)
 
-    result = await store.get_sms_segments(include_customers=True, holdout_pct=0)
+    result = await _segments(store, include_customers=True, holdout_pct=0)
     customers = _by_id(result)
 
     assert set(customers) == {1, 2, 3, 4}, "only eligible buyers are returned"
@@ -187,7 +193,7 @@ async def test_deprecated_sources_excluded(tmp_path):
         _add_order(conn, oid=3, buyer_id=2, days_ago=10, total="9000.00",
                    is_active_source=False)
 
-    result = await store.get_sms_segments(include_customers=True, holdout_pct=0)
+    result = await _segments(store, include_customers=True, holdout_pct=0)
     customers = _by_id(result)
 
     assert set(customers) == {1}, "source-2 buyer has no orders on live sources"
@@ -207,7 +213,7 @@ async def test_returns_excluded_from_ltv(tmp_path):
         _add_order(conn, oid=1, buyer_id=1, days_ago=10, total="6000.00")
         _add_order(conn, oid=2, buyer_id=1, days_ago=5, total="5000.00", is_return=True)
 
-    result = await store.get_sms_segments(include_customers=True, holdout_pct=0)
+    result = await _segments(store, include_customers=True, holdout_pct=0)
     customer = _by_id(result)[1]
 
     assert customer["ltv"] == 6000.0
@@ -228,7 +234,7 @@ async def test_duplicate_phones_collapse_to_highest_ltv(tmp_path):
         _add_buyer(conn, 2, "+380961111111")
         _add_order(conn, oid=2, buyer_id=2, days_ago=10, total="8000.00")
 
-    result = await store.get_sms_segments(include_customers=True, holdout_pct=0)
+    result = await _segments(store, include_customers=True, holdout_pct=0)
 
     assert result["totals"]["customers"] == 1, "one SMS per phone number"
     assert result["customers"][0]["buyerId"] == 2, "the higher-LTV record wins"
@@ -245,13 +251,16 @@ async def test_holdout_is_deterministic_per_campaign(tmp_path):
             _add_buyer(conn, i, f"3809{i:08d}")
             _add_order(conn, oid=i, buyer_id=i, days_ago=10, total="6000.00")
 
-    first = await store.get_sms_segments(
+    first = await _segments(
+        store,
         include_customers=True, holdout_pct=20, campaign="aug-promo",
     )
-    again = await store.get_sms_segments(
+    again = await _segments(
+        store,
         include_customers=True, holdout_pct=20, campaign="aug-promo",
     )
-    other = await store.get_sms_segments(
+    other = await _segments(
+        store,
         include_customers=True, holdout_pct=20, campaign="sep-promo",
     )
 
@@ -277,7 +286,7 @@ async def test_holdout_zero_targets_everyone(tmp_path):
             _add_buyer(conn, i, f"3809{i:08d}")
             _add_order(conn, oid=i, buyer_id=i, days_ago=10, total="6000.00")
 
-    result = await store.get_sms_segments(holdout_pct=0)
+    result = await _segments(store, holdout_pct=0)
 
     assert result["totals"]["holdout"] == 0
     assert result["totals"]["target"] == 50
@@ -290,7 +299,7 @@ async def test_tier_filter_and_summary_shape(tmp_path):
     store = await _make_store(tmp_path)
     await _seed(store)
 
-    result = await store.get_sms_segments(tier="CORE", include_customers=True, holdout_pct=0)
+    result = await _segments(store, tier="CORE", include_customers=True, holdout_pct=0)
 
     assert {c["tier"] for c in result["customers"]} == {"CORE"}
     assert [s["tier"] for s in result["segments"]] == ["CORE"]
@@ -314,7 +323,7 @@ async def test_funnel_accounts_for_every_dropped_customer(tmp_path):
     store = await _make_store(tmp_path)
     await _seed(store)
 
-    funnel = _funnel(await store.get_sms_segments())
+    funnel = _funnel(await _segments(store))
 
     # 9 buyers seeded; the b2b one never enters a retail segmentation at all.
     assert funnel["customers"] == 8
@@ -339,7 +348,7 @@ async def test_funnel_survives_an_empty_segmentation(tmp_path):
         _add_buyer(conn, 1, "380961111111")
         _add_order(conn, oid=1, buyer_id=1, days_ago=500, total="1000.00")
 
-    result = await store.get_sms_segments()
+    result = await _segments(store)
 
     assert result["segments"] == []
     assert result["totals"]["customers"] == 0
@@ -357,7 +366,7 @@ async def test_funnel_counts_opt_outs_separately_from_bad_phones(tmp_path):
     await _seed(store)
     await store.add_marketing_optout(buyer_id=1, phone="380961111111")
 
-    funnel = _funnel(await store.get_sms_segments())
+    funnel = _funnel(await _segments(store))
 
     assert funnel["phone"] == 4, "opting out is not a phone problem"
     assert funnel["subscribed"] == 3
@@ -372,7 +381,7 @@ async def test_funnel_describes_the_base_not_the_tier_filter(tmp_path):
     store = await _make_store(tmp_path)
     await _seed(store)
 
-    result = await store.get_sms_segments(tier="CORE")
+    result = await _segments(store, tier="CORE")
 
     assert result["totals"]["customers"] == 2
     assert _funnel(result)["uniquePhone"] == 4
@@ -385,7 +394,7 @@ async def test_customers_omitted_unless_requested(tmp_path):
     store = await _make_store(tmp_path)
     await _seed(store)
 
-    result = await store.get_sms_segments()
+    result = await _segments(store)
 
     assert result["customers"] == [], "PII stays out of the default response"
     assert result["totals"]["customers"] == 4, "summary is still complete"
@@ -399,7 +408,7 @@ async def test_limit_truncates_rows_but_not_summary(tmp_path):
     store = await _make_store(tmp_path)
     await _seed(store)
 
-    result = await store.get_sms_segments(include_customers=True, limit=2, holdout_pct=0)
+    result = await _segments(store, include_customers=True, limit=2, holdout_pct=0)
 
     assert len(result["customers"]) == 2
     assert result["totals"]["customers"] == 4
@@ -420,7 +429,8 @@ async def test_last_order_is_the_most_recent_one(tmp_path):
         _add_order(conn, oid=11, buyer_id=1, days_ago=15, total="4000.00",
                    product_id=PRODUCT_HIGH_MARGIN, quantity=4, line_price="1000.00")
 
-    customer = _by_id(await store.get_sms_segments(
+    customer = _by_id(await _segments(
+        store,
         include_customers=True, holdout_pct=0,
     ))[1]
 
@@ -455,7 +465,8 @@ async def test_last_order_lists_items_and_counts_the_rest(tmp_path):
                 [100 + i, pid, f"Item {pid}", 5 - i],
             )
 
-    customer = _by_id(await store.get_sms_segments(
+    customer = _by_id(await _segments(
+        store,
         include_customers=True, holdout_pct=0,
     ))[1]
 
@@ -483,7 +494,8 @@ async def test_long_product_names_are_truncated(tmp_path):
         _add_order(conn, oid=1, buyer_id=1, days_ago=10, total="1000.00", product_id=301)
         conn.execute("UPDATE order_products SET name = ? WHERE order_id = 1", [long_name])
 
-    items = _by_id(await store.get_sms_segments(
+    items = _by_id(await _segments(
+        store,
         include_customers=True, holdout_pct=0,
     ))[1]["lastOrderItems"]
 
@@ -507,7 +519,8 @@ async def test_last_order_ignores_returns_and_dead_sources(tmp_path):
         _add_order(conn, oid=3, buyer_id=1, days_ago=2, total="800.00",
                    is_active_source=False)
 
-    customer = _by_id(await store.get_sms_segments(
+    customer = _by_id(await _segments(
+        store,
         include_customers=True, holdout_pct=0,
     ))[1]
 
@@ -534,13 +547,15 @@ async def test_margin_basis_reranks_customers(tmp_path):
         _add_order(conn, oid=2, buyer_id=2, days_ago=10, total="8000.00",
                    product_id=PRODUCT_LOW_MARGIN, quantity=8, line_price="1000.00")
 
-    by_revenue = _by_id(await store.get_sms_segments(
+    by_revenue = _by_id(await _segments(
+        store,
         include_customers=True, holdout_pct=0, ltv_basis="revenue",
     ))
     assert by_revenue[1]["ltv"] == by_revenue[2]["ltv"] == 8000.0
     assert by_revenue[1]["tier"] == by_revenue[2]["tier"], "revenue cannot tell them apart"
 
-    by_margin = _by_id(await store.get_sms_segments(
+    by_margin = _by_id(await _segments(
+        store,
         include_customers=True, holdout_pct=0, ltv_basis="margin",
     ))
     assert by_margin[1]["ltv"] == 6400.0   # 8000 - 8*200
@@ -572,7 +587,8 @@ async def test_order_discount_is_charged_to_margin(tmp_path):
         _add_order(conn, oid=1, buyer_id=1, days_ago=10, total="8000.00",
                    product_id=PRODUCT_HIGH_MARGIN, quantity=10, line_price="1000.00")
 
-    customer = _by_id(await store.get_sms_segments(
+    customer = _by_id(await _segments(
+        store,
         include_customers=True, holdout_pct=0, ltv_basis="margin",
     ))[1]
 
@@ -596,7 +612,8 @@ async def test_uncosted_lines_reported_via_coverage(tmp_path):
         _add_order(conn, oid=2, buyer_id=1, days_ago=20, total="1000.00",
                    product_id=PRODUCT_NO_COST)
 
-    customer = _by_id(await store.get_sms_segments(
+    customer = _by_id(await _segments(
+        store,
         include_customers=True, holdout_pct=0, ltv_basis="margin",
     ))[1]
 
@@ -618,7 +635,8 @@ async def test_below_cost_sales_yield_negative_margin(tmp_path):
         _add_order(conn, oid=1, buyer_id=1, days_ago=10, total="400.00",
                    product_id=PRODUCT_LOW_MARGIN, quantity=1, line_price="400.00")
 
-    customer = _by_id(await store.get_sms_segments(
+    customer = _by_id(await _segments(
+        store,
         include_customers=True, holdout_pct=0, ltv_basis="margin",
     ))[1]
 
@@ -633,22 +651,22 @@ async def test_basis_defaults_and_validation(tmp_path):
     store = await _make_store(tmp_path)
     await _seed(store)
 
-    revenue = await store.get_sms_segments(ltv_basis="revenue")
+    revenue = await _segments(store, ltv_basis="revenue")
     assert revenue["criteria"]["vipLtv"] == 10000.0
     assert revenue["criteria"]["coreLtv"] == 5000.0
     assert revenue["ltvBasis"] == "revenue"
 
-    margin = await store.get_sms_segments(ltv_basis="margin")
+    margin = await _segments(store, ltv_basis="margin")
     assert margin["criteria"]["vipLtv"] == 5500.0
     assert margin["criteria"]["coreLtv"] == 2750.0
     assert margin["ltvBasis"] == "margin"
 
     # An explicit threshold still wins over the basis default
-    explicit = await store.get_sms_segments(ltv_basis="margin", vip_ltv=999)
+    explicit = await _segments(store, ltv_basis="margin", vip_ltv=999)
     assert explicit["criteria"]["vipLtv"] == 999
 
     with pytest.raises(ValueError, match="ltv_basis"):
-        await store.get_sms_segments(ltv_basis="profit")
+        await _segments(store, ltv_basis="profit")
 
     await store.close()
 
@@ -662,7 +680,7 @@ async def test_summary_reports_both_bases(tmp_path):
         _add_order(conn, oid=1, buyer_id=1, days_ago=10, total="10000.00",
                    product_id=PRODUCT_HIGH_MARGIN, quantity=10, line_price="1000.00")
 
-    segment = (await store.get_sms_segments(holdout_pct=0))["segments"][0]
+    segment = (await _segments(store, holdout_pct=0))["segments"][0]
 
     assert segment["tier"] == "VIP"
     assert segment["totalRevenue"] == 10000.0
@@ -678,19 +696,22 @@ async def test_thresholds_are_configurable(tmp_path):
     await _seed(store)
 
     # Lower the VIP bar: buyer 3 (LTV 6000) is promoted out of CORE
-    result = await store.get_sms_segments(
+    result = await _segments(
+        store,
         vip_ltv=6000, include_customers=True, holdout_pct=0,
     )
     assert _by_id(result)[3]["tier"] == "VIP"
 
     # Widen the reactivation window: buyer 5 (200 days) becomes eligible
-    result = await store.get_sms_segments(
+    result = await _segments(
+        store,
         reactivation_max_recency=250, include_customers=True, holdout_pct=0,
     )
     assert _by_id(result)[5]["tier"] == "REACTIVATION"
 
     # Narrow the overall window: buyer 4 (60 days) drops out
-    result = await store.get_sms_segments(
+    result = await _segments(
+        store,
         max_recency_days=35, reactivation_max_recency=35,
         include_customers=True, holdout_pct=0,
     )
@@ -705,7 +726,8 @@ async def test_several_tiers_come_back_in_one_roster(tmp_path):
     store = await _make_store(tmp_path)
     await _seed(store)
 
-    result = await store.get_sms_segments(
+    result = await _segments(
+        store,
         tier=["CORE", "REACTIVATION"], include_customers=True, holdout_pct=0,
     )
 
@@ -720,7 +742,7 @@ async def test_a_single_tier_name_still_works_as_a_string(tmp_path):
     store = await _make_store(tmp_path)
     await _seed(store)
 
-    result = await store.get_sms_segments(tier="VIP", holdout_pct=0)
+    result = await _segments(store, tier="VIP", holdout_pct=0)
 
     assert [s["tier"] for s in result["segments"]] == ["VIP"]
 
@@ -741,11 +763,12 @@ async def test_tier_subset_does_not_change_who_wins_a_shared_phone(tmp_path):
         _add_buyer(conn, 2, "380961111111")
         _add_order(conn, oid=20, buyer_id=2, days_ago=30, total="1000.00")
 
-    everyone = await store.get_sms_segments(include_customers=True, holdout_pct=0)
+    everyone = await _segments(store, include_customers=True, holdout_pct=0)
     assert set(_by_id(everyone)) == {1}, "the VIP wins the number"
 
     # Asking only for Reactivation must not resurrect buyer 2 on that number.
-    only_react = await store.get_sms_segments(
+    only_react = await _segments(
+        store,
         tier=["REACTIVATION"], include_customers=True, holdout_pct=0,
     )
     assert only_react["customers"] == []
@@ -0,0 +1,111 @@
+"""The dashboard serves before the startup sync, and says how far it has got.
+
+`startup_event` used to await init_and_sync, so uvicorn accepted nothing until
+a KeyCRM sync, the SKU inventory refresh and a Meilisearch load had finished,
+and every deploy was a 502 window.
+"""
+import sys
+import subprocess
+
+import pytest
+
+from web.schemas import HealthResponse
+from web.startup import StartupProgress
+
+
+class TestStartupProgress:
+    @pytest.mark.asyncio
+    async def test_phases_report_status_and_progress(self):
+        progress = StartupProgress(("store", "sync", "search"))
+        async with progress.phase("store"):
+            pass
+
+        snap = progress.snapshot()
+        assert snap["progress"] == "1/3"
+        assert snap["phase"] == "pending"
+        assert snap["phases"]["store"]["status"] == "done"
+        assert snap["phases"]["store"]["duration_ms"] is not None
+        assert snap["stale"] is True
+
+    @pytest.mark.asyncio
+    async def test_a_failed_phase_is_recorded_and_raised(self):
+        progress = StartupProgress(("sync",))
+
+        with pytest.raises(RuntimeError):
+            async with progress.phase("sync"):
+                raise RuntimeError("KeyCRM unreachable")
+
+        phase = progress.snapshot()["phases"]["sync"]
+        assert phase == {**phase, "status": "failed", "error": "KeyCRM unreachable"}
+        assert progress.complete
+        assert progress.stale
+
+    @pytest.mark.asyncio
+    async def test_data_is_fresh_once_sync_is_done(self):
+        progress = StartupProgress(("sync", "search"))
+        async with progress.phase("sync"):
+            pass
+        progress.skip("search", "unavailable")
+
+        snap = progress.snapshot()
+        assert snap["stale"] is False
+        assert snap["phase"] == "complete"
+        assert snap["progress"] == "2/2"
+
+    def test_ready_is_separate_from_warm(self):
+        progress = StartupProgress(("sync",))
+        progress.mark_ready()
+
+        assert progress.ready
+        assert not progress.complete
+
+
+class TestHealthDeclaresReadiness:
+    def test_fields(self):
+        """Undeclared keys are dropped by the response model on the way out."""
+        for name in ("live", "ready", "startup"):
+            assert name in HealthResponse.model_fields
+
+
+class TestWarmUp:
+    @pytest.mark.asyncio
+    async def test_a_failed_sync_still_starts_the_scheduler(self, monkeypatch):
+        import web.main as web_main
+        progress = StartupProgress()
+        ran = []
+
+        def step(name, result=None, exc=None):
+            async def fn(*args):
+                ran.append(name)
+                if exc:
+                    raise exc
+                return result
+            return fn
+
+        monkeypatch.setattr(web_main, "startup_progress", progress)
+        monkeypatch.setattr(web_main, "initial_sync", step("sync", exc=RuntimeError("KeyCRM down")))
+        monkeypatch.setattr(web_main, "ensure_sku_inventory", step("sku_inventory"))
+        monkeypatch.setattr(web_main, "init_search", step("search", result=False))
+        monkeypatch.setattr(web_main, "start_scheduler", step("scheduler"))
+        monkeypatch.setattr(web_main, "_start_prediction_training", step("prediction"))
+
+        await web_main._warm_up()
+
+        assert ran == ["sync", "sku_inventory", "search", "scheduler", "prediction"]
+        phases = progress.snapshot()["phases"]
+        assert phases["sync"]["status"] == "failed"
+        assert phases["search"]["status"] == "skipped"
+        assert phases["scheduler"]["status"] == "done"
+        assert progress.stale
+
+
+class TestColdImport:
+    def test_the_web_app_does_not_import_heavy_libraries(self):
+        heavy = ["pandas", "anthropic", "meilisearch", "openpyxl", "PIL", "lightgbm"]
+        code = (
+            "import os, sys; os.environ.setdefault('DASHBOARD_SECRET_KEY', 'x'); "
+            "import web.main; "
+            f"print([m for m in {heavy!r} if m in sys.modules])"
+        )
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert out.stdout.strip().splitlines()[-1] == "[]"
@@ -12,7 +12,9 @@ from datetime import datetime, timedelta, timezone
 
 import pytest
 
-from core.upsert_decider import should_update_order
+import duckdb
+
+from core.upsert_decider import order_payload_hash, should_update_order, should_update_order_sql
 
 
 UTC = timezone.utc
@@ -128,3 +130,90 @@ class TestProductionScenarios:
         existing = None
         incoming = _ts(hour=10)
         assert should_update_order(existing, incoming) is True
+
+
+class TestSqlParity:
+    """upsert_orders decides a batch in SQL; it must agree with the function."""
+
+    _VALUES = [None, _ts(hour=9), _ts(hour=10), _ts(hour=11)]
+
+    @pytest.mark.parametrize("force", [False, True])
+    def test_sql_agrees_with_python_on_every_pair(self, force):
+        conn = duckdb.connect()
+        conn.execute("CREATE TABLE pairs (e TIMESTAMPTZ, i TIMESTAMPTZ)")
+        pairs = [(e, i) for e in self._VALUES for i in self._VALUES]
+        conn.executemany("INSERT INTO pairs VALUES (?, ?)", pairs)
+        rows = conn.execute(
+            f"SELECT e, i, {should_update_order_sql('e', 'i', force=force)} FROM pairs"
+        ).fetchall()
+
+        assert len(rows) == len(pairs)
+        for e, i, decided in rows:
+            assert decided is should_update_order(e, i, force=force), (e, i)
+
+
+class TestForceWithPayloadHash:
+    """force plus a fingerprint writes only what moved — the status refresh."""
+
+    def test_same_hash_skips_even_when_forced(self):
+        assert should_update_order(_ts(), _ts(), force=True, existing_hash=7, incoming_hash=7) is False
+
+    def test_different_hash_updates(self):
+        assert should_update_order(_ts(), _ts(), force=True, existing_hash=7, incoming_hash=8) is True
+
+    def test_no_stored_hash_updates(self):
+        """Rows written before the column existed, or by a path that does not hash."""
+        assert should_update_order(_ts(), _ts(), force=True, existing_hash=None, incoming_hash=7) is True
+
+    def test_without_an_incoming_hash_force_is_unconditional(self):
+        """Repair and reconciliation overwrite whatever we hold."""
+        assert should_update_order(_ts(), _ts(), force=True, existing_hash=7) is True
+
+    def test_hashes_do_not_change_the_timestamp_path(self):
+        assert should_update_order(_ts(), _ts(), existing_hash=7, incoming_hash=8) is False
+
+    @pytest.mark.parametrize("force", [False, True])
+    def test_sql_agrees_with_python(self, force):
+        hashes = [None, 7, 8]
+        conn = duckdb.connect()
+        conn.execute("CREATE TABLE pairs (e TIMESTAMPTZ, i TIMESTAMPTZ, eh BIGINT, ih BIGINT)")
+        rows = [(_ts(), _ts(), eh, ih) for eh in hashes for ih in hashes]
+        conn.executemany("INSERT INTO pairs VALUES (?, ?, ?, ?)", rows)
+        sql = should_update_order_sql("e", "i", force=force, existing_hash="eh", incoming_hash="ih")
+
+        for e, i, eh, ih, decided in conn.execute(f"SELECT *, {sql} FROM pairs").fetchall():
+            assert decided is should_update_order(
+                e, i, force=force, existing_hash=eh, incoming_hash=ih,
+            ), (eh, ih)
+
+
+class TestOrderPayloadHash:
+    _ORDER = {
+        "source_id": 1, "status_id": 12, "status_group_id": None, "grand_total": 100.0,
+        "ordered_at": _ts(), "created_at": _ts(hour=9), "updated_at": _ts(),
+        "buyer_id": 5, "manager_id": None, "manager_comment": None, "promocode": None,
+    }
+    _LINES = [{"product_id": 1, "name": "tea", "quantity": 1, "price_sold": 50.0}]
+
+    def test_is_stable_and_fits_a_bigint(self):
+        h = order_payload_hash(self._ORDER, self._LINES)
+        assert h == order_payload_hash(dict(self._ORDER), [dict(self._LINES[0])])
+        assert -(2 ** 63) <= h < 2 ** 63
+
+    def test_a_status_change_moves_it(self):
+        moved = {**self._ORDER, "status_id": 19}
+        assert order_payload_hash(moved, self._LINES) != order_payload_hash(self._ORDER, self._LINES)
+
+    def test_a_line_item_change_moves_it(self):
+        lines = [{**self._LINES[0], "quantity": 2}]
+        assert order_payload_hash(self._ORDER, lines) != order_payload_hash(self._ORDER, self._LINES)
+
+    def test_what_is_not_stored_does_not_move_it(self):
+        """Same instant in another zone, same DECIMAL(12, 2), extra payload keys."""
+        same = {
+            **self._ORDER,
+            "updated_at": _ts().astimezone(timezone(timedelta(hours=3))),
+            "grand_total": 100.001,
+            "id": 1,
+        }
+        assert order_payload_hash(same, self._LINES) == order_payload_hash(self._ORDER, self._LINES)
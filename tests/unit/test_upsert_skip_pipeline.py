@@ -445,3 +445,224 @@ class TestOnlyChangesDriveARebuild:
                 )
         finally:
             await store.close()
+
+
+class TestSetBasedWrite:
+    """The batch is decided and written in SQL; the row-level contract holds."""
+
+    @pytest.mark.asyncio
+    async def test_a_null_comment_keeps_the_stored_attribution(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            first = _order_payload(1)
+            first["manager_comment"] = "utm_source=instagram"
+            await store.upsert_orders([first])
+
+            await store.upsert_orders([
+                _order_payload(1, updated_at="2026-04-01T11:00:00+00:00", grand_total="150.00"),
+            ])
+
+            async with store.connection() as conn:
+                row = conn.execute(
+                    "SELECT manager_comment, grand_total FROM orders WHERE id = 1"
+                ).fetchone()
+            assert row[0] == "utm_source=instagram"
+            assert float(row[1]) == 150.0
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_an_order_sent_twice_in_one_payload_keeps_the_last_copy(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            result = await store.upsert_orders([
+                _order_payload(1, qty=1),
+                _order_payload(1, qty=3, grand_total="300.00"),
+            ])
+            assert result.count == 1
+            async with store.connection() as conn:
+                total = conn.execute("SELECT grand_total FROM orders WHERE id = 1").fetchone()[0]
+                qty = conn.execute(
+                    "SELECT quantity FROM order_products WHERE order_id = 1"
+                ).fetchall()
+            assert float(total) == 300.0
+            assert qty == [(3,)]
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_a_failed_batch_falls_back_to_row_by_row(self, tmp_path, monkeypatch):
+        import core.duckdb_store as duckdb_store
+
+        store = await _make_store(tmp_path)
+        try:
+            await store.upsert_orders([_order_payload(1)])
+            # Any constraint failure in the set-based statement sends the batch
+            # down the per-row path, which must land the same result.
+            monkeypatch.setattr(
+                duckdb_store, "_BULK_ORDER_INSERT_SQL",
+                "INSERT INTO orders (id, ordered_at) VALUES (NULL, now())",
+            )
+            result = await store.upsert_orders([
+                _order_payload(1, updated_at="2026-04-01T11:00:00+00:00", qty=2),
+                _order_payload(2),
+            ])
+
+            assert sorted(result.changed_ids) == [1, 2]
+            assert result.failed == 0
+            assert await _count(store, "orders") == 2
+            assert await _count(store, "order_products") == 2
+        finally:
+            await store.close()
+
+
+class TestStatusRefreshWritesOnlyWhatMoved:
+    """force_update with skip_unchanged_payload, as refresh_order_statuses calls it."""
+
+    @staticmethod
+    async def _refresh(store, orders):
+        return await store.upsert_orders(orders, force_update=True, skip_unchanged_payload=True)
+
+    @pytest.mark.asyncio
+    async def test_an_identical_window_writes_nothing(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            orders = [_order_payload(1), _order_payload(2)]
+            assert sorted((await self._refresh(store, orders)).changed_ids) == [1, 2]
+            before = await _max_synced_at(store, 1)
+
+            result = await self._refresh(store, orders)
+
+            assert result.count == 2
+            assert result.changed_ids == []
+            assert result.skipped_unchanged == 2
+            assert await _max_synced_at(store, 1) == before
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_a_status_change_without_a_new_updated_at_is_written(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            await self._refresh(store, [_order_payload(1), _order_payload(2)])
+
+            result = await self._refresh(store, [_order_payload(1, status_id=19), _order_payload(2)])
+
+            assert result.changed_ids == [1]
+            async with store.connection() as conn:
+                assert conn.execute("SELECT status_id FROM orders WHERE id = 1").fetchone() == (19,)
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_a_line_item_change_is_written(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            await self._refresh(store, [_order_payload(1)])
+
+            result = await self._refresh(store, [_order_payload(1, qty=4)])
+
+            assert result.changed_ids == [1]
+            async with store.connection() as conn:
+                assert conn.execute(
+                    "SELECT quantity FROM order_products WHERE order_id = 1"
+                ).fetchall() == [(4,)]
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_a_row_without_a_hash_is_written_once(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            await store.upsert_orders([_order_payload(1)])
+            async with store.connection() as conn:
+                conn.execute("UPDATE orders SET payload_hash = NULL")
+
+            assert (await self._refresh(store, [_order_payload(1)])).changed_ids == [1]
+            assert (await self._refresh(store, [_order_payload(1)])).changed_ids == []
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_a_plain_force_still_rewrites_everything(self, tmp_path):
+        """Repair and reconciliation overwrite regardless of the hash."""
+        store = await _make_store(tmp_path)
+        try:
+            await self._refresh(store, [_order_payload(1)])
+            result = await store.upsert_orders([_order_payload(1)], force_update=True)
+            assert result.changed_ids == [1]
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_the_row_by_row_fallback_honours_the_hash(self, tmp_path, monkeypatch):
+        import core.duckdb_store as duckdb_store
+
+        store = await _make_store(tmp_path)
+        try:
+            await self._refresh(store, [_order_payload(1)])
+            monkeypatch.setattr(
+                duckdb_store, "_BULK_ORDER_INSERT_SQL",
+                "INSERT INTO orders (id, ordered_at) VALUES (NULL, now())",
+            )
+            result = await self._refresh(store, [_order_payload(1), _order_payload(2)])
+
+            assert result.changed_ids == [2]
+            assert result.skipped_unchanged == 1
+            assert (await self._refresh(store, [_order_payload(2)])).changed_ids == []
+        finally:
+            await store.close()
+
+
+class TestStatusRefreshStats:
+    """refresh_order_statuses' `unchanged` counts hash matches, nothing else."""
+
+    @staticmethod
+    def _client(orders):
+        from unittest.mock import MagicMock
+
+        client = MagicMock()
+
+        async def paginate(*args, **kwargs):
+            yield orders
+
+        client.paginate = paginate
+        return client
+
+    async def _refresh(self, store, orders, monkeypatch):
+        from unittest.mock import AsyncMock
+
+        from core import sync_service
+        monkeypatch.setattr(sync_service, "get_async_client", AsyncMock(return_value=self._client(orders)))
+        return await sync_service.SyncService(store).refresh_order_statuses()
+
+    @pytest.mark.asyncio
+    async def test_only_orders_whose_hash_matched_are_unchanged(self, tmp_path, monkeypatch):
+        store = await _make_store(tmp_path)
+        try:
+            await self._refresh(store, [_order_payload(1), _order_payload(2)], monkeypatch)
+
+            stats = await self._refresh(
+                store, [_order_payload(1), _order_payload(2, status_id=19)], monkeypatch,
+            )
+
+            assert (stats["orders"], stats["written"], stats["unchanged"]) == (2, 1, 1)
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_staged_orders_are_not_counted_unchanged(self, tmp_path, monkeypatch):
+        import sys
+        from types import SimpleNamespace
+
+        from core.config import SyncConfig
+        monkeypatch.setattr(
+            sys.modules["core.config"], "config", SimpleNamespace(sync=SyncConfig(mode="staging")),
+        )
+        store = await _make_store(tmp_path)
+        try:
+            stats = await self._refresh(store, [_order_payload(1), _order_payload(2)], monkeypatch)
+
+            assert (stats["written"], stats["unchanged"], stats["staged"]) == (0, 0, 2)
+        finally:
+            await store.close()
@@ -0,0 +1,191 @@
+"""Validation reads history from a ledger and re-derives only what moved.
+
+Step 4 used to recompute every Silver and Bronze total on every refresh. The
+ledger holds those per (date, sales_type); a scoped tick rewrites the dates it
+rebuilt, and a full sweep on a slower cadence rebuilds all of it. The Gold side
+is still read whole, so a damaged Gold cell anywhere fails the very next tick.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import core.duckdb_store as duckdb_store
+from core.duckdb_store import VALIDATION_LEDGER_INSERT_SQL, DuckDBStore
+
+
+async def _make_store(tmp_path):
+    store = DuckDBStore(db_path=tmp_path / "test.duckdb")
+    await store.connect()
+    return store
+
+
+def _insert_order(conn, oid, buyer_id, when, total="1000.00"):
+    conn.execute(
+        """
+        INSERT INTO orders (
+            id, source_id, status_id, grand_total, ordered_at, created_at,
+            updated_at, buyer_id, manager_id, manager_comment, promocode
+        ) VALUES (?, 4, 12, ?, ?, ?, ?, ?, NULL, NULL, NULL)
+        """,
+        [oid, total, when, when, when, buyer_id],
+    )
+    conn.execute(
+        "INSERT INTO order_products (id, order_id, product_id, name, quantity, price_sold) "
+        "VALUES (?, ?, 1, 'p', 2, 150)",
+        [oid * 1000, oid],
+    )
+
+
+async def _seed(store, n=30):
+    """n orders over five days, midday UTC so the Kyiv date is the UTC date.
+
+    Thirty, so that one order more or less stays above the 95% Silver/orders
+    ratio below which the refresh goes full and the scoped path never runs.
+    """
+    when = datetime.now(timezone.utc).replace(
+        hour=12, minute=0, second=0, microsecond=0
+    ) - timedelta(days=1)
+    async with store.connection() as conn:
+        for oid in range(1, n + 1):
+            _insert_order(conn, oid, 100 + oid, when - timedelta(days=oid % 5))
+    res = await store.refresh_warehouse_layers(trigger="manual")
+    assert res["validation_mode"] == "full"
+    return when
+
+
+def _ledger(conn):
+    return sorted(conn.execute(
+        "SELECT date, sales_type, silver_rows, silver_revenue, bronze_product_revenue "
+        "FROM warehouse_checksums"
+    ).fetchall(), key=repr)
+
+
+def _ledger_from_scratch(conn):
+    conn.execute("CREATE TEMP TABLE ledger_check AS SELECT * FROM warehouse_checksums LIMIT 0")
+    try:
+        conn.execute(
+            VALIDATION_LEDGER_INSERT_SQL.format(date_filter="TRUE")
+            .replace("INTO warehouse_checksums", "INTO ledger_check")
+        )
+        return sorted(conn.execute(
+            "SELECT date, sales_type, silver_rows, silver_revenue, bronze_product_revenue "
+            "FROM ledger_check"
+        ).fetchall(), key=repr)
+    finally:
+        conn.execute("DROP TABLE ledger_check")
+
+
+class TestTheLedger:
+    @pytest.mark.asyncio
+    async def test_the_first_refresh_sweeps_and_fills_it(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            await _seed(store)
+            async with store.connection() as conn:
+                ledger = _ledger(conn)
+                assert ledger == _ledger_from_scratch(conn)
+                assert sum(r[2] for r in ledger) == 30
+                assert float(sum(r[4] for r in ledger)) == 30 * 300
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_a_scoped_tick_keeps_it_equal_to_a_rebuild(self, tmp_path):
+        """Including the date an order moved away from, which must lose it."""
+        store = await _make_store(tmp_path)
+        try:
+            when = await _seed(store)
+            async with store.connection() as conn:
+                conn.execute(
+                    "UPDATE orders SET grand_total = 2500, ordered_at = ? WHERE id = 3",
+                    [when - timedelta(days=20)],
+                )
+                _insert_order(conn, 31, 999, when)
+
+            res = await store.refresh_warehouse_layers(
+                trigger="dirty_flag", changed_order_ids=[3, 31],
+            )
+            assert res["validation_mode"] == "dates"
+            assert res["validation_passed"] is True
+            assert res["bronze_orders"] == res["silver_rows"] == 31
+            async with store.connection() as conn:
+                assert _ledger(conn) == _ledger_from_scratch(conn)
+        finally:
+            await store.close()
+
+
+class TestScopedValidation:
+    @pytest.mark.asyncio
+    async def test_gold_damage_on_an_untouched_date_still_fails(self, tmp_path):
+        """The Gold side is read whole: the ledger is what Gold should hold."""
+        store = await _make_store(tmp_path)
+        try:
+            when = await _seed(store)
+            async with store.connection() as conn:
+                conn.execute(
+                    "UPDATE gold_daily_revenue SET revenue = revenue + 1 WHERE date = ?",
+                    [(when - timedelta(days=3)).date()],
+                )
+
+            res = await store.refresh_warehouse_layers(
+                trigger="dirty_flag", changed_order_ids=[5],
+            )
+            assert res["validation_mode"] == "dates"
+            assert res["checksum_match"] is False
+            assert res["validation_passed"] is False
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_silver_drift_outside_the_scope_waits_for_the_sweep(self, tmp_path):
+        """The trade, stated: a scoped tick trusts history; the sweep checks it."""
+        store = await _make_store(tmp_path)
+        try:
+            await _seed(store)
+            async with store.connection() as conn:
+                conn.execute("DELETE FROM silver_orders WHERE id = 2")
+
+            res = await store.refresh_warehouse_layers(
+                trigger="dirty_flag", changed_order_ids=[5],
+            )
+            assert res["validation_mode"] == "dates"
+            assert res["validation_passed"] is True
+
+            store.request_full_validation()
+            res = await store.refresh_warehouse_layers(
+                trigger="dirty_flag", changed_order_ids=[5],
+            )
+            assert res["validation_mode"] == "full"
+            assert res["validation_passed"] is False
+            assert res["bronze_orders"] == 30 and res["silver_rows"] == 29
+        finally:
+            await store.close()
+
+
+class TestTheCadence:
+    @pytest.mark.asyncio
+    async def test_the_sweep_comes_round_on_the_clock(self, tmp_path, monkeypatch):
+        store = await _make_store(tmp_path)
+        try:
+            await _seed(store)
+            monkeypatch.setattr(duckdb_store, "WAREHOUSE_FULL_VALIDATION_SECONDS", 0)
+            res = await store.refresh_warehouse_layers(
+                trigger="dirty_flag", changed_order_ids=[1],
+            )
+            assert res["validation_mode"] == "full"
+        finally:
+            await store.close()
+
+    @pytest.mark.asyncio
+    async def test_the_audit_row_says_which_it_was(self, tmp_path):
+        store = await _make_store(tmp_path)
+        try:
+            await _seed(store)
+            await store.refresh_warehouse_layers(
+                trigger="dirty_flag", changed_order_ids=[1],
+            )
+            status = await store.get_warehouse_status()
+            assert status["validation_mode"] == "dates"
+            assert status["stage_ms"]["validation"] is not None
+        finally:
+            await store.close()
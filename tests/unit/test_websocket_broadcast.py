@@ -0,0 +1,138 @@
+"""Broadcasts are encoded once and delivered per connection, at its own pace.
+
+`broadcast` used to build each connection's message separately and gather
+every send, so the slowest client set the pace for the room, and a client
+that had stopped reading held the sync event handler open indefinitely.
+"""
+import asyncio
+import json
+
+import pytest
+
+from core import websocket_manager as wsm
+from core.websocket_manager import ConnectionManager
+
+
+class _Client:
+    """A WebSocket that records what it is sent; `stall` blocks every send."""
+
+    def __init__(self, stall: bool = False):
+        self.sent = []
+        self.closed_with = None
+        self._stall = asyncio.Event() if stall else None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message: str):
+        if self._stall is not None and self.sent:
+            await self._stall.wait()
+        self.sent.append(message)
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        self.closed_with = code
+
+    def events(self):
+        return [json.loads(m)["event"] for m in self.sent]
+
+
+async def _connect(manager, clients, room="dashboard"):
+    return [await manager.connect(c, room=room) for c in clients]
+
+
+class TestBroadcast:
+    @pytest.mark.asyncio
+    async def test_a_thousand_clients_are_not_held_up_by_slow_ones(self):
+        manager = ConnectionManager(send_queue_limit=8)
+        fast = [_Client() for _ in range(1000)]
+        slow = [_Client(stall=True) for _ in range(5)]
+        await _connect(manager, fast + slow)
+
+        for i in range(3):
+            assert await asyncio.wait_for(
+                manager.broadcast("dashboard", "milestone_reached", {"i": i}), timeout=1
+            ) == 1005
+        await asyncio.sleep(0)
+
+        assert all(c.events() == ["connected"] + ["milestone_reached"] * 3 for c in fast)
+        assert all(c.events() == ["connected"] for c in slow)
+        assert manager.connection_count("dashboard") == 1005
+
+    @pytest.mark.asyncio
+    async def test_the_message_is_encoded_once(self, monkeypatch):
+        manager = ConnectionManager()
+        clients = [_Client() for _ in range(50)]
+        await _connect(manager, clients)
+        encode = ConnectionManager._encode
+        calls = []
+        monkeypatch.setattr(ConnectionManager, "_encode", staticmethod(
+            lambda *a: calls.append(a) or encode(*a)
+        ))
+
+        await manager.broadcast("dashboard", "orders_synced", {"count": 3})
+        await manager.flush()
+
+        assert len(calls) == 1
+        assert len({id(c.sent[-1]) for c in clients}) == 1
+
+    @pytest.mark.asyncio
+    async def test_a_client_too_far_behind_is_evicted(self):
+        manager = ConnectionManager(send_queue_limit=4)
+        fast, slow = _Client(), _Client(stall=True)
+        await _connect(manager, [fast, slow])
+
+        for i in range(6):
+            await manager.broadcast("dashboard", "milestone_reached", {"i": i})
+            await asyncio.sleep(0)
+        # The close handshake runs in the background.
+        await asyncio.sleep(0.01)
+
+        assert manager.connection_count("dashboard") == 1
+        assert slow.closed_with == 1013
+        assert fast.events().count("milestone_reached") == 6
+        assert manager.get_stats()["evicted_slow_connections"] == 1
+
+    @pytest.mark.asyncio
+    async def test_queued_sync_notices_are_coalesced(self):
+        manager = ConnectionManager(send_queue_limit=4)
+        slow = _Client(stall=True)
+        await _connect(manager, [slow])
+        # The writer takes this one and stalls sending it.
+        await manager.broadcast("dashboard", "milestone_reached", {})
+        await asyncio.sleep(0)
+
+        for i in range(20):
+            await manager.broadcast("dashboard", "orders_synced", {"count": i})
+        await manager.broadcast("dashboard", "milestone_reached", {"amount": 1})
+
+        conn = next(iter(manager._rooms["dashboard"].values()))
+        assert [event for event, _ in conn.outbox] == ["orders_synced", "milestone_reached"]
+        assert json.loads(conn.outbox[0][1])["data"] == {"count": 19}
+        assert manager.connection_count("dashboard") == 1
+        assert manager.get_stats()["coalesced_messages"] == 19
+
+    @pytest.mark.asyncio
+    async def test_disconnect_stops_the_writer(self):
+        manager = ConnectionManager()
+        conn, = await _connect(manager, [_Client()])
+
+        await manager.disconnect(conn)
+        await asyncio.sleep(0)
+
+        assert conn.writer.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_pong_waits_its_turn(self):
+        manager = ConnectionManager()
+        client = _Client()
+        conn, = await _connect(manager, [client])
+
+        await manager.broadcast("dashboard", "goal_progress", {})
+        await manager.handle_message(conn, "ping")
+        await manager.flush()
+
+        assert client.events() == ["connected", "goal_progress", "pong"]
+
+
+def test_default_queue_limit():
+    assert ConnectionManager()._send_queue_limit == wsm.SEND_QUEUE_LIMIT
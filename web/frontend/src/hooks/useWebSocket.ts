@@ -1,5 +1,7 @@
 import { useEffect, useRef, useCallback, useState } from 'react'
 import { useQueryClient } from '@tanstack/react-query'
+import { applyGoldDelta, GOLD_QUERY_ROOTS, type GoldDelta } from '../lib/goldDelta'
+import { useFilterStore } from '../store/filterStore'
 
 // WebSocket event types from backend
 export type WebSocketEvent =
@@ -10,7 +12,9 @@ export type WebSocketEvent =
   | 'goal_progress'
   | 'milestone_reached'
   | 'sync_status'
+  | 'gold_delta'
   | 'connected'
+  | 'subscribed'
   | 'pong'
 
 export interface WebSocketMessage {
@@ -46,6 +50,12 @@ export function useWebSocket(options: UseWebSocketOptions = {}) {
   const reconnectAttempts = useRef(0)
   const reconnectTimeout = useRef<ReturnType<typeof setTimeout> | undefined>(undefined)
   const pingInterval = useRef<ReturnType<typeof setInterval> | undefined>(undefined)
+  // Sales type the server sends gold_delta for; null until it confirms
+  const subscribedSalesType = useRef<string | null>(null)
+  const hasConnected = useRef(false)
+  const salesType = useFilterStore((state) => state.salesType)
+  // Read through a ref so a filter change re-subscribes instead of reconnecting
+  const salesTypeRef = useRef(salesType)
 
   const [connectionState, setConnectionState] = useState<ConnectionState>('disconnected')
   const [lastMessageTime, setLastMessageTime] = useState<Date | null>(null)
@@ -70,6 +80,19 @@ export function useWebSocket(options: UseWebSocketOptions = {}) {
     }
   }, [])
 
+  const invalidateGoldQueries = useCallback(() => {
+    for (const root of GOLD_QUERY_ROOTS) {
+      queryClient.invalidateQueries({ queryKey: [root] })
+    }
+  }, [queryClient])
+
+  // Ask for gold_delta messages matching the dashboard's sales-type filter
+  const subscribe = useCallback(() => {
+    if (room !== 'dashboard' || ws.current?.readyState !== WebSocket.OPEN) return
+    subscribedSalesType.current = null
+    ws.current.send(JSON.stringify({ action: 'subscribe', sales_type: salesTypeRef.current }))
+  }, [room])
+
   // Handle incoming messages
   const handleMessage = useCallback((event: MessageEvent) => {
     try {
@@ -84,10 +107,19 @@ export function useWebSocket(options: UseWebSocketOptions = {}) {
       // Handle specific events
       switch (message.event) {
         case 'orders_synced':
-          // Invalidate summary and revenue queries to trigger refetch
-          queryClient.invalidateQueries({ queryKey: ['summary'] })
-          queryClient.invalidateQueries({ queryKey: ['revenueTrend'] })
-          queryClient.invalidateQueries({ queryKey: ['salesBySource'] })
+          // Subscribed clients get the revenue changes as a gold_delta once
+          // the warehouse refresh finishes; the rest refetch now.
+          if (!subscribedSalesType.current) {
+            invalidateGoldQueries()
+          }
+          break
+
+        case 'gold_delta':
+          applyGoldDelta(queryClient, message.data as unknown as GoldDelta)
+          break
+
+        case 'subscribed':
+          subscribedSalesType.current = (message.data.sales_type as string) ?? null
           break
 
         case 'products_synced':
@@ -122,7 +154,11 @@ export function useWebSocket(options: UseWebSocketOptions = {}) {
           break
 
         case 'connected':
-          // Server confirmed connection
+          // Deltas sent while we were away are lost; catch up once
+          if (hasConnected.current) {
+            invalidateGoldQueries()
+          }
+          hasConnected.current = true
           break
 
         case 'pong':
@@ -132,7 +168,7 @@ export function useWebSocket(options: UseWebSocketOptions = {}) {
     } catch (e) {
       console.warn('Failed to parse WebSocket message:', e)
     }
-  }, [queryClient, onMessage, onMilestone])
+  }, [queryClient, onMessage, onMilestone, invalidateGoldQueries])
 
   // Connect to WebSocket
   const connect = useCallback(() => {
@@ -158,6 +194,7 @@ export function useWebSocket(options: UseWebSocketOptions = {}) {
         console.log(`WebSocket connected to ${room}`)
         setConnectionState('connected')
         reconnectAttempts.current = 0
+        subscribe()
 
         // Start ping interval for keep-alive
         pingInterval.current = setInterval(() => {
@@ -176,6 +213,7 @@ export function useWebSocket(options: UseWebSocketOptions = {}) {
       ws.current.onclose = (event) => {
         console.log(`WebSocket closed: ${event.code} ${event.reason}`)
         setConnectionState('disconnected')
+        subscribedSalesType.current = null
 
         // Clear ping interval
         if (pingInterval.current) {
@@ -198,7 +236,7 @@ export function useWebSocket(options: UseWebSocketOptions = {}) {
       console.error('Failed to create WebSocket:', e)
       setConnectionState('disconnected')
     }
-  }, [enabled, room, handleMessage])
+  }, [enabled, room, handleMessage, subscribe])
 
   // Disconnect from WebSocket
   const disconnect = useCallback(() => {
@@ -226,6 +264,12 @@ export function useWebSocket(options: UseWebSocketOptions = {}) {
     }
   }, [enabled, connect, cleanup])
 
+  // Re-subscribe when the filter changes on an open connection
+  useEffect(() => {
+    salesTypeRef.current = salesType
+    subscribe()
+  }, [salesType, subscribe])
+
   return {
     connectionState,
     isConnected: connectionState === 'connected',
@@ -0,0 +1,133 @@
+import { describe, it, expect } from 'vitest'
+import { QueryClient } from '@tanstack/react-query'
+import { applyGoldDelta, patchRevenueTrend, patchSalesBySource, patchSummary, type GoldDeltaCell } from '../goldDelta'
+import type { RevenueTrendResponse, SalesBySourceResponse, SummaryResponse } from '../../types/api'
+
+// The server side is tests/unit/test_gold_delta.py. A patched widget has to
+// show what a refetch would have returned.
+
+function cell(date: string, revenue: number, orders: number, extra: Partial<GoldDeltaCell> = {}): GoldDeltaCell {
+  return {
+    date, revenue, orders_count: orders, returns_count: 0, returns_revenue: 0,
+    instagram_revenue: 0, instagram_orders: 0, telegram_revenue: 0, telegram_orders: 0,
+    shopify_revenue: 0, shopify_orders: 0, ...extra,
+  }
+}
+
+const SUMMARY: SummaryResponse = {
+  totalOrders: 10, totalRevenue: 10000, avgCheck: 1000, totalReturns: 1, returnRate: 0,
+  returnsRevenue: 500, startDate: '2026-08-01', endDate: '2026-08-03',
+}
+const RANGE = { start: '2026-08-01', end: '2026-08-03' }
+
+describe('patchSummary', () => {
+  it('adds cells inside the range and recomputes the average check', () => {
+    const next = patchSummary(SUMMARY, [cell('2026-08-02', 2000, 1), cell('2026-07-31', 999, 1)])
+    expect(next).toMatchObject({ totalOrders: 11, totalRevenue: 12000, avgCheck: 1090.91 })
+  })
+
+  it('leaves the summary alone when nothing falls in its range', () => {
+    expect(patchSummary(SUMMARY, [cell('2026-09-01', 100, 1)])).toBe(SUMMARY)
+  })
+})
+
+describe('patchRevenueTrend', () => {
+  const trend: RevenueTrendResponse = {
+    labels: ['01.08', '02.08', '03.08'],
+    revenue: [1000, 2000, 3000],
+    orders: [1, 2, 3],
+  }
+
+  it('moves the day the cell belongs to', () => {
+    const next = patchRevenueTrend(trend, [cell('2026-08-03', -3000, -3)], RANGE)
+    expect(next?.revenue).toEqual([1000, 2000, 0])
+    expect(next?.orders).toEqual([1, 2, 0])
+  })
+
+  it('gives up when the labels do not line up with the range', () => {
+    const weekly = { ...trend, labels: ['27.07', '03.08', '10.08'] }
+    expect(patchRevenueTrend(weekly, [cell('2026-08-02', 10, 1)], RANGE)).toBeNull()
+  })
+})
+
+describe('patchSalesBySource', () => {
+  const sources: SalesBySourceResponse = {
+    labels: ['Instagram', 'Shopify'], revenue: [100, 200], orders: [1, 2], backgroundColor: ['#a', '#b'],
+  }
+
+  it('adds to the source that moved', () => {
+    const next = patchSalesBySource(sources, [cell('2026-08-01', 50, 1, { shopify_revenue: 50, shopify_orders: 1 })], RANGE)
+    expect(next?.revenue).toEqual([100, 250])
+  })
+
+  it('gives up when the source has no slot yet', () => {
+    expect(patchSalesBySource(sources, [cell('2026-08-01', 50, 1, { telegram_revenue: 50 })], RANGE)).toBeNull()
+  })
+})
+
+describe('applyGoldDelta', () => {
+  const retail = 'period=month&sales_type=retail'
+  const b2b = 'period=month&sales_type=b2b'
+  const delta = { sales_type: 'retail', generation: 2, full: false, cells: [cell('2026-08-02', 1000, 1)] }
+
+  it('patches its own filter and marks other filters stale', () => {
+    const client = new QueryClient()
+    client.setQueryData(['summary', retail], { ...SUMMARY, gold_generation: 1 })
+    client.setQueryData(['summary', b2b], { ...SUMMARY, gold_generation: 1 })
+
+    applyGoldDelta(client, delta)
+
+    expect(client.getQueryData<SummaryResponse>(['summary', retail])?.totalRevenue).toBe(11000)
+    expect(client.getQueryState(['summary', retail])?.isInvalidated).toBe(false)
+    expect(client.getQueryState(['summary', b2b])?.isInvalidated).toBe(true)
+  })
+
+  it('adds a change once, however often it arrives', () => {
+    const client = new QueryClient()
+    client.setQueryData(['summary', retail], { ...SUMMARY, gold_generation: 1 })
+
+    applyGoldDelta(client, delta)
+    applyGoldDelta(client, delta)
+
+    expect(client.getQueryData<SummaryResponse>(['summary', retail])).toMatchObject({
+      totalRevenue: 11000, gold_generation: 2,
+    })
+  })
+
+  it('leaves data read after the refresh alone', () => {
+    const client = new QueryClient()
+    client.setQueryData(['summary', retail], { ...SUMMARY, gold_generation: 2 })
+    client.setQueryData(['summary', b2b], { ...SUMMARY, gold_generation: 3 })
+
+    applyGoldDelta(client, delta)
+
+    expect(client.getQueryData<SummaryResponse>(['summary', retail])?.totalRevenue).toBe(10000)
+    expect(client.getQueryState(['summary', retail])?.isInvalidated).toBe(false)
+    expect(client.getQueryState(['summary', b2b])?.isInvalidated).toBe(false)
+  })
+
+  it('leaves a trend read after the refresh as it is, even when its summary is patched', () => {
+    const client = new QueryClient()
+    const trend: RevenueTrendResponse = {
+      labels: ['01.08', '02.08', '03.08'], revenue: [1000, 3000, 3000], orders: [1, 3, 3], gold_generation: 3,
+    }
+    client.setQueryData(['summary', retail], { ...SUMMARY, gold_generation: 1 })
+    client.setQueryData(['revenueTrend', retail], trend)
+
+    applyGoldDelta(client, delta)
+
+    expect(client.getQueryData<SummaryResponse>(['summary', retail])?.totalRevenue).toBe(11000)
+    expect(client.getQueryData(['revenueTrend', retail])).toBe(trend)
+    expect(client.getQueryState(['revenueTrend', retail])?.isInvalidated).toBe(false)
+  })
+
+  it('refetches data with no generation to compare', () => {
+    const client = new QueryClient()
+    client.setQueryData(['summary', retail], SUMMARY)
+
+    applyGoldDelta(client, delta)
+
+    expect(client.getQueryData<SummaryResponse>(['summary', retail])?.totalRevenue).toBe(10000)
+    expect(client.getQueryState(['summary', retail])?.isInvalidated).toBe(true)
+  })
+})
@@ -0,0 +1,221 @@
+/**
+ * Apply a `gold_delta` WebSocket message to cached dashboard queries.
+ *
+ * After a warehouse refresh the server sends, per sales-type filter, how much
+ * each changed day's Gold cell moved. Summary, revenue trend and
+ * sales-by-source for that filter are sums over days, so adding the
+ * differences gives the same answer a refetch would, without every open
+ * dashboard hitting the API at once.
+ *
+ * Every response carries the `gold_generation` it was read at, and a delta
+ * the one its refresh produced: data at that generation or later already
+ * includes the change and is left alone, and what is patched takes the
+ * delta's generation, so the same change is never added twice.
+ *
+ * Anything that cannot be patched safely is invalidated instead: queries with
+ * a product/source filter (they are not built from Gold cells), a date range
+ * we cannot place, or data without a generation to compare.
+ */
+
+import type { Query, QueryClient } from '@tanstack/react-query'
+import type { RevenueTrendResponse, SalesBySourceResponse, SummaryResponse } from '../types/api'
+
+export interface GoldDeltaCell {
+  date: string
+  revenue: number
+  orders_count: number
+  returns_count: number
+  returns_revenue: number
+  instagram_revenue: number
+  instagram_orders: number
+  telegram_revenue: number
+  telegram_orders: number
+  shopify_revenue: number
+  shopify_orders: number
+}
+
+export interface GoldDelta {
+  sales_type: string
+  generation: number
+  full: boolean
+  cells: GoldDeltaCell[]
+}
+
+// Query families built from gold_daily_revenue
+export const GOLD_QUERY_ROOTS = ['summary', 'revenueTrend', 'salesBySource'] as const
+
+// Filters the server answers from Silver, not from Gold cells
+const SILVER_FILTERS = ['source_id', 'category_id', 'brand', 'promocode']
+
+// sales-by-source label -> its [revenue, orders] cell columns
+const SOURCE_COLUMNS: Record<string, [keyof GoldDeltaCell, keyof GoldDeltaCell]> = {
+  Instagram: ['instagram_revenue', 'instagram_orders'],
+  Telegram: ['telegram_revenue', 'telegram_orders'],
+  Shopify: ['shopify_revenue', 'shopify_orders'],
+}
+
+const DAY_MS = 24 * 60 * 60 * 1000
+
+const round2 = (n: number) => Math.round(n * 100) / 100
+
+function dayIndex(start: string, date: string): number {
+  return Math.round((Date.parse(date) - Date.parse(start)) / DAY_MS)
+}
+
+function inRange(date: string, start: string, end: string): boolean {
+  return date >= start && date <= end
+}
+
+function dayLabel(date: string): string {
+  // Server labels trend points '%d.%m'
+  const [, month, day] = date.split('-')
+  return `${day}.${month}`
+}
+
+function paramsOf(query: Query): URLSearchParams | null {
+  const raw = query.queryKey[1]
+  return typeof raw === 'string' ? new URLSearchParams(raw) : null
+}
+
+// The date range a params string resolves to, as its summary reported it
+function rangeFor(queryClient: QueryClient, params: string): { start: string; end: string } | null {
+  const summary = queryClient.getQueryData<SummaryResponse>(['summary', params])
+  return summary ? { start: summary.startDate, end: summary.endDate } : null
+}
+
+export function patchSummary(data: SummaryResponse, cells: GoldDeltaCell[]): SummaryResponse {
+  const inside = cells.filter((c) => inRange(c.date, data.startDate, data.endDate))
+  if (!inside.length) return data
+  const sum = (key: keyof GoldDeltaCell) => inside.reduce((acc, c) => acc + (c[key] as number), 0)
+
+  const next = { ...data }
+  next.totalOrders = data.totalOrders + sum('orders_count')
+  next.totalRevenue = round2(data.totalRevenue + sum('revenue'))
+  next.totalReturns = data.totalReturns + sum('returns_count')
+  next.avgCheck = next.totalOrders > 0 ? round2(next.totalRevenue / next.totalOrders) : 0
+  if (typeof data.returnsRevenue === 'number') {
+    next.returnsRevenue = round2(data.returnsRevenue + sum('returns_revenue'))
+  }
+  return next
+}
+
+/** Patched trend, or null when a changed day cannot be placed on the chart. */
+export function patchRevenueTrend(
+  data: RevenueTrendResponse,
+  cells: GoldDeltaCell[],
+  range: { start: string; end: string },
+): RevenueTrendResponse | null {
+  const revenue = [...data.revenue]
+  const orders = [...data.orders]
+  let comparison = data.comparison ? { ...data.comparison, revenue: [...data.comparison.revenue] } : undefined
+  let currentDelta = 0
+  let previousDelta = 0
+
+  for (const cell of cells) {
+    if (inRange(cell.date, range.start, range.end)) {
+      const i = dayIndex(range.start, cell.date)
+      if (data.labels[i] !== dayLabel(cell.date)) return null
+      revenue[i] = round2(revenue[i] + cell.revenue)
+      orders[i] = orders[i] + cell.orders_count
+      currentDelta += cell.revenue
+    }
+    const period = comparison?.period
+    if (comparison && period && inRange(cell.date, period.start, period.end)) {
+      const i = dayIndex(period.start, cell.date)
+      if (i < 0 || i >= comparison.revenue.length) return null
+      comparison.revenue[i] = round2(comparison.revenue[i] + cell.revenue)
+      previousDelta += cell.revenue
+    }
+  }
+
+  if (comparison?.totals && (currentDelta || previousDelta)) {
+    const current = round2(comparison.totals.current + currentDelta)
+    const previous = round2(comparison.totals.previous + previousDelta)
+    comparison = {
+      ...comparison,
+      totals: {
+        current,
+        previous,
+        growth_percent: previous > 0 ? Math.round(((current - previous) / previous) * 1000) / 10 : 0,
+      },
+    }
+  }
+  return { ...data, revenue, orders, comparison }
+}
+
+/** Patched breakdown, or null when a source that moved has no slot in it. */
+export function patchSalesBySource(
+  data: SalesBySourceResponse,
+  cells: GoldDeltaCell[],
+  range: { start: string; end: string },
+): SalesBySourceResponse | null {
+  const inside = cells.filter((c) => inRange(c.date, range.start, range.end))
+  const revenue = [...data.revenue]
+  const orders = [...data.orders]
+
+  data.labels.forEach((label, i) => {
+    const columns = SOURCE_COLUMNS[label]
+    if (!columns) return
+    for (const cell of inside) {
+      revenue[i] = round2(revenue[i] + (cell[columns[0]] as number))
+      orders[i] = orders[i] + (cell[columns[1]] as number)
+    }
+  })
+  const unplaced = Object.entries(SOURCE_COLUMNS).some(
+    ([label, [rev, ord]]) => !data.labels.includes(label) && inside.some((c) => c[rev] || c[ord]),
+  )
+  return unplaced ? null : { ...data, revenue, orders }
+}
+
+function generationOf(data: unknown): number | undefined {
+  const stamp = (data as { gold_generation?: unknown } | undefined)?.gold_generation
+  return typeof stamp === 'number' ? stamp : undefined
+}
+
+function patch(queryClient: QueryClient, query: Query, delta: GoldDelta): boolean {
+  const root = query.queryKey[0]
+  const params = query.queryKey[1] as string
+  const data = query.state.data
+  let next: SummaryResponse | RevenueTrendResponse | SalesBySourceResponse | null
+  if (root === 'summary') {
+    next = patchSummary(data as SummaryResponse, delta.cells)
+  } else {
+    const range = rangeFor(queryClient, params)
+    if (!range) return false
+    next = root === 'revenueTrend'
+      ? patchRevenueTrend(data as RevenueTrendResponse, delta.cells, range)
+      : patchSalesBySource(data as SalesBySourceResponse, delta.cells, range)
+  }
+  if (!next) return false
+  queryClient.setQueryData(query.queryKey, { ...next, gold_generation: delta.generation })
+  return true
+}
+
+export function applyGoldDelta(queryClient: QueryClient, delta: GoldDelta): void {
+  const queries = queryClient.getQueryCache().findAll({
+    predicate: (q) => (GOLD_QUERY_ROOTS as readonly unknown[]).includes(q.queryKey[0]),
+  })
+  // Summaries first: the trend and source patches read their date range.
+  queries.sort((a, b) => Number(b.queryKey[0] === 'summary') - Number(a.queryKey[0] === 'summary'))
+
+  for (const query of queries) {
+    const params = paramsOf(query)
+    if (!params) continue
+    const generation = generationOf(query.state.data)
+    // Read at or after the refresh: the change is already in it
+    if (generation !== undefined && generation >= delta.generation) continue
+    if (params.get('sales_type') !== delta.sales_type) {
+      // Another filter's data moved too, by an amount we were not sent
+      queryClient.invalidateQueries({ queryKey: query.queryKey, exact: true, refetchType: 'none' })
+      continue
+    }
+    const patchable =
+      !delta.full &&
+      generation !== undefined &&
+      query.state.fetchStatus !== 'fetching' &&
+      !SILVER_FILTERS.some((f) => params.has(f))
+    if (!patchable || !patch(queryClient, query, delta)) {
+      queryClient.invalidateQueries({ queryKey: query.queryKey, exact: true })
+    }
+  }
+}
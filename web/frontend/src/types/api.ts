@@ -6,8 +6,10 @@ export interface SummaryResponse {
   avgCheck: number
   totalReturns: number
   returnRate: number
+  returnsRevenue?: number
   startDate: string
   endDate: string
+  gold_generation?: number
 }
 
 export interface ReturnOrder {
@@ -75,6 +77,7 @@ export interface RevenueTrendResponse {
     }
   }
   forecast?: RevenueForecast
+  gold_generation?: number
 }
 
 export interface SalesBySourceResponse {
@@ -82,6 +85,7 @@ export interface SalesBySourceResponse {
   revenue: number[]
   orders: number[]
   backgroundColor: string[]
+  gold_generation?: number
 }
 
 export interface TopProductsResponse {
@@ -1144,6 +1148,8 @@ export interface CategoryCombo {
   categoryA: string
   categoryB: string
   coOccurrence: number
+  support: number
+  lift: number
 }
 
 export interface BrandAffinityPair {
@@ -1151,6 +1157,8 @@ export interface BrandAffinityPair {
   brandB: string
   coOccurrence: number
   productPairs: number
+  support: number
+  lift: number
 }
 
 // ─── Margin Analysis Types ──────────────────────────────────────────────────
@@ -18,11 +18,12 @@ from web.routes.auth import api_gate, require_admin
 from web.middleware import RequestLoggingMiddleware, RequestTimeoutMiddleware
 from bot.database import init_database
 from core.duckdb_store import get_store, close_store
-from core.sync_service import init_and_sync
+from core.sync_service import initial_sync, ensure_sku_inventory, init_search
 from core.config import validate_config, ConfigurationError
 from core.observability import setup_logging, get_logger
 from core.scheduler import start_scheduler, stop_scheduler
 from core.events import events, SyncEvent
+from web.startup import startup_progress
 
 # Configure structured logging
 # Use JSON format in production (LOG_FORMAT=json), human-readable otherwise
@@ -127,9 +128,19 @@ app.include_router(websocket.router)  # WebSocket routes (no /api prefix) — se
 app.include_router(chat.router, prefix="/api", dependencies=[Depends(api_gate), Depends(require_admin)])
 app.include_router(pages.router)  # SPA catch-all must be last
 
+# Background warm-up started by startup_event; see web/startup.py.
+_warm_up_task = None
+
 
 @app.on_event("startup")
 async def startup_event():
+    """Open the store and start serving; everything slower runs in `_warm_up`.
+
+    Awaiting the startup sync here held uvicorn off its socket for the whole
+    sync, SKU refresh and Meilisearch load, so every deploy was a 502 window.
+    With data already in DuckDB the dashboard now serves it, stale, from the
+    first request, and /api/health reports the warm-up as it goes.
+    """
     logger.info("KoreanStory Dashboard starting...")
 
     # Log sync mode for visibility
@@ -148,58 +159,79 @@ async def startup_event():
     init_database()
     logger.info("SQLite database initialized")
 
-    # Initialize DuckDB analytics store and sync from API
+    # Open the DuckDB analytics store
     logger.info("Initializing DuckDB analytics store...")
-    try:
-        await init_and_sync(full_sync_days=730)
-        store = await get_store()
-        stats = await store.get_stats()
-        logger.info(
-            f"DuckDB ready: {stats['orders']} orders, "
-            f"{stats['products']} products, "
-            f"{stats['categories']} categories, "
-            f"{stats['db_size_mb']} MB"
-        )
-    except Exception as e:
-        logger.error(f"DuckDB sync failed on startup: {e}", exc_info=True)
-        # Don't crash if store has data — serve stale data, scheduler will retry sync
+    async with startup_progress.phase("store"):
         store = await get_store()
         stats = await store.get_stats()
-        if stats.get("orders", 0) == 0:
-            raise  # Fail fast only if DuckDB has no data at all
-        logger.warning(f"Serving stale data ({stats['orders']} orders) — sync will retry via scheduler")
+    logger.info(
+        f"DuckDB open: {stats['orders']} orders, "
+        f"{stats['products']} products, "
+        f"{stats['categories']} categories, "
+        f"{stats['db_size_mb']} MB"
+    )
+
+    if stats.get("orders", 0) == 0:
+        # Nothing to serve yet, so there is no reason to start before the
+        # first sync — and a failed one should still fail the boot.
+        async with startup_progress.phase("sync"):
+            await initial_sync(full_sync_days=730)
 
-    # Migrate users from SQLite to DuckDB (one-time, idempotent)
+    # Migrate users from SQLite to DuckDB (one-time, idempotent). Before
+    # serving: the login check reads the DuckDB users table.
     try:
         await _migrate_sqlite_users_to_duckdb(store)
     except Exception as e:
         logger.warning(f"User migration from SQLite skipped: {e}")
 
-    # Start background job scheduler (replaces old asyncio background sync)
-    try:
-        await start_scheduler()
-        logger.info("Background job scheduler started")
-    except Exception as e:
-        logger.error(f"Scheduler initialization failed: {e}", exc_info=True)
-        # Non-fatal - dashboard can work without scheduler
-
     # Register event handlers for sync events
     _register_event_handlers()
     logger.info("Event handlers registered")
 
-    # Train revenue prediction model in background (non-blocking)
-    try:
-        from core.prediction_service import get_prediction_service
-        prediction_service = get_prediction_service()
-        if not prediction_service.is_ready:
-            asyncio.create_task(_train_prediction_model())
-            logger.info("Revenue prediction model training scheduled")
-        else:
-            logger.info("Revenue prediction model loaded from disk")
-    except Exception as e:
-        logger.warning(f"Prediction service initialization skipped: {e}")
+    startup_progress.mark_ready()
+    global _warm_up_task
+    _warm_up_task = asyncio.create_task(_warm_up())
+    logger.info("Dashboard ready - all queries use DuckDB; warm-up continues in background")
+
+
+async def _warm_up() -> None:
+    """The rest of startup, one tracked phase at a time, after serving begins.
+
+    Every phase is non-fatal: a failed sync leaves stale data being served
+    and the scheduler, started regardless, retries it.
+    """
+    async def run(name, fn, *args):
+        try:
+            async with startup_progress.phase(name):
+                result = await fn(*args)
+        except Exception as e:
+            logger.error(f"Startup phase {name} failed: {e}", exc_info=True)
+            return
+        if result is False:
+            startup_progress.skip(name, "unavailable")
+
+    if startup_progress.stale:
+        await run("sync", initial_sync, 730)
+    await run("sku_inventory", ensure_sku_inventory)
+    await run("search", init_search)
 
-    logger.info("Dashboard ready - all queries use DuckDB")
+    # Started after the sync so the scheduler's first incremental sync does not
+    # race the startup one.
+    await run("scheduler", start_scheduler)
+
+    # Train revenue prediction models in background (non-blocking)
+    await run("prediction", _start_prediction_training)
+
+
+async def _start_prediction_training() -> None:
+    from core.prediction_service import SALES_TYPES, get_prediction_service
+    prediction_service = get_prediction_service()
+    missing = await prediction_service.missing_models(SALES_TYPES)
+    if missing:
+        asyncio.create_task(_train_prediction_model(missing))
+        logger.info(f"Revenue prediction model training scheduled: {', '.join(missing)}")
+    else:
+        logger.info("Revenue prediction models found on disk")
 
 
 async def _migrate_sqlite_users_to_duckdb(store):
@@ -251,15 +283,16 @@ async def _migrate_sqlite_users_to_duckdb(store):
             logger.info(f"Fixed {len(fixed)} users incorrectly set as admin: {[r[0] for r in fixed]}")
 
 
-async def _train_prediction_model():
-    """Train revenue prediction model in background after startup."""
+async def _train_prediction_model(sales_types):
+    """Train the missing revenue prediction models in background after startup."""
     # Wait for DuckDB to be fully ready with data
     await asyncio.sleep(10)
     try:
         from core.prediction_service import get_prediction_service
         service = get_prediction_service()
-        result = await service.train(sales_type="retail")
-        logger.info(f"Prediction model training result: {result.get('status')}")
+        results = await service.train_all(sales_types)
+        for sales_type, result in results.items():
+            logger.info(f"Prediction model training result ({sales_type}): {result.get('status')}")
     except Exception as e:
         logger.warning(f"Background prediction training failed: {e}")
 
@@ -322,6 +355,19 @@ def _register_event_handlers():
             {"sync_type": sync_type, "error": error}
         )
 
+    @events.on(SyncEvent.WAREHOUSE_REFRESHED)
+    async def on_warehouse_refreshed(data: dict):
+        """Push the Gold cells that moved to dashboards, one payload per sales-type filter."""
+        from core.gold_delta import DASHBOARD_SALES_TYPES, delta_for_sales_type
+
+        cells = data.get("gold_delta")
+        for sales_type in DASHBOARD_SALES_TYPES:
+            payload = delta_for_sales_type(cells, sales_type, data.get("gold_generation", 0))
+            if payload["full"] or payload["cells"]:
+                await ws_manager.broadcast(
+                    "dashboard", WebSocketEvent.GOLD_DELTA, payload, sales_type=sales_type
+                )
+
     @events.on(SyncEvent.GOALS_UPDATED)
     async def on_goals_updated(data: dict):
         """Broadcast goal updates to WebSocket clients."""
@@ -334,6 +380,10 @@ def _register_event_handlers():
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    # A deploy can stop the process mid warm-up
+    if _warm_up_task is not None and not _warm_up_task.done():
+        _warm_up_task.cancel()
+
     # Stop scheduler first (graceful shutdown of background jobs)
     try:
         stop_scheduler()
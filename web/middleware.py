@@ -114,10 +114,14 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
                 }
             )
 
-        # Record metrics
-        endpoint = f"{method} {path}"
-        metrics.record_request(endpoint)
-        metrics.record_timing(endpoint, duration_ms)
+        # Record metrics under the route template (/api/orders/{order_id}), not
+        # the raw path, so ids and scanners cannot grow the series without bound
+        route = getattr(request.scope.get("route"), "path", None) or "unmatched"
+        metrics.record_request(f"{method} {route}")
+        metrics.observe(
+            "http_request_duration", duration_ms,
+            method=method, route=route, status=str(response.status_code),
+        )
 
         if response.status_code >= 400:
             metrics.record_error(f"HTTP_{response.status_code}")
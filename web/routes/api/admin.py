@@ -120,7 +120,8 @@ async def rebuild_silver_from_scratch(
     use when silver has corrupted rows blocking DELETE+INSERT rebuild.
     """
     from core.duckdb_store import (
-        SILVER_ORDERS_DDL, silver_select_sql, silver_pass2_sql,
+        SILVER_ORDERS_DDL, rewrite_buyer_stats, rewrite_cohort_activity,
+        silver_select_sql, silver_pass2_sql,
     )
 
     store = await get_store()
@@ -130,8 +131,12 @@ async def rebuild_silver_from_scratch(
         conn.execute(SILVER_ORDERS_DDL)
         conn.execute(f"INSERT INTO silver_orders SELECT {silver_select_sql()} FROM orders o")
         conn.execute(silver_pass2_sql())
+        rewrite_buyer_stats(conn)
+        rewrite_cohort_activity(conn)
         count = conn.execute("SELECT COUNT(*) FROM silver_orders").fetchone()[0]
         max_date = conn.execute("SELECT MAX(order_date) FROM silver_orders").fetchone()[0]
+    store.bump_gold_generation()
+    store.request_full_validation()
 
     logger.info(f"Rebuilt silver_orders from scratch: {count} rows, max_date={max_date}")
     return {"status": "ok", "silver_rows": count, "max_order_date": str(max_date)}
@@ -221,6 +226,8 @@ async def purge_orders(
         "silver_orders": after_silver,
     }
     result["checkpoint"] = "done"
+    # Silver lost rows behind the refresh's back; see request_full_validation.
+    store.request_full_validation()
     logger.info(f"Purged orders: {result}")
     return result
 
@@ -812,6 +819,43 @@ async def get_events(
     }
 
 
+# ─── Query Profiler ──────────────────────────────────────────────────────────
+
+@router.get("/duckdb/profile")
+@limiter.limit("30/minute")
+async def get_query_profile(request: Request):
+    """DuckDB statement profile: totals per repository method, slowest statements, sampled plans."""
+    from core.query_profiler import query_profiler
+
+    return query_profiler.snapshot()
+
+
+@router.post("/duckdb/profile")
+@limiter.limit("10/minute")
+async def configure_query_profile(
+    request: Request,
+    enabled: Optional[bool] = Query(None, description="Turn statement profiling on or off"),
+    sample_rate: Optional[float] = Query(
+        None, ge=0.0, le=1.0,
+        description="Fraction of reads to EXPLAIN ANALYZE (each sampled read runs twice)",
+    ),
+    top_n: Optional[int] = Query(None, ge=1, le=500, description="Slowest statements to keep"),
+    reset: bool = Query(False, description="Clear what has been collected"),
+):
+    """Turn the DuckDB query profiler on or off. Off costs nothing; on, every statement is timed."""
+    from core.query_profiler import query_profiler
+
+    query_profiler.configure(enabled=enabled, top_n=top_n, sample_rate=sample_rate)
+    if reset:
+        query_profiler.reset()
+    logger.info(
+        f"Query profiler: enabled={query_profiler.enabled} "
+        f"sample_rate={query_profiler.sample_rate} top_n={query_profiler.top_n}"
+    )
+    snapshot = query_profiler.snapshot()
+    return {key: snapshot[key] for key in ("enabled", "sample_rate", "top_n", "statements")}
+
+
 # ─── Reconciliation ──────────────────────────────────────────────────────────
 
 @router.get("/reconciliation")
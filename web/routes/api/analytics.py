@@ -201,6 +201,7 @@ async def train_revenue_forecast(
 async def tune_revenue_forecast(
     request: Request,
     sales_type: Optional[str] = Query("retail", description="Sales type: retail or b2b"),
+    halving: bool = Query(False, description="Prune the grid by successive halving over the folds"),
     admin: dict = Depends(require_admin),
 ):
     """Run hyperparameter grid search for LightGBM parameters. Requires admin."""
@@ -211,7 +212,7 @@ async def tune_revenue_forecast(
 
     from core.prediction_service import get_prediction_service
     service = get_prediction_service()
-    return await service.tune(sales_type)
+    return await service.tune(sales_type, halving=halving)
 
 
 @router.get("/revenue/forecast/evaluate")
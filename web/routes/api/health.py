@@ -9,10 +9,15 @@ import asyncio
 import time
 
 from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
 
+from core import keycrm
 from core.observability import get_correlation_id, metrics, Timer
+from core.query_cache import query_cache
 from web.config import VERSION
+from web.routes.auth import session_cache
 from web.schemas import HealthResponse, MetricsResponse
+from web.startup import startup_progress
 from ._deps import limiter, get_store, get_logger, START_TIME
 
 router = APIRouter()
@@ -119,6 +124,11 @@ async def health_check(request: Request):
         "migrations": migrations,
         "sync": sync_status,
         "data_quality": data_quality,
+        "query_cache": query_cache.get_stats(),
+        "keycrm_governor": keycrm.rate_governor.get_stats(),
+        "live": True,
+        "ready": startup_progress.ready,
+        "startup": startup_progress.snapshot(),
     }
 
 
@@ -179,11 +189,12 @@ async def detailed_health_check(request: Request):
 
     # 6. Prediction service
     try:
-        from core.prediction_service import get_prediction_service
+        from core.prediction_service import forecast_cache, get_prediction_service
         pred_service = get_prediction_service()
         components["prediction"] = {
             "status": "ready" if pred_service.is_ready else "not_ready",
             "model_loaded": pred_service.is_ready,
+            "forecast_cache": forecast_cache.get_stats(),
         }
     except Exception as e:
         components["prediction"] = {"status": "unavailable", "error": str(e)}
@@ -285,4 +296,18 @@ async def get_metrics_endpoint(request: Request):
         "uptime_seconds": int(time.time() - START_TIME),
         "correlation_id": get_correlation_id(),
         **metrics.get_stats(),
+        "session_cache": session_cache.get_stats(),
     }
+
+
+@router.get("/metrics/prometheus", response_class=PlainTextResponse)
+@limiter.limit("60/minute")
+async def get_prometheus_metrics(request: Request):
+    """The same metrics in the Prometheus text format, for a scraper.
+
+    Request latency by method, route and status; DuckDB lock wait and
+    execution time by lane. Gated like /api/metrics.
+    """
+    return PlainTextResponse(
+        metrics.prometheus_text(), media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
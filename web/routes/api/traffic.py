@@ -253,6 +253,13 @@ _backfill_status: dict = {"running": False, "result": None}
 
 async def _run_backfill(days: int):
     """Background task: backfill manager_comment from KeyCRM API."""
+    from core.keycrm import Priority, keycrm_priority
+
+    with keycrm_priority(Priority.BACKGROUND):
+        await _backfill_manager_comments(days)
+
+
+async def _backfill_manager_comments(days: int):
     from core.keycrm import get_async_client
 
     store = await get_store()
@@ -10,6 +10,7 @@ from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
 
 from core.config import config, is_production_url
 from core.permissions import is_hardcoded_admin
+from core.query_cache import QueryCache
 from web.config import TEMPLATES_DIR
 from web.services.auth_service import (
     verify_telegram_auth,
@@ -56,6 +57,15 @@ SESSION_MAX_AGE = 7 * 24 * 60 * 60
 DASHBOARD_URL = os.getenv("DASHBOARD_URL", "")
 COOKIE_SECURE = is_production_url(DASHBOARD_URL) or os.getenv("COOKIE_SECURE", "false").lower() == "true"
 
+# Role and status per user, as _resolve_session last read them from DuckDB.
+# Every /api request and WebSocket handshake resolves the session, so without
+# this each one was a users-table query. Entries are keyed to the store's
+# users_generation, which every user or permission write bumps: a freeze,
+# denial or role change applies on the very next request. The TTL only bounds
+# how long a user that went unused stays in memory.
+SESSION_CACHE_TTL_SECONDS = 30.0
+session_cache = QueryCache(max_entries=1024, ttl_seconds=SESSION_CACHE_TTL_SECONDS)
+
 
 @router.get("/login")
 async def login_page(request: Request, error: str = None, status: str = None):
@@ -237,9 +247,10 @@ async def _resolve_session(session: str | None) -> dict | None:
     """
     Validate a signed session string and return fresh user data, or None.
 
-    Re-reads role/status from DuckDB so admin changes (role updates, freezes,
-    denials) take effect immediately on the next request. Shared by the HTTP
-    and WebSocket entry points.
+    Role/status come from DuckDB through `session_cache`, which is dropped on
+    every user write, so admin changes (role updates, freezes, denials) take
+    effect immediately on the next request. Shared by the HTTP and WebSocket
+    entry points.
     """
     if not session:
         return None
@@ -260,7 +271,10 @@ async def _resolve_session(session: str | None) -> dict | None:
         try:
             from core.duckdb_store import get_store
             store = await get_store()
-            user = await store.get_user(user_id)
+            user = await session_cache.get_or_compute(
+                ("user", user_id), store.users_generation,
+                lambda: _session_user(store, user_id),
+            )
             if user:
                 if user.get('status') != 'approved':
                     return None
@@ -285,6 +299,14 @@ async def _resolve_session(session: str | None) -> dict | None:
         return None
 
 
+async def _session_user(store, user_id: int) -> dict | None:
+    """The part of a users row a session needs; None if there is no row."""
+    user = await store.get_user(user_id)
+    if not user:
+        return None
+    return {"status": user.get("status"), "role": user.get("role", "viewer")}
+
+
 async def get_current_user(request: Request) -> dict | None:
     """Get current user from the HTTP session cookie (None if not authenticated)."""
     return await _resolve_session(request.cookies.get(SESSION_COOKIE))
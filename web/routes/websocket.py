@@ -34,10 +34,13 @@ async def dashboard_websocket(websocket: WebSocket):
     - goal_progress: Progress toward revenue goals
     - milestone_reached: A goal milestone was achieved
     - sync_status: Sync service status change
+    - gold_delta: Gold revenue cells a warehouse refresh changed, for the
+      sales type the client subscribed to (see core/gold_delta.py)
 
     Client can send:
     - "ping" for keep-alive (responds with "pong")
-    - JSON: {"action": "subscribe", "room": "dashboard"}
+    - JSON: {"action": "subscribe", "sales_type": "retail"} (responds with
+      "subscribed" for "retail", "b2b" or "all"; any other value unsubscribes)
     """
     user = await get_current_user_ws(websocket)
     if not user:
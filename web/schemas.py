@@ -74,6 +74,27 @@ class HealthResponse(BaseModel):
             "because Pydantic already owns that word."
         ),
     )
+    query_cache: Optional[Dict[str, Any]] = Field(
+        None, description="Dashboard query cache: entries, hits, misses, coalesced, evictions"
+    )
+    keycrm_governor: Optional[Dict[str, Any]] = Field(
+        None,
+        description=(
+            "Shared KeyCRM rate governor: current and ceiling rate, tokens, queue "
+            "depth and grants per priority class, 429 and slow-response events"
+        ),
+    )
+    live: bool = Field(True, description="The process is up and answering")
+    ready: bool = Field(
+        False, description="DuckDB is open and holds data; may be stale until startup.sync is done"
+    )
+    startup: Optional[Dict[str, Any]] = Field(
+        None,
+        description=(
+            "Background warm-up after serving began: current phase, settled/total "
+            "progress, whether data is stale, and each phase's status and duration"
+        ),
+    )
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -88,6 +109,7 @@ class TimingStats(BaseModel):
     max_ms: float
     p50_ms: Optional[float] = None
     p95_ms: Optional[float] = None
+    p99_ms: Optional[float] = None
 
 
 class MetricsResponse(BaseModel):
@@ -97,6 +119,9 @@ class MetricsResponse(BaseModel):
     requests: Dict[str, int] = Field(default_factory=dict)
     errors: Dict[str, int] = Field(default_factory=dict)
     timing: Dict[str, TimingStats] = Field(default_factory=dict)
+    session_cache: Optional[Dict[str, Any]] = Field(
+        None, description="User role/status cache behind session checks: hits, misses, hit_ratio"
+    )
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -2,14 +2,22 @@
 Dashboard service for analytics data.
 
 Uses DuckDB as the primary data source for fast, persistent queries.
-No in-memory caching needed - DuckDB queries are <10ms.
+
+The widgets every page opens with (trend, sources, top products, summary) go
+through `core.query_cache`: DuckDB answers them in <10ms on a quiet store, but
+not while a refresh holds the writer, and every tab asks the same questions.
+Entries are keyed to the store's `gold_generation`, so a refresh that changed
+anything retires them.
 """
+import functools
+import inspect
 import logging
 from datetime import date, datetime
 from typing import Dict, List, Optional, Any, Tuple
 
 from core.duckdb_store import get_store
 from core.filters import parse_period as _parse_period_core
+from core.query_cache import query_cache
 
 logger = logging.getLogger(__name__)
 
@@ -26,9 +34,43 @@ def _parse_dates(start_date: str, end_date: str) -> Tuple[date, date]:
     return start, end
 
 
+def _cached(fn):
+    """Serve `fn` from the query cache, keyed by its fully-bound arguments.
+
+    Binding against the signature is the normalisation: `get_summary_stats(a,
+    b)` and `get_summary_stats(a, b, sales_type="retail")` are one question
+    and must be one entry.
+
+    A dict answer is stamped with the `gold_generation` it was read at, so the
+    dashboard can tell whether a `gold_delta` is already in what it holds. One
+    that a refresh overtook mid-query is left unstamped, and the dashboard
+    refetches it rather than patch it.
+    """
+    signature = inspect.signature(fn)
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = (fn.__name__, tuple(sorted(bound.arguments.items())))
+        store = await get_store()
+        generation = store.gold_generation
+
+        async def compute():
+            result = await fn(*args, **kwargs)
+            if isinstance(result, dict) and store.gold_generation == generation:
+                result["gold_generation"] = generation
+            return result
+
+        return await query_cache.get_or_compute(key, generation, compute)
+
+    return wrapper
+
+
 # ─── Dashboard Query Functions ────────────────────────────────────────────────
 
 
+@_cached
 async def get_revenue_trend(
     start_date: str,
     end_date: str,
@@ -77,35 +119,11 @@ async def get_comparison_for_dates(
     Returns dict mapping each date to its comparison-period revenue.
     E.g. for year_ago, date 2026-02-01 maps to revenue on 2025-02-01.
     """
-    from dateutil.relativedelta import relativedelta
-
-    if not dates:
-        return {}
-
-    # Compute comparison dates
-    comp_dates = []
-    date_map = {}  # comp_date -> original_date
-    for d in dates:
-        if compare_type == "year_ago":
-            cd = d - relativedelta(years=1)
-        elif compare_type == "month_ago":
-            cd = d - relativedelta(months=1)
-        else:
-            # previous_period: shift by len(dates) days back
-            cd = d - relativedelta(days=len(dates))
-        comp_dates.append(cd)
-        date_map[cd] = d
-
-    if not comp_dates:
-        return {}
-
     store = await get_store()
-    revenue_by_date = await store.get_daily_revenue_for_dates(comp_dates, sales_type)
-
-    # Map back to original dates
-    return {date_map[cd]: revenue_by_date.get(cd, 0) for cd in comp_dates}
+    return await store.get_comparison_revenue_for_dates(dates, compare_type, sales_type)
 
 
+@_cached
 async def get_sales_by_source(
     start_date: str,
     end_date: str,
@@ -127,6 +145,7 @@ async def get_sales_by_source(
     )
 
 
+@_cached
 async def get_top_products(
     start_date: str,
     end_date: str,
@@ -151,6 +170,7 @@ async def get_top_products(
     )
 
 
+@_cached
 async def get_summary_stats(
     start_date: str,
     end_date: str,
@@ -178,16 +178,18 @@ class SearchService:
 
                 buyer_dict["orders"] = [dict(o) for o in orders]
 
-                # Get aggregated stats
+                # Aggregated stats, kept per buyer by the warehouse refresh
+                # (returns and inactive sources excluded, as in Gold)
                 stats = conn.execute("""
                     SELECT
-                        COUNT(*) as total_orders,
-                        SUM(CASE WHEN NOT is_return THEN grand_total ELSE 0 END) as total_spent,
-                        AVG(CASE WHEN NOT is_return THEN grand_total ELSE NULL END) as avg_order_value,
-                        MIN(ordered_at) as first_order,
-                        MAX(ordered_at) as last_order
-                    FROM silver_orders
-                    WHERE buyer_id = ?
+                        COALESCE(st.orders, 0) as total_orders,
+                        COALESCE(st.revenue, 0) as total_spent,
+                        st.revenue / NULLIF(st.orders, 0) as avg_order_value,
+                        st.first_ordered_at as first_order,
+                        st.last_ordered_at as last_order
+                    FROM (SELECT ?::BIGINT AS buyer_id) b
+                    LEFT JOIN silver_buyer_stats st
+                        ON st.buyer_id = b.buyer_id AND st.sales_type = 'all'
                 """, [buyer_id]).fetchone()
 
                 buyer_dict["stats"] = dict(stats) if stats else {}
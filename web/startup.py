@@ -0,0 +1,96 @@
+"""Startup phases — what the web process has done since it began serving.
+
+The app accepts requests as soon as DuckDB is open and holds data; syncing
+with KeyCRM, the SKU inventory refresh, Meilisearch, the scheduler and model
+training follow as a background warm-up. ``/api/health`` reports from here:
+
+- live: the process answers (it does if it can report anything at all);
+- ready: the store is open and has data to serve — stale until ``sync`` is done;
+- startup: each phase's status and timing, and how many are finished.
+
+One instance app-wide, like the limiter; ``web.main`` drives it.
+"""
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional, Sequence
+
+from core.observability import get_logger
+
+logger = get_logger(__name__)
+
+# In the order web.main runs them. `store` blocks serving; the rest do not.
+STARTUP_PHASES = ("store", "sync", "sku_inventory", "search", "scheduler", "prediction")
+
+# A phase that has settled either way. Progress counts these.
+_SETTLED = ("done", "failed", "skipped")
+
+
+class StartupProgress:
+    """Per-phase status of the warm-up, and whether the app is ready."""
+
+    def __init__(self, phases: Sequence[str] = STARTUP_PHASES):
+        self._started = time.monotonic()
+        self._phases: Dict[str, Dict[str, Any]] = {
+            name: {"status": "pending", "duration_ms": None, "error": None} for name in phases
+        }
+        self._ready = False
+        self._warm_since: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def mark_ready(self) -> None:
+        """The store is open and has data; requests can be answered, if stale."""
+        if not self._ready:
+            self._ready = True
+            logger.info(f"Ready to serve after {self._elapsed_ms():.0f} ms")
+
+    @property
+    def stale(self) -> bool:
+        """Serving what was in DuckDB at boot: the startup sync has not finished."""
+        return self._phases.get("sync", {}).get("status") != "done"
+
+    @property
+    def complete(self) -> bool:
+        return all(p["status"] in _SETTLED for p in self._phases.values())
+
+    @asynccontextmanager
+    async def phase(self, name: str):
+        """Track one phase. A failure is recorded and re-raised."""
+        entry = self._phases[name]
+        entry["status"] = "running"
+        t0 = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            entry["status"] = "failed"
+            entry["error"] = str(e) or type(e).__name__
+            raise
+        else:
+            entry["status"] = "done"
+        finally:
+            entry["duration_ms"] = round((time.monotonic() - t0) * 1000, 1)
+            if self.complete and self._warm_since is None:
+                self._warm_since = self._elapsed_ms()
+                logger.info(f"Startup warm-up finished after {self._warm_since:.0f} ms")
+
+    def skip(self, name: str, reason: str) -> None:
+        self._phases[name].update(status="skipped", error=reason)
+
+    def _elapsed_ms(self) -> float:
+        return (time.monotonic() - self._started) * 1000
+
+    def snapshot(self) -> Dict[str, Any]:
+        running = [n for n, p in self._phases.items() if p["status"] == "running"]
+        settled = sum(p["status"] in _SETTLED for p in self._phases.values())
+        return {
+            "phase": running[0] if running else ("complete" if self.complete else "pending"),
+            "progress": f"{settled}/{len(self._phases)}",
+            "stale": self.stale,
+            "elapsed_ms": round(self._warm_since if self._warm_since is not None else self._elapsed_ms(), 1),
+            "phases": {name: dict(p) for name, p in self._phases.items()},
+        }
+
+
+startup_progress = StartupProgress()